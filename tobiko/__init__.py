@@ -28,6 +28,7 @@ from tobiko.common import _loader
 from tobiko.common import _logging
 from tobiko.common import _operation
 from tobiko.common import _os
+from tobiko.common import _profiler
 from tobiko.common import _retry
 from tobiko.common import _select
 from tobiko.common import _shelves
@@ -93,21 +94,35 @@ get_object_name = _fixture.get_object_name
 remove_fixture = _fixture.remove_fixture
 reset_fixture = _fixture.reset_fixture
 setup_fixture = _fixture.setup_fixture
+setup_fixtures = _fixture.setup_fixtures
 cleanup_fixture = _fixture.cleanup_fixture
 use_fixture = _fixture.use_fixture
 list_required_fixtures = _fixture.list_required_fixtures
+get_fixture_graph = _fixture.get_fixture_graph
 SharedFixture = _fixture.SharedFixture
 FixtureManager = _fixture.FixtureManager
 RequiredFixture = _fixture.RequiredFixture
+enable_fixture_profiler = _fixture.enable_fixture_profiler
+disable_fixture_profiler = _fixture.disable_fixture_profiler
+get_fixture_profiler = _fixture.get_fixture_profiler
+
+FixtureCall = _profiler.FixtureCall
+FixtureProfiler = _profiler.FixtureProfiler
+get_fixture_summary = _profiler.get_fixture_summary
+load_fixture_calls = _profiler.load_fixture_calls
+write_fixture_profile = _profiler.write_fixture_profile
 
 parse_ini_file = _ini.parse_ini_file
 
 CaptureLogFixture = _logging.CaptureLogFixture
 
+lazy_import = _loader.lazy_import
+LazyModule = _loader.LazyModule
 load_object = _loader.load_object
 load_module = _loader.load_module
 
 makedirs = _os.makedirs
+load_json_file = _os.load_json_file
 open_output_file = _os.open_output_file
 
 runs_operation = _operation.runs_operation
@@ -122,15 +137,25 @@ operation_config = _operation.operation_config
 
 retry = _retry.retry
 retry_attempt = _retry.retry_attempt
+retry_backoff = _retry.retry_backoff
 retry_on_exception = _retry.retry_on_exception
+AdaptiveBackoff = _retry.AdaptiveBackoff
+DecorrelatedJitterBackoff = _retry.DecorrelatedJitterBackoff
+ExponentialBackoff = _retry.ExponentialBackoff
+FibonacciBackoff = _retry.FibonacciBackoff
 Retry = _retry.Retry
 RetryAttempt = _retry.RetryAttempt
+RetryBackoff = _retry.RetryBackoff
+RetryBackoffType = _retry.RetryBackoffType
+RetryStats = _retry.RetryStats
 RetryCountLimitError = _retry.RetryCountLimitError
 RetryLimitError = _retry.RetryLimitError
 RetryTimeLimitError = _retry.RetryTimeLimitError
 
 Selection = _select.Selection
+IndexedSelection = _select.IndexedSelection
 select = _select.select
+select_indexed = _select.select_indexed
 select_uniques = _select.select_uniques
 ObjectNotFound = _select.ObjectNotFound
 MultipleObjectsFound = _select.MultipleObjectsFound
@@ -13,10 +13,13 @@
 #    under the License.
 from __future__ import absolute_import
 
+from concurrent import futures
+import contextlib
 import json
 import os
 import inspect
 import sys
+import threading
 import typing
 
 import fixtures
@@ -27,6 +30,7 @@ from tobiko.common import _case
 from tobiko.common import _detail
 from tobiko.common import _exception
 from tobiko.common import _loader
+from tobiko.common import _profiler
 
 
 LOG = log.getLogger(__name__)
@@ -185,7 +189,9 @@ def setup_fixture(obj: FixtureType,
                                                  fixture_id=fixture_id,
                                                  manager=manager))
             try:
-                fixture.setUp()
+                with fixture_manager(fixture, manager).profile_fixture(
+                        fixture, 'setup'):
+                    fixture.setUp()
                 break
             except testtools.MultipleExceptions:
                 errors.append(sys.exc_info())
@@ -195,6 +201,172 @@ def setup_fixture(obj: FixtureType,
     return fixture
 
 
+def setup_fixtures(objs: typing.Iterable[typing.Any],
+                   manager: 'FixtureManager' = None,
+                   workers_count: int = None) \
+        -> typing.List[fixtures.Fixture]:
+    """It setups fixtures required by given objects concurrently
+
+    It builds the graph of the fixtures required by given objects (fixtures,
+    test cases, test methods or their names) and then setups them using a
+    bounded pool of threads: every fixture is set up only after the fixtures
+    it requires, while independent branches of the graph are set up at the
+    same time.
+
+    :param workers_count: maximum number of fixtures to be set up at the same
+        time. When None it is taken from 'fixture_setup_workers' option of
+        'common' configuration section. When lower than 2 fixtures are set
+        up one after the other.
+
+    :returns: the list of fixtures set up, in order of completion.
+    """
+    graph = get_fixture_graph(objs, manager=manager)
+    if workers_count is None:
+        workers_count = get_fixture_setup_workers()
+
+    if workers_count < 2 or len(graph) < 2:
+        return [setup_fixture(node.fixture)
+                for node in graph.values()]
+
+    LOG.debug(f"Set up {len(graph)} fixture(s) using up to {workers_count} "
+              "worker thread(s)")
+    return FixtureGraphSetup(graph=graph,
+                             workers_count=workers_count).setup_fixtures()
+
+
+def get_fixture_setup_workers() -> int:
+    from tobiko import config
+    return config.CONF.tobiko.common.fixture_setup_workers or 1
+
+
+class FixtureNode(typing.NamedTuple):
+    fixture: fixtures.Fixture
+    requires: typing.FrozenSet[str]
+
+
+def get_fixture_graph(objs: typing.Iterable[typing.Any],
+                      manager: 'FixtureManager' = None) \
+        -> typing.Dict[str, FixtureNode]:
+    """Get the graph of fixtures to be set up for given objects
+
+    It maps every fixture name to a node containing fixture instance and
+    the names of the fixtures that has to be set up before it.
+    """
+    graph: typing.Dict[str, FixtureNode] = {}
+    visited: typing.Set[str] = set()
+    objects = list(objs)
+    objects.reverse()
+    while objects:
+        name, obj = get_name_and_object(objects.pop())
+        if is_fixture(obj):
+            fixture = get_fixture(obj, manager=manager)
+            name = get_fixture_name(fixture)
+            if name in graph:
+                continue
+            required = get_setup_required_fixtures(fixture)
+            graph[name] = FixtureNode(
+                fixture=fixture,
+                requires=frozenset(get_fixture_name(f) for f in required))
+        else:
+            if name in visited:
+                continue
+            visited.add(name)
+            required = get_setup_required_fixtures(obj)
+            if is_test_method(obj) and '.' in name:
+                # Test methods also require test class fixtures
+                objects.append(name.rsplit('.', 1)[0])
+        objects.extend(reversed(required))
+    return graph
+
+
+def get_setup_required_fixtures(obj) -> typing.List[fixtures.Fixture]:
+    """Get fixtures required to be set up by given :param obj:"""
+    if is_test_method(obj):
+        # Get fixtures from default values that are fixtures
+        defaults = getattr(obj, '__defaults__', None) or []
+        return [get_fixture(default)
+                for default in defaults
+                if is_fixture(default)]
+
+    if isinstance(obj, fixtures.Fixture):
+        obj = type(obj)
+    if inspect.isclass(obj):
+        # Get fixtures from members of type RequiredFixture that are going to
+        # be set up when accessed
+        return [prop.fixture
+                for prop in get_required_fixture_properties(obj)
+                if prop.setup]
+    return []
+
+
+class FixtureGraphSetup:
+    """It setups fixtures of a graph using a bounded pool of threads"""
+
+    def __init__(self,
+                 graph: typing.Dict[str, FixtureNode],
+                 workers_count: int):
+        self.pending = dict(graph)
+        self.workers_count = workers_count
+        self.running: typing.Dict[futures.Future, str] = {}
+        self.done: typing.Dict[str, fixtures.Fixture] = {}
+        self.failed: typing.Set[str] = set()
+        self.errors: typing.List[typing.Any] = []
+
+    def setup_fixtures(self) -> typing.List[fixtures.Fixture]:
+        with futures.ThreadPoolExecutor(
+                max_workers=self.workers_count) as executor:
+            while self.pending or self.running:
+                self.submit_ready_fixtures(executor)
+                self.wait_for_fixtures()
+
+        if self.errors:
+            with _exception.handle_multiple_exceptions(
+                    handle_exception=handle_setup_error):
+                raise testtools.MultipleExceptions(*self.errors)
+        return list(self.done.values())
+
+    def submit_ready_fixtures(self, executor: futures.Executor):
+        self.skip_failing_fixtures()
+        for name, node in list(self.pending.items()):
+            if all(required in self.done for required in node.requires):
+                self.submit_fixture(executor, name)
+
+        if self.pending and not self.running:
+            # There are cyclic dependencies: set up the first pending fixture
+            # and let it set up what it requires on its own
+            self.submit_fixture(executor, next(iter(self.pending)))
+
+    def skip_failing_fixtures(self):
+        # Don't set up fixtures requiring (even indirectly) a failed one
+        skipped = True
+        while skipped:
+            skipped = [name
+                       for name, node in self.pending.items()
+                       if node.requires & self.failed]
+            for name in skipped:
+                LOG.debug(f"Skip set up of fixture '{name}' because a "
+                          "required fixture failed")
+                self.failed.add(name)
+                del self.pending[name]
+
+    def submit_fixture(self, executor: futures.Executor, name: str):
+        fixture = self.pending.pop(name).fixture
+        self.running[executor.submit(setup_fixture, fixture)] = name
+
+    def wait_for_fixtures(self):
+        if not self.running:
+            return
+        finished, _ = futures.wait(self.running,
+                                   return_when=futures.FIRST_COMPLETED)
+        for future in finished:
+            name = self.running.pop(future)
+            try:
+                self.done[name] = future.result()
+            except Exception:
+                self.errors.append(sys.exc_info())
+                self.failed.add(name)
+
+
 def handle_setup_error(ex_type, ex_value, ex_tb):
     if issubclass(ex_type, fixtures.SetupError):
         details = ex_value.args[0]
@@ -251,7 +423,9 @@ def cleanup_fixture(obj: FixtureType,
     """It cleans up registered fixture"""
     fixture = get_fixture(obj, fixture_id=fixture_id, manager=manager)
     with _exception.handle_multiple_exceptions():
-        fixture.cleanUp()
+        with fixture_manager(fixture, manager).profile_fixture(
+                fixture, 'cleanup'):
+            fixture.cleanUp()
     return fixture
 
 
@@ -464,6 +638,34 @@ class FixtureManager:
 
     def __init__(self):
         self.fixtures: typing.Dict[str, F] = {}
+        self.profiler: typing.Optional[_profiler.FixtureProfiler] = None
+        self._lock = threading.RLock()
+
+    def enable_profiler(self, profiler: _profiler.FixtureProfiler = None) \
+            -> _profiler.FixtureProfiler:
+        """It starts recording fixtures set up and clean up calls"""
+        if profiler is None:
+            profiler = self.profiler or _profiler.FixtureProfiler()
+        self.profiler = profiler
+        return profiler
+
+    def disable_profiler(self) -> typing.Optional[_profiler.FixtureProfiler]:
+        profiler, self.profiler = self.profiler, None
+        return profiler
+
+    @contextlib.contextmanager
+    def profile_fixture(self, fixture: fixtures.Fixture, operation: str) \
+            -> typing.Iterator[None]:
+        profiler = self.profiler
+        if profiler is None:
+            yield
+        else:
+            cached = (operation == 'setup' and
+                      bool(getattr(fixture, '_setup_executed', False)))
+            with profiler.profile(name=get_fixture_name(fixture),
+                                  operation=operation,
+                                  cached=cached):
+                yield
 
     def get_fixture(self,
                     obj: FixtureType,
@@ -474,12 +676,18 @@ class FixtureManager:
         try:
             return self.fixtures[name]
         except KeyError:
-            fixture: F = self.init_fixture(obj=obj,
-                                           name=name,
-                                           fixture_id=fixture_id)
-            assert isinstance(fixture, fixtures.Fixture)
-            self.fixtures[name] = fixture
-            return fixture
+            pass
+        # Make sure only one fixture is created when called from many threads
+        with self._lock:
+            try:
+                return self.fixtures[name]
+            except KeyError:
+                fixture: F = self.init_fixture(obj=obj,
+                                               name=name,
+                                               fixture_id=fixture_id)
+                assert isinstance(fixture, fixtures.Fixture)
+                self.fixtures[name] = fixture
+                return fixture
 
     @staticmethod
     def init_fixture(obj: typing.Union[typing.Type[F], F],
@@ -513,6 +721,31 @@ def fixture_manager(obj: FixtureType,
 FIXTURES = FixtureManager()
 
 
+def enable_fixture_profiler(manager: FixtureManager = None,
+                            profiler: _profiler.FixtureProfiler = None) \
+        -> _profiler.FixtureProfiler:
+    if manager is None:
+        manager = FIXTURES
+    return manager.enable_profiler(profiler)
+
+
+def get_fixture_profiler(manager: FixtureManager = None) \
+        -> typing.Optional[_profiler.FixtureProfiler]:
+    if manager is None:
+        manager = FIXTURES
+    return manager.profiler
+
+
+def disable_fixture_profiler(manager: FixtureManager = None) \
+        -> typing.Optional[_profiler.FixtureProfiler]:
+    if manager is None:
+        manager = FIXTURES
+    return manager.disable_profiler()
+
+
+_SETUP_LOCK_CREATION_LOCK = threading.Lock()
+
+
 class SharedFixture(fixtures.Fixture):
     """Base class for fixtures intended to be shared between multiple tests
 
@@ -534,6 +767,7 @@ class SharedFixture(fixtures.Fixture):
 
     _setup_executed = False
     _cleanup_executed = False
+    _setup_lock: typing.Optional[threading.RLock] = None
 
     __tobiko_fixture__ = True
     __tobiko_fixture_name__: typing.Optional[str] = None
@@ -556,25 +790,37 @@ class SharedFixture(fixtures.Fixture):
         # make sure class states can be used after cleanUp
         super(SharedFixture, self)._clear_cleanups()
 
+    @property
+    def setup_lock(self) -> threading.RLock:
+        """Lock preventing many threads to set up the fixture at once"""
+        if self._setup_lock is None:
+            with _SETUP_LOCK_CREATION_LOCK:
+                if self._setup_lock is None:
+                    self._setup_lock = threading.RLock()
+        return self._setup_lock
+
     def setUp(self):
         """Executes _setUp/setup_fixture method only the first time is called
 
         """
-        if not self._setup_executed:
-            LOG.debug('Set up fixture %r', self.fixture_name)
-            super(SharedFixture, self).setUp()
-            self._cleanup_executed = False
-            self._setup_executed = True
+        with self.setup_lock:
+            if not self._setup_executed:
+                LOG.debug('Set up fixture %r', self.fixture_name)
+                super(SharedFixture, self).setUp()
+                self._cleanup_executed = False
+                self._setup_executed = True
 
     def cleanUp(self, raise_first=True):
         """Executes registered cleanups if any"""
-        if not self._cleanup_executed:
-            LOG.debug('Clean up fixture %r', self.fixture_name)
-            self.addCleanup(self.cleanup_fixture)
-        result = super(SharedFixture, self).cleanUp(raise_first=raise_first)
-        self._setup_executed = False
-        self._cleanup_executed = True
-        return result
+        with self.setup_lock:
+            if not self._cleanup_executed:
+                LOG.debug('Clean up fixture %r', self.fixture_name)
+                self.addCleanup(self.cleanup_fixture)
+            result = super(SharedFixture, self).cleanUp(
+                raise_first=raise_first)
+            self._setup_executed = False
+            self._cleanup_executed = True
+            return result
 
     def __enter__(self):
         return setup_fixture(self)
@@ -612,6 +858,7 @@ class RequiredFixture(property, typing.Generic[G]):
 
     def __init__(self, cls: typing.Type[G], setup=True, **kwargs):
         self.cls = cls
+        self.setup = setup
         self.kwargs = kwargs
         if setup:
             fget = self.setup_fixture
@@ -14,7 +14,10 @@
 from __future__ import absolute_import
 
 import importlib
+import importlib.util
 import inspect
+import types
+import typing
 import weakref
 import sys
 
@@ -184,3 +187,49 @@ class LoaderManager(object):
 
 
 LOADERS = LoaderManager()
+
+# Heavy packages that must only be imported when they are actually used
+LAZY_MODULES = ['dpkt',
+                'docker',
+                'glanceclient',
+                'ironicclient',
+                'metalsmith',
+                'neutron_lib',
+                'openstack',
+                'pandas',
+                'podman']
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy importing the real module on first attribute access
+
+    It allows to refer to heavy (and often optional) dependencies at module
+    level without paying their import time until they are actually used.
+    Sub-modules not imported by their package are returned as lazy modules
+    too, so that for example 'lazy_import("a").b.c.f()' works the same way
+    as 'import a.b.c; a.b.c.f()'.
+    """
+
+    def __getattr__(self, name: str) -> typing.Any:
+        module = importlib.import_module(self.__name__)
+        try:
+            return getattr(module, name)
+        except AttributeError:
+            submodule_name = f'{self.__name__}.{name}'
+            if importlib.util.find_spec(submodule_name) is None:
+                raise
+        return lazy_import(submodule_name)
+
+    def __dir__(self):
+        return dir(importlib.import_module(self.__name__))
+
+    def __repr__(self):
+        return f"<lazy module '{self.__name__}'>"
+
+
+def lazy_import(module_name: str) -> typing.Any:
+    """Returns given module, or a lazy proxy when it is not imported yet"""
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = LazyModule(module_name)
+    return module
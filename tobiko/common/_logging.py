@@ -13,7 +13,11 @@
 #    under the License.
 from __future__ import absolute_import
 
+import codecs
+import io
 import logging
+import tempfile
+import typing
 
 from oslo_log import log
 from testtools import content
@@ -57,28 +61,78 @@ class CaptureLogFixture(_fixture.SharedFixture):
             content_object = _detail.details_content(
                 content_type=content.UTF8_TEXT,
                 content_id=self.fixture_name,
-                get_text=handler.format_all)
+                get_bytes=handler.iter_bytes)
             return {'log': content_object}
         else:
             return {}
 
 
 class CaptureLogHandler(logging.Handler):
+    """Log handler formatting records as soon as they are emitted
 
-    def __init__(self, level=None):
+    Formatted lines are written to a temporary file that is kept in memory
+    until it gets bigger than max_memory bytes, so that the memory used for
+    capturing log lines doesn't grow with test case duration.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, level=None, max_memory: int = None):
+        from tobiko import config
+        CONF = config.CONF
         if level is None:
-            from tobiko import config
-            CONF = config.CONF
             if CONF.tobiko.debug:
                 level = logging.DEBUG
             else:
                 level = logging.INFO
+        if max_memory is None:
+            max_memory = CONF.tobiko.logging.capture_log_max_memory
         super(CaptureLogHandler, self).__init__(level)
-        self.records = []
+        self.max_memory = max(0, max_memory or 0)
+        self.stream: typing.Optional[typing.IO[bytes]]
+        if self.max_memory > 0:
+            self.stream = tempfile.SpooledTemporaryFile(
+                max_size=self.max_memory, prefix='tobiko-log-')
+        else:
+            self.stream = tempfile.TemporaryFile(prefix='tobiko-log-')
 
     def emit(self, record):
-        self.records.append(record)
-
-    def format_all(self):
-        for record in self.records:
-            yield self.format(record) + '\n'
+        try:
+            line = (self.format(record) + '\n').encode(errors='ignore')
+        except Exception:
+            self.handleError(record)
+            return
+        if self.stream is not None:
+            self.stream.write(line)
+
+    def iter_bytes(self) -> typing.Iterator[bytes]:
+        offset = 0
+        while True:
+            self.acquire()
+            try:
+                stream = self.stream
+                if stream is None:
+                    break
+                # Lines emitted while reading are written at the end
+                stream.seek(offset)
+                chunk = stream.read(self.chunk_size)
+                stream.seek(0, io.SEEK_END)
+            finally:
+                self.release()
+            if not chunk:
+                break
+            offset += len(chunk)
+            yield chunk
+
+    def format_all(self) -> typing.Iterator[str]:
+        return codecs.iterdecode(self.iter_bytes(), 'utf-8', errors='ignore')
+
+    def close(self):
+        self.acquire()
+        try:
+            stream, self.stream = self.stream, None
+            if stream is not None:
+                stream.close()
+        finally:
+            self.release()
+        super(CaptureLogHandler, self).close()
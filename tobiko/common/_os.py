@@ -14,8 +14,10 @@
 from __future__ import absolute_import
 
 import contextlib
+import json
 import os
 import tempfile
+import typing
 
 from oslo_log import log
 
@@ -57,3 +59,28 @@ def open_output_file(filename, mode='w', temp_dir=None, text=False):
         with _exception.exc_info():
             if os.path.isfile(temp_filename):
                 os.remove(temp_filename)
+
+
+def load_json_file(filename: str, version: typing.Any = None) \
+        -> typing.Optional[typing.Dict[str, typing.Any]]:
+    """Loads a JSON object from a file written with open_output_file
+
+    It returns None when the file doesn't exist, can't be parsed, or when
+    its 'version' field is not given version.
+    """
+    try:
+        with open(filename) as fd:
+            data = json.load(fd)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        LOG.warning(f"Unable to load JSON file '{filename}'", exc_info=True)
+        return None
+    if not isinstance(data, dict):
+        LOG.debug(f"Ignore JSON file '{filename}' not containing an object")
+        return None
+    if version is not None and data.get('version') != version:
+        LOG.debug(f"Ignore JSON file '{filename}' with incompatible "
+                  f"version: {data.get('version')!r} != {version!r}")
+        return None
+    return data
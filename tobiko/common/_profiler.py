@@ -0,0 +1,377 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import collections
+import contextlib
+import json
+import os
+import threading
+import typing
+
+from oslo_log import log
+
+from tobiko.common import _case
+from tobiko.common import _time
+
+
+LOG = log.getLogger(__name__)
+
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+
+class FixtureCall(typing.NamedTuple):
+    """Fixture set up or clean up call recorded by a profiler"""
+    name: str
+    operation: str  # 'setup' or 'cleanup'
+    stack: typing.Tuple[str, ...]  # labels of the calls it was made from
+    test_id: typing.Optional[str]
+    cached: bool  # True when the fixture was already set up
+    start: float
+    duration: float
+    self_time: float  # duration without the time spent in nested calls
+    worker: str
+    thread: str
+    # Number of calls summed up by this record (cache hits made for the
+    # same test case are recorded together)
+    calls: int = 1
+
+    @property
+    def label(self) -> str:
+        return get_call_label(self.name, self.operation)
+
+
+def get_call_label(name: str, operation: str) -> str:
+    if operation == 'setup':
+        return name
+    return f'{name} ({operation})'
+
+
+def get_worker_id() -> str:
+    """Name of the pytest-xdist worker running current process"""
+    return os.environ.get('PYTEST_XDIST_WORKER') or 'master'
+
+
+class ProfilerFrame(object):
+
+    def __init__(self, label: str):
+        self.label = label
+        self.children_time = 0.
+
+
+class FixtureProfiler(object):
+    """It records how long fixtures take to be set up and cleaned up
+
+    Every call is recorded together with the stack of fixture calls it
+    has been made from (for example a fixture requiring another fixture
+    inside its setup_fixture method), with the test case it was made for
+    and with the worker process and thread that made it.
+    """
+
+    def __init__(self, worker: str = None):
+        if worker is None:
+            worker = get_worker_id()
+        self.worker = worker
+        self.test_id: typing.Optional[str] = None
+        self.records: typing.List[FixtureCall] = []
+        # Index of the record summing up cache hits of every fixture
+        self._cache_hits: typing.Dict[typing.Tuple[str, typing.Optional[str]],
+                                      int] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _get_stack(self) -> typing.List[ProfilerFrame]:
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack: typing.List[ProfilerFrame] = []
+            self._local.stack = stack
+            return stack
+
+    def get_test_id(self) -> typing.Optional[str]:
+        if self.test_id is not None:
+            return self.test_id
+        case = _case.get_test_case()
+        if isinstance(case, _case.DummyTestCase):
+            return None
+        return case.id()
+
+    @contextlib.contextmanager
+    def profile(self, name: str, operation: str = 'setup',
+                cached: bool = False) -> typing.Iterator[None]:
+        stack = self._get_stack()
+        parents = tuple(frame.label for frame in stack)
+        frame = ProfilerFrame(get_call_label(name, operation))
+        stack.append(frame)
+        start = _time.time()
+        try:
+            yield
+        finally:
+            duration = _time.time() - start
+            stack.pop()
+            if stack:
+                stack[-1].children_time += duration
+            record = FixtureCall(
+                name=name,
+                operation=operation,
+                stack=parents,
+                test_id=self.get_test_id(),
+                cached=cached,
+                start=start,
+                duration=duration,
+                self_time=max(0., duration - frame.children_time),
+                worker=self.worker,
+                thread=threading.current_thread().name)
+            with self._lock:
+                if cached:
+                    self._add_cache_hit(record)
+                else:
+                    self.records.append(record)
+
+    def _add_cache_hit(self, record: FixtureCall):
+        key = record.name, record.test_id
+        index = self._cache_hits.get(key)
+        if index is None:
+            self._cache_hits[key] = len(self.records)
+            self.records.append(record)
+        else:
+            hits = self.records[index]
+            self.records[index] = hits._replace(
+                calls=hits.calls + 1,
+                duration=hits.duration + record.duration,
+                self_time=hits.self_time + record.self_time)
+
+    def clear(self):
+        with self._lock:
+            self.records = []
+            self._cache_hits.clear()
+
+    def dump(self, filename: str):
+        dump_fixture_calls(self.records, filename)
+
+
+def dump_fixture_calls(records: typing.Iterable[FixtureCall],
+                       filename: str):
+    """Writes records as JSON lines (one file for every xdist worker)"""
+    dirname = os.path.dirname(filename)
+    if dirname and not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    with open(filename, 'w', encoding='utf-8') as fd:
+        for record in records:
+            fd.write(json.dumps(record._asdict()) + '\n')
+
+
+def load_fixture_calls(filenames: typing.Iterable[str]) \
+        -> typing.List[FixtureCall]:
+    records = []
+    for filename in filenames:
+        with open(filename, encoding='utf-8') as fd:
+            for line in fd:
+                if line.strip():
+                    fields = json.loads(line)
+                    fields['stack'] = tuple(fields['stack'])
+                    records.append(FixtureCall(**fields))
+    return records
+
+
+def get_collapsed_stacks(records: typing.Iterable[FixtureCall]) -> str:
+    """Renders records in the collapsed stack format of flamegraph.pl
+
+    Each line is made of the test case, of the stack of fixture calls and
+    of the time spent in the innermost one (in microseconds).
+    """
+    weights: typing.Dict[str, int] = collections.defaultdict(int)
+    for record in records:
+        stack = ';'.join((record.test_id or '<no test>',) + record.stack +
+                         (record.label,))
+        weights[stack] += int(round(record.self_time * 1e6))
+    return ''.join(f'{stack} {weight}\n'
+                   for stack, weight in sorted(weights.items()))
+
+
+def get_speedscope_profile(records: typing.Iterable[FixtureCall],
+                           name: str = 'tobiko fixtures') \
+        -> typing.Dict[str, typing.Any]:
+    """Renders records as speedscope file with a profile for every worker"""
+    frames: typing.List[typing.Dict[str, str]] = []
+    frame_indexes: typing.Dict[str, int] = {}
+
+    def frame_index(label: str) -> int:
+        index = frame_indexes.get(label)
+        if index is None:
+            index = frame_indexes[label] = len(frames)
+            frames.append({'name': label})
+        return index
+
+    workers: typing.Dict[str, typing.List[FixtureCall]] = \
+        collections.defaultdict(list)
+    for record in records:
+        workers[record.worker].append(record)
+
+    profiles = []
+    for worker, worker_records in sorted(workers.items()):
+        worker_records.sort(key=lambda r: r.start)
+        samples = [[frame_index(label)
+                    for label in record.stack + (record.label,)]
+                   for record in worker_records]
+        weights = [record.self_time for record in worker_records]
+        profiles.append({'type': 'sampled',
+                         'name': worker,
+                         'unit': 'seconds',
+                         'startValue': 0.,
+                         'endValue': sum(weights),
+                         'samples': samples,
+                         'weights': weights})
+    return {'$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'tobiko',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': profiles}
+
+
+def get_blocking_time(records: typing.Iterable[FixtureCall]) -> float:
+    """Wall time tests spent waiting for fixtures on all the workers
+
+    Time ranges of outermost calls made by concurrent threads of the same
+    worker are merged, so that it is counted only once. Cache hits are
+    not taken into account.
+    """
+    ranges: typing.Dict[str, typing.List[typing.Tuple[float, float]]] = \
+        collections.defaultdict(list)
+    for record in records:
+        if not record.stack and not record.cached:
+            ranges[record.worker].append(
+                (record.start, record.start + record.duration))
+    total = 0.
+    for worker_ranges in ranges.values():
+        end = None
+        for start, stop in sorted(worker_ranges):
+            if end is not None and start < end:
+                start = end
+            if stop > start:
+                total += stop - start
+            end = stop if end is None else max(end, stop)
+    return total
+
+
+def get_critical_path(records: typing.Iterable[FixtureCall]) \
+        -> typing.List[typing.Dict[str, typing.Any]]:
+    """Chain of nested calls taking most time
+
+    It starts from the slowest outermost call and walks down through the
+    slowest call made from it until reaching a call without nested calls.
+    """
+    children: typing.Dict[typing.Tuple, typing.List[FixtureCall]] = \
+        collections.defaultdict(list)
+    for record in records:
+        if not record.cached:
+            children[(record.worker, record.thread,
+                      record.stack)].append(record)
+
+    path: typing.List[typing.Dict[str, typing.Any]] = []
+    candidates = [record
+                  for (_, _, stack), calls in children.items()
+                  if not stack
+                  for record in calls]
+    while candidates:
+        slowest = max(candidates, key=lambda r: r.duration)
+        path.append({'name': slowest.name,
+                     'operation': slowest.operation,
+                     'test_id': slowest.test_id,
+                     'worker': slowest.worker,
+                     'duration': slowest.duration})
+        stack = slowest.stack + (slowest.label,)
+        end = slowest.start + slowest.duration
+        candidates = [record
+                      for record in children.get(
+                          (slowest.worker, slowest.thread, stack), [])
+                      if slowest.start <= record.start <= end]
+    return path
+
+
+def get_fixture_summary(records: typing.Iterable[FixtureCall],
+                        top: int = 10) -> typing.Dict[str, typing.Any]:
+    """Aggregates records by fixture name
+
+    :param top: number of slowest fixtures to be listed
+    """
+    records = list(records)
+    blocking_time = get_blocking_time(records)
+    fixtures: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+    tests: typing.Dict[str, typing.Set[str]] = collections.defaultdict(set)
+    for record in records:
+        summary = fixtures.get(record.name)
+        if summary is None:
+            summary = fixtures[record.name] = {
+                'name': record.name, 'setups': 0, 'cache_hits': 0,
+                'cleanups': 0, 'setup_time': 0., 'cleanup_time': 0.,
+                'self_time': 0., 'max_time': 0.}
+        if record.operation == 'cleanup':
+            summary['cleanups'] += 1
+            summary['cleanup_time'] += record.duration
+        elif record.cached:
+            summary['cache_hits'] += record.calls
+            summary['setup_time'] += record.duration
+        else:
+            summary['setups'] += 1
+            summary['setup_time'] += record.duration
+        summary['self_time'] += record.self_time
+        if not record.cached:
+            summary['max_time'] = max(summary['max_time'], record.duration)
+        if record.test_id is not None:
+            tests[record.name].add(record.test_id)
+
+    for name, summary in fixtures.items():
+        summary['total_time'] = summary['setup_time'] + summary['cleanup_time']
+        summary['tests'] = len(tests[name])
+        # Share of the time tests waited for fixtures spent by this one
+        # (not including the time spent by fixtures it requires)
+        summary['blocking_ratio'] = (
+            blocking_time and min(1., summary['self_time'] / blocking_time))
+
+    ordered = sorted(fixtures.values(),
+                     key=lambda s: (-s['total_time'], s['name']))
+    return {'workers': sorted({record.worker for record in records}),
+            'calls': sum(record.calls for record in records),
+            'blocking_time': blocking_time,
+            'slowest': [summary['name'] for summary in ordered[:top]],
+            'critical_path': get_critical_path(records),
+            'fixtures': ordered}
+
+
+def write_fixture_profile(records: typing.Iterable[FixtureCall],
+                          prefix: str,
+                          top: int = 10) -> typing.Dict[str, typing.Any]:
+    """Writes speedscope, collapsed stacks and JSON summary files
+
+    :returns: the summary of the recorded calls
+    """
+    records = list(records)
+    summary = get_fixture_summary(records, top=top)
+    dirname = os.path.dirname(prefix)
+    if dirname and not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    with open(prefix + '.speedscope.json', 'w', encoding='utf-8') as fd:
+        json.dump(get_speedscope_profile(records), fd)
+    with open(prefix + '.collapsed.txt', 'w', encoding='utf-8') as fd:
+        fd.write(get_collapsed_stacks(records))
+    with open(prefix + '.json', 'w', encoding='utf-8') as fd:
+        json.dump(summary, fd, indent=4, sort_keys=True)
+    LOG.info(f"Fixture profile written to '{prefix}.*' files "
+             f"({len(records)} calls, {summary['blocking_time']:.3f} "
+             "seconds spent waiting for fixtures)")
+    return summary
@@ -13,8 +13,10 @@
 #    under the License.
 from __future__ import absolute_import
 
+import abc
 import functools
 import itertools
+import random
 import typing
 
 from oslo_log import log
@@ -42,8 +44,17 @@ class RetryTimeLimitError(RetryLimitError):
     message = ("Retry time limit exceeded ({attempt.details})")
 
 
+NO_STATE = object()
+
+
 class RetryAttempt(object):
 
+    # State of the waited resource observed by this attempt
+    state: typing.Any = NO_STATE
+
+    # State observed by the latest previous attempt reporting any
+    previous_state: typing.Any = NO_STATE
+
     def __init__(self,
                  number: int,
                  start_time: float,
@@ -129,6 +140,20 @@ class RetryAttempt(object):
         else:
             return False
 
+    def observe(self, state: typing.Any):
+        """Records the state of the resource waited by this attempt
+
+        It allows adaptive backoff policies to check whenever the waited
+        resource is changing or not.
+        """
+        self.state = state
+
+    @property
+    def state_changed(self) -> bool:
+        return (self.state is not NO_STATE and
+                self.previous_state is not NO_STATE and
+                self.state != self.previous_state)
+
     def __repr__(self):
         return f"retry_attempt({self.details})"
 
@@ -149,23 +174,201 @@ def retry_attempt(number: int = 0,
                         interval=interval)
 
 
+class RetryBackoff(abc.ABC):
+    """Policy giving the time to wait before making next retry attempt
+
+    The base time is given by the retry interval (or sleep time) and it is
+    then changed according to the policy. Returned time is never greater
+    than max_interval (when given), and retry loop never sleeps past its
+    timeout.
+    """
+
+    default_interval = 1.
+
+    def __init__(self, max_interval: _time.Seconds = None):
+        self.max_interval = _time.to_seconds(max_interval)
+
+    def get_interval(self, attempt: RetryAttempt) -> float:
+        return (attempt.interval or attempt.sleep_time or
+                self.default_interval)
+
+    def get_sleep_time(self,
+                       attempt: RetryAttempt,
+                       previous: typing.Optional[float]) -> float:
+        """Returns the time to sleep after given attempt
+
+        :param attempt: the attempt that has just been made
+        :param previous: the time waited after previous attempt, or None
+            for the first attempt
+        """
+        sleep_time = self._get_sleep_time(attempt=attempt, previous=previous)
+        if self.max_interval is not None:
+            sleep_time = min(sleep_time, self.max_interval)
+        return max(0., sleep_time)
+
+    @abc.abstractmethod
+    def _get_sleep_time(self,
+                        attempt: RetryAttempt,
+                        previous: typing.Optional[float]) -> float:
+        raise NotImplementedError
+
+    def __eq__(self, other):
+        return type(self) is type(other) and vars(self) == vars(other)
+
+    def __hash__(self):
+        raise NotImplementedError
+
+    def __repr__(self):
+        params = ', '.join(f'{name}={value!r}'
+                           for name, value in sorted(vars(self).items())
+                           if value is not None)
+        return f"{type(self).__name__}({params})"
+
+
+class ExponentialBackoff(RetryBackoff):
+    """Multiplies the waiting time by a constant factor at every attempt"""
+
+    def __init__(self,
+                 factor: float = 2.,
+                 max_interval: _time.Seconds = None):
+        super(ExponentialBackoff, self).__init__(max_interval=max_interval)
+        self.factor = factor
+
+    def _get_sleep_time(self, attempt, previous):
+        if previous is None:
+            return self.get_interval(attempt)
+        return previous * self.factor
+
+
+class DecorrelatedJitterBackoff(RetryBackoff):
+    """Picks a random waiting time growing with the previous one
+
+    Retry loops started at the same time (like the ones of parallel test
+    workers) spread their requests over time instead of making them in
+    bursts.
+    """
+
+    def __init__(self,
+                 factor: float = 3.,
+                 max_interval: _time.Seconds = None,
+                 uniform: typing.Callable[[float, float], float] = None):
+        super(DecorrelatedJitterBackoff, self).__init__(
+            max_interval=max_interval)
+        self.factor = factor
+        self.uniform = random.uniform if uniform is None else uniform
+
+    def _get_sleep_time(self, attempt, previous):
+        interval = self.get_interval(attempt)
+        if previous is None:
+            return interval
+        return self.uniform(interval, max(interval, previous * self.factor))
+
+
+class FibonacciBackoff(RetryBackoff):
+    """Multiplies the interval by the Fibonacci number of the attempt"""
+
+    def _get_sleep_time(self, attempt, previous):
+        a, b = 1, 1
+        for _ in range(attempt.number - 1):
+            a, b = b, a + b
+        return self.get_interval(attempt) * a
+
+
+class AdaptiveBackoff(RetryBackoff):
+    """Waits shortly after the waited resource changes its state
+
+    While the state observed by retry attempts doesn't change, the waiting
+    time gets multiplied by a constant factor up to max_interval (by default
+    four times the retry interval). When it changes (what often means the
+    resource is about to reach the waited state) it goes back to
+    min_interval (by default a quarter of the retry interval).
+
+    It only makes sense for waiters observing states that change before
+    the waited one is reached (like the set of pending resources of a
+    batch waiter): loops observing a single state until they exit get
+    slower at every attempt.
+    """
+
+    def __init__(self,
+                 factor: float = 1.5,
+                 min_interval: _time.Seconds = None,
+                 max_interval: _time.Seconds = None):
+        super(AdaptiveBackoff, self).__init__(max_interval=max_interval)
+        self.factor = factor
+        self.min_interval = _time.to_seconds(min_interval)
+
+    def _get_sleep_time(self, attempt, previous):
+        interval = self.get_interval(attempt)
+        if attempt.state_changed:
+            if self.min_interval is None:
+                return interval / 4.
+            return self.min_interval
+        if previous is None:
+            return interval
+        sleep_time = previous * self.factor
+        if self.max_interval is None:
+            sleep_time = min(sleep_time, 4. * interval)
+        return sleep_time
+
+
+RETRY_BACKOFFS: typing.Dict[str, typing.Type[RetryBackoff]] = {
+    'adaptive': AdaptiveBackoff,
+    'exponential': ExponentialBackoff,
+    'fibonacci': FibonacciBackoff,
+    'jitter': DecorrelatedJitterBackoff,
+}
+
+RetryBackoffType = typing.Union[RetryBackoff, str, None]
+
+
+def retry_backoff(backoff: RetryBackoffType,
+                  **params) -> typing.Optional[RetryBackoff]:
+    """Returns a backoff policy given its name (or the policy itself)"""
+    if backoff is None or isinstance(backoff, RetryBackoff):
+        return backoff
+    try:
+        return RETRY_BACKOFFS[backoff](**params)
+    except KeyError:
+        raise ValueError(f"Invalid retry backoff: {backoff!r}") from None
+
+
+class RetryStats(object):
+    """Attempts made and time slept by all the loops of a Retry object"""
+
+    def __init__(self):
+        self.loops = 0
+        self.attempts = 0
+        self.sleeps = 0
+        self.sleep_time = 0.
+
+    def __repr__(self):
+        return (f"retry_stats(loops={self.loops}, "
+                f"attempts={self.attempts}, "
+                f"sleeps={self.sleeps}, "
+                f"sleep_time={self.sleep_time})")
+
+
 class Retry(object):
 
     def __init__(self,
                  count: typing.Optional[int] = None,
                  timeout: _time.Seconds = None,
                  sleep_time: _time.Seconds = None,
-                 interval: _time.Seconds = None):
+                 interval: _time.Seconds = None,
+                 backoff: RetryBackoffType = None):
         self.count = count
         self.timeout = _time.to_seconds(timeout)
         self.sleep_time = _time.to_seconds(sleep_time)
         self.interval = _time.to_seconds(interval)
+        self.backoff = retry_backoff(backoff)
+        self.stats = RetryStats()
 
     def __eq__(self, other):
         return (other.count == self.count and
                 other.timeout == self.timeout and
                 other.sleep_time == self.sleep_time and
-                other.interval == self.interval)
+                other.interval == self.interval and
+                other.backoff == self.backoff)
 
     def __hash__(self):
         raise NotImplementedError
@@ -173,6 +376,9 @@ class Retry(object):
     def __iter__(self) -> typing.Iterator[RetryAttempt]:
         start_time = _time.time()
         elapsed_time = 0.
+        previous_state = NO_STATE
+        previous_sleep_time: typing.Optional[float] = None
+        self.stats.loops += 1
         for number in itertools.count(1):
             attempt = retry_attempt(number=number,
                                     count=self.count,
@@ -181,12 +387,24 @@ class Retry(object):
                                     timeout=self.timeout,
                                     sleep_time=self.sleep_time,
                                     interval=self.interval)
+            attempt.previous_state = previous_state
+            self.stats.attempts += 1
 
             yield attempt
 
             attempt.check_limits()
+            if attempt.state is not NO_STATE:
+                previous_state = attempt.state
 
             elapsed_time = _time.time() - start_time
+            if self.backoff is not None:
+                previous_sleep_time = self.backoff.get_sleep_time(
+                    attempt=attempt, previous=previous_sleep_time)
+                elapsed_time = self._sleep(attempt=attempt,
+                                           sleep_time=previous_sleep_time,
+                                           elapsed_time=elapsed_time)
+                continue
+
             sleep_time = self.sleep_time
             if sleep_time is None and self.interval is not None:
                 sleep_time = attempt.number * self.interval - elapsed_time
@@ -199,8 +417,26 @@ class Retry(object):
                         LOG.debug(f"Wait for {sleep_time} seconds before "
                                   f"retrying... ({attempt.details})")
                         _time.sleep(sleep_time)
+                        self.stats.sleeps += 1
+                        self.stats.sleep_time += sleep_time
                         elapsed_time = _time.time() - start_time
 
+    def _sleep(self,
+               attempt: RetryAttempt,
+               sleep_time: float,
+               elapsed_time: float) -> float:
+        if self.timeout is not None:
+            # Make last attempt when the timeout is reached
+            sleep_time = min(sleep_time, self.timeout - elapsed_time)
+        if sleep_time <= 0.:
+            return elapsed_time
+        LOG.debug(f"Wait for {sleep_time} seconds before retrying... "
+                  f"({attempt.details}, backoff={self.backoff})")
+        _time.sleep(sleep_time)
+        self.stats.sleeps += 1
+        self.stats.sleep_time += sleep_time
+        return _time.time() - attempt.start_time
+
     @property
     def details(self) -> str:
         details = []
@@ -212,6 +448,8 @@ class Retry(object):
             details.append(f"sleep_time={self.sleep_time}")
         if self.interval is not None:
             details.append(f"interval={self.interval}")
+        if self.backoff is not None:
+            details.append(f"backoff={self.backoff}")
         return ', '.join(details)
 
     def __repr__(self):
@@ -226,7 +464,9 @@ def retry(other_retry: typing.Optional[Retry] = None,
           default_count: typing.Optional[int] = None,
           default_timeout: _time.Seconds = None,
           default_sleep_time: _time.Seconds = None,
-          default_interval: _time.Seconds = None) -> Retry:
+          default_interval: _time.Seconds = None,
+          backoff: RetryBackoffType = None,
+          default_backoff: RetryBackoffType = None) -> Retry:
 
     if other_retry is not None:
         # Apply default values from the other Retry object
@@ -235,17 +475,20 @@ def retry(other_retry: typing.Optional[Retry] = None,
         timeout = timeout or other_retry.timeout
         sleep_time = sleep_time or other_retry.sleep_time
         interval = interval or other_retry.interval
+        backoff = backoff or other_retry.backoff
 
     # Apply default values
     count = count or default_count
     timeout = timeout or default_timeout
     sleep_time = sleep_time or default_sleep_time
     interval = interval or default_interval
+    backoff = backoff or default_backoff
 
     return Retry(count=count,
                  timeout=timeout,
                  sleep_time=sleep_time,
-                 interval=interval)
+                 interval=interval,
+                 backoff=backoff)
 
 
 def retry_on_exception(
@@ -260,6 +503,8 @@ def retry_on_exception(
         default_timeout: _time.Seconds = None,
         default_sleep_time: _time.Seconds = None,
         default_interval: _time.Seconds = None,
+        backoff: RetryBackoffType = None,
+        default_backoff: RetryBackoffType = None,
         on_exception: typing.Optional[typing.Callable] = None) -> \
         typing.Callable[[typing.Callable], typing.Callable]:
 
@@ -271,7 +516,9 @@ def retry_on_exception(
                          default_count=default_count,
                          default_timeout=default_timeout,
                          default_sleep_time=default_sleep_time,
-                         default_interval=default_interval)
+                         default_interval=default_interval,
+                         backoff=backoff,
+                         default_backoff=default_backoff)
     exceptions = (exception,) + exceptions
 
     def decorator(func):
@@ -13,6 +13,9 @@
 #    under the License.
 from __future__ import absolute_import
 
+import collections
+import functools
+import operator
 import re
 import typing
 
@@ -88,20 +91,248 @@ class Selection(list, typing.Generic[T]):
         return f'{type(self).__name__}({list(self)!r})'
 
 
+IndexKey = typing.Tuple[str, typing.Tuple[typing.Any, ...]]
+Index = typing.Dict[typing.Tuple[typing.Any, ...], typing.List[int]]
+
+
+def invalidates_indexes(method):
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.clear_indexes()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class IndexedSelection(Selection[T]):
+    """Selection looking up objects by using hash tables
+
+    An index is built the first time objects are looked up by a given set of
+    attributes (or items), so that following lookups using the same ones
+    only take a dictionary access instead of a linear scan. Membership
+    checks are done by using a set of contained objects in the same way.
+    Indexes are discarded when the selection is changed.
+
+    Objects changed after being indexed are not re-indexed: objects found
+    by using an index are checked again against given values, and indexes
+    are discarded (falling back to a linear scan) as soon as any of them
+    doesn't match anymore. Objects that started matching given values after
+    being indexed can't be detected this way, therefore clear_indexes has
+    to be called (or a new selection has to be created) after changing
+    them.
+
+    When values (or objects) can't be hashed, or when objects are matched
+    against regular expressions, it falls back to the same linear scan made
+    by Selection class.
+    """
+
+    _indexes: typing.Dict[IndexKey, typing.Optional[Index]]
+    _members: typing.Optional[typing.Tuple[set, list]]
+
+    def __init__(self, *args):
+        super(IndexedSelection, self).__init__(*args)
+        self.clear_indexes()
+
+    def clear_indexes(self):
+        self._indexes = {}
+        self._members = None
+
+    append = invalidates_indexes(list.append)
+    extend = invalidates_indexes(list.extend)
+    insert = invalidates_indexes(list.insert)
+    remove = invalidates_indexes(list.remove)
+    pop = invalidates_indexes(list.pop)
+    clear = invalidates_indexes(list.clear)
+    sort = invalidates_indexes(list.sort)
+    reverse = invalidates_indexes(list.reverse)
+    __setitem__ = invalidates_indexes(list.__setitem__)
+    __delitem__ = invalidates_indexes(list.__delitem__)
+    __iadd__ = invalidates_indexes(list.__iadd__)
+    __imul__ = invalidates_indexes(list.__imul__)
+
+    def with_attributes(self, **attributes) -> 'Selection[T]':
+        positions = self._lookup('attributes', attributes)
+        objects = self._check_positions(
+            positions,
+            lambda obj: equal_attributes(obj, select_values(attributes)))
+        if objects is None:
+            return super(IndexedSelection, self).with_attributes(
+                **attributes)
+        patterns = select_patterns(attributes)
+        return self.create(obj for obj in objects
+                           if equal_attributes(obj, patterns))
+
+    def without_attributes(self, **attributes) -> 'Selection[T]':
+        positions = self._lookup('attributes', attributes, inverse=True)
+        objects = self._check_positions(
+            positions,
+            lambda obj: equal_attributes(obj, attributes, inverse=True))
+        if objects is None:
+            return super(IndexedSelection, self).without_attributes(
+                **attributes)
+        return self.create(objects)
+
+    def with_items(self: 'IndexedSelection[typing.Dict]', **items) \
+            -> 'Selection[typing.Dict]':
+        positions = self._lookup('items', items)
+        objects = self._check_positions(
+            positions, lambda obj: equal_items(obj, select_values(items)))
+        if objects is None:
+            return super(IndexedSelection, self).with_items(**items)
+        patterns = select_patterns(items)
+        return self.create(obj for obj in objects
+                           if equal_items(obj, patterns))
+
+    def without_items(self: 'IndexedSelection[typing.Dict]', **items) \
+            -> 'Selection[typing.Dict]':
+        positions = self._lookup('items', items, inverse=True)
+        objects = self._check_positions(
+            positions, lambda obj: equal_items(obj, items, inverse=True))
+        if objects is None:
+            return super(IndexedSelection, self).without_items(**items)
+        return self.create(objects)
+
+    def __contains__(self, obj) -> bool:
+        if self._members is None:
+            self._members = split_hashables(self)
+        hashables, others = self._members
+        try:
+            if obj in hashables:
+                return True
+        except TypeError:
+            pass
+        return obj in others
+
+    def _check_positions(self,
+                         positions: typing.Optional[typing.List[int]],
+                         predicate: typing.Callable[[T], bool]) \
+            -> typing.Optional[typing.List[T]]:
+        """Objects at given positions, if they still match the index
+
+        It returns None (after discarding indexes) when any object doesn't
+        match anymore the values it has been indexed with.
+        """
+        if positions is None:
+            return None
+        objects = [self[i] for i in positions]
+        if all(predicate(obj) for obj in objects):
+            return objects
+        # Some object has been changed after being indexed
+        self.clear_indexes()
+        return None
+
+    def _lookup(self,
+                kind: str,
+                matchers: typing.Dict[str, typing.Any],
+                inverse=False) -> typing.Optional[typing.List[int]]:
+        """Positions of the objects possibly matching given values
+
+        Regular expressions can't be looked up in an index, therefore
+        they are ignored and returned positions still have to be checked
+        against them. It returns None when no index can be used at all.
+        """
+        keys = tuple(sorted(key
+                            for key, matcher in matchers.items()
+                            if not isinstance(matcher, PatternType)))
+        if not keys or (inverse and len(keys) < len(matchers)):
+            return None
+        if inverse:
+            # Exclude objects matching any of the given values
+            excluded: typing.Set[int] = set()
+            for key in keys:
+                positions = self._lookup_index(kind, (key,),
+                                               (matchers[key],))
+                if positions is None:
+                    return None
+                excluded.update(positions)
+            return [i for i in range(len(self)) if i not in excluded]
+        return self._lookup_index(kind, keys,
+                                  tuple(matchers[key] for key in keys))
+
+    def _lookup_index(self,
+                      kind: str,
+                      keys: typing.Tuple[str, ...],
+                      values: typing.Tuple[typing.Any, ...]) \
+            -> typing.Optional[typing.List[int]]:
+        index = self._get_index(kind, keys)
+        if index is None:
+            return None
+        try:
+            return index.get(values, [])
+        except TypeError:
+            return None  # unhashable values
+
+    def _get_index(self,
+                   kind: str,
+                   keys: typing.Tuple[str, ...]) -> typing.Optional[Index]:
+        try:
+            return self._indexes[kind, keys]
+        except KeyError:
+            pass
+        get_value: typing.Callable[[typing.Any, str], typing.Any]
+        if kind == 'attributes':
+            get_value = getattr
+        else:
+            get_value = operator.getitem
+        positions: typing.Dict[typing.Tuple[typing.Any, ...],
+                               typing.List[int]] = collections.defaultdict(
+            list)
+        index: typing.Optional[Index]
+        try:
+            for i, obj in enumerate(self):
+                positions[tuple(get_value(obj, key)
+                                for key in keys)].append(i)
+        except (AttributeError, KeyError, TypeError):
+            # Values missing or unhashable: let linear scan handle them
+            index = None
+        else:
+            index = dict(positions)
+        self._indexes[kind, keys] = index
+        return index
+
+
 def select(objects: typing.Iterable[T]) -> Selection[T]:
     return Selection.create(objects)
 
 
+def select_indexed(objects: typing.Iterable[T]) -> IndexedSelection[T]:
+    return IndexedSelection(objects)
+
+
 def select_uniques(objects: typing.Iterable[T],
                    destination: Selection = None) -> Selection[T]:
     if destination is None:
         destination = Selection[T]()
+    hashables, others = split_hashables(destination)
     for obj in objects:
-        if obj not in destination:
-            destination.append(obj)
+        try:
+            if obj in hashables:
+                continue
+            hashables.add(obj)
+        except TypeError:
+            if obj in others:
+                continue
+            others.append(obj)
+        else:
+            if obj in others:
+                continue
+        destination.append(obj)
     return destination
 
 
+def split_hashables(objects: typing.Iterable[T]) \
+        -> typing.Tuple[typing.Set[T], typing.List[T]]:
+    hashables: typing.Set[T] = set()
+    others: typing.List[T] = []
+    for obj in objects:
+        try:
+            hashables.add(obj)
+        except TypeError:
+            others.append(obj)
+    return hashables, others
+
+
 def equal_attributes(obj,
                      attributes: typing.Dict[str, typing.Any],
                      inverse=False) \
@@ -126,6 +357,20 @@ def equal_items(obj: typing.Dict,
 PatternType = type(re.compile("", 0))
 
 
+def select_patterns(matchers: typing.Dict[str, typing.Any]) \
+        -> typing.Dict[str, typing.Any]:
+    return {key: matcher
+            for key, matcher in matchers.items()
+            if isinstance(matcher, PatternType)}
+
+
+def select_values(matchers: typing.Dict[str, typing.Any]) \
+        -> typing.Dict[str, typing.Any]:
+    return {key: matcher
+            for key, matcher in matchers.items()
+            if not isinstance(matcher, PatternType)}
+
+
 def match(matcher: typing.Any, value: typing.Any) -> bool:
     if isinstance(matcher, PatternType):
         return matcher.match(value) is not None
@@ -13,9 +13,13 @@
 #    under the License.
 from __future__ import absolute_import
 
+import abc
 import dbm
 import os
 import shelve
+import sqlite3
+import threading
+import typing
 
 from oslo_log import log
 
@@ -24,6 +28,8 @@ import tobiko
 
 LOG = log.getLogger(__name__)
 TEST_RUN_SHELF = 'test_run'
+TEST_RUN_UID_KEY = 'PYTEST_XDIST_TESTRUNUID'
+SQLITE_DB_NAME = 'shelves.sqlite'
 
 
 def get_shelves_dir():
@@ -33,120 +39,343 @@ def get_shelves_dir():
     return shelves_dir
 
 
+def get_shelves_backend_name() -> str:
+    from tobiko import config
+    return config.CONF.tobiko.common.shelves_backend
+
+
 def get_shelf_path(shelf):
     return os.path.join(get_shelves_dir(), shelf)
 
 
-def addme_to_shared_resource(shelf, resource):
-    shelf_path = get_shelf_path(shelf)
-    # this is needed for unit tests
-    resource = str(resource)
-    testcase_id = tobiko.get_test_case().id()
-    for attempt in tobiko.retry(timeout=10.0,
-                                interval=0.5):
-        try:
-            with shelve.open(shelf_path) as db:
-                if db.get(resource) is None:
-                    db[resource] = set()
-                # the add and remove methods do not work directly on the db
-                auxset = db[resource]
-                auxset.add(testcase_id)
-                db[resource] = auxset
-                return db[resource]
-        except dbm.error:
-            LOG.exception(f"Error accessing shelf {shelf}")
-            if attempt.is_last:
-                raise
+class ShelvesBackend(abc.ABC):
+    """Store keeping track of which test cases are using a shared resource
 
+    Shared resources are grouped by shelves (usually named after the module
+    defining the fixtures that create them). The store is shared between
+    every process (for example pytest-xdist workers) using the same shelves
+    directory.
+    """
 
-def removeme_from_shared_resource(shelf, resource):
-    shelf_path = get_shelf_path(shelf)
-    # this is needed for unit tests
-    resource = str(resource)
-    testcase_id = tobiko.get_test_case().id()
-    for attempt in tobiko.retry(timeout=10.0,
-                                interval=0.5):
-        try:
-            with shelve.open(shelf_path) as db:
-                # the add and remove methods do not work directly on the db
-                db[resource] = db.get(resource) or set()
-                if testcase_id in db[resource]:
+    def __init__(self, shelves_dir: str):
+        self.shelves_dir = shelves_dir
+
+    @abc.abstractmethod
+    def add_test(self, shelf: str, resource: str, testcase_id: str) \
+            -> typing.Set[str]:
+        """Register a test case as user of a resource
+
+        :returns: the test cases using the resource
+        """
+
+    @abc.abstractmethod
+    def remove_test(self, shelf: str, resource: str, testcase_id: str) \
+            -> typing.Set[str]:
+        """Unregister a test case as user of a resource
+
+        :returns: the test cases still using the resource
+        """
+
+    @abc.abstractmethod
+    def remove_test_from_all(self, testcase_id: str):
+        """Unregister a test case from all resources it is using"""
+
+    @abc.abstractmethod
+    def initialize(self, test_run_uid: str = None):
+        """Forget all registered resources once per test run"""
+
+
+class DbmShelvesBackend(ShelvesBackend):
+    """Shelves backend storing a dbm shelf file per shelf"""
+
+    def get_shelf_path(self, shelf: str) -> str:
+        return os.path.join(self.shelves_dir, shelf)
+
+    def add_test(self, shelf: str, resource: str, testcase_id: str) \
+            -> typing.Set[str]:
+        shelf_path = self.get_shelf_path(shelf)
+        for attempt in tobiko.retry(timeout=10.0,
+                                    interval=0.5):
+            try:
+                with shelve.open(shelf_path) as db:
+                    if db.get(resource) is None:
+                        db[resource] = set()
+                    # the add and remove methods do not work directly on the
+                    # db
                     auxset = db[resource]
-                    auxset.remove(testcase_id)
+                    auxset.add(testcase_id)
                     db[resource] = auxset
-                return db[resource]
-        except dbm.error:
-            LOG.exception(f"Error accessing shelf {shelf}")
-            if attempt.is_last:
-                raise
+                    return db[resource]
+            except dbm.error:
+                LOG.exception(f"Error accessing shelf {shelf}")
+                if attempt.is_last:
+                    raise
+        raise RuntimeError('Broken retry loop')
 
-
-def remove_test_from_shelf_resources(testcase_id, shelf):
-    shelf_path = get_shelf_path(shelf)
-    for attempt in tobiko.retry(timeout=10.0,
-                                interval=0.5):
-        try:
-            with shelve.open(shelf_path) as db:
-                if not db:
-                    return
-                for resource in db.keys():
+    def remove_test(self, shelf: str, resource: str, testcase_id: str) \
+            -> typing.Set[str]:
+        shelf_path = self.get_shelf_path(shelf)
+        for attempt in tobiko.retry(timeout=10.0,
+                                    interval=0.5):
+            try:
+                with shelve.open(shelf_path) as db:
+                    # the add and remove methods do not work directly on the
+                    # db
+                    db[resource] = db.get(resource) or set()
                     if testcase_id in db[resource]:
                         auxset = db[resource]
                         auxset.remove(testcase_id)
                         db[resource] = auxset
-                return db
-        except dbm.error as err:
-            LOG.exception(f"Error accessing shelf {shelf}")
-            if "db type could not be determined" in str(err):
-                # remove the filename extension, which depends on the specific
-                # DBM implementation
-                shelf_path = '.'.join(shelf_path.split('.')[:-1])
-            if attempt.is_last:
-                raise
+                    return db[resource]
+            except dbm.error:
+                LOG.exception(f"Error accessing shelf {shelf}")
+                if attempt.is_last:
+                    raise
+        raise RuntimeError('Broken retry loop')
 
+    def remove_test_from_shelf(self, testcase_id: str, shelf: str):
+        shelf_path = self.get_shelf_path(shelf)
+        for attempt in tobiko.retry(timeout=10.0,
+                                    interval=0.5):
+            try:
+                with shelve.open(shelf_path) as db:
+                    if not db:
+                        return
+                    for resource in db.keys():
+                        if testcase_id in db[resource]:
+                            auxset = db[resource]
+                            auxset.remove(testcase_id)
+                            db[resource] = auxset
+                    return
+            except dbm.error as err:
+                LOG.exception(f"Error accessing shelf {shelf}")
+                if "db type could not be determined" in str(err):
+                    # remove the filename extension, which depends on the
+                    # specific DBM implementation
+                    shelf_path = '.'.join(shelf_path.split('.')[:-1])
+                if attempt.is_last:
+                    raise
 
-def remove_test_from_all_shared_resources(testcase_id):
-    LOG.debug(f'Removing test {testcase_id} from all shelf resources')
-    shelves_dir = get_shelves_dir()
-    for filename in os.listdir(shelves_dir):
-        if TEST_RUN_SHELF not in filename:
-            remove_test_from_shelf_resources(testcase_id, filename)
+    def remove_test_from_all(self, testcase_id: str):
+        for filename in self.list_shelf_files():
+            self.remove_test_from_shelf(testcase_id, filename)
 
+    def list_shelf_files(self) -> typing.List[str]:
+        return [filename
+                for filename in os.listdir(self.shelves_dir)
+                if (TEST_RUN_SHELF not in filename and
+                    not filename.startswith(SQLITE_DB_NAME))]
 
-def initialize_shelves():
-    shelves_dir = get_shelves_dir()
-    shelf_path = os.path.join(shelves_dir, TEST_RUN_SHELF)
-    id_key = 'PYTEST_XDIST_TESTRUNUID'
-    test_run_uid = os.environ.get(id_key)
+    def initialize(self, test_run_uid: str = None):
+        shelf_path = self.get_shelf_path(TEST_RUN_SHELF)
+        # if no PYTEST_XDIST_TESTRUNUID ->
+        #     pytest was executed with only one worker
+        # if tobiko.initialize_shelves() == True ->
+        #    this is the first pytest worker running cleanup_shelves
+        # then, cleanup the shelves directory
+        # else, another worker did it before
+        for attempt in tobiko.retry(timeout=15.0,
+                                    interval=0.5):
+            try:
+                with shelve.open(shelf_path) as db:
+                    if test_run_uid is None:
+                        LOG.debug("Only one pytest worker - Initializing "
+                                  "shelves")
+                    elif test_run_uid == db.get(TEST_RUN_UID_KEY):
+                        LOG.debug("Another pytest worker already initialized "
+                                  "the shelves")
+                        return
+                    else:
+                        LOG.debug("Initializing shelves for the "
+                                  "test run uid %s", test_run_uid)
+                        db[TEST_RUN_UID_KEY] = test_run_uid
+                    for filename in self.list_shelf_files():
+                        os.unlink(os.path.join(self.shelves_dir, filename))
+                    return
+            except dbm.error:
+                LOG.exception(f"Error accessing shelf {TEST_RUN_SHELF}")
+                if attempt.is_last:
+                    raise
 
-    tobiko.makedirs(shelves_dir)
 
-    # if no PYTEST_XDIST_TESTRUNUID ->
-    #     pytest was executed with only one worker
-    # if tobiko.initialize_shelves() == True ->
-    #    this is the first pytest worker running cleanup_shelves
-    # then, cleanup the shelves directory
-    # else, another worker did it before
-    for attempt in tobiko.retry(timeout=15.0,
-                                interval=0.5):
-        try:
-            with shelve.open(shelf_path) as db:
+class SQLiteShelvesBackend(ShelvesBackend):
+    """Shelves backend storing all shelves in a single SQLite database
+
+    The database is opened in WAL mode, so readers never block writers, and
+    every operation is executed as a single transaction waiting for other
+    processes' locks to be released. Resources are indexed both by
+    (shelf, resource) and by test case ID, so that registering a test case
+    or removing it from every resource costs a single indexed statement
+    whatever the number of shelves or workers.
+    """
+
+    timeout = 30.
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS shared_resources (
+            shelf TEXT NOT NULL,
+            resource TEXT NOT NULL,
+            testcase_id TEXT NOT NULL,
+            PRIMARY KEY (shelf, resource, testcase_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS shared_resources_by_testcase_id
+            ON shared_resources (testcase_id);
+        CREATE TABLE IF NOT EXISTS test_run (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        """
+
+    def __init__(self, shelves_dir: str):
+        super().__init__(shelves_dir=shelves_dir)
+        self.db_path = os.path.join(shelves_dir, SQLITE_DB_NAME)
+        self._lock = threading.Lock()
+        self._connection: typing.Optional[sqlite3.Connection] = None
+        self._connection_pid: typing.Optional[int] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # Connections can't be shared with forked child processes
+        if self._connection is None or self._connection_pid != os.getpid():
+            tobiko.makedirs(self.shelves_dir)
+            connection = sqlite3.connect(self.db_path,
+                                         timeout=self.timeout,
+                                         isolation_level=None,
+                                         check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(self._SCHEMA)
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _execute(self,
+                 *statements: typing.Tuple[str, typing.Tuple],
+                 query: typing.Tuple[str, typing.Tuple] = None) \
+            -> typing.List[typing.Tuple]:
+        with self._lock:
+            connection = self.connection
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                for sql, params in statements:
+                    connection.execute(sql, params)
+                rows: typing.List[typing.Tuple] = []
+                if query is not None:
+                    rows = connection.execute(*query).fetchall()
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+            return rows
+
+    def _list_tests_query(self, shelf: str, resource: str) \
+            -> typing.Tuple[str, typing.Tuple]:
+        return ('SELECT testcase_id FROM shared_resources '
+                'WHERE shelf = ? AND resource = ?', (shelf, resource))
+
+    def add_test(self, shelf: str, resource: str, testcase_id: str) \
+            -> typing.Set[str]:
+        rows = self._execute(
+            ('INSERT OR IGNORE INTO shared_resources '
+             '(shelf, resource, testcase_id) VALUES (?, ?, ?)',
+             (shelf, resource, testcase_id)),
+            query=self._list_tests_query(shelf, resource))
+        return {testcase_id for testcase_id, in rows}
+
+    def remove_test(self, shelf: str, resource: str, testcase_id: str) \
+            -> typing.Set[str]:
+        rows = self._execute(
+            ('DELETE FROM shared_resources '
+             'WHERE shelf = ? AND resource = ? AND testcase_id = ?',
+             (shelf, resource, testcase_id)),
+            query=self._list_tests_query(shelf, resource))
+        return {testcase_id for testcase_id, in rows}
+
+    def remove_test_from_all(self, testcase_id: str):
+        self._execute(
+            ('DELETE FROM shared_resources WHERE testcase_id = ?',
+             (testcase_id,)))
+
+    def initialize(self, test_run_uid: str = None):
+        with self._lock:
+            connection = self.connection
+            connection.execute('BEGIN IMMEDIATE')
+            try:
                 if test_run_uid is None:
                     LOG.debug("Only one pytest worker - Initializing shelves")
-                elif test_run_uid == db.get(id_key):
-                    LOG.debug("Another pytest worker already initialized "
-                              "the shelves")
-                    return
                 else:
-                    LOG.debug("Initializing shelves for the "
-                              "test run uid %s", test_run_uid)
-                    db[id_key] = test_run_uid
-                for filename in os.listdir(shelves_dir):
-                    if TEST_RUN_SHELF not in filename:
-                        file_path = os.path.join(shelves_dir, filename)
-                        os.unlink(file_path)
-                return
-        except dbm.error:
-            LOG.exception(f"Error accessing shelf {TEST_RUN_SHELF}")
-            if attempt.is_last:
+                    row = connection.execute(
+                        'SELECT value FROM test_run WHERE key = ?',
+                        (TEST_RUN_UID_KEY,)).fetchone()
+                    if row is not None and row[0] == test_run_uid:
+                        LOG.debug("Another pytest worker already initialized "
+                                  "the shelves")
+                        connection.execute('ROLLBACK')
+                        return
+                    LOG.debug("Initializing shelves for the test run uid %s",
+                              test_run_uid)
+                    connection.execute(
+                        'INSERT OR REPLACE INTO test_run (key, value) '
+                        'VALUES (?, ?)', (TEST_RUN_UID_KEY, test_run_uid))
+                connection.execute('DELETE FROM shared_resources')
+            except Exception:
+                connection.execute('ROLLBACK')
                 raise
+            connection.execute('COMMIT')
+
+
+SHELVES_BACKENDS: typing.Dict[str, typing.Type[ShelvesBackend]] = {
+    'dbm': DbmShelvesBackend,
+    'sqlite': SQLiteShelvesBackend,
+}
+
+_BACKENDS: typing.Dict[typing.Tuple[str, str], ShelvesBackend] = {}
+
+
+def get_shelves_backend(backend_name: str = None,
+                        shelves_dir: str = None) -> ShelvesBackend:
+    if backend_name is None:
+        backend_name = get_shelves_backend_name()
+    if shelves_dir is None:
+        shelves_dir = get_shelves_dir()
+    key = backend_name, shelves_dir
+    backend = _BACKENDS.get(key)
+    if backend is None:
+        try:
+            backend_class = SHELVES_BACKENDS[backend_name]
+        except KeyError:
+            raise ValueError(
+                f"Invalid shelves backend name: '{backend_name}'") from None
+        _BACKENDS[key] = backend = backend_class(shelves_dir=shelves_dir)
+    return backend
+
+
+def addme_to_shared_resource(shelf, resource):
+    # this is needed for unit tests
+    resource = str(resource)
+    testcase_id = tobiko.get_test_case().id()
+    return get_shelves_backend().add_test(shelf=shelf,
+                                          resource=resource,
+                                          testcase_id=testcase_id)
+
+
+def removeme_from_shared_resource(shelf, resource):
+    # this is needed for unit tests
+    resource = str(resource)
+    testcase_id = tobiko.get_test_case().id()
+    return get_shelves_backend().remove_test(shelf=shelf,
+                                             resource=resource,
+                                             testcase_id=testcase_id)
+
+
+def remove_test_from_all_shared_resources(testcase_id):
+    LOG.debug(f'Removing test {testcase_id} from all shelf resources')
+    get_shelves_backend().remove_test_from_all(testcase_id)
+
+
+def initialize_shelves():
+    shelves_dir = get_shelves_dir()
+    tobiko.makedirs(shelves_dir)
+    test_run_uid = os.environ.get(TEST_RUN_UID_KEY)
+    get_shelves_backend(shelves_dir=shelves_dir).initialize(
+        test_run_uid=test_run_uid)
@@ -43,6 +43,11 @@ CONFIG_MODULES = ['tobiko.common._case',
                   'tobiko.shiftstack.config',
                   'tobiko.tripleo.config']
 
+# Modules of packages too slow to be imported every time tobiko
+# configuration is loaded: their options are registered when first used,
+# and are listed here only for generating configuration samples
+LAZY_CONFIG_MODULES = ['tobiko.openstack.heat.config']
+
 
 LOGGING_CONF_GROUP_NAME = "logging"
 
@@ -50,6 +55,12 @@ LOGGING_OPTIONS = [
     cfg.BoolOpt('capture_log',
                 default=True,
                 help="Whenever to report debugging log lines"),
+    cfg.IntOpt('capture_log_max_memory',
+               default=1024 * 1024,
+               help="Maximum number of bytes of log lines captured for "
+                    "every test case to be kept in memory. Exceeding lines "
+                    "are moved to a temporary file (0 to always write them "
+                    "to a temporary file)"),
     cfg.StrOpt('line_format',
                default=('%(asctime)s.%(msecs)03d %(process)d %(levelname)s '
                         '%(name)s - %(message)s'),
@@ -87,9 +98,35 @@ COMMON_OPTIONS = [
     cfg.StrOpt('shelves_dir',
                default='~/.tobiko/cache/shelves',
                help="Directory where to look for shelves."),
+    cfg.StrOpt('shelves_backend',
+               default='sqlite',
+               choices=['sqlite', 'dbm'],
+               help=("Backend used to store shelves: 'sqlite' stores all of "
+                     "them in a single SQLite database, 'dbm' stores every "
+                     "shelf in a separate dbm file")),
     cfg.StrOpt('lock_dir',
                default='~/.tobiko/cache/lock',
                help="Directory where lock persistent files will be saved"),
+    cfg.FloatOpt('resources_cache_ttl',
+                 default=1.,
+                 help=("Number of seconds OpenStack resources listed by "
+                       "helper functions (like servers, ports or stacks) "
+                       "are reused before being requested again. Values "
+                       "lower than or equal to 0 disable the cache")),
+    cfg.IntOpt('fixture_setup_workers',
+               default=1,
+               help=("Maximum number of fixtures required by a test case to "
+                     "be set up at the same time before executing it. Values "
+                     "lower than 2 disable concurrent fixtures set up")),
+    cfg.BoolOpt('fixture_profile',
+                default=False,
+                help=("Record how long fixtures take to be set up and "
+                      "cleaned up and write speedscope, collapsed stacks "
+                      "and JSON summary reports at the end of the test "
+                      "session")),
+    cfg.IntOpt('fixture_profile_top',
+               default=10,
+               help="Number of slowest fixtures listed by the profile"),
 ]
 
 
@@ -259,7 +296,7 @@ def list_tobiko_options():
                    list_testcase_options() +
                    list_common_options())
 
-    for module_name in CONFIG_MODULES:
+    for module_name in CONFIG_MODULES + LAZY_CONFIG_MODULES:
         module = importlib.import_module(module_name)
         if hasattr(module, 'list_options'):
             all_options += module.list_options()
@@ -0,0 +1,152 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import collections
+import functools
+import threading
+import time
+import typing
+
+from oslo_log import log
+
+import tobiko
+
+
+LOG = log.getLogger(__name__)
+
+T = typing.TypeVar('T')
+F = typing.TypeVar('F', bound=typing.Callable[..., typing.Any])
+
+ResourceCacheKey = typing.Tuple[str, typing.Any, typing.Hashable]
+
+
+class ResourceCache:
+    """Results of OpenStack list requests reused for a short time
+
+    Results are stored per resource kind (like 'servers' or 'ports'), API
+    client and request parameters, and are reused until they get older
+    than the cache TTL or until resources of the same kind get
+    invalidated by any helper function changing them.
+    """
+
+    def __init__(self, ttl: tobiko.Seconds = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: typing.Dict[ResourceCacheKey,
+                                   typing.Tuple[float, typing.Any]] = {}
+        self._generations: typing.Dict[str, int] = collections.defaultdict(
+            int)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ttl(self) -> float:
+        ttl = self._ttl
+        if ttl is None:
+            from tobiko import config
+            ttl = config.CONF.tobiko.common.resources_cache_ttl
+        return ttl or 0.
+
+    def get(self,
+            kind: str,
+            client: typing.Any,
+            params: typing.Dict[str, typing.Any],
+            fetch: typing.Callable[[], T]) -> T:
+        ttl = self.ttl
+        if ttl <= 0.:
+            return fetch()
+        key = kind, client, make_params_key(params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generations[kind]
+        fetched_at = time.monotonic()
+        value = fetch()
+        with self._lock:
+            # Results requested before resources were changed are discarded
+            if self._generations[kind] == generation:
+                self._entries[key] = fetched_at, value
+        return value
+
+    def invalidate(self, *kinds: str):
+        with self._lock:
+            if not kinds:
+                kinds = tuple(self._generations)
+                self._entries.clear()
+            else:
+                self._entries = {key: entry
+                                 for key, entry in self._entries.items()
+                                 if key[0] not in kinds}
+            for kind in kinds:
+                self._generations[kind] += 1
+
+
+def make_params_key(params: typing.Dict[str, typing.Any]) \
+        -> typing.Hashable:
+    # Parameter values (like lists or dicts) are not always hashable
+    return tuple(sorted((name, repr(value))
+                        for name, value in params.items()))
+
+
+RESOURCES_CACHE = ResourceCache()
+
+
+def cached_list(kind: str,
+                client: typing.Any,
+                params: typing.Dict[str, typing.Any],
+                fetch: typing.Callable[[], typing.Iterable[T]]) \
+        -> typing.List[T]:
+    """Returns a new list of resources recently listed by the same client
+
+    The list is a new one at every call, but its elements (like port dicts
+    or server objects) are shared with any other caller getting the same
+    cached result: they are read-only and must be copied before being
+    changed.
+    """
+    return list(RESOURCES_CACHE.get(kind=kind,
+                                    client=client,
+                                    params=params,
+                                    fetch=lambda: tuple(fetch())))
+
+
+def invalidate_resources(*kinds: str):
+    """Forget cached resources of given kinds (or of any kind if none)"""
+    RESOURCES_CACHE.invalidate(*kinds)
+
+
+def invalidates_resources(*kinds: str) -> typing.Callable[[F], F]:
+    """Decorates functions changing resources of given kinds
+
+    Cached resources get invalidated after the function returns, even when
+    it raises an exception as resources could have been changed anyway.
+    """
+
+    def decorator(func: F) -> F:
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                invalidate_resources(*kinds)
+
+        return typing.cast(F, wrapper)
+
+    return decorator
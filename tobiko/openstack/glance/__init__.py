@@ -13,10 +13,12 @@
 #    under the License.
 from __future__ import absolute_import
 
+from tobiko.openstack.glance import _cache
 from tobiko.openstack.glance import _client
 from tobiko.openstack.glance import _image
 from tobiko.openstack.glance import _io
 from tobiko.openstack.glance import _lzma
+from tobiko.openstack.glance import _pipeline
 
 
 glance_client = _client.glance_client
@@ -35,5 +37,17 @@ URLGlanceImageFixture = _image.URLGlanceImageFixture
 CustomizedGlanceImageFixture = _image.CustomizedGlanceImageFixture
 
 open_image_file = _io.open_image_file
+get_file_compression_type = _io.get_file_compression_type
+
+ImageDecompressError = _pipeline.ImageDecompressError
+ImageReader = _pipeline.ImageReader
+ImageReaderStats = _pipeline.ImageReaderStats
+open_image_reader = _pipeline.open_image_reader
+
+ImageCache = _cache.ImageCache
+ImageCacheError = _cache.ImageCacheError
+ImageChecksumMismatch = _cache.ImageChecksumMismatch
+get_image_cache = _cache.get_image_cache
+parse_checksums = _cache.parse_checksums
 
 has_lzma = _lzma.has_lzma
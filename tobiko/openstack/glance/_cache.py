@@ -0,0 +1,432 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+from concurrent import futures
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import typing
+from urllib import parse
+
+from oslo_concurrency import lockutils
+from oslo_log import log
+import requests
+
+import tobiko
+
+
+LOG = log.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+SHA256_PATTERN = re.compile(r'^[0-9a-fA-F]{64}$')
+
+# Line format used by BSD tools and 'sha256sum --tag'
+BSD_CHECKSUM_LINE = re.compile(
+    r'^SHA256\s*\((?P<filename>.+)\)\s*=\s*(?P<checksum>[0-9a-fA-F]{64})$')
+
+
+class ImageCacheError(tobiko.TobikoException):
+    message = "Unable to get image file from URL {url!r}: {reason}"
+
+
+class ImageChecksumMismatch(ImageCacheError):
+    message = ("Image file downloaded from URL {url!r} has SHA-256 checksum "
+               "{actual!r} instead of {expected!r}")
+
+
+def sha256_file(filename: str, chunk_size: int = CHUNK_SIZE) -> str:
+    checksum = hashlib.sha256()
+    with open(filename, 'rb') as fd:
+        for chunk in iter(lambda: fd.read(chunk_size), b''):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def parse_checksums(text: str) -> typing.Dict[str, str]:
+    """Parses SHA-256 checksum manifests (like SHA256SUMS files)
+
+    Both GNU ('<checksum>  <filename>') and BSD ('SHA256 (<filename>) =
+    <checksum>') line formats are supported. Lines with checksums of other
+    types are ignored.
+
+    :returns: a dictionary of checksums indexed by file name
+    """
+    checksums: typing.Dict[str, str] = {}
+    for line in text.splitlines():
+        line = line.strip()
+        match = BSD_CHECKSUM_LINE.match(line)
+        if match is not None:
+            filename = match.group('filename')
+            checksum = match.group('checksum')
+        else:
+            fields = line.split(None, 1)
+            if len(fields) != 2 or not SHA256_PATTERN.match(fields[0]):
+                continue
+            checksum, filename = fields
+            filename = filename.strip().lstrip('*')
+        checksums[os.path.basename(filename)] = checksum.lower()
+    return checksums
+
+
+class RemoteFileInfo(typing.NamedTuple):
+    size: typing.Optional[int]
+    accept_ranges: bool
+    # ETag or Last-Modified headers, they tell if remote file changed
+    validator: typing.Optional[str]
+
+
+class ImageCache(object):
+    """Image files downloaded from URLs stored by their SHA-256 checksum
+
+    Cache directory layout:
+
+    - sha256/<checksum>: verified image files
+    - urls/<key>.json: checksum and validator of files downloaded from every
+      URL (<key> is the SHA-256 checksum of the URL)
+    - partial/<key>: files being downloaded, resumed with HTTP Range
+      requests after a failure
+
+    Every URL is downloaded holding an external (file) lock, so that many
+    processes sharing the same cache directory (for example pytest-xdist
+    workers) download it only once.
+    """
+
+    def __init__(self,
+                 cache_dir: str,
+                 workers_count: int = 1,
+                 chunk_size: int = CHUNK_SIZE,
+                 session: requests.Session = None):
+        self.cache_dir = os.path.realpath(os.path.expanduser(cache_dir))
+        self.workers_count = max(1, workers_count)
+        self.chunk_size = chunk_size
+        if session is None:
+            session = requests.Session()
+        self.session = session
+
+    def get_file(self, checksum: str) -> typing.Optional[str]:
+        """Gets the cache file with given SHA-256 checksum if any"""
+        filename = self._entry_file(checksum)
+        if os.path.isfile(filename):
+            return filename
+        return None
+
+    def add_file(self, filename: str, checksum: str = None) -> str:
+        """Verifies and copies a local file to the cache
+
+        :returns: the cache file
+        """
+        actual = sha256_file(filename, chunk_size=self.chunk_size)
+        if checksum is not None and actual != checksum.lower():
+            raise ImageChecksumMismatch(url=filename, actual=actual,
+                                        expected=checksum)
+        entry_file = self._entry_file(actual)
+        if not os.path.isfile(entry_file):
+            temp_file = self._partial_file(f'add-{actual}')
+            shutil.copyfile(filename, temp_file)
+            self._commit(temp_file, entry_file)
+        return entry_file
+
+    def get_checksum(self, checksums_url: str, filename: str) -> str:
+        """Gets the checksum of a file from an upstream manifest"""
+        response = self.session.get(checksums_url)
+        response.raise_for_status()
+        checksums = parse_checksums(response.text)
+        try:
+            return checksums[os.path.basename(filename)]
+        except KeyError:
+            raise ImageCacheError(
+                url=checksums_url,
+                reason=f"no SHA-256 checksum for file {filename!r}") from None
+
+    def fetch(self,
+              url: str,
+              checksum: str = None,
+              checksums_url: str = None,
+              seed_file: str = None) -> str:
+        """Gets the cache file with the content of given URL
+
+        :param checksum: the expected SHA-256 checksum of the file. When
+            given the file is looked for in the cache before any request is
+            sent to the server.
+        :param checksums_url: URL of a manifest listing the checksum of the
+            file (used when checksum is not given)
+        :param seed_file: local copy of the file (for example downloaded
+            before the cache existed) to be used instead of downloading it
+            when it has the expected checksum. It is ignored when the
+            checksum is unknown.
+        :returns: the cache file
+        """
+        if checksum is None and checksums_url is not None:
+            filename = os.path.basename(parse.urlparse(url).path)
+            checksum = self.get_checksum(checksums_url, filename)
+        if checksum is not None:
+            checksum = checksum.lower()
+
+        key = hashlib.sha256(url.encode()).hexdigest()
+        with self._lock(key):
+            if checksum is not None:
+                cached_file = self.get_file(checksum)
+                if cached_file is not None:
+                    LOG.debug(f"Image file found in cache: {url!r} -> "
+                              f"{cached_file!r}")
+                    return cached_file
+
+            info = self._get_remote_file_info(url)
+            record = self._load_record(key)
+            if (checksum is None and record is not None and
+                    is_same_remote_file(record, info)):
+                cached_file = self.get_file(record['sha256'])
+                if cached_file is not None:
+                    LOG.debug(f"Image file found in cache: {url!r} -> "
+                              f"{cached_file!r}")
+                    return cached_file
+
+            cached_file = None
+            if (seed_file is not None and checksum is not None and
+                    os.path.isfile(seed_file) and
+                    (info.size is None or
+                     os.path.getsize(seed_file) == info.size)):
+                LOG.debug(f"Add image file to cache: {seed_file!r}")
+                try:
+                    cached_file = self.add_file(seed_file, checksum=checksum)
+                except ImageChecksumMismatch as ex:
+                    LOG.warning(f"Ignore stale image file {seed_file!r}: "
+                                f"{ex}")
+            if cached_file is None:
+                cached_file = self._download(url=url, key=key, info=info,
+                                             checksum=checksum)
+            self._save_record(key, {'url': url,
+                                    'sha256': os.path.basename(cached_file),
+                                    'size': info.size,
+                                    'validator': info.validator})
+            return cached_file
+
+    def _download(self, url: str, key: str, info: RemoteFileInfo,
+                  checksum: str = None) -> str:
+        partial_file = self._partial_file(key)
+        # A partial file can only be resumed when remote file didn't change
+        partial_record = partial_file + '.json'
+        # Parts of a concurrent download are kept in files named
+        # '<partial_file>.<offset>' until all of them are complete
+        partial_files = [filename
+                         for filename in glob.glob(
+                             glob.escape(partial_file) + '.*')
+                         if filename != partial_record]
+        if os.path.isfile(partial_file):
+            partial_files.append(partial_file)
+        if partial_files:
+            try:
+                with open(partial_record) as fd:
+                    validator = json.load(fd).get('validator')
+            except (OSError, ValueError):
+                validator = None
+            if not info.accept_ranges or validator != info.validator:
+                LOG.debug(f"Discard partial image file: {partial_file!r}")
+                for filename in partial_files:
+                    os.remove(filename)
+        with open(partial_record, 'w') as fd:
+            json.dump({'url': url, 'validator': info.validator}, fd)
+
+        LOG.debug(f"Download image file: {url!r} -> {partial_file!r} "
+                  f"({info.size} bytes)...")
+        if (self.workers_count > 1 and info.accept_ranges and
+                info.size is not None and info.size > self.chunk_size):
+            self._download_ranges(url=url, filename=partial_file,
+                                  size=info.size)
+        else:
+            self._download_range(url=url, filename=partial_file,
+                                 accept_ranges=info.accept_ranges)
+
+        actual_size = os.path.getsize(partial_file)
+        if info.size is not None and actual_size != info.size:
+            raise ImageCacheError(url=url,
+                                  reason=f"file size mismatch: {actual_size} "
+                                         f"!= {info.size}")
+        actual = sha256_file(partial_file, chunk_size=self.chunk_size)
+        if checksum is not None and actual != checksum:
+            os.remove(partial_file)
+            raise ImageChecksumMismatch(url=url, actual=actual,
+                                        expected=checksum)
+        entry_file = self._entry_file(actual)
+        self._commit(partial_file, entry_file)
+        os.remove(partial_record)
+        LOG.debug(f"Image file downloaded: {url!r} -> {entry_file!r}")
+        return entry_file
+
+    def _download_ranges(self, url: str, filename: str, size: int):
+        """Downloads parts of the file concurrently, then joins them"""
+        if os.path.isfile(filename):
+            # Resume the download of the missing part only
+            start = os.path.getsize(filename)
+        else:
+            start = 0
+        part_size = max(self.chunk_size,
+                        -(-(size - start) // self.workers_count))
+        ranges = [(offset, min(offset + part_size, size))
+                  for offset in range(start, size, part_size)]
+        part_files = [f'{filename}.{offset}' for offset, _ in ranges]
+        with futures.ThreadPoolExecutor(
+                max_workers=self.workers_count) as executor:
+            for future in [executor.submit(self._download_range,
+                                           url=url,
+                                           filename=part_file,
+                                           start=offset,
+                                           stop=stop)
+                           for part_file, (offset, stop) in zip(part_files,
+                                                                ranges)]:
+                future.result()
+        with open(filename, 'ab') as fd:
+            for part_file in part_files:
+                with open(part_file, 'rb') as part_fd:
+                    shutil.copyfileobj(part_fd, fd, self.chunk_size)
+                os.remove(part_file)
+
+    def _download_range(self, url: str, filename: str, start: int = 0,
+                        stop: int = None, accept_ranges: bool = True):
+        """Downloads bytes from start to stop appending them to filename
+
+        Bytes already in the file are not requested again.
+        """
+        offset = 0
+        if os.path.isfile(filename):
+            offset = os.path.getsize(filename)
+        if stop is not None and start + offset >= stop:
+            if start + offset > stop:
+                # Left by a download split in different ranges
+                os.truncate(filename, stop - start)
+            return
+        headers = {}
+        if accept_ranges and (start + offset > 0 or stop is not None):
+            last = '' if stop is None else str(stop - 1)
+            headers['Range'] = f'bytes={start + offset}-{last}'
+            if offset:
+                LOG.debug(f"Resume download of {filename!r} from byte "
+                          f"{start + offset}")
+        with self.session.get(url, headers=headers, stream=True) as response:
+            if response.status_code == 416 and offset and stop is None:
+                return  # the file was already complete
+            response.raise_for_status()
+            if response.status_code == 206:
+                mode = 'ab'
+            elif start == 0:
+                # Range was ignored: the whole file is being received
+                mode = 'wb'
+            else:
+                raise ImageCacheError(url=url,
+                                      reason="range requests not supported")
+            with open(filename, mode) as fd:
+                for chunk in response.iter_content(self.chunk_size):
+                    fd.write(chunk)
+        if stop is not None and os.path.getsize(filename) != stop - start:
+            # Connection closed before the whole range was received
+            raise ImageCacheError(
+                url=url,
+                reason=f"incomplete range {start}-{stop - 1}: "
+                       f"{os.path.getsize(filename)} bytes received")
+
+    def _get_remote_file_info(self, url: str) -> RemoteFileInfo:
+        try:
+            response = self.session.head(url, allow_redirects=True)
+            response.raise_for_status()
+        except requests.RequestException as ex:
+            LOG.debug(f"Unable to get image file info from URL {url!r}: "
+                      f"{ex}")
+            return RemoteFileInfo(size=None, accept_ranges=False,
+                                  validator=None)
+        size = response.headers.get('content-length')
+        return RemoteFileInfo(
+            size=size and int(size) or None,
+            accept_ranges=(response.headers.get('accept-ranges') == 'bytes'),
+            validator=(response.headers.get('etag') or
+                       response.headers.get('last-modified')))
+
+    def _lock(self, key: str):
+        lock_dir = os.path.join(self.cache_dir, 'locks')
+        tobiko.makedirs(lock_dir)
+        return lockutils.lock(f'image-{key}', external=True,
+                              lock_path=lock_dir)
+
+    def _entry_file(self, checksum: str) -> str:
+        return os.path.join(self.cache_dir, 'sha256', checksum.lower())
+
+    def _partial_file(self, key: str) -> str:
+        partial_dir = os.path.join(self.cache_dir, 'partial')
+        tobiko.makedirs(partial_dir)
+        return os.path.join(partial_dir, key)
+
+    def _record_file(self, key: str) -> str:
+        return os.path.join(self.cache_dir, 'urls', f'{key}.json')
+
+    def _load_record(self, key: str) -> typing.Optional[typing.Dict]:
+        try:
+            with open(self._record_file(key)) as fd:
+                return json.load(fd)
+        except (OSError, ValueError):
+            return None
+
+    def _save_record(self, key: str, record: typing.Dict):
+        record_file = self._record_file(key)
+        tobiko.makedirs(os.path.dirname(record_file))
+        with open(record_file, 'w') as fd:
+            json.dump(record, fd)
+
+    @staticmethod
+    def _commit(temp_file: str, entry_file: str):
+        tobiko.makedirs(os.path.dirname(entry_file))
+        # Cache files are never modified after being verified
+        os.chmod(temp_file, 0o444)
+        os.replace(temp_file, entry_file)
+
+
+def is_same_remote_file(record: typing.Dict, info: RemoteFileInfo) -> bool:
+    if info.size is None and info.validator is None:
+        # Server can't be reached: the file downloaded before is used
+        return True
+    return (record.get('validator') == info.validator and
+            record.get('size') == info.size)
+
+
+def link_image_file(cached_file: str, image_file: str) -> str:
+    """Makes image file a hard link to the cache file when possible
+
+    :returns: image file, or the cache file when the link can't be made
+        (for example when they are on different file systems)
+    """
+    if (os.path.isfile(image_file) and
+            os.path.samefile(cached_file, image_file)):
+        return image_file
+    tobiko.makedirs(os.path.dirname(image_file))
+    temp_file = f'{image_file}.{os.getpid()}.tmp'
+    try:
+        os.link(cached_file, temp_file)
+        os.replace(temp_file, image_file)
+    except OSError as ex:
+        LOG.debug(f"Unable to link image file {image_file!r} to cache file "
+                  f"{cached_file!r}: {ex}")
+        return cached_file
+    return image_file
+
+
+def get_image_cache() -> ImageCache:
+    from tobiko import config
+    CONF = config.CONF
+    return ImageCache(cache_dir=CONF.tobiko.glance.image_cache_dir,
+                      workers_count=CONF.tobiko.glance.image_download_workers)
@@ -13,8 +13,6 @@
 #    under the License.
 from __future__ import absolute_import
 
-from glanceclient.v2 import client as glanceclient
-from glanceclient import exc
 from oslo_log import log
 
 import tobiko
@@ -22,6 +20,9 @@ from tobiko.openstack import _client
 
 LOG = log.getLogger(__name__)
 
+glanceclient = tobiko.lazy_import('glanceclient.v2.client')
+exc = tobiko.lazy_import('glanceclient.exc')
+
 
 class GlanceClientFixture(_client.OpenstackClientFixture):
 
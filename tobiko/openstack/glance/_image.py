@@ -16,17 +16,17 @@ from __future__ import absolute_import
 import contextlib
 import io
 import os
-import tempfile
 import time
 import typing  # noqa
 
 from oslo_log import log
-import requests
 
 import tobiko
 from tobiko.config import get_bool_env
+from tobiko.openstack.glance import _cache
 from tobiko.openstack.glance import _client
 from tobiko.openstack.glance import _io
+from tobiko.openstack.glance import _pipeline
 from tobiko.openstack import keystone
 from tobiko.shell import sh
 
@@ -302,6 +302,10 @@ class FileGlanceImageFixture(UploadGlanceImageFixture):
     image_dir = None
     compression_type = None
 
+    #: SHA-256 checksum of the image file. When given, a missing image file
+    #: is looked for in the images cache
+    image_checksum: typing.Optional[str] = None
+
     def __init__(self, image_file=None, image_dir=None, **kwargs):
         super(FileGlanceImageFixture, self).__init__(**kwargs)
 
@@ -328,16 +332,56 @@ class FileGlanceImageFixture(UploadGlanceImageFixture):
         return os.path.join(self.real_image_dir, self.image_file)
 
     def get_image_data(self):
-        return self.get_image_file(image_file=self.real_image_file)
+        image_file = self.real_image_file
+        if self.image_checksum and not os.path.isfile(image_file):
+            cached_file = _cache.get_image_cache().get_file(
+                self.image_checksum)
+            if cached_file is not None:
+                LOG.debug(f"Image {self.image_name!r} file found in cache: "
+                          f"{cached_file!r}")
+                image_file = _cache.link_image_file(cached_file=cached_file,
+                                                    image_file=image_file)
+        return self.get_image_file(image_file=image_file)
 
     def get_image_file(self, image_file: str):
         image_file = self.customize_image_file(base_file=image_file)
         image_size = os.path.getsize(image_file)
+        compression_type = (self.compression_type or
+                            _io.get_file_compression_type(image_file))
+        if compression_type:
+            return self.get_decompressed_image_data(
+                image_file=image_file, compression_type=compression_type)
         LOG.debug('Uploading image %r data from file %r (%d bytes)',
                   self.image_name, image_file, image_size)
-        image_data = _io.open_image_file(
-            filename=image_file, mode='rb',
-            compression_type=self.compression_type)
+        image_data = _io.open_image_file(filename=image_file, mode='rb',
+                                         compression_type=compression_type)
+        return image_data, image_size
+
+    def get_decompressed_image_data(self, image_file: str,
+                                    compression_type: str):
+        image_size = os.path.getsize(image_file)
+        decompressed_file = f'{image_file}.decompressed'
+        if (os.path.isfile(decompressed_file) and
+                os.stat(image_file).st_mtime_ns <=
+                os.stat(decompressed_file).st_mtime_ns):
+            image_size = os.path.getsize(decompressed_file)
+            LOG.debug(f"Uploading image {self.image_name!r} data from "
+                      f"decompressed file {decompressed_file!r} "
+                      f"({image_size} bytes)")
+            return io.open(decompressed_file, 'rb'), image_size
+
+        from tobiko import config
+        CONF = config.CONF
+        if CONF.tobiko.glance.keep_decompressed_images:
+            copy_file = decompressed_file
+        else:
+            copy_file = None
+        LOG.debug(f"Uploading image {self.image_name!r} data from "
+                  f"{compression_type} file {image_file!r} ({image_size} "
+                  "bytes)")
+        image_data = _pipeline.open_image_reader(
+            filename=image_file, compression_type=compression_type,
+            copy_file=copy_file)
         return image_data, image_size
 
     def customize_image_file(self, base_file: str) -> str:
@@ -348,6 +392,10 @@ class URLGlanceImageFixture(FileGlanceImageFixture):
 
     image_url: str
 
+    #: URL of a manifest with the SHA-256 checksum of the image file, used
+    #: when image_checksum is not given
+    image_checksums_url: typing.Optional[str] = None
+
     def __init__(self,
                  image_url: str = None,
                  **kwargs):
@@ -358,63 +406,22 @@ class URLGlanceImageFixture(FileGlanceImageFixture):
             self.image_url = image_url
         tobiko.check_valid_type(image_url, str)
 
+    def get_image_data(self):
+        return self.get_image_file(image_file=self.real_image_file)
+
     def get_image_file(self, image_file: str):
-        http_request = requests.get(self.image_url, stream=True)
-        expected_size = int(http_request.headers.get('content-length', 0))
-        chunks = http_request.iter_content(chunk_size=io.DEFAULT_BUFFER_SIZE)
-        try:
-            http_request.raise_for_status()
-        except requests.exceptions.HTTPError:
-            error_content = b''.join(chunks).decode()
-            LOG.exception("Error getting image file from URL: "
-                          f"{self.image_url}:\n"
-                          f"{error_content}")
-            raise
-
-        download_image = True
-        if expected_size:
-            try:
-                actual_size = os.path.getsize(image_file)
-            except Exception as ex:
-                LOG.debug("Unable to get image %r data from file %r: %s",
-                          self.image_name, image_file, ex)
-            else:
-                if actual_size == expected_size:
-                    LOG.debug("Cached image %r file %r found (%d bytes)",
-                              self.image_name, image_file, actual_size)
-                    download_image = False
-
-        if download_image:
-            LOG.debug("Downloading image %r from URL %r to file %r "
-                      "(%d bytes)", self.image_name, self.image_url,
-                      image_file, expected_size)
-            self._download_image_file(image_file=image_file,
-                                      chunks=chunks,
-                                      expected_size=expected_size)
+        # Image files are downloaded once to the images cache, then
+        # verified copies are shared by every fixture using the same URL
+        cached_file = _cache.get_image_cache().fetch(
+            url=self.image_url,
+            checksum=self.image_checksum,
+            checksums_url=self.image_checksums_url,
+            seed_file=image_file)
+        image_file = _cache.link_image_file(cached_file=cached_file,
+                                            image_file=image_file)
         return super(URLGlanceImageFixture, self).get_image_file(
             image_file=image_file)
 
-    def _download_image_file(self, image_file, chunks, expected_size):
-        image_dir = os.path.dirname(image_file)
-        LOG.debug('Ensure image directory exists: %r', image_dir)
-        tobiko.makedirs(image_dir)
-
-        fd, temp_file = tempfile.mkstemp(dir=image_dir)
-        with io.open(fd, 'wb', io.DEFAULT_BUFFER_SIZE) as image_data:
-            for chunk in chunks:
-                image_data.write(chunk)
-
-        actual_size = os.path.getsize(temp_file)
-        LOG.debug('Downloaded image %r from URL %r to file %r (%d bytes)',
-                  self.image_name, self.image_url, image_file,
-                  actual_size)
-
-        if expected_size and actual_size != expected_size:
-            message = "Download file size mismatch: {!s} != {!r}".format(
-                expected_size, actual_size)
-            raise RuntimeError(message)
-        os.rename(temp_file, image_file)
-
 
 class CustomizedGlanceImageFixture(FileGlanceImageFixture):
 
@@ -0,0 +1,486 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import bz2
+import collections
+from concurrent import futures
+import io
+import os
+import queue
+import re
+import struct
+import threading
+import typing
+import zipfile
+import zlib
+
+from oslo_log import log
+
+import tobiko
+from tobiko.openstack.glance import _io
+from tobiko.openstack.glance import _lzma
+
+
+LOG = log.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+# Decompressed segments are kept in memory: bigger ones are not
+# decompressed in parallel
+MAX_SEGMENT_SIZE = 128 * 1024 * 1024
+MAX_BZ2_SEGMENT_SIZE = 8 * 1024 * 1024
+
+XZ_HEADER_MAGIC = b'\xfd7zXZ\x00'
+XZ_FOOTER_MAGIC = b'YZ'
+XZ_HEADER_SIZE = XZ_FOOTER_SIZE = 12
+
+# Stream header followed by the magic of a block or of the end of stream
+BZ2_STREAM_START = re.compile(
+    b'BZh[1-9](?:\x31\x41\x59\x26\x53\x59|\x17\x72\x45\x38\x50\x90)')
+
+
+class ImageDecompressError(tobiko.TobikoException):
+    message = "Unable to decompress image file {filename!r}: {reason}"
+
+
+class ImageSegment(typing.NamedTuple):
+    """Part of a compressed file that can be decompressed on its own"""
+    offset: int
+    size: int
+    # Fields below are used by xz blocks only
+    stream_header: bytes = b''
+    unpadded_size: int = 0
+    uncompressed_size: int = 0
+
+
+class ImageReaderStats(object):
+    """Throughput metrics of an image reader"""
+
+    def __init__(self):
+        self.start_time = tobiko.time()
+        self.end_time: typing.Optional[float] = None
+        self.read_bytes = 0
+        # time the reader waited for decompressed data to be produced
+        self.read_wait_time = 0.
+        # time the producer waited for read-ahead buffers to be consumed
+        self.produce_wait_time = 0.
+
+    @property
+    def elapsed_time(self) -> float:
+        end_time = self.end_time
+        if end_time is None:
+            end_time = tobiko.time()
+        return end_time - self.start_time
+
+    @property
+    def throughput(self) -> float:
+        """Bytes read for every second"""
+        elapsed_time = self.elapsed_time
+        if elapsed_time <= 0.:
+            return 0.
+        return self.read_bytes / elapsed_time
+
+    def __repr__(self):
+        return (f"{type(self).__name__}("
+                f"read_bytes={self.read_bytes}, "
+                f"elapsed_time={self.elapsed_time:.3f}, "
+                f"throughput={self.throughput / 1048576.:.1f}MiB/s, "
+                f"read_wait_time={self.read_wait_time:.3f}, "
+                f"produce_wait_time={self.produce_wait_time:.3f})")
+
+
+class ImageReader(io.RawIOBase):
+    """File object reading chunks produced by a background thread
+
+    Chunks (for example decompressed image file data) are produced while
+    previous ones are being read (for example while they are uploaded to
+    Glance). At most 'buffers_count' chunks are produced ahead of the
+    reader. Produced chunks can also be written to a copy file, that is
+    committed when the reader gets to the end of the data.
+    """
+
+    def __init__(self,
+                 chunks: typing.Iterable[bytes],
+                 name: str = '<chunks>',
+                 buffers_count: int = 4,
+                 copy_file: str = None):
+        super().__init__()
+        self.name = name
+        self.copy_file = copy_file
+        self.stats = ImageReaderStats()
+        self._chunks = chunks
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, buffers_count))
+        self._stop = threading.Event()
+        self._buffer = memoryview(b'')
+        self._eof = False
+        self._thread = threading.Thread(target=self._produce,
+                                        name=f'image-reader-{name}',
+                                        daemon=True)
+        self._thread.start()
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1) -> bytes:
+        if self.closed:
+            raise ValueError('I/O operation on closed file.')
+        if size is None or size < 0:
+            return b''.join(iter(lambda: self.read(CHUNK_SIZE), b''))
+        if not self._buffer and not self._eof:
+            self._buffer = memoryview(self._get_chunk())
+        data = bytes(self._buffer[:size])
+        self._buffer = self._buffer[len(data):]
+        self.stats.read_bytes += len(data)
+        return data
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            if self.stats.end_time is None:
+                self.stats.end_time = tobiko.time()
+            LOG.debug(f"Image reader closed: {self.name!r} {self.stats}")
+        super().close()
+
+    def _get_chunk(self) -> bytes:
+        start_time = tobiko.time()
+        chunk = self._queue.get()
+        self.stats.read_wait_time += tobiko.time() - start_time
+        if isinstance(chunk, BaseException):
+            self._eof = True
+            raise chunk
+        if not chunk:
+            self._eof = True
+            self.stats.end_time = tobiko.time()
+        return chunk
+
+    def _put(self, item) -> bool:
+        start_time = tobiko.time()
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(item, timeout=0.1)
+                except queue.Full:
+                    continue
+                return True
+            return False
+        finally:
+            self.stats.produce_wait_time += tobiko.time() - start_time
+
+    def _produce(self):
+        copy_fd = None
+        temp_file = None
+        chunks = iter(self._chunks)
+        try:
+            if self.copy_file is not None:
+                temp_file = f'{self.copy_file}.{os.getpid()}.tmp'
+                copy_fd = open(temp_file, 'wb')
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if copy_fd is not None:
+                    copy_fd.write(chunk)
+                if not self._put(chunk):
+                    return  # reader has been closed
+            if copy_fd is not None:
+                copy_fd.close()
+                os.replace(temp_file, self.copy_file)
+                temp_file = None
+                LOG.debug(f"Image data copied to file: {self.copy_file!r}")
+            self._put(b'')
+        except Exception as ex:
+            LOG.exception(f"Error producing image data: {self.name!r}")
+            self._put(ex)
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+            if copy_fd is not None:
+                copy_fd.close()
+            if temp_file is not None and os.path.isfile(temp_file):
+                os.remove(temp_file)
+
+
+def iter_file_chunks(filename: str,
+                     compression_type: str = None,
+                     chunk_size: int = CHUNK_SIZE) -> typing.Iterator[bytes]:
+    """Reads and decompresses a file sequentially"""
+    if compression_type == 'zip':
+        with zipfile.ZipFile(filename) as archive:
+            members = [info
+                       for info in archive.infolist()
+                       if not info.is_dir()]
+            if len(members) != 1:
+                raise ImageDecompressError(
+                    filename=filename,
+                    reason=f"ZIP archive has {len(members)} files")
+            with archive.open(members[0]) as fd:
+                yield from iter(lambda: fd.read(chunk_size), b'')
+    else:
+        with _io.open_image_file(filename=filename, mode='rb',
+                                 compression_type=compression_type) as fd:
+            yield from iter(lambda: fd.read(chunk_size), b'')
+
+
+def iter_parallel_chunks(filename: str,
+                         compression_type: str,
+                         segments: typing.Sequence[ImageSegment],
+                         workers_count: int) -> typing.Iterator[bytes]:
+    """Decompresses file segments concurrently, yielding them in order
+
+    At most 'workers_count' segments are decompressed ahead of the one
+    being yielded. Worker threads run concurrently because bz2 and lzma
+    modules release the GIL while decompressing.
+    """
+    decompress = SEGMENT_DECOMPRESSORS[compression_type]
+    with open(filename, 'rb') as fd, \
+            futures.ThreadPoolExecutor(max_workers=workers_count) as executor:
+        pending: typing.Deque[futures.Future] = collections.deque()
+        try:
+            for segment in segments:
+                pending.append(executor.submit(decompress, fd.fileno(),
+                                               segment, filename))
+                if len(pending) >= workers_count:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def read_segment(fileno: int, segment: ImageSegment) -> bytes:
+    data = os.pread(fileno, segment.size, segment.offset)
+    if len(data) != segment.size:
+        raise EOFError(f"{segment.size - len(data)} bytes missing")
+    return data
+
+
+def decompress_bz2_segment(fileno: int, segment: ImageSegment,
+                           filename: str) -> bytes:
+    decompressor = bz2.BZ2Decompressor()
+    data = decompressor.decompress(read_segment(fileno, segment))
+    if not decompressor.eof or decompressor.unused_data:
+        raise ImageDecompressError(
+            filename=filename,
+            reason=f"invalid BZ2 stream at offset {segment.offset}")
+    return data
+
+
+def decompress_xz_segment(fileno: int, segment: ImageSegment,
+                          filename: str) -> bytes:
+    """Decompresses an xz block wrapping it into a single block stream"""
+    lzma = _lzma.import_lzma()
+    flags = segment.stream_header[6:8]
+    index = (b'\x00' + _encode_xz_int(1) +
+             _encode_xz_int(segment.unpadded_size) +
+             _encode_xz_int(segment.uncompressed_size))
+    index += b'\x00' * (-len(index) % 4)
+    index += struct.pack('<I', zlib.crc32(index))
+    backward_size = struct.pack('<I', len(index) // 4 - 1)
+    footer = (struct.pack('<I', zlib.crc32(backward_size + flags)) +
+              backward_size + flags + XZ_FOOTER_MAGIC)
+    data = (segment.stream_header + read_segment(fileno, segment) + index +
+            footer)
+    try:
+        return lzma.decompress(data, format=lzma.FORMAT_XZ)
+    except lzma.LZMAError as ex:
+        raise ImageDecompressError(
+            filename=filename,
+            reason=f"invalid XZ block at offset {segment.offset}: "
+                   f"{ex}") from ex
+
+
+SEGMENT_DECOMPRESSORS = {'bz2': decompress_bz2_segment,
+                         'xz': decompress_xz_segment}
+
+
+def _encode_xz_int(value: int) -> bytes:
+    data = bytearray()
+    while value >= 0x80:
+        data.append((value & 0x7f) | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def _decode_xz_int(data: bytes, offset: int) -> typing.Tuple[int, int]:
+    value = 0
+    for i in range(9):
+        byte = data[offset + i]
+        value |= (byte & 0x7f) << (7 * i)
+        if not byte & 0x80:
+            return value, offset + i + 1
+    raise ValueError("invalid variable length integer")
+
+
+def list_xz_segments(fileno: int, file_size: int) -> typing.List[ImageSegment]:
+    """Lists the blocks of every stream of an xz file
+
+    Streams are walked backward from the end of the file, using footer
+    and index of every stream to locate its blocks.
+    """
+    segments: typing.List[ImageSegment] = []
+    end = file_size
+    while end > 0:
+        # Skip stream padding
+        while end >= 4 and os.pread(fileno, 4, end - 4) == b'\x00' * 4:
+            end -= 4
+        if end == 0:
+            break
+        if end < XZ_HEADER_SIZE + XZ_FOOTER_SIZE:
+            raise ValueError(f"truncated stream at offset {end}")
+        footer = os.pread(fileno, XZ_FOOTER_SIZE, end - XZ_FOOTER_SIZE)
+        if footer[10:] != XZ_FOOTER_MAGIC:
+            raise ValueError(f"invalid stream footer at offset {end}")
+        index_size = (struct.unpack('<I', footer[4:8])[0] + 1) * 4
+        index_start = end - XZ_FOOTER_SIZE - index_size
+        index = os.pread(fileno, index_size, index_start)
+        if index[:1] != b'\x00':
+            raise ValueError(f"invalid stream index at offset {index_start}")
+        records = []
+        records_count, offset = _decode_xz_int(index, 1)
+        for _ in range(records_count):
+            unpadded_size, offset = _decode_xz_int(index, offset)
+            uncompressed_size, offset = _decode_xz_int(index, offset)
+            records.append((unpadded_size, uncompressed_size))
+        blocks_size = sum(_round_up_4(unpadded_size)
+                          for unpadded_size, _ in records)
+        stream_start = index_start - blocks_size - XZ_HEADER_SIZE
+        header = os.pread(fileno, XZ_HEADER_SIZE, max(0, stream_start))
+        if (stream_start < 0 or not header.startswith(XZ_HEADER_MAGIC) or
+                header[6:8] != footer[8:10]):
+            raise ValueError(f"invalid stream header at offset "
+                             f"{stream_start}")
+        offset = stream_start + XZ_HEADER_SIZE
+        stream_segments = []
+        for unpadded_size, uncompressed_size in records:
+            size = _round_up_4(unpadded_size)
+            stream_segments.append(
+                ImageSegment(offset=offset,
+                             size=size,
+                             stream_header=header,
+                             unpadded_size=unpadded_size,
+                             uncompressed_size=uncompressed_size))
+            offset += size
+        segments[:0] = stream_segments
+        end = stream_start
+    return segments
+
+
+def list_bz2_segments(fileno: int, file_size: int,
+                      chunk_size: int = CHUNK_SIZE) \
+        -> typing.List[ImageSegment]:
+    """Lists the streams of a bz2 file (like the ones written by pbzip2)
+
+    Streams are looked for by their magic bytes. The rare candidates
+    found inside compressed data make decompression fail rather than
+    producing wrong data.
+    """
+    overlap = len(b'BZh1') + len(b'\x31\x41\x59\x26\x53\x59') - 1
+    offsets = []
+    for position in range(0, file_size, chunk_size):
+        data = os.pread(fileno, chunk_size + overlap, position)
+        offsets += [position + match.start()
+                    for match in BZ2_STREAM_START.finditer(data)
+                    if match.start() < chunk_size]
+    if offsets[:1] != [0]:
+        raise ValueError("invalid stream header at offset 0")
+    return [ImageSegment(offset=start, size=stop - start)
+            for start, stop in zip(offsets, offsets[1:] + [file_size])]
+
+
+def list_image_segments(filename: str, compression_type: str) \
+        -> typing.Optional[typing.List[ImageSegment]]:
+    """Lists parts of a compressed file to be decompressed concurrently
+
+    :returns: None when the file can't be decompressed in parallel
+    """
+    try:
+        with open(filename, 'rb') as fd:
+            file_size = os.fstat(fd.fileno()).st_size
+            if compression_type == 'xz':
+                segments = list_xz_segments(fd.fileno(), file_size)
+                max_size = max((segment.uncompressed_size
+                                for segment in segments), default=0)
+                too_big = max_size > MAX_SEGMENT_SIZE
+            elif compression_type == 'bz2':
+                segments = list_bz2_segments(fd.fileno(), file_size)
+                too_big = any(segment.size > MAX_BZ2_SEGMENT_SIZE
+                              for segment in segments)
+            else:
+                return None
+    except (IndexError, ValueError) as ex:
+        LOG.debug(f"Unable to list segments of file {filename!r}: {ex}")
+        return None
+    if len(segments) < 2 or too_big:
+        LOG.debug(f"File {filename!r} can't be decompressed in parallel "
+                  f"({len(segments)} segments)")
+        return None
+    return segments
+
+
+def open_image_reader(filename: str,
+                      compression_type: str = None,
+                      workers_count: int = None,
+                      buffers_count: int = None,
+                      copy_file: str = None) -> ImageReader:
+    """Opens a compressed image file decompressing it in background
+
+    Files made of many xz blocks or bz2 streams are decompressed by
+    'workers_count' threads at the same time.
+
+    :param copy_file: file where decompressed data is written while it is
+        read
+    """
+    if workers_count is None or buffers_count is None:
+        from tobiko import config
+        CONF = config.CONF
+        if workers_count is None:
+            workers_count = CONF.tobiko.glance.image_decompress_workers
+        if buffers_count is None:
+            buffers_count = CONF.tobiko.glance.image_read_ahead_buffers
+    if compression_type is None:
+        compression_type = _io.get_file_compression_type(filename)
+
+    segments = None
+    if workers_count > 1 and compression_type in SEGMENT_DECOMPRESSORS:
+        segments = list_image_segments(filename, compression_type)
+    chunks: typing.Iterable[bytes]
+    if segments:
+        LOG.debug(f"Decompress {len(segments)} segments of file "
+                  f"{filename!r} using {workers_count} workers")
+        chunks = iter_parallel_chunks(filename=filename,
+                                      compression_type=compression_type,
+                                      segments=segments,
+                                      workers_count=workers_count)
+    else:
+        chunks = iter_file_chunks(filename=filename,
+                                  compression_type=compression_type)
+    return ImageReader(chunks=chunks,
+                       name=filename,
+                       buffers_count=buffers_count,
+                       copy_file=copy_file)
+
+
+def _round_up_4(size: int) -> int:
+    return -(-size // 4) * 4
@@ -24,6 +24,31 @@ OPTIONS = [
                default='~/.tobiko/cache/glance/images',
                help=("Default directory where to look for image "
                      "files")),
+    cfg.StrOpt('image_cache_dir',
+               default='~/.tobiko/cache/glance/cache',
+               help=("Directory where image files downloaded from URLs are "
+                     "stored by their SHA-256 checksum. It can be shared "
+                     "by many hosts to download every image only once")),
+    cfg.IntOpt('image_download_workers',
+               default=1,
+               help=("Number of HTTP range requests used to download an "
+                     "image file at the same time. Values lower than 2 "
+                     "download image files with a single request")),
+    cfg.IntOpt('image_decompress_workers',
+               default=1,
+               help=("Number of threads decompressing an image file at the "
+                     "same time. Only files made of many XZ blocks or BZ2 "
+                     "streams (like the ones written by 'xz -T0' or pbzip2 "
+                     "tools) can be decompressed by more than one thread")),
+    cfg.IntOpt('image_read_ahead_buffers',
+               default=4,
+               help=("Number of decompressed image file chunks produced "
+                     "ahead of the one being uploaded")),
+    cfg.BoolOpt('keep_decompressed_images',
+                default=False,
+                help=("Write decompressed data of compressed image files "
+                      "to '<image_file>.decompressed' files while "
+                      "uploading them, to upload these files later")),
 ]
 
 
@@ -50,6 +75,12 @@ def get_images_options():
                         help="Default " + name + " image URL"),
              cfg.StrOpt('image_file',
                         help="Default " + name + " image filename"),
+             cfg.StrOpt('image_checksum',
+                        help="Default " + name + " image file SHA-256 "
+                             "checksum"),
+             cfg.StrOpt('image_checksums_url',
+                        help="Default " + name + " image SHA-256 checksums "
+                             "manifest URL (like SHA256SUMS files)"),
              cfg.StrOpt('container_format',
                         help="Default " + name + " container format"),
              cfg.StrOpt('disk_format',
@@ -14,9 +14,12 @@
 from __future__ import absolute_import
 
 from tobiko.openstack.heat import _client
+from tobiko.openstack.heat import _orchestrate
+from tobiko.openstack.heat import _poller
 from tobiko.openstack.heat import _template
 from tobiko.openstack.heat import _resource
 from tobiko.openstack.heat import _stack
+from tobiko.openstack.heat import config
 
 heat_client = _client.heat_client
 default_heat_client = _client.default_heat_client
@@ -29,6 +32,8 @@ heat_template = _template.heat_template
 heat_template_file = _template.heat_template_file
 HeatTemplateFixture = _template.HeatTemplateFixture
 HeatTemplateFileFixture = _template.HeatTemplateFileFixture
+HeatTemplateCache = _template.HeatTemplateCache
+find_heat_template_file = _template.find_heat_template_file
 
 RESOURCE_CLASSES = _resource.RESOURCE_CLASSES
 ResourceType = _resource.ResourceType
@@ -38,6 +43,7 @@ list_resources = _resource.list_resources
 StackType = _stack.StackType
 HeatStackFixture = _stack.HeatStackFixture
 HeatStackNotFound = _stack.HeatStackNotFound
+HeatStackDeletionFailed = _stack.HeatStackDeletionFailed
 heat_stack_parameters = _stack.heat_stack_parameters
 find_stack = _stack.find_stack
 list_stacks = _stack.list_stacks
@@ -51,3 +57,15 @@ DELETE_IN_PROGRESS = _stack.DELETE_IN_PROGRESS
 DELETE_COMPLETE = _stack.DELETE_COMPLETE
 DELETE_FAILED = _stack.DELETE_FAILED
 STACK_CLASSES = _stack.STACK_CLASSES
+
+HeatStackPoller = _poller.HeatStackPoller
+get_stack_poller = _poller.get_stack_poller
+
+ProjectStackLimiter = _orchestrate.ProjectStackLimiter
+create_stacks = _orchestrate.create_stacks
+delete_stacks = _orchestrate.delete_stacks
+
+# Registering options drops values cached by tobiko configuration (and any
+# patch applied to them), therefore it is done as soon as this package is
+# imported instead of the first time Heat options are used
+config.get_heat_options()
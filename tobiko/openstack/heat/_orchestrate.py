@@ -0,0 +1,177 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+from concurrent import futures
+import contextlib
+import sys
+import threading
+import typing
+
+from oslo_log import log
+import testtools
+
+import tobiko
+from tobiko.openstack.heat import _poller
+from tobiko.openstack.heat import _stack
+
+
+LOG = log.getLogger(__name__)
+
+StackFixtureType = typing.Union[_stack.HeatStackFixture,
+                                typing.Type[_stack.HeatStackFixture]]
+
+
+class ProjectStackLimiter(object):
+    """It limits the number of stacks being created for every project"""
+
+    def __init__(self, max_stacks: int = None):
+        self._max_stacks = max_stacks
+        self._lock = threading.Lock()
+        self._semaphores: typing.Dict[str, threading.BoundedSemaphore] = {}
+
+    @property
+    def max_stacks(self) -> int:
+        max_stacks = self._max_stacks
+        if max_stacks is None:
+            from tobiko.openstack.heat import config
+            max_stacks = config.get_heat_options().max_stacks_per_project
+        return max_stacks or 0
+
+    @contextlib.contextmanager
+    def limit(self, project: typing.Optional[str]) -> typing.Iterator[None]:
+        max_stacks = self.max_stacks
+        if max_stacks < 1:
+            yield
+            return
+        key = project or ''
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                self._semaphores[key] = semaphore = \
+                    threading.BoundedSemaphore(max_stacks)
+        if not semaphore.acquire(blocking=False):
+            LOG.debug(f"Waiting for one of {max_stacks} stacks being created "
+                      f"for project '{project}' to complete...")
+            semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+PROJECT_STACK_LIMITER = ProjectStackLimiter()
+
+
+def create_stacks(stacks: typing.Iterable[StackFixtureType],
+                  wait_for_complete=True,
+                  workers_count: int = None,
+                  limiter: ProjectStackLimiter = None) \
+        -> typing.List[_stack.HeatStackFixture]:
+    """Sets up many stack fixtures at the same time
+
+    Stacks are created by a bounded pool of threads and their status is
+    refreshed by a poller shared by every stack using the same Heat
+    client, with a single list request for all of them at every poll.
+
+    :param wait_for_complete: when True every stack is waited for to
+        reach CREATE_COMPLETE status.
+    :param workers_count: maximum number of stacks being created at the
+        same time. When None it is taken from 'stack_workers' option of
+        'heat' configuration section.
+    :param limiter: it limits the number of stacks being created at the
+        same time for every project (see 'max_stacks_per_project' option
+        of 'heat' configuration section).
+    :returns: the list of stack fixtures, in the same order.
+    """
+    if limiter is None:
+        limiter = PROJECT_STACK_LIMITER
+
+    def create_stack(stack: _stack.HeatStackFixture):
+        setup_shared_poller(stack)
+        stack.setup_project()
+        with limiter.limit(stack.project):
+            tobiko.setup_fixture(stack)
+            if wait_for_complete:
+                stack.wait_for_create_complete()
+
+    return run_stacks(stacks, create_stack, workers_count=workers_count)
+
+
+def delete_stacks(stacks: typing.Iterable[StackFixtureType],
+                  workers_count: int = None) \
+        -> typing.List[_stack.HeatStackFixture]:
+    """Cleans up many stack fixtures at the same time
+
+    Stacks that are still used by other test cases are not deleted (see
+    HeatStackFixture.cleanup_fixture method). Deleted stacks are waited
+    for to disappear using a poller shared by every stack.
+
+    :returns: the list of stack fixtures, in the same order.
+    """
+
+    def delete_stack(stack: _stack.HeatStackFixture):
+        setup_shared_poller(stack)
+        tobiko.cleanup_fixture(stack)
+
+    return run_stacks(stacks, delete_stack, workers_count=workers_count)
+
+
+def setup_shared_poller(stack: _stack.HeatStackFixture) \
+        -> _poller.HeatStackPoller:
+    poller = stack.stack_poller
+    if poller is None:
+        stack.stack_poller = poller = _poller.get_stack_poller(
+            stack.setup_client())
+    return poller
+
+
+def run_stacks(stacks: typing.Iterable[StackFixtureType],
+               func: typing.Callable[[_stack.HeatStackFixture], None],
+               workers_count: int = None) \
+        -> typing.List[_stack.HeatStackFixture]:
+    fixtures: typing.List[_stack.HeatStackFixture] = []
+    for obj in stacks:
+        fixture = typing.cast(_stack.HeatStackFixture,
+                              tobiko.get_fixture(obj))
+        tobiko.check_valid_type(fixture, _stack.HeatStackFixture)
+        if fixture not in fixtures:
+            fixtures.append(fixture)
+    if not fixtures:
+        return fixtures
+
+    if workers_count is None:
+        from tobiko.openstack.heat import config
+        workers_count = config.get_heat_options().stack_workers
+    workers_count = max(1, min(workers_count or 1, len(fixtures)))
+    LOG.debug(f"Processing {len(fixtures)} stack(s) using up to "
+              f"{workers_count} worker thread(s)...")
+
+    errors = []
+    with futures.ThreadPoolExecutor(max_workers=workers_count) as executor:
+        running = {executor.submit(func, fixture): fixture
+                   for fixture in fixtures}
+        for future in futures.as_completed(running):
+            try:
+                future.result()
+            except Exception:
+                LOG.debug("Error processing stack "
+                          f"'{running[future].stack_name}'")
+                errors.append(sys.exc_info())
+    if errors:
+        with tobiko.handle_multiple_exceptions():
+            raise testtools.MultipleExceptions(*errors)
+    return fixtures
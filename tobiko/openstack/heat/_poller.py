@@ -0,0 +1,134 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import collections
+import threading
+import typing
+import weakref
+
+from heatclient.v1 import stacks
+from oslo_log import log
+
+import tobiko
+from tobiko.openstack.heat import _client
+
+
+LOG = log.getLogger(__name__)
+
+
+class HeatStackPoller(object):
+    """It refreshes the status of many stacks with a single list request
+
+    Threads waiting for stacks to change status ask the poller for their
+    stack instead of getting it on their own. Stacks asked for are listed
+    together by the first thread finding their status older than
+    'max_age' seconds, while other threads wait for that request to
+    return. Stacks that are not listed (for example because they have
+    been deleted) are reported as None.
+    """
+
+    def __init__(self,
+                 client: _client.HeatClient,
+                 max_age: tobiko.Seconds = None):
+        self.client = client
+        self._max_age = max_age
+        self._condition = threading.Condition()
+        self._polling = False
+        # names of the stacks to be listed by next request
+        self._names: typing.Set[str] = set()
+        self._stacks: typing.Dict[str, typing.Optional[stacks.Stack]] = {}
+        self._updated: typing.Dict[str, float] = {}
+        self._generations: typing.Dict[str, int] = collections.defaultdict(
+            int)
+        self.polls_count = 0
+
+    @property
+    def max_age(self) -> float:
+        max_age = self._max_age
+        if max_age is None:
+            from tobiko.openstack.heat import config
+            max_age = config.get_heat_options().poll_interval
+        return max_age or 0.
+
+    def get_stack(self, stack_name: str) -> typing.Optional[stacks.Stack]:
+        with self._condition:
+            self._names.add(stack_name)
+            while True:
+                updated = self._updated.get(stack_name)
+                if (updated is not None and
+                        tobiko.time() - updated < self.max_age):
+                    return self._stacks[stack_name]
+                if not self._polling:
+                    break
+                self._condition.wait()
+            self._polling = True
+            # Stack could have been discarded by the request that has just
+            # returned
+            self._names.add(stack_name)
+            names = sorted(self._names)
+            generations = {name: self._generations[name] for name in names}
+
+        start_time = tobiko.time()
+        try:
+            LOG.debug(f"Polling status of {len(names)} stack(s)...")
+            found = {stack.stack_name: stack
+                     for stack in self.client.stacks.list(
+                         filters={'name': names})}
+        except Exception:
+            with self._condition:
+                self._polling = False
+                self._condition.notify_all()
+            raise
+
+        with self._condition:
+            for name in names:
+                # Stacks changed while listing them are listed again
+                if self._generations[name] != generations[name]:
+                    continue
+                stack = found.get(name)
+                self._stacks[name] = stack
+                self._updated[name] = start_time
+                status = getattr(stack, 'stack_status', '')
+                if not status.endswith('_IN_PROGRESS'):
+                    self._names.discard(name)
+            self.polls_count += 1
+            self._polling = False
+            self._condition.notify_all()
+        return found.get(stack_name)
+
+    def invalidate(self, stack_name: str):
+        """Forgets the status of a stack after it has been changed"""
+        with self._condition:
+            self._generations[stack_name] += 1
+            self._stacks.pop(stack_name, None)
+            self._updated.pop(stack_name, None)
+
+
+STACK_POLLERS: typing.MutableMapping[typing.Any, HeatStackPoller] = \
+    weakref.WeakKeyDictionary()
+STACK_POLLERS_LOCK = threading.Lock()
+
+
+def get_stack_poller(client: _client.HeatClientType = None) \
+        -> HeatStackPoller:
+    """Gets the poller shared by every stack of the same Heat client"""
+    client = _client.heat_client(client)
+    with STACK_POLLERS_LOCK:
+        poller = STACK_POLLERS.get(client)
+        if poller is None:
+            STACK_POLLERS[client] = poller = HeatStackPoller(client=client)
+        return poller
@@ -25,7 +25,9 @@ from oslo_log import log
 
 import tobiko
 from tobiko import config
+from tobiko.openstack import _cache
 from tobiko.openstack.heat import _client
+from tobiko.openstack.heat import _poller
 from tobiko.openstack.heat import _template
 from tobiko.openstack import keystone
 from tobiko.openstack import neutron
@@ -93,10 +95,15 @@ def get_stack(stack: StackIdType,
             stack_id, resolve_outputs=resolve_outputs)
 
 
+# Kinds of cached resources that can be created or deleted with stacks
+STACK_RESOURCE_KINDS = ['stacks', 'servers', 'ports', 'hypervisors']
+
+
 def list_stacks(client: _client.HeatClientType = None,
                 **kwargs) -> tobiko.Selection[StackType]:
     client = _client.heat_client(client)
-    return tobiko.select(client.stacks.list(**kwargs))
+    return tobiko.select(_cache.cached_list(
+        'stacks', client, kwargs, lambda: client.stacks.list(**kwargs)))
 
 
 def find_stack(client: _client.HeatClientType = None,
@@ -127,6 +134,9 @@ class HeatStackFixture(tobiko.SharedFixture):
     project: typing.Optional[str] = None
     user: typing.Optional[str] = None
     output_needs_stack_complete: bool = True
+    #: poller shared with other stacks to refresh stack status while
+    # waiting for it to change
+    stack_poller: typing.Optional[_poller.HeatStackPoller] = None
 
     def __init__(
             self,
@@ -285,6 +295,9 @@ class HeatStackFixture(tobiko.SharedFixture):
         except exc.HTTPConflict:
             LOG.debug(f"Stack '{self.stack_name}' already created")
             return self.validate_created_stack()
+        finally:
+            _cache.invalidate_resources(*STACK_RESOURCE_KINDS)
+            self.invalidate_polled_stack()
 
         LOG.debug(f"New stack being created: name='{self.stack_name}', "
                   f"id='{stack_id}'.")
@@ -349,6 +362,9 @@ class HeatStackFixture(tobiko.SharedFixture):
         else:
             LOG.debug('Deleting stack %r (id=%r)...', self.stack_name,
                       stack_id)
+        finally:
+            _cache.invalidate_resources(*STACK_RESOURCE_KINDS)
+            self.invalidate_polled_stack()
 
     @property
     def stack_id(self) -> str:
@@ -372,6 +388,28 @@ class HeatStackFixture(tobiko.SharedFixture):
             self._outputs = self._resources = None
         return stack
 
+    def setup_stack_poller(self) -> typing.Optional[_poller.HeatStackPoller]:
+        from tobiko.openstack.heat import config as heat_config
+        poller = self.stack_poller
+        if (poller is None and
+                heat_config.get_heat_options().shared_stack_poller):
+            self.stack_poller = poller = _poller.get_stack_poller(
+                self.setup_client())
+        return poller
+
+    def refresh_stack(self) -> typing.Optional[stacks.Stack]:
+        """Gets the stack status from the stack poller if any"""
+        poller = self.setup_stack_poller()
+        if poller is None:
+            return self.get_stack()
+        self.stack = stack = poller.get_stack(self.stack_name)
+        self._outputs = self._resources = None
+        return stack
+
+    def invalidate_polled_stack(self):
+        if self.stack_poller is not None:
+            self.stack_poller.invalidate(self.stack_name)
+
     def wait_for_create_complete(self,
                                  cached=True,
                                  check=True,
@@ -450,7 +488,7 @@ class HeatStackFixture(tobiko.SharedFixture):
                 cached = False
                 stack = self.stack or self.get_stack()
             else:
-                stack = self.get_stack()
+                stack = self.refresh_stack()
             stack_status = getattr(stack, 'stack_status', DELETE_COMPLETE)
             if stack_status in expected_status:
                 LOG.debug(f"Stack '{self.stack_name}' reached expected "
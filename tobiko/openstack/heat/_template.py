@@ -14,15 +14,22 @@
 from __future__ import absolute_import
 
 from collections import abc
+import copy
 import os
 import sys
+import threading
 import typing
+from urllib import parse
 
 from heatclient.common import template_utils
+from oslo_log import log
 
 import tobiko
 
 
+LOG = log.getLogger(__name__)
+
+
 TEMPLATE_SUFFIX = '.yaml'
 
 TEMPLATE_DIRS = list(sys.path)
@@ -46,12 +53,17 @@ class HeatTemplateFixture(tobiko.SharedFixture):
     def setup_fixture(self):
         self.setup_template()
 
+    _dumped_template: typing.Optional[typing.Dict[str, typing.Any]] = None
+
     def setup_template(self):
         # Ensure main sections are dictionaries
         tobiko.check_valid_type(self.outputs, abc.Mapping)
         tobiko.check_valid_type(self.parameters, abc.Mapping)
         tobiko.check_valid_type(self.resources, abc.Mapping)
-        self.template_yaml = tobiko.dump_yaml(self.template)
+        # Comparing templates is cheaper than dumping them again
+        if self._dumped_template != self.template:
+            self.template_yaml = tobiko.dump_yaml(self.template)
+            self._dumped_template = copy.deepcopy(self.template)
 
     @property
     def outputs(self) -> typing.Dict[str, typing.Any]:
@@ -84,10 +96,13 @@ class HeatTemplateFileFixture(HeatTemplateFixture):
             template_file = find_heat_template_file(
                 template_file=self.template_file,
                 template_dirs=template_dirs)
-        template_files, template = template_utils.get_template_contents(
-            template_file=template_file)
-        self.template = template
-        self.template_files = template_files
+        # Templates are shared with every fixture loading the same file:
+        # they must not be modified
+        entry = TEMPLATE_CACHE.get_template(template_file)
+        self.template = entry.template
+        self.template_files = entry.template_files
+        self.template_yaml = entry.template_yaml
+        self._dumped_template = entry.template
         super(HeatTemplateFileFixture, self).setup_template()
 
 
@@ -116,11 +131,103 @@ def heat_template_file(template_file: str,
 
 def find_heat_template_file(template_file: str,
                             template_dirs: typing.Iterable[str]):
-    for template_dir in template_dirs:
-        template_path = os.path.join(template_dir, template_file)
-        if os.path.exists(template_path):
+    return TEMPLATE_CACHE.find_template_file(template_file=template_file,
+                                             template_dirs=template_dirs)
+
+
+FileStat = typing.Tuple[str, int, int]
+
+
+class HeatTemplateEntry(typing.NamedTuple):
+    template_file: str
+    template: typing.Dict[str, typing.Any]
+    # Files required by the template (like the ones referenced by
+    # get_file functions) indexed by URL
+    template_files: typing.Dict[str, typing.Any]
+    template_yaml: str
+    # Path, modification time and size of every loaded file
+    stats: typing.Tuple[FileStat, ...]
+
+
+class HeatTemplateCache(object):
+    """Heat template files parsed once for every process
+
+    Template files are looked for in template directories only the first
+    time they are asked for. Parsed templates are reused until the
+    template file, or any file it requires, is modified.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paths: typing.Dict[typing.Tuple[str, typing.Tuple[str, ...]],
+                                 str] = {}
+        self._entries: typing.Dict[str, HeatTemplateEntry] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def find_template_file(self,
+                           template_file: str,
+                           template_dirs: typing.Iterable[str]) -> str:
+        template_dirs = tuple(template_dirs)
+        key = template_file, template_dirs
+        with self._lock:
+            template_path = self._paths.get(key)
+        if template_path is not None and os.path.exists(template_path):
             return template_path
 
-    msg = "Template file {!r} not found in directories {!r}".format(
-        template_file, template_dirs)
-    raise IOError(msg)
+        for template_dir in template_dirs:
+            template_path = os.path.join(template_dir, template_file)
+            if os.path.exists(template_path):
+                with self._lock:
+                    self._paths[key] = template_path
+                return template_path
+
+        msg = "Template file {!r} not found in directories {!r}".format(
+            template_file, list(template_dirs))
+        raise IOError(msg)
+
+    def get_template(self, template_file: str) -> HeatTemplateEntry:
+        template_file = os.path.abspath(template_file)
+        with self._lock:
+            entry = self._entries.get(template_file)
+        if entry is not None and entry.stats == get_file_stats(
+                stat[0] for stat in entry.stats):
+            with self._lock:
+                self.hits += 1
+            return entry
+
+        LOG.debug(f"Load Heat template file: '{template_file}'")
+        template_files, template = template_utils.get_template_contents(
+            template_file=template_file)
+        paths = [template_file] + [parse.urlparse(url).path
+                                   for url in sorted(template_files)
+                                   if url.startswith('file:')]
+        entry = HeatTemplateEntry(template_file=template_file,
+                                  template=template,
+                                  template_files=template_files,
+                                  template_yaml=tobiko.dump_yaml(template),
+                                  stats=get_file_stats(paths))
+        with self._lock:
+            self.misses += 1
+            self._entries[template_file] = entry
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._paths.clear()
+            self._entries.clear()
+
+
+def get_file_stats(paths: typing.Iterable[str]) -> typing.Tuple[FileStat, ...]:
+    stats = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stats.append((path, -1, -1))
+        else:
+            stats.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(stats)
+
+
+TEMPLATE_CACHE = HeatTemplateCache()
@@ -0,0 +1,68 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import itertools
+
+from oslo_config import cfg
+
+from tobiko import config
+
+
+GROUP_NAME = 'heat'
+OPTIONS = [
+    cfg.FloatOpt('poll_interval',
+                 default=5.,
+                 help=("Maximum age, in seconds, of stack statuses shared "
+                       "by stacks waiting for their status to change")),
+    cfg.BoolOpt('shared_stack_poller',
+                default=False,
+                help=("Refresh the status of every stack being waited for "
+                      "with a single list request, instead of getting "
+                      "every stack on its own")),
+    cfg.IntOpt('stack_workers',
+               default=8,
+               help=("Maximum number of stacks created or deleted at the "
+                     "same time by create_stacks and delete_stacks "
+                     "functions")),
+    cfg.IntOpt('max_stacks_per_project',
+               default=0,
+               help=("Maximum number of stacks being created at the same "
+                     "time for the same project, to avoid exceeding its "
+                     "quotas (0 for no limit)")),
+]
+
+
+def register_tobiko_options(conf):
+    conf.register_opts(group=cfg.OptGroup(GROUP_NAME), opts=OPTIONS)
+
+
+def list_options():
+    return [(GROUP_NAME, itertools.chain(OPTIONS))]
+
+
+def get_heat_options():
+    """Gets Heat options, registering them the first time
+
+    Heat package (and client library) is too slow to be imported every
+    time tobiko configuration is loaded, therefore this module is not
+    listed in tobiko.config.CONFIG_MODULES and its options are only
+    registered when Heat package is imported.
+    """
+    conf = config.CONF.tobiko
+    if GROUP_NAME not in conf:
+        register_tobiko_options(conf=conf)
+    return conf[GROUP_NAME]
@@ -19,6 +19,7 @@ from tobiko.openstack.keystone import _credentials
 from tobiko.openstack.keystone import _resource
 from tobiko.openstack.keystone import _services
 from tobiko.openstack.keystone import _session
+from tobiko.openstack.keystone import _token_cache
 
 KeystoneClient = _client.KeystoneClient
 KeystoneClientFixture = _client.KeystoneClientFixture
@@ -71,3 +72,6 @@ KeystoneSessionManager = _session.KeystoneSessionManager
 get_keystone_endpoint = _session.get_keystone_endpoint
 get_keystone_session = _session.get_keystone_session
 get_keystone_token = _session.get_keystone_token
+
+KeystoneTokenCache = _token_cache.KeystoneTokenCache
+get_keystone_token_cache = _token_cache.get_keystone_token_cache
@@ -22,6 +22,7 @@ from oslo_log import log
 
 import tobiko
 from tobiko.openstack.keystone import _credentials
+from tobiko.openstack.keystone import _token_cache
 from tobiko import http
 
 
@@ -74,6 +75,9 @@ class KeystoneSessionFixture(tobiko.SharedFixture):
         params.pop('api_version', None)
         params.pop('cacert', None)
         auth = loader.load_from_options(**params)
+        token_cache = _token_cache.get_keystone_token_cache()
+        if token_cache is not None:
+            token_cache.bind(auth)
         session = _session.Session(auth=auth, verify=False)
         http.setup_http_session(session)
         return session
@@ -0,0 +1,152 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import hashlib
+import json
+import os
+import typing
+
+from keystoneauth1.identity import base
+from oslo_concurrency import lockutils
+from oslo_log import log
+
+import tobiko
+
+
+LOG = log.getLogger(__name__)
+
+
+class KeystoneTokenCache:
+    """Keystone tokens and service catalogs shared between processes
+
+    Authentication states are stored in files named after the hash of the
+    credentials they have been obtained with. Files are read and written
+    while holding an inter-process lock, so that only one of the processes
+    running at the same time (like test workers) authenticates to Keystone
+    while the others wait for it and then reuse the same token.
+    """
+
+    version = 1
+
+    def __init__(self, cache_dir: str, renew_before: tobiko.Seconds = 300.):
+        self.cache_dir = cache_dir
+        self.renew_before = int(renew_before or 0)
+
+    def bind(self, auth: base.BaseIdentityPlugin) -> bool:
+        """Make given authentication plugin use this cache
+
+        It returns False when the plugin can't be cached because its
+        credentials can't be identified.
+        """
+        try:
+            cache_id = auth.get_cache_id()
+        except NotImplementedError:
+            cache_id = None
+        if not cache_id:
+            return False
+
+        key = hashlib.sha256(cache_id.encode()).hexdigest()
+        get_access = auth.get_access
+        invalidate = auth.invalidate
+
+        def get_cached_access(session, **kwargs):
+            auth_ref = auth.auth_ref
+            if auth_ref is None or auth_ref.will_expire_soon(
+                    self.renew_before):
+                with self.lock(key):
+                    self._renew_access(auth, key, get_access, session)
+            return get_access(session, **kwargs)
+
+        def invalidate_cached_access():
+            auth_ref = auth.auth_ref
+            if auth_ref is not None:
+                with self.lock(key):
+                    self.discard_state(key, auth_token=auth_ref.auth_token)
+            return invalidate()
+
+        auth.get_access = get_cached_access  # type: ignore
+        auth.invalidate = invalidate_cached_access  # type: ignore
+        return True
+
+    def _renew_access(self, auth, key: str, get_access, session):
+        state = self.load_state(key)
+        if state is not None:
+            auth.set_auth_state(state)
+            if not auth.auth_ref.will_expire_soon(self.renew_before):
+                LOG.debug("Keystone token loaded from cache file "
+                          f"'{self.cache_file(key)}'")
+                return
+        # Authenticate again to Keystone and share obtained token
+        auth.auth_ref = None
+        get_access(session)
+        self.save_state(key, auth.get_auth_state())
+
+    def lock(self, key: str):
+        tobiko.makedirs(self.cache_dir, mode=0o700)
+        return lockutils.lock(f'keystone-token-{key}',
+                              external=True,
+                              lock_path=self.cache_dir)
+
+    def cache_file(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    def load_state(self, key: str) -> typing.Optional[str]:
+        data = tobiko.load_json_file(self.cache_file(key),
+                                     version=self.version)
+        if data is None:
+            return None
+        return data.get('auth_state') or None
+
+    def save_state(self, key: str, state: typing.Optional[str]):
+        if not state:
+            return
+        cache_file = self.cache_file(key)
+        data = {'version': self.version, 'auth_state': state}
+        try:
+            # Output files can only be read by current user (like files
+            # created by mkstemp), what is required as they contain valid
+            # tokens
+            with tobiko.open_output_file(cache_file) as fd:
+                json.dump(data, fd)
+        except OSError:
+            LOG.warning(f"Unable to save Keystone token cache file "
+                        f"'{cache_file}'", exc_info=True)
+
+    def discard_state(self, key: str, auth_token: str = None):
+        """Remove cached state unless it holds a token other than given one"""
+        if auth_token is not None:
+            state = self.load_state(key)
+            if (state is not None and
+                    json.loads(state).get('auth_token') != auth_token):
+                return
+        try:
+            os.unlink(self.cache_file(key))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            LOG.warning(f"Unable to remove Keystone token cache file "
+                        f"'{self.cache_file(key)}'", exc_info=True)
+
+
+def get_keystone_token_cache() -> typing.Optional[KeystoneTokenCache]:
+    from tobiko import config
+    conf = config.CONF.tobiko.keystone
+    if not conf.token_cache_dir:
+        return None
+    return KeystoneTokenCache(
+        cache_dir=tobiko.tobiko_config_path(conf.token_cache_dir),
+        renew_before=conf.token_renew_before)
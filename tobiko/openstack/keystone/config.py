@@ -62,7 +62,16 @@ OPTIONS = [
                 help="Directories where to look for clouds files"),
     cfg.ListOpt('clouds_file_names',
                 default=['clouds.yaml', 'clouds.yml', 'clouds.json'],
-                help="Clouds file names")]
+                help="Clouds file names"),
+    cfg.StrOpt('token_cache_dir',
+               default='~/.tobiko/cache/keystone',
+               help=("Directory where Keystone tokens and service catalogs "
+                     "are shared between test runner processes. Set it "
+                     "empty to disable the token cache")),
+    cfg.FloatOpt('token_renew_before',
+                 default=300.,
+                 help=("Number of seconds before its expiration a cached "
+                       "Keystone token is renewed"))]
 
 
 def register_tobiko_options(conf):
@@ -20,6 +20,7 @@ import typing
 from oslo_log import log
 
 import tobiko
+from tobiko.openstack import _cache
 from tobiko.openstack.neutron import _client
 from tobiko.shell import sh
 
@@ -51,9 +52,15 @@ NeutronAgentType = typing.Dict[str, typing.Any]
 
 def list_agents(client=None, **params) \
         -> tobiko.Selection[NeutronAgentType]:
-    agents = _client.neutron_client(client).list_agents(**params)
-    if isinstance(agents, abc.Mapping):
-        agents = agents['agents']
+    client = _client.neutron_client(client)
+
+    def fetch_agents():
+        agents = client.list_agents(**params)
+        if isinstance(agents, abc.Mapping):
+            agents = agents['agents']
+        return agents
+
+    agents = _cache.cached_list('agents', client, params, fetch_agents)
     return tobiko.Selection[NeutronAgentType](agents)
 
 
@@ -113,7 +120,8 @@ class NetworkingAgentFixture(tobiko.SharedFixture):
     agents = None
 
     def setup_fixture(self):
-        self.agents = list_agents()
+        # Agents are looked up many times by the same attributes
+        self.agents = tobiko.select_indexed(list_agents())
 
 
 def list_networking_agents(**attributes):
@@ -16,6 +16,7 @@ from __future__ import absolute_import
 import typing
 
 import tobiko
+from tobiko.openstack import _cache
 from tobiko.openstack.neutron import _client
 from tobiko.openstack.neutron import _network
 from tobiko.openstack.neutron import _port
@@ -69,6 +70,7 @@ def list_floating_ips(client: _client.NeutronClientType = None,
     return tobiko.select(floating_ips)
 
 
+@_cache.invalidates_resources('ports')
 def create_floating_ip(network: _network.NetworkIdType = None,
                        port: _port.PortIdType = None,
                        client: _client.NeutronClientType = None,
@@ -100,6 +102,7 @@ def cleanup_floating_ip(floating_ip: FloatingIpIdType,
         pass
 
 
+@_cache.invalidates_resources('ports')
 def delete_floating_ip(floating_ip: FloatingIpIdType,
                        client: _client.NeutronClientType = None):
     floating_ip_id = get_floating_ip_id(floating_ip)
@@ -109,6 +112,7 @@ def delete_floating_ip(floating_ip: FloatingIpIdType,
         raise NoSuchFloatingIp(id=floating_ip_id) from ex
 
 
+@_cache.invalidates_resources('ports')
 def update_floating_ip(floating_ip: FloatingIpIdType,
                        client: _client.NeutronClientType = None,
                        **params) -> FloatingIpType:
@@ -18,6 +18,7 @@ import typing
 import netaddr
 
 import tobiko
+from tobiko.openstack import _cache
 from tobiko.openstack.neutron import _client
 
 
@@ -70,6 +71,7 @@ def find_network(client: _client.NeutronClientType = None,
         return default
 
 
+@_cache.invalidates_resources('ports')
 def create_network(client: _client.NeutronClientType = None,
                    add_cleanup=True,
                    **params) -> NetworkType:
@@ -88,6 +90,7 @@ def cleanup_network(network: NetworkIdType,
         pass
 
 
+@_cache.invalidates_resources('ports')
 def delete_network(network: NetworkIdType,
                    client: _client.NeutronClientType = None):
     network_id = get_network_id(network)
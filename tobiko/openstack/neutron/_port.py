@@ -19,6 +19,7 @@ import typing
 import netaddr
 
 import tobiko
+from tobiko.openstack import _cache
 from tobiko.openstack.neutron import _client
 from tobiko.openstack.neutron import _network
 from tobiko.openstack.neutron import _subnet
@@ -48,6 +49,7 @@ def get_port(port: PortIdType,
         raise NoSuchPort(id=port_id) from ex
 
 
+@_cache.invalidates_resources('ports')
 def create_port(client: _client.NeutronClientType = None,
                 network: _network.NetworkIdType = None,
                 add_cleanup=True,
@@ -75,6 +77,7 @@ def cleanup_port(port: PortIdType,
         pass
 
 
+@_cache.invalidates_resources('ports')
 def update_port(port: PortIdType,
                 client: _client.NeutronClientType = None,
                 **params) -> PortType:
@@ -84,6 +87,7 @@ def update_port(port: PortIdType,
     return reply['port']
 
 
+@_cache.invalidates_resources('ports')
 def delete_port(port: PortIdType,
                 client: _client.NeutronClientType = None):
     port_id = get_port_id(port)
@@ -119,7 +123,9 @@ def list_ports(client: _client.NeutronClientType = None,
     if subnet is not None:
         subnet_id = _subnet.get_subnet_id(subnet)
         params.setdefault('fixed_ips', f'subnet_id={subnet_id}')
-    ports = _client.neutron_client(client).list_ports(**params)['ports']
+    client = _client.neutron_client(client)
+    ports = _cache.cached_list('ports', client, params,
+                               lambda: client.list_ports(**params)['ports'])
     return tobiko.select(ports)
 
 
@@ -19,6 +19,7 @@ import json
 from oslo_log import log
 
 import tobiko
+from tobiko.openstack import _cache
 from tobiko.openstack.neutron import _agent
 from tobiko.openstack.neutron import _client
 from tobiko.openstack.neutron import _network
@@ -49,6 +50,7 @@ def get_router(router: RouterIdType, client=None, **params) -> RouterType:
         raise NoSuchRouter(id=router_id) from ex
 
 
+@_cache.invalidates_resources('ports')
 def create_router(client: _client.NeutronClientType = None,
                   network: _network.NetworkIdType = None,
                   add_cleanup=True,
@@ -75,6 +77,7 @@ def cleanup_router(router: RouterIdType,
         pass
 
 
+@_cache.invalidates_resources('ports')
 def delete_router(router: RouterIdType,
                   client: _client.NeutronClientType = None):
     router_id = get_router_id(router)
@@ -134,6 +137,7 @@ def wait_for_master_and_backup_agents(
 RouterInterfaceType = typing.Dict[str, typing.Any]
 
 
+@_cache.invalidates_resources('ports')
 def add_router_interface(router: RouterIdType,
                          subnet: _subnet.SubnetIdType = None,
                          port: _port.PortIdType = None,
@@ -165,6 +169,7 @@ def cleanup_router_interface(router: RouterIdType,
         pass
 
 
+@_cache.invalidates_resources('ports')
 def remove_router_interface(router: RouterIdType,
                             subnet: _subnet.SubnetIdType = None,
                             port: _port.PortIdType = None,
@@ -182,6 +187,7 @@ def remove_router_interface(router: RouterIdType,
         raise tobiko.ObjectNotFound() from ex
 
 
+@_cache.invalidates_resources('ports')
 def update_router(router: RouterIdType, client=None, **params) -> RouterType:
     router_id = get_router_id(router)
     reply = _client.neutron_client(client).update_router(
@@ -19,6 +19,7 @@ import typing
 import netaddr
 
 import tobiko
+from tobiko.openstack import _cache
 from tobiko.openstack.neutron import _client
 from tobiko.openstack.neutron import _network
 
@@ -45,6 +46,7 @@ def get_subnet(subnet: SubnetIdType,
         raise NoSuchSubnet(id=subnet_id) from ex
 
 
+@_cache.invalidates_resources('ports')
 def create_subnet(client: _client.NeutronClientType = None,
                   network: _network.NetworkIdType = None,
                   add_cleanup=True,
@@ -74,6 +76,7 @@ def cleanup_subnet(subnet: SubnetIdType,
         pass
 
 
+@_cache.invalidates_resources('ports')
 def delete_subnet(subnet: SubnetIdType,
                   client: _client.NeutronClientType = None):
     subnet_id = get_subnet_id(subnet)
@@ -112,6 +115,7 @@ def find_subnet(client: _client.NeutronClientType = None,
         return default
 
 
+@_cache.invalidates_resources('ports')
 def update_subnet(subnet: SubnetIdType,
                   client: _client.NeutronClientType = None,
                   gateway_ip: typing.Union[str, netaddr.IPAddress] = None,
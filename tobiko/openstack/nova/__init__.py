@@ -28,6 +28,7 @@ NovaClientType = _client.NovaClientType
 get_console_output = _client.get_console_output
 get_nova_client = _client.get_nova_client
 get_server = _client.get_server
+get_servers = _client.get_servers
 find_hypervisor = _client.find_hypervisor
 find_server = _client.find_server
 find_service = _client.find_service
@@ -38,12 +39,17 @@ list_services = _client.list_services
 nova_client = _client.nova_client
 NovaClientFixture = _client.NovaClientFixture
 wait_for_server_status = _client.wait_for_server_status
+wait_for_servers_status = _client.wait_for_servers_status
+iter_servers_status = _client.iter_servers_status
 WaitForServerStatusError = _client.WaitForServerStatusError
 WaitForServerStatusTimeout = _client.WaitForServerStatusTimeout
 shutoff_server = _client.shutoff_server
+shutoff_servers = _client.shutoff_servers
 activate_server = _client.activate_server
+activate_servers = _client.activate_servers
 delete_server = _client.delete_server
 ensure_server_status = _client.ensure_server_status
+ensure_servers_status = _client.ensure_servers_status
 live_migrate_server = _client.live_migrate_server
 migrate_server = _client.migrate_server
 confirm_resize = _client.confirm_resize
@@ -14,6 +14,7 @@
 from __future__ import absolute_import
 
 import contextlib
+import sys
 import typing
 
 import novaclient
@@ -22,8 +23,10 @@ import novaclient.v2.client
 import novaclient.v2.servers
 import novaclient.v2.hypervisors
 from oslo_log import log
+import testtools
 
 import tobiko
+from tobiko.openstack import _cache
 from tobiko.openstack import _client
 
 
@@ -83,7 +86,9 @@ def get_nova_client(session=None, shared=True, init_client=None,
 def list_hypervisors(client: NovaClientType = None, detailed=True, **params) \
         -> tobiko.Selection[NovaHypervisor]:
     client = nova_client(client)
-    hypervisors = client.hypervisors.list(detailed=detailed)
+    hypervisors = _cache.cached_list(
+        'hypervisors', client, {'detailed': detailed},
+        lambda: client.hypervisors.list(detailed=detailed))
     return tobiko.select(hypervisors).with_attributes(**params)
 
 
@@ -96,9 +101,19 @@ def find_hypervisor(client: NovaClientType = None, unique=False, **params) \
         return hypervisors.first
 
 
+# Server attributes Nova API can filter exactly as with_attributes does
+SERVERS_SEARCH_OPTS = ['status']
+
+
 def list_servers(client: NovaClientType = None, **params) -> \
         tobiko.Selection[NovaServer]:
-    servers = nova_client(client).servers.list()
+    client = nova_client(client)
+    search_opts = {name: params[name]
+                   for name in SERVERS_SEARCH_OPTS
+                   if isinstance(params.get(name), str)}
+    servers = _cache.cached_list(
+        'servers', client, search_opts,
+        lambda: client.servers.list(search_opts=search_opts or None))
     return tobiko.select(servers).with_attributes(**params)
 
 
@@ -162,6 +177,7 @@ def get_server(server: ServerType = None,
                                   reason=str(ex)) from ex
 
 
+@_cache.invalidates_resources('servers', 'ports', 'hypervisors')
 def delete_server(server: ServerType = None,
                   server_id: str = None,
                   client: NovaClientType = None,
@@ -170,6 +186,7 @@ def delete_server(server: ServerType = None,
     return nova_client(client).servers.delete(server_id, **params)
 
 
+@_cache.invalidates_resources('servers', 'ports', 'hypervisors')
 def migrate_server(server: ServerType = None,
                    server_id: str = None,
                    host: str = None,
@@ -186,6 +203,7 @@ def migrate_server(server: ServerType = None,
             'migrate', server_id, info=params)
 
 
+@_cache.invalidates_resources('servers', 'ports', 'hypervisors')
 def live_migrate_server(server: ServerType = None,
                         server_id: str = None,
                         host: str = None,
@@ -248,6 +266,7 @@ class NotInSharedStorageMigrateServerError(MigrateServerError):
     pass
 
 
+@_cache.invalidates_resources('servers', 'hypervisors')
 def confirm_resize(server: typing.Optional[ServerType] = None,
                    server_id: typing.Optional[str] = None,
                    client: NovaClientType = None, **params):
@@ -380,6 +399,187 @@ def wait_for_server_status(
     return _server
 
 
+def get_servers(servers: typing.Iterable[ServerType],
+                client: NovaClientType = None) -> \
+        typing.Dict[str, NovaServer]:
+    """Gets many servers details with a single list request
+
+    Servers that are not listed (for example because they belong to
+    another project) are got one by one.
+
+    :returns: a dictionary of servers by ID, in the same order.
+    """
+    client = nova_client(client)
+    server_ids = _list_server_ids(servers)
+    if not server_ids:
+        return {}
+    found = _list_servers_by_id(client=client)
+    return {server_id: (found.get(server_id) or
+                        get_server(server_id=server_id, client=client))
+            for server_id in server_ids}
+
+
+def _list_server_ids(servers: typing.Iterable[ServerType]) -> typing.List[str]:
+    server_ids: typing.List[str] = []
+    for server in servers:
+        server_id = get_server_id(server)
+        if server_id not in server_ids:
+            server_ids.append(server_id)
+    return server_ids
+
+
+def _list_servers_by_id(client: NovaClient,
+                        changes_since: str = None) -> \
+        typing.Dict[str, NovaServer]:
+    search_opts = None
+    if changes_since is not None:
+        search_opts = {'changes-since': changes_since}
+    return {server.id: server
+            for server in client.servers.list(search_opts=search_opts)}
+
+
+def iter_servers_status(
+        servers: typing.Iterable[ServerType],
+        status: str,
+        client: NovaClientType = None,
+        timeout: tobiko.Seconds = None,
+        sleep_time: tobiko.Seconds = None,
+        transient_status: typing.Optional[typing.Container[str]] = None) -> \
+            typing.Iterator[NovaServer]:
+    """Waits for many servers to get the same status
+
+    The status of every pending server is refreshed with a single list
+    request at every retry attempt: the first one lists all servers, while
+    next ones only list servers updated since the latest update time
+    reported by Nova. Servers that can't be listed (like the ones of other
+    projects) are got one by one instead. Servers are yielded as soon as
+    they reach the waited status. Servers getting any other non-transient
+    status (or still pending after timeout) are reported after every other
+    one is settled.
+    """
+    if transient_status is None:
+        transient_status = NOVA_SERVER_TRANSIENT_STATUS.get(status) or []
+    client = nova_client(client)
+    pending = _list_server_ids(servers)
+    if not pending:
+        return
+
+    errors: typing.List[typing.Tuple] = []
+    latest: typing.Dict[str, NovaServer] = {}
+    unlisted: typing.Set[str] = set()
+    changes_since: typing.Optional[str] = None
+    for attempt in tobiko.retry(timeout=timeout,
+                                interval=sleep_time,
+                                default_timeout=300.,
+                                default_interval=5.):
+        changes_since = _refresh_servers(client=client,
+                                         server_ids=pending,
+                                         servers=latest,
+                                         unlisted=unlisted,
+                                         changes_since=changes_since)
+        for server_id in list(pending):
+            _server = latest.get(server_id)
+            if _server is not None and _server.status == status:
+                pending.remove(server_id)
+                yield _server
+            elif _server is None or _server.status not in transient_status:
+                # Server not found or not changing status
+                pending.remove(server_id)
+                errors.append(_exc_info(WaitForServerStatusError(
+                    server_id=server_id,
+                    server_status=getattr(_server, 'status', None),
+                    status=status)))
+        if not pending:
+            break
+
+        try:
+            attempt.check_time_left()
+        except tobiko.RetryTimeLimitError as ex:
+            for server_id in pending:
+                errors.append(_exc_info(WaitForServerStatusTimeout(
+                    server_id=server_id,
+                    server_status=latest[server_id].status,
+                    status=status,
+                    timeout=attempt.timeout), cause=ex))
+            break
+
+        LOG.debug(f"Waiting for {len(pending)} server(s) status to get "
+                  f"to {status}: {', '.join(pending)}")
+    else:
+        raise RuntimeError("Broken retry loop")
+
+    _raise_errors(errors)
+
+
+def _refresh_servers(client: NovaClient,
+                     server_ids: typing.List[str],
+                     servers: typing.Dict[str, NovaServer],
+                     unlisted: typing.Set[str],
+                     changes_since: str = None) -> typing.Optional[str]:
+    """Updates servers details with those changed since given time
+
+    Servers not listed by the first request (changes_since is None), like
+    the ones of other projects, are added to unlisted set and then got one
+    by one at every call. Servers that can't be found are left out.
+
+    :returns: the latest update time of listed servers.
+    """
+    found = _list_servers_by_id(client=client, changes_since=changes_since)
+    if changes_since is None:
+        unlisted.update(server_id
+                        for server_id in server_ids
+                        if server_id not in found)
+    for server_id in server_ids:
+        if server_id in unlisted:
+            try:
+                found[server_id] = get_server(server_id=server_id,
+                                              client=client)
+            except ServerNotFoundError:
+                LOG.debug(f"Server '{server_id}' not found")
+                servers.pop(server_id, None)
+    servers.update(found)
+    return max([changes_since or ''] +
+               [getattr(server, 'updated', None) or ''
+                for server in found.values()
+                if server.id not in unlisted]) or None
+
+
+def _exc_info(error: Exception, cause: Exception = None) -> typing.Tuple:
+    try:
+        raise error from cause
+    except Exception:
+        return sys.exc_info()
+
+
+def _raise_errors(errors: typing.List[typing.Tuple]):
+    if errors:
+        with tobiko.handle_multiple_exceptions():
+            raise testtools.MultipleExceptions(*errors)
+
+
+def wait_for_servers_status(
+        servers: typing.Iterable[ServerType],
+        status: str,
+        client: NovaClientType = None,
+        timeout: tobiko.Seconds = None,
+        sleep_time: tobiko.Seconds = None,
+        transient_status: typing.Optional[typing.Container[str]] = None) -> \
+            typing.List[NovaServer]:
+    """Waits for many servers to get the same status
+
+    :returns: the list of servers, in the same order (see
+        iter_servers_status function for details).
+    """
+    server_ids = _list_server_ids(servers)
+    found = {server.id: server
+             for server in iter_servers_status(
+                 servers=server_ids, status=status, client=client,
+                 timeout=timeout, sleep_time=sleep_time,
+                 transient_status=transient_status)}
+    return [found[server_id] for server_id in server_ids]
+
+
+@_cache.invalidates_resources('servers')
 def shutoff_server(server: ServerType = None,
                    client: NovaClientType = None,
                    timeout: tobiko.Seconds = None,
@@ -398,6 +598,7 @@ def shutoff_server(server: ServerType = None,
                                   sleep_time=sleep_time)
 
 
+@_cache.invalidates_resources('servers', 'hypervisors')
 def activate_server(server: ServerType,
                     client: NovaClientType = None,
                     timeout: tobiko.Seconds = None,
@@ -407,16 +608,21 @@ def activate_server(server: ServerType,
     if server.status == 'ACTIVE':
         return server
 
-    if server.status == 'SHUTOFF':
-        LOG.info(f"Start server '{server.id}' (status='{server.status}').")
-        client.servers.start(server.id)
-    elif server.status == 'RESIZE':
+    if server.status == 'RESIZE':
         server = wait_for_server_status(
             server=server.id, status='VERIFY_RESIZE', client=client,
             timeout=timeout, sleep_time=sleep_time)
-        LOG.info(f"Confirm resize of server '{server.id}' "
-                 f"(status='{server.status}').")
-        client.servers.confirm_resize(server)
+    _request_server_activation(server=server, client=client)
+    return wait_for_server_status(server=server.id, status='ACTIVE',
+                                  client=client,
+                                  timeout=timeout,
+                                  sleep_time=sleep_time)
+
+
+def _request_server_activation(server: NovaServer, client: NovaClient):
+    if server.status == 'SHUTOFF':
+        LOG.info(f"Start server '{server.id}' (status='{server.status}').")
+        client.servers.start(server.id)
     elif server.status == 'VERIFY_RESIZE':
         LOG.info(f"Confirm resize of server '{server.id}' "
                  f"(status='{server.status}').")
@@ -426,12 +632,8 @@ def activate_server(server: ServerType,
                     f"it  (status='{server.status}').")
         client.servers.reboot(server.id, reboot_type='HARD')
 
-    return wait_for_server_status(server=server.id, status='ACTIVE',
-                                  client=client,
-                                  timeout=timeout,
-                                  sleep_time=sleep_time)
-
 
+@_cache.invalidates_resources('servers')
 def reboot_server(server: ServerType,
                   client: NovaClientType = None,
                   timeout: tobiko.Seconds = None,
@@ -466,3 +668,77 @@ def ensure_server_status(server: ServerType,
                               sleep_time=sleep_time)
     else:
         raise ValueError(f"Unsupported server status: '{status}'")
+
+
+@_cache.invalidates_resources('servers')
+def shutoff_servers(servers: typing.Iterable[ServerType],
+                    client: NovaClientType = None,
+                    timeout: tobiko.Seconds = None,
+                    sleep_time: tobiko.Seconds = None) -> \
+        typing.List[NovaServer]:
+    """Stops many servers and waits for all of them at the same time"""
+    client = nova_client(client)
+    found = get_servers(servers, client=client)
+    stopping = []
+    for server in found.values():
+        if server.status != 'SHUTOFF':
+            LOG.info(f"stop server '{server.id}' "
+                     f"(status='{server.status}').")
+            client.servers.stop(server.id)
+            stopping.append(server.id)
+    for server in iter_servers_status(servers=stopping,
+                                      status='SHUTOFF',
+                                      client=client,
+                                      timeout=timeout,
+                                      sleep_time=sleep_time):
+        found[server.id] = server
+    return list(found.values())
+
+
+@_cache.invalidates_resources('servers', 'hypervisors')
+def activate_servers(servers: typing.Iterable[ServerType],
+                     client: NovaClientType = None,
+                     timeout: tobiko.Seconds = None,
+                     sleep_time: tobiko.Seconds = None) -> \
+        typing.List[NovaServer]:
+    """Activates many servers and waits for all of them at the same time"""
+    client = nova_client(client)
+    found = get_servers(servers, client=client)
+    resizing = [server.id
+                for server in found.values()
+                if server.status == 'RESIZE']
+    for server in iter_servers_status(servers=resizing,
+                                      status='VERIFY_RESIZE',
+                                      client=client,
+                                      timeout=timeout,
+                                      sleep_time=sleep_time):
+        found[server.id] = server
+
+    activating = []
+    for server in found.values():
+        if server.status != 'ACTIVE':
+            _request_server_activation(server=server, client=client)
+            activating.append(server.id)
+    for server in iter_servers_status(servers=activating,
+                                      status='ACTIVE',
+                                      client=client,
+                                      timeout=timeout,
+                                      sleep_time=sleep_time):
+        found[server.id] = server
+    return list(found.values())
+
+
+def ensure_servers_status(servers: typing.Iterable[ServerType],
+                          status: str,
+                          client: NovaClientType = None,
+                          timeout: tobiko.Seconds = None,
+                          sleep_time: tobiko.Seconds = None) -> \
+        typing.List[NovaServer]:
+    if status == 'ACTIVE':
+        return activate_servers(servers=servers, client=client,
+                                timeout=timeout, sleep_time=sleep_time)
+    elif status == 'SHUTOFF':
+        return shutoff_servers(servers=servers, client=client,
+                               timeout=timeout, sleep_time=sleep_time)
+    else:
+        raise ValueError(f"Unsupported server status: '{status}'")
@@ -46,6 +46,7 @@ create_member = _client.create_member
 
 # Waiters
 wait_for_status = _waiters.wait_for_status
+wait_for_objects_status = _waiters.wait_for_objects_status
 wait_for_octavia_service = _waiters.wait_for_octavia_service
 
 # Validators
@@ -57,6 +58,8 @@ TimeoutException = _exceptions.TimeoutException
 OctaviaClientException = _exceptions.OctaviaClientException
 RoundRobinException = _exceptions.RoundRobinException
 TrafficTimeoutError = _exceptions.TrafficTimeoutError
+UnexpectedStatusException = _exceptions.UnexpectedStatusException
+ObjectNotFoundException = _exceptions.ObjectNotFoundException
 AmphoraMgmtPortNotFound = _exceptions.AmphoraMgmtPortNotFound
 
 # Constants
@@ -35,6 +35,16 @@ class RoundRobinException(tobiko.TobikoException):
     message = "Round robin exception: {reason}"
 
 
+class UnexpectedStatusException(tobiko.TobikoException):
+    message = ("{kind} {object_id} got unexpected {status_key} '{status}' "
+               "while waiting for '{expected_status}'")
+
+
+class ObjectNotFoundException(tobiko.ObjectNotFound):
+    message = ("{kind} {object_id} not found while waiting for "
+               "{status_key} '{expected_status}'")
+
+
 class TrafficTimeoutError(tobiko.TobikoException):
     message = "Traffic timeout error: {reason}"
 
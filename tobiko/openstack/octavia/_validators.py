@@ -38,10 +38,16 @@ def check_members_balanced(ip_address: str,
                            requests_count: int = 10,
                            connect_timeout: tobiko.Seconds = 10.,
                            interval: tobiko.Seconds = 1,
-                           ssh_client: ssh.SSHClientFixture = None) -> (
+                           ssh_client: ssh.SSHClientFixture = None,
+                           concurrency: int = 1) -> (
         typing.Dict[str, int]):
 
-    """Check if traffic is properly balanced between members."""
+    """Check if traffic is properly balanced between members.
+
+    When concurrency is greater than 1, requests are sent at the same time
+    by as many HTTP clients, and the order replies are received in is not
+    checked against the load balancer algorithm.
+    """
 
     # Getting the members count
     if members_count is None:
@@ -52,14 +58,61 @@ def check_members_balanced(ip_address: str,
         else:  # members_count is None and pool_id is not None
             members_count = len(list(octavia.list_members(pool_id=pool_id)))
 
+    scheme = 'HTTP' if protocol == 'TCP' else protocol
+    if concurrency > 1:
+        replies = _send_concurrent_requests(
+            ip_address=ip_address,
+            scheme=scheme,
+            port=port,
+            requests_count=members_count * requests_count,
+            concurrency=concurrency,
+            connect_timeout=connect_timeout,
+            ssh_client=ssh_client)
+    else:
+        replies = _send_sequential_requests(
+            ip_address=ip_address,
+            scheme=scheme,
+            port=port,
+            members_count=members_count,
+            lb_algorithm=lb_algorithm,
+            requests_count=members_count * requests_count,
+            connect_timeout=connect_timeout,
+            interval=interval,
+            ssh_client=ssh_client)
+
+    LOG.debug(f"Replies counts from load balancer: {replies}")
+
+    # assert that 'members_count' servers replied
+    missing_members_count = members_count - len(replies)
+    LOG.debug(f'Members count from pool {pool_id} is {members_count}')
+    LOG.debug(f'len(replies) is {len(replies)}')
+
+    if 0 != missing_members_count:
+        raise octavia.RoundRobinException(
+            f'Missing replies from {missing_members_count} members.')
+
+    return replies
+
+
+def _send_sequential_requests(ip_address: str,
+                              scheme: str,
+                              port: int,
+                              members_count: int,
+                              lb_algorithm: typing.Optional[str],
+                              requests_count: int,
+                              connect_timeout: tobiko.Seconds,
+                              interval: tobiko.Seconds,
+                              ssh_client: typing.Optional[
+                                  ssh.SSHClientFixture]) -> (
+        typing.Dict[str, int]):
     last_content = None
     replies: typing.Dict[str, int] = collections.defaultdict(lambda: 0)
-    for attempt in tobiko.retry(count=members_count * requests_count,
+    for attempt in tobiko.retry(count=requests_count,
                                 interval=interval):
         try:
             content = curl.execute_curl(
                 hostname=ip_address,
-                scheme='HTTP' if protocol == 'TCP' else protocol,
+                scheme=scheme,
                 port=port,
                 path='id',
                 connect_timeout=connect_timeout,
@@ -87,16 +140,35 @@ def check_members_balanced(ip_address: str,
             break
     else:
         raise RuntimeError('Broken retry loop')
+    return replies
 
-    LOG.debug(f"Replies counts from load balancer: {replies}")
-
-    # assert that 'members_count' servers replied
-    missing_members_count = members_count - len(replies)
-    LOG.debug(f'Members count from pool {pool_id} is {members_count}')
-    LOG.debug(f'len(replies) is {len(replies)}')
-
-    if 0 != missing_members_count:
-        raise octavia.RoundRobinException(
-            f'Missing replies from {missing_members_count} members.')
 
-    return replies
+def _send_concurrent_requests(ip_address: str,
+                              scheme: str,
+                              port: int,
+                              requests_count: int,
+                              concurrency: int,
+                              connect_timeout: tobiko.Seconds,
+                              ssh_client: typing.Optional[
+                                  ssh.SSHClientFixture]) -> (
+        typing.Dict[str, int]):
+    result = curl.generate_curl_load(hostname=ip_address,
+                                     scheme=scheme,
+                                     port=port,
+                                     path='id',
+                                     requests_count=requests_count,
+                                     concurrency=concurrency,
+                                     connect_timeout=connect_timeout,
+                                     ssh_client=ssh_client)
+    LOG.debug(f"Traffic sent by {concurrency} concurrent clients: "
+              f"error rate is {result.error_rate:.2%}, latency percentiles "
+              f"are {result.latency_percentiles} seconds")
+    errors = result.errors
+    if errors.get(28):
+        raise octavia.TrafficTimeoutError(
+            reason=f"{errors[28]} of {requests_count} requests timed out")
+    elif errors:
+        raise octavia.RequestException(
+            command='curl',
+            error=f"failed requests count by curl exit status: {errors}")
+    return result.contents
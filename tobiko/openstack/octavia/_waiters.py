@@ -27,6 +27,8 @@ LOG = log.getLogger(__name__)
 
 CONF = config.CONF
 
+openstack = tobiko.lazy_import('openstack')
+
 
 def wait_for_status(object_id: str,
                     status_key: str = _constants.PROVISIONING_STATUS,
@@ -71,6 +73,144 @@ def wait_for_status(object_id: str,
                   f"from '{response[status_key]}' to '{status}'...")
 
 
+OctaviaObjectsKey = typing.Tuple[str, typing.Optional[str]]
+
+
+def wait_for_objects_status(
+        load_balancers: typing.Iterable[str] = (),
+        listeners: typing.Iterable[str] = (),
+        pools: typing.Iterable[str] = (),
+        members: typing.Iterable[typing.Tuple[str, str]] = (),
+        status_key: str = _constants.PROVISIONING_STATUS,
+        status: str = _constants.ACTIVE,
+        interval: tobiko.Seconds = None,
+        max_interval: tobiko.Seconds = None,
+        timeout: tobiko.Seconds = None,
+        client=None) -> typing.Dict[str, typing.Any]:
+    """Waits for many objects of any kind to reach a specific status.
+
+    All objects of the same kind are polled together with a single list
+    request (one per pool for members) on every check. The time between
+    checks starts from interval and is doubled up to max_interval every time
+    none of the objects changed its status since previous check. It goes
+    back to interval as soon as any object changes its status.
+
+    :param load_balancers: The ids of the load balancers to query.
+    :param listeners: The ids of the listeners to query.
+    :param pools: The ids of the pools to query.
+    :param members: The (pool id, member id) pairs of the members to query.
+    :param status_key: The key of the status field in the response.
+    :param status: The status to wait for. Ex. "ACTIVE"
+    :param interval: The minimum time between checks, in seconds.
+    :param max_interval: The maximum time between checks, in seconds.
+    :param timeout: The maximum time, in seconds, to check the status.
+    :returns: the objects which reached the status, by id.
+    :raises UnexpectedStatusException: An object got ERROR status.
+    :raises ObjectNotFoundException: An object is not listed anymore (for
+                                     example because it has been deleted).
+    :raises RetryTimeLimitError: Some object did not reach the status in
+                                 the timeout period.
+    """
+    pending: typing.Dict[OctaviaObjectsKey, typing.Set[str]] = {}
+    for kind, object_ids in [('load_balancer', load_balancers),
+                             ('listener', listeners),
+                             ('pool', pools)]:
+        if object_ids:
+            pending[kind, None] = set(object_ids)
+    for pool_id, member_id in members:
+        pending.setdefault(('member', pool_id), set()).add(member_id)
+
+    if client is None:
+        client = openstacksdkclient.openstacksdk_client()
+    min_interval = tobiko.to_seconds_float(interval or 1.)
+    max_interval = max(min_interval, tobiko.to_seconds_float(
+        max_interval or CONF.tobiko.octavia.check_interval))
+    sleep_time = min_interval
+    found: typing.Dict[str, typing.Any] = {}
+    statuses: typing.Dict[str, str] = {}
+    for attempt in tobiko.retry(timeout=timeout,
+                                default_timeout=(
+                                    CONF.tobiko.octavia.check_timeout)):
+        changed = _check_objects_status(client=client,
+                                        pending=pending,
+                                        found=found,
+                                        statuses=statuses,
+                                        status_key=status_key,
+                                        status=status)
+        if not pending:
+            return found
+
+        # it will raise tobiko.RetryTimeLimitError in case of timeout
+        attempt.check_limits()
+
+        if changed:
+            sleep_time = min_interval
+        else:
+            sleep_time = min(2. * sleep_time, max_interval)
+        LOG.debug(f"Waiting for {sum(len(ids) for ids in pending.values())} "
+                  f"objects {status_key} to get to '{status}'...")
+        time_left = attempt.time_left
+        tobiko.sleep(sleep_time if time_left is None
+                     else min(sleep_time, time_left))
+    raise RuntimeError('Broken retry loop')
+
+
+def _check_objects_status(client,
+                          pending: typing.Dict[OctaviaObjectsKey,
+                                               typing.Set[str]],
+                          found: typing.Dict[str, typing.Any],
+                          statuses: typing.Dict[str, str],
+                          status_key: str,
+                          status: str) -> bool:
+    """Checks the status of pending objects
+
+    :param statuses: the status of every object got by previous check
+    :returns: True when any object changed its status since previous check
+    """
+    changed = False
+    for (kind, pool_id), object_ids in list(pending.items()):
+        listed = set()
+        for obj in _list_objects(client=client, kind=kind, pool_id=pool_id):
+            if obj.id not in object_ids:
+                continue
+            listed.add(obj.id)
+            object_status = obj[status_key]
+            previous_status = statuses.get(obj.id, object_status)
+            statuses[obj.id] = object_status
+            if object_status != previous_status:
+                changed = True
+            if object_status == status:
+                found[obj.id] = obj
+                object_ids.remove(obj.id)
+                changed = True
+            elif object_status == _constants.ERROR:
+                raise octavia.UnexpectedStatusException(
+                    kind=kind,
+                    object_id=obj.id,
+                    status_key=status_key,
+                    status=object_status,
+                    expected_status=status)
+        for object_id in sorted(object_ids - listed):
+            raise octavia.ObjectNotFoundException(
+                kind=kind,
+                object_id=object_id,
+                status_key=status_key,
+                expected_status=status)
+        if not object_ids:
+            del pending[kind, pool_id]
+    return changed
+
+
+def _list_objects(client, kind: str, pool_id: typing.Optional[str]):
+    if kind == 'member':
+        try:
+            return list(client.load_balancer.members(pool=pool_id))
+        except openstack.exceptions.NotFoundException:
+            # The pool has been deleted together with its members
+            return []
+    return getattr(client.load_balancer, f'{kind}s')()
+
+
 def wait_for_octavia_service(interval: tobiko.Seconds = None,
                              timeout: tobiko.Seconds = None):
     for attempt in tobiko.retry(timeout=timeout,
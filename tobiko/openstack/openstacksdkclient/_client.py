@@ -15,12 +15,13 @@
 #    under the License.
 from __future__ import absolute_import
 
-import openstack
-
 import tobiko
 from tobiko.openstack import keystone
 
 
+openstack = tobiko.lazy_import('openstack')
+
+
 class OpenstacksdkClientFixture(tobiko.SharedFixture):
 
     client = None
@@ -44,6 +44,8 @@ class CirrosImageFixture(glance.URLGlanceImageFixture):
     image_url = CONF.tobiko.cirros.image_url or CIRROS_IMAGE_URL
     image_name = CONF.tobiko.cirros.image_name
     image_file = CONF.tobiko.cirros.image_file
+    image_checksum = CONF.tobiko.cirros.image_checksum
+    image_checksums_url = CONF.tobiko.cirros.image_checksums_url
     container_format = CONF.tobiko.cirros.container_format or "bare"
     disk_format = CONF.tobiko.cirros.disk_format or "qcow2"
     username = CONF.tobiko.cirros.username or 'cirros'
@@ -30,6 +30,7 @@ CONF = config.CONF
 class UbuntuMinimalImageFixture(glance.FileGlanceImageFixture):
     image_name = CONF.tobiko.ubuntu.image_name
     image_file = CONF.tobiko.ubuntu.image_file
+    image_checksum = CONF.tobiko.ubuntu.image_checksum
     disk_format = CONF.tobiko.ubuntu.disk_format or "qcow2"
     container_format = CONF.tobiko.ubuntu.container_format or "bare"
     username = CONF.tobiko.ubuntu.username or 'ubuntu'
@@ -0,0 +1,132 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import hashlib
+import json
+import os
+import time
+import typing
+
+from oslo_log import log
+
+import tobiko
+from tobiko.shell import ssh
+
+
+LOG = log.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# Secrets are never written to snapshot files
+SECRET_CONNECT_PARAMETERS = frozenset(['password', 'passphrase'])
+
+
+class TopologySnapshot(typing.NamedTuple):
+    nodes: typing.List[typing.Dict[str, typing.Any]]
+    groups: typing.Dict[str, typing.List[str]]
+    created_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+
+def get_snapshot_file(snapshot_dir: typing.Optional[str],
+                      key_params: typing.Dict[str, typing.Any]) \
+        -> typing.Optional[str]:
+    if not snapshot_dir:
+        return None
+    key = hashlib.sha256(
+        json.dumps(key_params, sort_keys=True, default=str).encode()
+    ).hexdigest()[:32]
+    return os.path.join(tobiko.tobiko_config_path(snapshot_dir),
+                        f'{key}.json')
+
+
+def load_snapshot(snapshot_file: str,
+                  ttl: tobiko.Seconds = None) \
+        -> typing.Optional[TopologySnapshot]:
+    data = tobiko.load_json_file(snapshot_file, version=SNAPSHOT_VERSION)
+    if data is None:
+        return None
+    try:
+        snapshot = TopologySnapshot(nodes=list(data['nodes']),
+                                    groups=dict(data['groups']),
+                                    created_at=float(data['created_at']))
+    except (KeyError, TypeError, ValueError):
+        LOG.debug(f"Ignore invalid topology snapshot '{snapshot_file}'")
+        return None
+    if ttl is not None and snapshot.age > ttl:
+        LOG.debug(f"Ignore expired topology snapshot '{snapshot_file}' "
+                  f"(age={snapshot.age}, ttl={ttl})")
+        return None
+    return snapshot
+
+
+def save_snapshot(snapshot_file: str,
+                  nodes: typing.List[typing.Dict[str, typing.Any]],
+                  groups: typing.Dict[str, typing.List[str]]):
+    data = {'version': SNAPSHOT_VERSION,
+            'created_at': time.time(),
+            'nodes': nodes,
+            'groups': groups}
+    try:
+        tobiko.makedirs(os.path.dirname(snapshot_file))
+        with tobiko.open_output_file(snapshot_file) as fd:
+            json.dump(data, fd)
+    except (OSError, TypeError, ValueError):
+        LOG.warning(f"Unable to save topology snapshot '{snapshot_file}'",
+                    exc_info=True)
+    else:
+        LOG.debug(f"Topology snapshot saved to '{snapshot_file}'")
+
+
+def ssh_client_snapshot(ssh_client: typing.Optional[ssh.SSHClientFixture]) \
+        -> typing.Optional[typing.Dict[str, typing.Any]]:
+    """Describe how to re-create given SSH client without connecting it
+
+    It returns None when the SSH client can not be described without
+    writing any secret to the snapshot.
+    """
+    if ssh_client is None:
+        return None
+    parameters = dict(ssh_client.setup_connect_parameters())
+    if SECRET_CONNECT_PARAMETERS.intersection(parameters):
+        return None
+    proxy: typing.Optional[typing.Dict[str, typing.Any]] = None
+    if ssh_client.proxy_client is not None:
+        proxy = ssh_client_snapshot(ssh_client.proxy_client)
+        if proxy is None:
+            return None
+    return {'host': ssh_client.host,
+            'parameters': parameters,
+            'proxy': proxy}
+
+
+def restore_ssh_client(data: typing.Dict[str, typing.Any]) \
+        -> ssh.SSHClientFixture:
+    """Re-create an SSH client from its snapshot
+
+    The connection is going to be established only when the SSH client is
+    used for the first time.
+    """
+    proxy_client = None
+    if data.get('proxy'):
+        proxy_client = restore_ssh_client(data['proxy'])
+    return ssh.ssh_client(host=data['host'],
+                          proxy_client=proxy_client,
+                          **data['parameters'])
@@ -15,8 +15,10 @@ from __future__ import absolute_import
 
 import collections
 from collections import abc
+from concurrent import futures
 import configparser
 import functools
+import os
 import re
 import typing
 from urllib import parse
@@ -38,6 +40,7 @@ from tobiko.openstack.topology import _address
 from tobiko.openstack.topology import _config
 from tobiko.openstack.topology import _connection
 from tobiko.openstack.topology import _exception
+from tobiko.openstack.topology import _snapshot
 
 
 LOG = log.getLogger(__name__)
@@ -286,11 +289,24 @@ class OpenStackTopologyNode:
                 self._l3_agent_mode = 'legacy'
         return self._l3_agent_mode
 
+    @property
+    def snapshot_params(self) -> typing.Dict[str, typing.Any]:
+        """Parameters to re-create the node from a topology snapshot"""
+        return {}
+
     def __repr__(self):
         return "{cls!s}<name={name!r}>".format(cls=type(self).__name__,
                                                name=self.name)
 
 
+class NodeProbe(typing.NamedTuple):
+    addresses: tobiko.Selection[netaddr.IPAddress]
+    hostname: typing.Optional[str]
+    ssh_client: typing.Optional[ssh.SSHClientFixture]
+    # Node already in the topology matching given hostname or addresses
+    node: typing.Optional[OpenStackTopologyNode] = None
+
+
 class OpenStackTopology(tobiko.SharedFixture):
 
     config = tobiko.required_fixture(_config.OpenStackTopologyConfig)
@@ -341,7 +357,9 @@ class OpenStackTopology(tobiko.SharedFixture):
             collections.OrderedDict())
 
     def setup_fixture(self):
-        self.discover_nodes()
+        if not self.load_snapshot():
+            self.discover_nodes()
+            self.save_snapshot()
 
     def cleanup_fixture(self):
         tobiko.cleanup_fixture(self._connections)
@@ -409,25 +427,22 @@ class OpenStackTopology(tobiko.SharedFixture):
                           group='proxy_jump')
 
     def discover_configured_nodes(self):
-        for address in self.config.conf.nodes or []:
-            self.add_node(address=address)
+        self.add_nodes(dict(address=address)
+                       for address in self.config.conf.nodes or [])
 
     def discover_controller_nodes(self):
         endpoints = keystone.list_endpoints(interface='public')
-        addresses = set(parse.urlparse(endpoint.url).hostname
-                        for endpoint in endpoints)
-        for address in addresses:
-            try:
-                self.add_node(address=address, group='controller')
-            except _connection.UreachableSSHServer as ex:
-                LOG.debug(f"Unable to SSH to end point address '{address}'. "
-                          f"{ex}")
+        addresses = sorted(set(parse.urlparse(endpoint.url).hostname
+                               for endpoint in endpoints))
+        self.add_nodes((dict(address=address, group='controller')
+                        for address in addresses),
+                       ignore_errors=(_connection.UreachableSSHServer,))
 
     def discover_compute_nodes(self):
-        for hypervisor in nova.list_hypervisors():
-            self.add_node(hostname=hypervisor.hypervisor_hostname,
-                          address=hypervisor.host_ip,
-                          group='compute')
+        self.add_nodes(dict(hostname=hypervisor.hypervisor_hostname,
+                            address=hypervisor.host_ip,
+                            group='compute')
+                       for hypervisor in nova.list_hypervisors())
 
     def add_node(self,
                  hostname: typing.Optional[str] = None,
@@ -436,6 +451,59 @@ class OpenStackTopology(tobiko.SharedFixture):
                  ssh_client: typing.Optional[ssh.SSHClientFixture] = None,
                  **create_params) \
             -> OpenStackTopologyNode:
+        probe = self._probe_node(hostname=hostname,
+                                 address=address,
+                                 ssh_client=ssh_client)
+        return self._add_probed_node(probe, group=group, **create_params)
+
+    def add_nodes(self,
+                  nodes_params: typing.Iterable[typing.Dict[str, typing.Any]],
+                  ignore_errors: typing.Tuple[typing.Type[Exception],
+                                              ...] = ()) \
+            -> typing.List[typing.Optional[OpenStackTopologyNode]]:
+        """Add many nodes probing them concurrently
+
+        Nodes are added in given order only after all of them have been
+        probed, so that the topology doesn't depend on which host replies
+        first. None is returned in place of nodes whose probing failed with
+        any of given ignored errors.
+        """
+        nodes_params = [dict(params) for params in nodes_params]
+        if not nodes_params:
+            return []
+        workers_count = max(1, min(len(nodes_params),
+                                   self.config.conf.discover_workers or 1))
+        with futures.ThreadPoolExecutor(
+                max_workers=workers_count,
+                thread_name_prefix='topology') as executor:
+            probes = []
+            for params in nodes_params:
+                probes.append(executor.submit(
+                    self._probe_node,
+                    hostname=params.pop('hostname', None),
+                    address=params.pop('address', None),
+                    ssh_client=params.pop('ssh_client', None)))
+        nodes: typing.List[typing.Optional[OpenStackTopologyNode]] = []
+        for params, probe in zip(nodes_params, probes):
+            try:
+                node_probe = probe.result()
+            except ignore_errors as ex:
+                LOG.debug(f"Unable to add topology node: {ex}")
+                nodes.append(None)
+            else:
+                nodes.append(self._add_probed_node(node_probe, **params))
+        return nodes
+
+    def _probe_node(self,
+                    hostname: typing.Optional[str] = None,
+                    address: typing.Optional[str] = None,
+                    ssh_client: typing.Optional[ssh.SSHClientFixture] = None) \
+            -> NodeProbe:
+        """Look for node details on the remote host
+
+        It doesn't change the topology, so it is safe to call it for many
+        nodes at once from many threads.
+        """
         if ssh_client is not None:
             # detect all global addresses from remote server
             try:
@@ -455,9 +523,34 @@ class OpenStackTopology(tobiko.SharedFixture):
         try:
             node = self.get_node(name=name, address=addresses)
         except _exception.NoSuchOpenStackTopologyNode:
-            node = self._add_node(addresses=addresses,
-                                  hostname=hostname,
-                                  ssh_client=ssh_client,
+            pass
+        else:
+            return NodeProbe(addresses=addresses,
+                             hostname=hostname,
+                             ssh_client=ssh_client,
+                             node=node)
+
+        if ssh_client is None:
+            ssh_client = self._ssh_connect(hostname=hostname,
+                                           addresses=addresses)
+        addresses.extend(self._list_addresses_from_host(ssh_client=ssh_client))
+        addresses = tobiko.select(remove_duplications(addresses))
+        hostname = hostname or sh.get_hostname(ssh_client=ssh_client)
+        return NodeProbe(addresses=addresses,
+                         hostname=hostname,
+                         ssh_client=ssh_client)
+
+    def _add_probed_node(self,
+                         probe: NodeProbe,
+                         group: typing.Optional[str] = None,
+                         **create_params) -> OpenStackTopologyNode:
+        node = probe.node
+        if node is None:
+            assert probe.hostname is not None
+            assert probe.ssh_client is not None
+            node = self._add_node(addresses=probe.addresses,
+                                  hostname=probe.hostname,
+                                  ssh_client=probe.ssh_client,
                                   **create_params)
 
         if group:
@@ -471,15 +564,9 @@ class OpenStackTopology(tobiko.SharedFixture):
 
     def _add_node(self,
                   addresses: typing.List[netaddr.IPAddress],
-                  hostname: str = None,
-                  ssh_client: ssh.SSHClientFixture = None,
+                  hostname: str,
+                  ssh_client: ssh.SSHClientFixture,
                   **create_params):
-        if ssh_client is None:
-            ssh_client = self._ssh_connect(hostname=hostname,
-                                           addresses=addresses)
-        addresses.extend(self._list_addresses_from_host(ssh_client=ssh_client))
-        addresses = tobiko.select(remove_duplications(addresses))
-        hostname = hostname or sh.get_hostname(ssh_client=ssh_client)
         name = node_name_from_hostname(hostname)
         try:
             node = self._names[name]
@@ -502,6 +589,93 @@ class OpenStackTopology(tobiko.SharedFixture):
                             f"used by node '{address_node.name}'")
         return node
 
+    @property
+    def snapshot_file(self) -> typing.Optional[str]:
+        return _snapshot.get_snapshot_file(
+            snapshot_dir=self.config.conf.snapshot_dir,
+            key_params=self.snapshot_key_params())
+
+    def snapshot_key_params(self) -> typing.Dict[str, typing.Any]:
+        """Parameters telling which cloud a topology snapshot belongs to"""
+        from tobiko import config
+        conf = config.CONF.tobiko
+        topology_class = type(self)
+        return {
+            'topology_class': (f'{topology_class.__module__}.'
+                               f'{topology_class.__qualname__}'),
+            'topology': {name: getattr(conf.topology, name)
+                         for name in ['nodes', 'key_file', 'username',
+                                      'port', 'ip_version']},
+            'ssh_proxy_jump': conf.ssh.proxy_jump,
+            'keystone': {name: getattr(conf.keystone, name)
+                         for name in ['auth_url', 'project_name',
+                                      'username']},
+            'environ': {name: os.environ.get(name)
+                        for name in ['OS_AUTH_URL', 'OS_CLOUD',
+                                     'OS_PROJECT_NAME', 'OS_USERNAME']}}
+
+    def load_snapshot(self) -> bool:
+        """Restore nodes from a recent topology snapshot if any
+
+        Nodes SSH clients are re-created without connecting them, so that
+        hosts are reached only when nodes are actually used.
+        """
+        snapshot_file = self.snapshot_file
+        if snapshot_file is None:
+            return False
+        snapshot = _snapshot.load_snapshot(
+            snapshot_file, ttl=self.config.conf.snapshot_ttl)
+        if snapshot is None:
+            return False
+        try:
+            self._restore_snapshot(snapshot)
+        except Exception:
+            LOG.warning(f"Unable to restore topology snapshot "
+                        f"'{snapshot_file}'", exc_info=True)
+            self._names.clear()
+            self._groups.clear()
+            self._addresses.clear()
+            return False
+        LOG.debug(f"Topology restored from snapshot '{snapshot_file}' "
+                  f"(age={snapshot.age}, nodes={list(self._names)})")
+        return True
+
+    def _restore_snapshot(self, snapshot: _snapshot.TopologySnapshot):
+        for data in snapshot.nodes:
+            self._add_node(
+                addresses=tobiko.select(netaddr.IPAddress(address)
+                                        for address in data['addresses']),
+                hostname=data['hostname'],
+                ssh_client=_snapshot.restore_ssh_client(data['ssh_client']),
+                **data['params'])
+        for group, names in snapshot.groups.items():
+            group_nodes = self.add_group(group=group)
+            for name in names:
+                node = self._names[name]
+                group_nodes.append(node)
+                node.add_group(group=group)
+
+    def save_snapshot(self):
+        snapshot_file = self.snapshot_file
+        if snapshot_file is None or not self._names:
+            return
+        nodes: typing.List[typing.Dict[str, typing.Any]] = []
+        for node in self._names.values():
+            ssh_client = _snapshot.ssh_client_snapshot(node.ssh_client)
+            if ssh_client is None:
+                LOG.debug("Topology snapshot not saved: unable to describe "
+                          f"SSH client of node '{node.name}'")
+                return
+            nodes.append({'name': node.name,
+                          'hostname': node.hostname,
+                          'addresses': [str(address)
+                                        for address in node.addresses],
+                          'ssh_client': ssh_client,
+                          'params': node.snapshot_params})
+        groups = {group: [node.name for node in group_nodes]
+                  for group, group_nodes in self._groups.items()}
+        _snapshot.save_snapshot(snapshot_file, nodes=nodes, groups=groups)
+
     def get_node(self,
                  name: str = None,
                  hostname: str = None,
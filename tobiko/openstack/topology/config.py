@@ -39,6 +39,20 @@ OPTIONS = [
                default=r"(\d{4}-\d{2}-\d{2} [0-9:.]+) .+",
                help="Regex to be used to parse date and time from "
                     "the OpenStack services' log lines. "),
+    cfg.IntOpt('discover_workers',
+               default=10,
+               help="Maximum number of cloud nodes to be discovered "
+                    "concurrently"),
+    cfg.StrOpt('snapshot_dir',
+               default='',
+               help="Directory where discovered topology snapshots are "
+                    "stored to be reused by later test runs and sibling "
+                    "workers (for example '~/.tobiko/cache/topology'). "
+                    "Topology snapshots are disabled when empty"),
+    cfg.FloatOpt('snapshot_ttl',
+                 default=3600.,
+                 help="Number of seconds a topology snapshot is reused "
+                      "before nodes are discovered again"),
 ]
 
 
@@ -0,0 +1,126 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import json
+import os
+import typing
+
+from oslo_log import log
+
+import tobiko
+
+LOG = log.getLogger(__name__)
+
+
+class FileStat(typing.NamedTuple):
+    path: str
+    mtime_ns: int
+    size: int
+
+
+def get_file_stat(path: str) -> typing.Optional[FileStat]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return FileStat(path=path, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+
+
+class DiscoverEntry(typing.NamedTuple):
+    module_name: str
+    test_ids: typing.List[str]
+    # Test file first, then source files test cases depends on
+    files: typing.List[FileStat]
+
+    def is_valid(self) -> bool:
+        return all(get_file_stat(f.path) == f for f in self.files)
+
+
+def make_discover_entry(module_name: str,
+                        test_ids: typing.Iterable[str],
+                        files: typing.Iterable[str]) -> DiscoverEntry:
+    stats: typing.List[FileStat] = []
+    for path in files:
+        stat = get_file_stat(path)
+        if stat is not None:
+            stats.append(stat)
+    return DiscoverEntry(module_name=module_name,
+                         test_ids=list(test_ids),
+                         files=stats)
+
+
+class DiscoverCache:
+    """Test case IDs found in test files, keyed by test file path
+
+    Entries are considered still valid only as long as the modification
+    time and size of every source file they were found from haven't
+    changed since they were stored.
+    """
+
+    version = 1
+
+    def __init__(self, cache_file: str = None):
+        self.cache_file = cache_file
+        self._entries: typing.Dict[str, DiscoverEntry] = {}
+        self._changed = False
+        if cache_file:
+            self._entries.update(self._load(cache_file))
+
+    def _load(self, cache_file: str) -> typing.Dict[str, DiscoverEntry]:
+        data = tobiko.load_json_file(cache_file, version=self.version)
+        if data is None:
+            return {}
+        entries: typing.Dict[str, DiscoverEntry] = {}
+        for test_file, entry in data.get('entries', {}).items():
+            try:
+                entries[test_file] = DiscoverEntry(
+                    module_name=entry['module_name'],
+                    test_ids=list(entry['test_ids']),
+                    files=[FileStat(*f) for f in entry['files']])
+            except (KeyError, TypeError):
+                LOG.debug(f"Ignore invalid discover cache entry for file "
+                          f"'{test_file}'")
+        return entries
+
+    def get(self, test_file: str, module_name: str) \
+            -> typing.Optional[typing.List[str]]:
+        entry = self._entries.get(test_file)
+        if (entry is None or
+                entry.module_name != module_name or
+                not entry.is_valid()):
+            return None
+        return list(entry.test_ids)
+
+    def put(self, test_file: str, entry: DiscoverEntry):
+        self._entries[test_file] = entry
+        self._changed = True
+
+    def save(self):
+        if not (self.cache_file and self._changed):
+            return
+        data = {'version': self.version,
+                'entries': {test_file: entry._asdict()
+                            for test_file, entry in self._entries.items()}}
+        try:
+            tobiko.makedirs(os.path.dirname(self.cache_file))
+            with tobiko.open_output_file(self.cache_file) as fd:
+                json.dump(data, fd)
+        except OSError:
+            LOG.warning(f"Unable to save discover cache '{self.cache_file}'",
+                        exc_info=True)
+        else:
+            self._changed = False
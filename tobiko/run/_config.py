@@ -15,6 +15,7 @@
 #    under the License.
 from __future__ import absolute_import
 
+import multiprocessing
 import typing
 import os
 
@@ -27,15 +28,28 @@ class RunConfigFixture(tobiko.SharedFixture):
     test_filename: str = 'test_*.py'
     python_path: typing.Optional[typing.List[str]] = None
     workers_count: typing.Optional[int] = None
+    discover_cache_file: typing.Optional[str] = None
 
     def setup_fixture(self):
         package_file = os.path.realpath(os.path.realpath(tobiko.__file__))
         package_dir = os.path.dirname(package_file)
         tobiko_dir = os.path.dirname(package_dir)
         self.test_path = [os.path.join(tobiko_dir, 'tobiko', 'tests', 'unit')]
+        workers_count = os.environ.get('TOBIKO_RUN_WORKERS_COUNT')
+        if workers_count:
+            self.workers_count = int(workers_count)
+        discover_cache_file = os.environ.get(
+            'TOBIKO_RUN_DISCOVER_CACHE_FILE',
+            os.path.join('~', '.tobiko', 'cache', 'run', 'discover.json'))
+        if discover_cache_file:
+            self.discover_cache_file = os.path.realpath(
+                os.path.expanduser(discover_cache_file))
 
     @property
     def forked(self) -> bool:
+        if multiprocessing.current_process().daemon:
+            # Pool workers are not allowed to have children processes
+            return False
         return self.workers_count is not None and self.workers_count != 1
 
 
@@ -24,8 +24,10 @@ import unittest
 from oslo_log import log
 
 import tobiko
+from tobiko.run import _cache
 from tobiko.run import _config
 from tobiko.run import _find
+from tobiko.run import _static
 from tobiko.run import _worker
 
 
@@ -49,31 +51,51 @@ def find_test_ids(test_path: typing.Union[str, typing.Iterable[str]],
 
     if forked:
         return forked_discover_test_ids(test_files=test_files,
-                                        python_path=python_path)
+                                        python_path=python_path,
+                                        config=config)
     else:
         return discover_test_ids(test_files=test_files,
-                                 python_path=python_path)
+                                 python_path=python_path,
+                                 config=config)
 
 
-def discover_test_ids(test_files: typing.Iterable[str],
-                      python_path: typing.Iterable[str] = None) \
+def get_python_dirs(python_path: typing.Iterable[str] = None) \
         -> typing.List[str]:
     if not python_path:
         python_path = sys.path
-    python_dirs = [os.path.realpath(p) + '/'
-                   for p in python_path
-                   if os.path.isdir(p)]
+    return [os.path.realpath(p) + '/'
+            for p in python_path
+            if os.path.isdir(p)]
+
+
+def get_discover_cache(config: _config.RunConfigFixture = None) \
+        -> _cache.DiscoverCache:
+    config = _config.run_confing(config)
+    return _cache.DiscoverCache(cache_file=config.discover_cache_file)
+
+
+def discover_test_ids(test_files: typing.Iterable[str],
+                      python_path: typing.Iterable[str] = None,
+                      config: _config.RunConfigFixture = None) \
+        -> typing.List[str]:
+    python_dirs = get_python_dirs(python_path)
+    cache = get_discover_cache(config)
+    static_index = _static.StaticIndex(python_dirs)
     test_ids: typing.List[str] = []
-    for test_file in test_files:
-        test_ids.extend(discover_file_test_ids(test_file=test_file,
-                                               python_dirs=python_dirs))
+    try:
+        for test_file in test_files:
+            test_ids.extend(discover_file_test_ids(
+                test_file=test_file,
+                python_dirs=python_dirs,
+                cache=cache,
+                static_index=static_index))
+    finally:
+        cache.save()
     return test_ids
 
 
-def discover_file_test_ids(test_file: str,
-                           python_dirs: typing.Iterable[str]) \
-        -> typing.List[str]:
-    test_file = os.path.realpath(test_file)
+def get_test_module_name(test_file: str,
+                         python_dirs: typing.Iterable[str]) -> str:
     if not os.path.isfile(test_file):
         raise ValueError(f"Test file doesn't exist: '{test_file}'")
 
@@ -82,12 +104,70 @@ def discover_file_test_ids(test_file: str,
 
     for python_dir in python_dirs:
         if test_file.startswith(python_dir):
-            module_name = test_file[len(python_dir):-3].replace('/', '.')
-            return discover_module_test_ids(module_name)
+            return test_file[len(python_dir):-3].replace('/', '.')
 
     raise ValueError(f"Test file not in Python path: '{test_file}'")
 
 
+def discover_file_test_ids(test_file: str,
+                           python_dirs: typing.Iterable[str],
+                           cache: _cache.DiscoverCache = None,
+                           static_index: _static.StaticIndex = None) \
+        -> typing.List[str]:
+    test_file = os.path.realpath(test_file)
+    module_name = get_test_module_name(test_file, python_dirs)
+    if cache is not None:
+        test_ids = cache.get(test_file, module_name)
+        if test_ids is not None:
+            LOG.debug(f"Test module '{module_name}' found in cache")
+            return test_ids
+    entry = discover_file_entry(test_file=test_file,
+                                python_dirs=python_dirs,
+                                static_index=static_index)
+    if cache is not None:
+        cache.put(test_file, entry)
+    return entry.test_ids
+
+
+def discover_file_entry(test_file: str,
+                        python_dirs: typing.Iterable[str],
+                        static_index: _static.StaticIndex = None) \
+        -> _cache.DiscoverEntry:
+    """Look for test cases without importing test module when possible"""
+    test_file = os.path.realpath(test_file)
+    module_name = get_test_module_name(test_file, python_dirs)
+    if static_index is None:
+        static_index = _static.StaticIndex(python_dirs)
+    try:
+        test_ids, files = static_index.discover_module_test_ids(module_name)
+    except _static.StaticDiscoveryError as ex:
+        LOG.debug(f"Test module '{module_name}' is going to be imported: "
+                  f"{ex}")
+        test_ids = discover_module_test_ids(module_name)
+        files = list_module_test_files(module_name, test_ids)
+    files = [test_file] + [f for f in files if f != test_file]
+    return _cache.make_discover_entry(module_name=module_name,
+                                      test_ids=test_ids,
+                                      files=files)
+
+
+def list_module_test_files(module_name: str,
+                           test_ids: typing.Iterable[str]) \
+        -> typing.List[str]:
+    """List source files defining given imported test cases classes"""
+    module = tobiko.load_module(module_name)
+    files: typing.Set[str] = set()
+    for class_name in {test_id.split('.')[-2] for test_id in test_ids}:
+        for cls in inspect.getmro(getattr(module, class_name)):
+            try:
+                source_file = inspect.getsourcefile(cls)
+            except TypeError:
+                continue  # builtin class
+            if source_file:
+                files.add(os.path.realpath(source_file))
+    return sorted(files)
+
+
 def discover_module_test_ids(module_name: str) -> typing.List[str]:
     LOG.debug(f"Load test module '{module_name}'...")
     module = tobiko.load_module(module_name)
@@ -128,15 +208,35 @@ def discover_module_test_ids(module_name: str) -> typing.List[str]:
 
 
 def forked_discover_test_ids(test_files: typing.Iterable[str],
-                             python_path: typing.Iterable[str] = None) \
+                             python_path: typing.Iterable[str] = None,
+                             config: _config.RunConfigFixture = None) \
         -> typing.List[str]:
-    results = [_worker.call_async(discover_test_ids,
-                                  test_files=[test_file],
-                                  python_path=python_path)
-               for test_file in test_files]
-    test_ids: typing.List[str] = []
-    for result in results:
-        test_ids.extend(result.get())
+    python_dirs = get_python_dirs(python_path)
+    cache = get_discover_cache(config)
+    test_files = [os.path.realpath(f) for f in test_files]
+    found: typing.Dict[str, typing.List[str]] = {}
+    pending: typing.Dict[str, typing.Any] = {}
+    for test_file in test_files:
+        module_name = get_test_module_name(test_file, python_dirs)
+        test_ids = cache.get(test_file, module_name)
+        if test_ids is not None:
+            found[test_file] = test_ids
+        elif test_file not in pending:
+            # Only test files not found in cache are sent to workers
+            pending[test_file] = _worker.call_async(discover_file_entry,
+                                                    test_file=test_file,
+                                                    python_dirs=python_dirs)
+    try:
+        for test_file, result in pending.items():
+            entry = result.get()
+            cache.put(test_file, entry)
+            found[test_file] = entry.test_ids
+    finally:
+        cache.save()
+
+    test_ids = []
+    for test_file in test_files:
+        test_ids.extend(found[test_file])
     return test_ids
 
 
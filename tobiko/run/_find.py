@@ -15,8 +15,8 @@
 #    under the License.
 from __future__ import absolute_import
 
+import fnmatch
 import os
-import subprocess
 import sys
 import typing
 
@@ -59,26 +59,28 @@ def find_test_files(test_path: typing.Union[str, typing.Iterable[str]] = None,
         LOG.debug("Find test files...\n"
                   f"  dir: '{find_dir}'\n"
                   f"  name: '{find_name}'")
-        try:
-            output = subprocess.check_output(
-                ['find', find_dir, '-name', find_name],
-                universal_newlines=True)
-        except subprocess.CalledProcessError as ex:
-            LOG.exception("Test files not found.")
+        if not os.path.isdir(find_dir):
+            LOG.error("Test files not found.")
             raise FileNotFoundError('Test files not found: \n'
                                     f"  dir: '{find_dir}'\n"
-                                    f"  name: '{find_name}'") from ex
-
-        for line in output.splitlines():
-            line = line.strip()
-            if line:
-                test_files.append(line)
+                                    f"  name: '{find_name}'")
+        test_files.extend(walk_test_files(find_dir, find_name))
 
         LOG.debug("Found test file(s):\n"
                   "  %s", '  \n'.join(test_files))
     return test_files
 
 
+def walk_test_files(top_dir: str, name_pattern: str) \
+        -> typing.Iterator[str]:
+    """Yield files under given directory matching given name pattern"""
+    for dir_path, dir_names, file_names in os.walk(top_dir):
+        # Visit directories in a stable order
+        dir_names.sort()
+        for file_name in sorted(fnmatch.filter(file_names, name_pattern)):
+            yield os.path.join(dir_path, file_name)
+
+
 def main(test_path: typing.List[str] = None):
     if test_path is None:
         test_path = sys.argv[1:]
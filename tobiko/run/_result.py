@@ -73,3 +73,156 @@ class TextIOWrapper(io.TextIOWrapper):
 
     def writeln(self, line: str):
         self.write(line + '\n')
+
+
+class TestRecord(typing.NamedTuple):
+    """Outcome of a test case executed by a worker process"""
+    test_id: str
+    description: typing.Optional[str]
+    events: typing.List[typing.Tuple[str, typing.Any]]
+
+
+class QueueTestResult(unittest.TestResult):
+    """Test result sending a record to a queue every time a test case stops
+
+    Test cases and exceptions can't be pickled, so their IDs and formatted
+    tracebacks are sent instead.
+    """
+
+    def __init__(self, queue):
+        super().__init__()
+        self.queue = queue
+        # Test cases can be nested, like when they run other test cases
+        self.records: typing.List[TestRecord] = []
+
+    def startTest(self, test: unittest.TestCase):
+        tobiko.push_test_case(test)
+        super().startTest(test)
+        self.records.append(TestRecord(test_id=test.id(),
+                                       description=test.shortDescription(),
+                                       events=[]))
+
+    def stopTest(self, test: unittest.TestCase):
+        super().stopTest(test)
+        actual_test = tobiko.pop_test_case()
+        assert actual_test == test
+        tobiko.remove_test_from_all_shared_resources(test.id())
+        record = self.records.pop()
+        assert record.test_id == test.id()
+        self.queue.put(record)
+
+    def add_event(self, test: unittest.TestCase, name: str, value=None):
+        if self.records and self.records[-1].test_id == test.id():
+            self.records[-1].events.append((name, value))
+        else:
+            # Errors raised out of any test case (like by setUpClass method)
+            self.queue.put(TestRecord(test_id=test.id(),
+                                      description=test.shortDescription(),
+                                      events=[(name, value)]))
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self.add_event(test, 'addError', self.errors[-1][1])
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self.add_event(test, 'addFailure', self.failures[-1][1])
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self.add_event(test, 'addSuccess')
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self.add_event(test, 'addSkip', reason)
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self.add_event(test, 'addExpectedFailure',
+                       self.expectedFailures[-1][1])
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self.add_event(test, 'addUnexpectedSuccess')
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+        if err is not None:
+            failure = issubclass(err[0], test.failureException)
+            self.add_event(test, 'addSubTest',
+                           (subtest.id(), failure,
+                            self._exc_info_to_string(err, test)))
+
+
+class RemoteTestCase(unittest.TestCase):
+    """Local stand-in for a test case executed by a worker process"""
+
+    def __init__(self, test_id: str, description: str = None):
+        super().__init__()
+        self._test_id = test_id
+        self._description = description
+
+    def id(self):
+        return self._test_id
+
+    def __str__(self):
+        return self._test_id
+
+    def __eq__(self, other):
+        return (isinstance(other, RemoteTestCase) and
+                self._test_id == other.id())
+
+    def __hash__(self):
+        return hash(self._test_id)
+
+    def shortDescription(self):
+        return self._description
+
+    def runTest(self):
+        raise RuntimeError(f"Remote test case can't be run: {self.id()}")
+
+
+class RemoteTestError(Exception):
+    """Error reported by a test case executed by a worker process"""
+
+
+class RemoteTestFailure(AssertionError):
+    """Failure reported by a test case executed by a worker process"""
+
+
+def remote_exc_info(traceback: str, failure=False):
+    error_type: typing.Type[Exception]
+    if failure:
+        error_type = RemoteTestFailure
+    else:
+        error_type = RemoteTestError
+    try:
+        raise error_type(traceback)
+    except error_type:
+        return sys.exc_info()
+
+
+def replay_test_record(record: TestRecord,
+                       result: unittest.TestResult):
+    """Report the outcome of a test case executed by a worker process"""
+    test = RemoteTestCase(test_id=record.test_id,
+                          description=record.description)
+    result.startTest(test)
+    try:
+        for name, value in record.events:
+            if name in ['addError', 'addFailure', 'addExpectedFailure']:
+                getattr(result, name)(
+                    test, remote_exc_info(value,
+                                          failure=name != 'addError'))
+            elif name == 'addSkip':
+                result.addSkip(test, value)
+            elif name == 'addSubTest':
+                subtest_id, failure, traceback = value
+                result.addSubTest(test,
+                                  RemoteTestCase(test_id=subtest_id),
+                                  remote_exc_info(traceback,
+                                                  failure=failure))
+            else:
+                getattr(result, name)(test)
+    finally:
+        result.stopTest(test)
@@ -16,6 +16,9 @@
 from __future__ import absolute_import
 
 import collections
+import multiprocessing
+import os
+import queue
 import sys
 import typing
 import unittest
@@ -25,6 +28,9 @@ from oslo_log import log
 import tobiko
 from tobiko.run import _config
 from tobiko.run import _discover
+from tobiko.run import _result
+from tobiko.run import _schedule
+from tobiko.run import _worker
 
 
 LOG = log.getLogger(__name__)
@@ -35,23 +41,48 @@ def run_tests(test_path: typing.Union[str, typing.Iterable[str]],
               python_path: typing.Iterable[str] = None,
               config: _config.RunConfigFixture = None,
               result: unittest.TestResult = None,
-              check=True) -> unittest.TestResult:
+              check=True,
+              forked: bool = None) -> unittest.TestResult:
     test_ids = _discover.find_test_ids(test_path=test_path,
                                        test_filename=test_filename,
                                        python_path=python_path,
+                                       forked=forked,
                                        config=config)
-    return run_test_ids(test_ids=test_ids, result=result, check=check)
+    return run_test_ids(test_ids=test_ids,
+                        result=result,
+                        check=check,
+                        forked=forked,
+                        config=config)
 
 
 def run_test_ids(test_ids: typing.List[str],
                  result: unittest.TestResult = None,
-                 check=True) \
+                 check=True,
+                 forked: bool = None,
+                 config: _config.RunConfigFixture = None) \
         -> unittest.TestResult:
+    test_ids = list(test_ids)
+    config = _config.run_confing(config)
+    if forked is None or multiprocessing.current_process().daemon:
+        forked = config.forked
+    suite: unittest.TestSuite
+    if forked:
+        suite = WorkersTestSuite(test_ids=test_ids)
+    else:
+        suite = load_test_suite(test_ids)
+
+    LOG.info(f'Run {len(test_ids)} test(s)')
+    result = tobiko.run_test(case=suite, result=result, check=check)
+
+    LOG.info(f'{result.testsRun} test(s) run')
+    return result
+
+
+def load_test_suite(test_ids: typing.Iterable[str]) -> unittest.TestSuite:
     test_classes: typing.Dict[str, typing.List[str]] = \
         collections.defaultdict(list)
 
     # regroup test ids my test class keeping test names order
-    test_ids = list(test_ids)
     for test_id in test_ids:
         test_class_id, test_name = test_id.rsplit('.', 1)
         test_classes[test_class_id].append(test_name)
@@ -63,12 +94,92 @@ def run_test_ids(test_ids: typing.List[str],
         for test_name in test_names:
             test = test_class(test_name)
             suite.addTest(test)
-
-    LOG.info(f'Run {len(test_ids)} test(s)')
-    result = tobiko.run_test(case=suite, result=result, check=check)
-
-    LOG.info(f'{result.testsRun} test(s) run')
-    return result
+    return suite
+
+
+def run_worker_test_ids(test_ids: typing.List[str], records_queue) -> int:
+    """Run test cases in a worker process sending results to given queue"""
+    suite = load_test_suite(test_ids)
+    result = _result.QueueTestResult(queue=records_queue)
+    suite.run(result)
+    return result.testsRun
+
+
+class WorkersTestSuite(unittest.TestSuite):
+    """Test suite running its test cases using the pool of workers
+
+    Test cases are split between workers by fixture affinity, so that
+    every worker sets up (and then reuses) as few fixtures as possible.
+    Results are reported to the local test result as soon as every test
+    case is stopped by the worker running it.
+    """
+
+    poll_interval = .1
+
+    def __init__(self, test_ids: typing.Iterable[str]):
+        super().__init__()
+        self.test_ids = list(test_ids)
+
+    def countTestCases(self) -> int:
+        return len(self.test_ids)
+
+    def run(self, result, debug=False):
+        # pylint: disable=arguments-differ
+        pool = tobiko.setup_fixture(_worker.WorkersPoolFixture)
+        workers_count = pool.workers_count or os.cpu_count() or 1
+        groups = _schedule.schedule_test_ids(test_ids=self.test_ids,
+                                             workers_count=workers_count)
+        LOG.info(f"Run {len(self.test_ids)} test(s) using "
+                 f"{len(groups)} worker(s)")
+        context = multiprocessing.get_context('spawn')
+        with context.Manager() as manager:
+            records_queue = manager.Queue()
+            pending = {_worker.call_async(run_worker_test_ids,
+                                          test_ids=group,
+                                          records_queue=records_queue):
+                       group
+                       for group in groups}
+            while pending:
+                self.replay_test_records(records_queue, result,
+                                         timeout=self.poll_interval)
+                for async_result, group in list(pending.items()):
+                    if async_result.ready():
+                        # Records are sent before worker function returns
+                        self.replay_test_records(records_queue, result)
+                        del pending[async_result]
+                        self.check_worker_result(async_result, group,
+                                                 result)
+        return result
+
+    @staticmethod
+    def replay_test_records(records_queue,
+                            result: unittest.TestResult,
+                            timeout: float = None):
+        while True:
+            try:
+                if timeout is None:
+                    record = records_queue.get_nowait()
+                else:
+                    record = records_queue.get(timeout=timeout)
+                    timeout = None
+            except queue.Empty:
+                break
+            _result.replay_test_record(record=record, result=result)
+
+    @staticmethod
+    def check_worker_result(async_result,
+                            group: typing.List[str],
+                            result: unittest.TestResult):
+        try:
+            async_result.get()
+        except Exception:
+            LOG.exception(f"Worker failed running {len(group)} test(s)")
+            test = _result.RemoteTestCase(
+                test_id=f"{group[0]}[worker]",
+                description=f"Worker running {len(group)} test(s)")
+            result.startTest(test)
+            result.addError(test, sys.exc_info())
+            result.stopTest(test)
 
 
 class RunTestCasesFailed(tobiko.TobikoException):
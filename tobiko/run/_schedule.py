@@ -0,0 +1,100 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import collections
+import math
+import typing
+
+from oslo_log import log
+
+import tobiko
+
+
+LOG = log.getLogger(__name__)
+
+
+class TestIdsBucket:
+
+    def __init__(self):
+        self.test_ids: typing.List[str] = []
+        self.fixtures: typing.Set[str] = set()
+
+    @property
+    def load(self) -> int:
+        return len(self.test_ids)
+
+    def add(self,
+            test_ids: typing.Iterable[str],
+            fixtures: typing.Iterable[str]):
+        self.test_ids.extend(test_ids)
+        self.fixtures.update(fixtures)
+
+
+def list_test_fixtures(test_id: str) -> typing.FrozenSet[str]:
+    try:
+        return frozenset(tobiko.list_required_fixtures([test_id]))
+    except Exception:
+        LOG.exception(f"Unable to list fixtures required by '{test_id}'")
+        return frozenset()
+
+
+def group_test_ids_by_fixtures(test_ids: typing.Iterable[str]) \
+        -> typing.Dict[typing.FrozenSet[str], typing.List[str]]:
+    """Group test cases requiring the same set of fixtures"""
+    groups: typing.Dict[typing.FrozenSet[str], typing.List[str]] = (
+        collections.defaultdict(list))
+    for test_id in test_ids:
+        groups[list_test_fixtures(test_id)].append(test_id)
+    return groups
+
+
+def schedule_test_ids(test_ids: typing.Iterable[str],
+                      workers_count: int) \
+        -> typing.List[typing.List[str]]:
+    """Split test cases between workers by fixture affinity
+
+    Test cases requiring the same fixtures are always scheduled to the same
+    worker. Groups of test cases are then assigned to the worker already
+    having most of their fixtures, among the workers that wouldn't get more
+    than a fair share of the test cases, so that fixtures are set up by as
+    few workers as possible while keeping workers load balanced.
+
+    :returns: a list of test case IDs for every worker that got any
+    """
+    test_ids = list(test_ids)
+    workers_count = max(1, workers_count)
+    groups = group_test_ids_by_fixtures(test_ids)
+    max_load = math.ceil(len(test_ids) / workers_count)
+    buckets = [TestIdsBucket() for _ in range(workers_count)]
+    # Schedule biggest groups first, leaving groups requiring fewer fixtures
+    # for last as they have less affinity with any worker
+    for fixtures, group in sorted(groups.items(),
+                                  key=lambda item: (-len(item[1]),
+                                                    -len(item[0]),
+                                                    sorted(item[0]))):
+        candidates = [bucket
+                      for bucket in buckets
+                      if bucket.load + len(group) <= max_load]
+        if candidates:
+            bucket = max(candidates,
+                         key=lambda b: (len(b.fixtures & fixtures), -b.load))
+        else:
+            bucket = min(buckets, key=lambda b: b.load)
+        bucket.add(test_ids=group, fixtures=fixtures)
+    return [bucket.test_ids
+            for bucket in buckets
+            if bucket.test_ids]
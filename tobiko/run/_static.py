@@ -0,0 +1,408 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import ast
+import builtins
+import os
+import typing
+
+from oslo_log import log
+
+
+LOG = log.getLogger(__name__)
+
+# Well known test case base classes that have no test methods
+TEST_CASE_CLASSES = {'unittest.TestCase',
+                     'unittest.case.TestCase',
+                     'testtools.TestCase',
+                     'testtools.testcase.TestCase'}
+
+
+class StaticDiscoveryError(Exception):
+    """Test cases can't be listed without importing the module"""
+
+
+class ModuleRef(typing.NamedTuple):
+    name: str
+
+
+class ClassRef(typing.NamedTuple):
+    module_name: str
+    name: str
+
+
+class TestCaseRef(typing.NamedTuple):
+    name: str
+
+
+class ExternalRef(typing.NamedTuple):
+    name: str
+
+
+class OtherRef(typing.NamedTuple):
+    name: str
+
+
+Ref = typing.Union[ModuleRef, ClassRef, TestCaseRef, ExternalRef, OtherRef]
+
+
+class ClassInfo(typing.NamedTuple):
+    is_test_case: bool
+    is_abstract: bool
+    has_external_bases: bool
+    test_names: typing.FrozenSet[str]
+    files: typing.FrozenSet[str]
+
+
+def get_assign_targets(node: typing.Union[ast.Assign, ast.AnnAssign]) \
+        -> typing.List[str]:
+    if isinstance(node, ast.Assign):
+        targets = node.targets
+    else:
+        targets = [node.target]
+    return [target.id
+            for target in targets
+            if isinstance(target, ast.Name)]
+
+
+def get_dotted_name(expr: ast.expr) -> str:
+    if isinstance(expr, ast.Call):
+        return get_dotted_name(expr.func)
+    if isinstance(expr, ast.Attribute):
+        return f'{get_dotted_name(expr.value)}.{expr.attr}'
+    if isinstance(expr, ast.Name):
+        return expr.id
+    return ''
+
+
+def get_decorator_names(
+        node: typing.Union[ast.FunctionDef, ast.AsyncFunctionDef]) \
+        -> typing.List[str]:
+    return [get_dotted_name(decorator)
+            for decorator in node.decorator_list]
+
+
+class StaticModule:
+    """Names defined at the top level of a Python module source file"""
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.is_package = os.path.basename(path) == '__init__.py'
+        self.classes: typing.Dict[str, ast.ClassDef] = {}
+        self.aliases: typing.Dict[str, ast.expr] = {}
+        self.imports: typing.Dict[str, typing.Tuple[str, ...]] = {}
+        self.others: typing.Set[str] = set()
+        self.dynamic = False
+        with open(path, 'rb') as source:
+            tree = ast.parse(source.read(), filename=path)
+        for node in tree.body:
+            self._visit(node)
+
+    def _visit(self, node: ast.stmt):
+        if isinstance(node, ast.ClassDef):
+            self.classes[node.name] = node
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            self.others.add(node.name)
+        elif isinstance(node, ast.Import):
+            self._visit_import(node)
+        elif isinstance(node, ast.ImportFrom):
+            self._visit_import_from(node)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            self._visit_assign(node)
+        elif isinstance(node, (ast.If, ast.Try, ast.With, ast.For,
+                               ast.While, ast.Delete)):
+            # Conditionally defined names can't be known statically
+            for child in ast.walk(node):
+                if isinstance(child, (ast.ClassDef, ast.Delete)):
+                    self.dynamic = True
+                    break
+
+    def _visit_import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.asname:
+                self.imports[alias.asname] = ('import', alias.name)
+            else:
+                name = alias.name.split('.', 1)[0]
+                self.imports[name] = ('import', name)
+
+    def _visit_import_from(self, node: ast.ImportFrom):
+        module_name = self._absolute_module_name(node)
+        for alias in node.names:
+            if alias.name == '*':
+                self.dynamic = True
+            else:
+                self.imports[alias.asname or alias.name] = (
+                    'from', module_name, alias.name)
+
+    def _visit_assign(self, node: typing.Union[ast.Assign, ast.AnnAssign]):
+        for target in get_assign_targets(node):
+            if isinstance(node.value, (ast.Name, ast.Attribute)):
+                self.aliases[target] = node.value
+            else:
+                self.others.add(target)
+
+    def _absolute_module_name(self, node: ast.ImportFrom) -> str:
+        if not node.level:
+            return node.module or ''
+        package = self.name.split('.')
+        if not self.is_package:
+            package = package[:-1]
+        if node.level > 1:
+            package = package[:-(node.level - 1)]
+        if node.module:
+            package.append(node.module)
+        return '.'.join(package)
+
+
+class StaticIndex:
+    """Lists test cases of Python modules by looking at their source code
+
+    Base classes are looked up in other modules source files found in
+    given Python directories, but only for modules of the same top level
+    packages of inspected test modules: any other class is considered
+    external. Whenever test cases can't be determined for sure from source
+    code, StaticDiscoveryError is raised.
+    """
+
+    def __init__(self, python_dirs: typing.Iterable[str]):
+        self.python_dirs = [os.path.realpath(d) for d in python_dirs]
+        self.packages: typing.Set[str] = set()
+        self._modules: typing.Dict[str, typing.Optional[StaticModule]] = {}
+        self._classes: typing.Dict[ClassRef, ClassInfo] = {}
+        self._collectors: typing.List[typing.Set[str]] = []
+        self._resolving: typing.Set[typing.Tuple[str, str]] = set()
+
+    def find_module_file(self, module_name: str) -> typing.Optional[str]:
+        if module_name.split('.', 1)[0] not in self.packages:
+            return None
+        relative_path = os.path.join(*module_name.split('.'))
+        for python_dir in self.python_dirs:
+            for path in [os.path.join(python_dir, relative_path + '.py'),
+                         os.path.join(python_dir, relative_path,
+                                      '__init__.py')]:
+                if os.path.isfile(path):
+                    return path
+        return None
+
+    def get_module(self, module_name: str) -> typing.Optional[StaticModule]:
+        try:
+            module = self._modules[module_name]
+        except KeyError:
+            path = self.find_module_file(module_name)
+            if path is None:
+                module = None
+            else:
+                try:
+                    module = StaticModule(name=module_name, path=path)
+                except (SyntaxError, ValueError) as ex:
+                    raise StaticDiscoveryError(
+                        f"Unable to parse '{path}': {ex}") from ex
+            self._modules[module_name] = module
+        if module is not None:
+            for collector in self._collectors:
+                collector.add(module.path)
+        return module
+
+    def resolve_name(self, module: StaticModule, name: str) -> Ref:
+        if name in module.classes:
+            return ClassRef(module.name, name)
+        if name in module.aliases:
+            return self.resolve_expr(module, module.aliases[name])
+        if name in module.others:
+            return OtherRef(f'{module.name}.{name}')
+        imported = module.imports.get(name)
+        if imported is not None:
+            if imported[0] == 'import':
+                return ModuleRef(imported[1])
+            _, module_name, attr = imported
+            submodule_name = f'{module_name}.{attr}'
+            if self.find_module_file(submodule_name):
+                return ModuleRef(submodule_name)
+            key = (module.name, name)
+            if key in self._resolving:
+                raise StaticDiscoveryError(
+                    f"Circular import of '{name}' in module '{module.name}'")
+            self._resolving.add(key)
+            try:
+                return self.resolve_attr(ModuleRef(module_name), attr)
+            finally:
+                self._resolving.remove(key)
+        if module.dynamic:
+            raise StaticDiscoveryError(
+                f"Name '{name}' could be defined dynamically in module "
+                f"'{module.name}'")
+        if hasattr(builtins, name):
+            return ExternalRef(name)
+        raise StaticDiscoveryError(
+            f"Name '{name}' not found in module '{module.name}'")
+
+    def resolve_attr(self, ref: Ref, attr: str) -> Ref:
+        name = f'{ref.name}.{attr}'
+        if isinstance(ref, ModuleRef):
+            if name in TEST_CASE_CLASSES:
+                return TestCaseRef(name)
+            module = self.get_module(ref.name)
+            if module is None:
+                if self.find_module_file(name):
+                    return ModuleRef(name)
+                return ExternalRef(name)
+            if (attr not in module.classes and
+                    attr not in module.aliases and
+                    attr not in module.imports and
+                    attr not in module.others and
+                    self.find_module_file(name)):
+                return ModuleRef(name)
+            return self.resolve_name(module, attr)
+        if isinstance(ref, (ExternalRef, OtherRef)):
+            return ExternalRef(name)
+        raise StaticDiscoveryError(f"Unable to resolve '{name}'")
+
+    def resolve_expr(self, module: StaticModule, expr: ast.expr) -> Ref:
+        if isinstance(expr, ast.Name):
+            return self.resolve_name(module, expr.id)
+        if isinstance(expr, ast.Attribute):
+            return self.resolve_attr(self.resolve_expr(module, expr.value),
+                                     expr.attr)
+        if isinstance(expr, ast.Subscript):
+            # Like typing.Generic[T]
+            ref = self.resolve_expr(module, expr.value)
+            if isinstance(ref, (ExternalRef, OtherRef)):
+                return ref
+        raise StaticDiscoveryError(
+            f"Unable to resolve expression {ast.dump(expr)} in module "
+            f"'{module.name}'")
+
+    def get_class_info(self, ref: ClassRef) -> ClassInfo:
+        info = self._classes.get(ref)
+        if info is None:
+            files: typing.Set[str] = set()
+            self._collectors.append(files)
+            try:
+                (is_test_case, is_abstract, has_external_bases,
+                 test_names) = self._inspect_class(ref)
+            finally:
+                self._collectors.pop()
+            self._classes[ref] = info = ClassInfo(
+                is_test_case=is_test_case,
+                is_abstract=is_abstract,
+                has_external_bases=has_external_bases,
+                test_names=frozenset(test_names),
+                files=frozenset(files))
+        for collector in self._collectors:
+            collector.update(info.files)
+        return info
+
+    def _inspect_class(self, ref: ClassRef) \
+            -> typing.Tuple[bool, bool, bool, typing.Set[str]]:
+        module = self.get_module(ref.module_name)
+        assert module is not None
+        node = module.classes[ref.name]
+        if node.keywords:
+            raise StaticDiscoveryError(
+                f"Class '{ref.module_name}.{ref.name}' has keywords "
+                "(like metaclass)")
+        test_names, is_abstract = self._inspect_class_body(ref, node)
+        is_test_case = False
+        has_external_bases = False
+        for base in node.bases:
+            base_ref = self.resolve_expr(module, base)
+            if isinstance(base_ref, TestCaseRef):
+                is_test_case = True
+            elif isinstance(base_ref, ClassRef):
+                base_info = self.get_class_info(base_ref)
+                is_test_case = is_test_case or base_info.is_test_case
+                is_abstract = is_abstract or base_info.is_abstract
+                has_external_bases = (has_external_bases or
+                                      base_info.has_external_bases)
+                test_names.update(base_info.test_names)
+            elif isinstance(base_ref, (ExternalRef, OtherRef)):
+                has_external_bases = True
+            else:
+                raise StaticDiscoveryError(
+                    f"Invalid base class '{base_ref.name}' for class "
+                    f"'{ref.module_name}.{ref.name}'")
+        if has_external_bases and test_names and not is_test_case:
+            # Any external class up in the hierarchy could be a test case
+            raise StaticDiscoveryError(
+                f"Unable to determine if class '{ref.module_name}."
+                f"{ref.name}' is a test case")
+        if is_test_case and is_abstract:
+            # Only importing it can tell if all abstract methods have been
+            # implemented
+            raise StaticDiscoveryError(
+                f"Test case class '{ref.module_name}.{ref.name}' could be "
+                "abstract")
+        return is_test_case, is_abstract, has_external_bases, test_names
+
+    @staticmethod
+    def _inspect_class_body(ref: ClassRef, node: ast.ClassDef) \
+            -> typing.Tuple[typing.Set[str], bool]:
+        test_names: typing.Set[str] = set()
+        is_abstract = False
+        for child in node.body:
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                decorators = get_decorator_names(child)
+                is_abstract = is_abstract or any(
+                    d.endswith('abstractmethod') for d in decorators)
+                if child.name.startswith('test_'):
+                    if any(d.endswith('property') for d in decorators):
+                        raise StaticDiscoveryError(
+                            f"Class '{ref.module_name}.{ref.name}' member "
+                            f"'{child.name}' is a property")
+                    test_names.add(child.name)
+            elif isinstance(child, (ast.Assign, ast.AnnAssign)):
+                for target in get_assign_targets(child):
+                    if target.startswith('test_'):
+                        raise StaticDiscoveryError(
+                            f"Class '{ref.module_name}.{ref.name}' member "
+                            f"'{target}' is not a method")
+        return test_names, is_abstract
+
+    def discover_module_test_ids(self, module_name: str) \
+            -> typing.Tuple[typing.List[str], typing.List[str]]:
+        """List test case IDs defined in given module
+
+        :returns: a tuple with the list of test case IDs and the list of
+            source files they have been found from
+        """
+        self.packages.add(module_name.split('.', 1)[0])
+        files: typing.Set[str] = set()
+        self._collectors.append(files)
+        try:
+            module = self.get_module(module_name)
+            if module is None:
+                raise StaticDiscoveryError(
+                    f"Module '{module_name}' source file not found")
+            if module.dynamic:
+                raise StaticDiscoveryError(
+                    f"Module '{module_name}' defines names dynamically")
+            names = (set(module.classes) | set(module.aliases) |
+                     set(module.imports))
+            test_ids: typing.List[str] = []
+            # Sort names the same way as dir(module) does
+            for name in sorted(names):
+                ref = self.resolve_name(module, name)
+                if not isinstance(ref, ClassRef):
+                    continue
+                info = self.get_class_info(ref)
+                if info.is_test_case:
+                    test_ids.extend(f'{module_name}.{name}.{test_name}'
+                                    for test_name in sorted(info.test_names))
+        finally:
+            self._collectors.pop()
+        return test_ids, sorted(files)
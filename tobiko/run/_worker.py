@@ -51,4 +51,38 @@ def workers_pool() -> pool.Pool:
 def call_async(func: typing.Callable,
                *args,
                **kwargs):
+    if multiprocessing.current_process().daemon:
+        # Pool workers are not allowed to have children processes
+        return SyncResult(func, *args, **kwargs)
     return workers_pool().apply_async(func, args=args, kwds=kwargs)
+
+
+class SyncResult:
+    """Result of a function called in the current process
+
+    It mimics the interface of results returned by pool.apply_async
+    """
+
+    def __init__(self, func: typing.Callable, *args, **kwargs):
+        self._value: typing.Any = None
+        self._exc_info: typing.Optional[tobiko.ExceptionInfo] = None
+        try:
+            self._value = func(*args, **kwargs)
+        except Exception:
+            self._exc_info = tobiko.exc_info()
+
+    def ready(self) -> bool:
+        return True
+
+    def successful(self) -> bool:
+        return self._exc_info is None
+
+    def wait(self, timeout: float = None):
+        # pylint: disable=unused-argument
+        pass
+
+    def get(self, timeout: float = None):
+        # pylint: disable=unused-argument
+        if self._exc_info is not None:
+            self._exc_info.reraise()
+        return self._value
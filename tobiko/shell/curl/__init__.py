@@ -16,11 +16,16 @@
 from __future__ import absolute_import
 
 from tobiko.shell.curl import _execute
+from tobiko.shell.curl import _load
 from tobiko.shell.curl import _process
 
 
 execute_curl = _execute.execute_curl
 
+CurlLoadResult = _load.CurlLoadResult
+CurlReply = _load.CurlReply
+generate_curl_load = _load.generate_curl_load
+
 CurlHeader = _process.CurlHeader
 CurlProcessFixture = _process.CurlProcessFixture
 assert_downloaded_file = _process.assert_downloaded_file
@@ -0,0 +1,159 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import collections
+import math
+import typing
+
+import netaddr
+from oslo_log import log
+
+import tobiko
+from tobiko.shell.curl import _execute
+from tobiko.shell import sh
+from tobiko.shell import ssh
+
+
+LOG = log.getLogger(__name__)
+
+
+class CurlReply(typing.NamedTuple):
+    exit_status: int
+    content: str
+    latency: float
+
+
+class CurlLoadResult(object):
+    """Outcome of the requests sent by a curl load generator"""
+
+    def __init__(self, replies: typing.Iterable[CurlReply]):
+        self.replies = list(replies)
+
+    @property
+    def requests_count(self) -> int:
+        return len(self.replies)
+
+    @property
+    def contents(self) -> typing.Dict[str, int]:
+        """Number of successful replies for every received content"""
+        return dict(collections.Counter(reply.content
+                                        for reply in self.replies
+                                        if reply.exit_status == 0))
+
+    @property
+    def errors(self) -> typing.Dict[int, int]:
+        """Number of failed requests for every curl exit status"""
+        return dict(collections.Counter(reply.exit_status
+                                        for reply in self.replies
+                                        if reply.exit_status != 0))
+
+    @property
+    def errors_count(self) -> int:
+        return sum(self.errors.values())
+
+    @property
+    def error_rate(self) -> float:
+        if not self.replies:
+            return 0.
+        return self.errors_count / self.requests_count
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Latency (in seconds) of successful requests by nearest rank"""
+        latencies = sorted(reply.latency
+                           for reply in self.replies
+                           if reply.exit_status == 0)
+        if not latencies:
+            return math.nan
+        rank = math.ceil(percentile / 100. * len(latencies))
+        return latencies[min(max(rank, 1), len(latencies)) - 1]
+
+    @property
+    def latency_percentiles(self) -> typing.Dict[int, float]:
+        return {percentile: self.latency_percentile(percentile)
+                for percentile in [50, 90, 99]}
+
+    def __repr__(self):
+        return (f"{type(self).__name__}("
+                f"requests_count={self.requests_count}, "
+                f"contents={self.contents}, "
+                f"errors={self.errors}, "
+                f"latency_percentiles={self.latency_percentiles})")
+
+
+def generate_curl_load(
+        hostname: typing.Union[str, netaddr.IPAddress],
+        port: int = None,
+        path: str = None,
+        scheme: str = None,
+        requests_count: int = 10,
+        concurrency: int = 1,
+        connect_timeout: tobiko.Seconds = None,
+        ssh_client: ssh.SSHClientType = None,
+        **execute_params) -> CurlLoadResult:
+    """Send HTTP requests from concurrent curl clients
+
+    All clients are started by a single shell process on the host reached
+    by given SSH client (or on the local host), and every one of them
+    sends its share of the requests one after the other.
+    """
+    if requests_count < 1:
+        raise ValueError(f"Invalid requests count: {requests_count}")
+    concurrency = max(1, min(concurrency, requests_count))
+    netloc = _execute.make_netloc(hostname=hostname, port=port)
+    url = _execute.make_url(scheme=scheme, netloc=netloc, path=path)
+    curl_command = sh.shell_command("curl -g -s -f -w '|%{time_total}'")
+    if connect_timeout is not None:
+        curl_command += f'--connect-timeout {int(connect_timeout)}'
+    curl_command += url
+    clients_requests = [
+        requests_count // concurrency + (i < requests_count % concurrency)
+        for i in range(concurrency)]
+    # Each client prints a line per request: <exit status>|<content>|<time>
+    script = ("set -f\n"  # echo must not expand contents as file names
+              f"for n in {' '.join(str(n) for n in clients_requests)}; do\n"
+              "  (for i in $(seq $n); do\n"
+              f"    out=$({curl_command})\n"
+              "    rc=$?\n"
+              "    printf '%s|%s\\n' $rc \"$(echo $out)\"\n"
+              "  done) &\n"
+              "done\n"
+              "wait\n")
+    LOG.debug(f"Send {requests_count} requests to {url} from "
+              f"{concurrency} concurrent curl clients...")
+    output = sh.execute(['/bin/sh', '-c', script],
+                        shell=False,
+                        ssh_client=ssh_client,
+                        **execute_params).stdout
+    result = CurlLoadResult(parse_curl_load_output(output))
+    LOG.debug(f"Requests sent to {url}: {result}")
+    return result
+
+
+def parse_curl_load_output(output: str) -> typing.List[CurlReply]:
+    replies = []
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        exit_status, _, content = line.partition('|')
+        content, _, latency = content.rpartition('|')
+        try:
+            replies.append(CurlReply(exit_status=int(exit_status),
+                                     content=content.strip(),
+                                     latency=float(latency or 'nan')))
+        except ValueError:
+            LOG.warning(f"Unexpected curl load output line: {line!r}")
+    return replies
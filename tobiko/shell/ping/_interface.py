@@ -17,7 +17,6 @@ from __future__ import absolute_import
 
 
 from oslo_log import log
-from neutron_lib import constants
 
 import tobiko
 from tobiko.shell.ping import _exception
@@ -27,6 +26,8 @@ from tobiko.shell import sh
 
 LOG = log.getLogger(__name__)
 
+constants = tobiko.lazy_import('neutron_lib.constants')
+
 
 def get_ping_command(parameters, ssh_client):
     interface = get_ping_interface(ssh_client=ssh_client)
@@ -69,8 +69,10 @@ ShellProcessNotTerminated = _exception.ShellProcessNotTerminated
 ShellStdinClosed = _exception.ShellStdinClosed
 
 execute = _execute.execute
+execute_many = _execute.execute_many
 execute_process = _execute.execute_process
 execute_result = _execute.execute_result
+map_execute = _execute.map_execute
 ShellExecuteResult = _execute.ShellExecuteResult
 
 HostNameError = _hostname.HostnameError
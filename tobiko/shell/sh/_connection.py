@@ -18,6 +18,7 @@ from __future__ import absolute_import
 import getpass
 import io
 import os.path
+import secrets
 import shutil
 import socket
 import tempfile
@@ -28,10 +29,10 @@ from oslo_log import log
 
 import tobiko
 from tobiko.shell.sh import _command
-from tobiko.shell.sh import _exception
 from tobiko.shell.sh import _execute
 from tobiko.shell.sh import _hostname
 from tobiko.shell.sh import _mktemp
+from tobiko.shell.sh import _sftp
 from tobiko.shell import ssh
 
 
@@ -265,23 +266,7 @@ class ShellConnection(tobiko.SharedFixture):
                   remote_dir: str,
                   make_dirs=True):
         # pylint: disable=redefined-outer-name
-        remote_dir = os.path.normpath(remote_dir)
-        put_files = {}
-        for local_file in local_files:
-            local_file = os.path.normpath(local_file)
-            if os.path.isdir(local_file):
-                top_dir = os.path.dirname(local_file)
-                for local_dir, _, files in os.walk(local_file):
-                    for filename in files:
-                        local_file = os.path.join(local_dir, filename)
-                        remote_file = os.path.join(
-                            remote_dir,
-                            os.path.relpath(local_file, start=top_dir))
-                        put_files[os.path.realpath(local_file)] = remote_file
-            else:
-                remote_file = os.path.join(
-                    remote_dir, os.path.basename(local_file))
-                put_files[os.path.realpath(local_file)] = remote_file
+        put_files = list_put_files(*local_files, remote_dir=remote_dir)
         remote_dirs = set()
         for local_file, remote_file in sorted(put_files.items()):
             if make_dirs:
@@ -461,6 +446,13 @@ class SSHShellConnection(ShellConnection):
             self._sftp = self.ssh_client.connect().open_sftp()
         return self._sftp
 
+    # Maximum number of files uploaded at the same time by put_files
+    put_files_workers = 4
+
+    def open_sftp_client(self) -> paramiko.SFTPClient:
+        """It opens a new SFTP channel on the same SSH connection"""
+        return self.ssh_client.connect().open_sftp()
+
     def get_environ(self) -> typing.Dict[str, str]:
         lines = self.execute('source /etc/profile; env').stdout.splitlines()
         return dict(_parse_env_line(line)
@@ -472,6 +464,28 @@ class SSHShellConnection(ShellConnection):
                   f"'{remote_file}'...")
         self.sftp_client.put(local_file, remote_file)
 
+    def put_files(self,
+                  *local_files: str,
+                  remote_dir: str,
+                  make_dirs=True):
+        # pylint: disable=redefined-outer-name
+        put_files = list_put_files(*local_files, remote_dir=remote_dir)
+        if not put_files:
+            return
+        if make_dirs:
+            _sftp.make_sftp_dirs(self.sftp_client,
+                                 {os.path.dirname(remote_file)
+                                  for remote_file in put_files.values()})
+        LOG.debug(f"Put {len(put_files)} remote file(s) as {self.login} "
+                  f"to '{remote_dir}'...")
+        if len(put_files) == 1:
+            [(local_file, remote_file)] = put_files.items()
+            self.sftp_client.put(local_file, _sftp.sftp_path(remote_file))
+        else:
+            _sftp.put_sftp_files(self.open_sftp_client,
+                                 files=put_files,
+                                 workers_count=self.put_files_workers)
+
     def open_file(self,
                   filename: typing.Union[str, bytes],
                   mode: str,
@@ -491,32 +505,38 @@ class SSHShellConnection(ShellConnection):
             remote_file = self.execute(f'echo {remote_file}').stdout.strip()
         self.sftp_client.get(remote_file, local_file)
 
+    def stat_files(self, *paths: str) \
+            -> typing.Dict[str, typing.Optional[paramiko.SFTPAttributes]]:
+        """Gets attributes of many remote files with a single round trip
+
+        :returns: a dictionary with attributes of every path (None for
+            paths that don't exist)
+        """
+        return _sftp.stat_sftp_paths(self.sftp_client, paths)
+
     def exists(self, path: str) -> bool:
-        try:
-            self.execute(['test', '-e', path])
-        except _exception.ShellCommandFailed:
-            return False
-        else:
-            return True
+        return self.stat_files(path)[path] is not None
 
     def is_file(self, path: str) -> bool:
-        try:
-            self.execute(['test', '-f', path])
-        except _exception.ShellCommandFailed:
-            return False
-        else:
-            return True
+        return _sftp.is_sftp_file(self.stat_files(path)[path])
 
     def is_directory(self, path: str) -> bool:
-        try:
-            self.execute(['test', '-d', path])
-        except _exception.ShellCommandFailed:
-            return False
-        else:
-            return True
+        return _sftp.is_sftp_directory(self.stat_files(path)[path])
+
+    temp_dir = '/tmp'
 
     def make_temp_file(self, auto_clean=True) -> str:
-        temp_file = self.execute('mktemp').stdout.strip()
+        while True:
+            temp_file = make_temp_name(self.temp_dir)
+            try:
+                # It fails when the file already exists
+                with self.sftp_client.open(temp_file, 'x') as fd:
+                    fd.chmod(0o600)
+            except IOError:
+                if self.exists(temp_file):
+                    continue
+                raise
+            break
         LOG.debug(f"Remote temporary file created as {self.login}: "
                   f"{temp_file}")
         if auto_clean:
@@ -524,7 +544,19 @@ class SSHShellConnection(ShellConnection):
         return temp_file
 
     def make_temp_dir(self, auto_clean=True, sudo: bool = None) -> str:
-        temp_dir = self.execute('mktemp -d', sudo=sudo).stdout.strip()
+        if sudo:
+            temp_dir = self.execute('mktemp -d', sudo=sudo).stdout.strip()
+        else:
+            while True:
+                temp_dir = make_temp_name(self.temp_dir)
+                try:
+                    # It fails when the directory already exists
+                    self.sftp_client.mkdir(temp_dir, mode=0o700)
+                except IOError:
+                    if self.exists(temp_dir):
+                        continue
+                    raise
+                break
         LOG.debug(f"Remote temporary directory created as {self.login}: "
                   f"{temp_dir}")
         if auto_clean:
@@ -538,11 +570,7 @@ class SSHShellConnection(ShellConnection):
         self.execute(command)
 
     def make_dirs(self, name: str, exist_ok=True):
-        command = _command.shell_command('mkdir')
-        if exist_ok:
-            command += '-p'
-        command += name
-        self.execute(command)
+        _sftp.make_sftp_dirs(self.sftp_client, [name], exist_ok=exist_ok)
 
     _user_dir: typing.Optional[str] = None
 
@@ -558,6 +586,42 @@ class SSHShellConnection(ShellConnection):
         return path
 
 
+def list_put_files(*local_files: str, remote_dir: str) \
+        -> typing.Dict[str, str]:
+    """Gets remote path of given local files and directories content
+
+    :returns: dictionary of remote paths indexed by local path
+    """
+    remote_dir = os.path.normpath(remote_dir)
+    put_files = {}
+    for local_file in local_files:
+        local_file = os.path.normpath(local_file)
+        if os.path.isdir(local_file):
+            top_dir = os.path.dirname(local_file)
+            for local_dir, _, files in os.walk(local_file):
+                for filename in files:
+                    local_file = os.path.join(local_dir, filename)
+                    remote_file = os.path.join(
+                        remote_dir,
+                        os.path.relpath(local_file, start=top_dir))
+                    put_files[os.path.realpath(local_file)] = remote_file
+        else:
+            remote_file = os.path.join(
+                remote_dir, os.path.basename(local_file))
+            put_files[os.path.realpath(local_file)] = remote_file
+    return put_files
+
+
+TEMP_NAME_CHARS = ('ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+                   'abcdefghijklmnopqrstuvwxyz0123456789')
+
+
+def make_temp_name(temp_dir: str) -> str:
+    """Random temporary file name like the ones made by mktemp"""
+    suffix = ''.join(secrets.choice(TEMP_NAME_CHARS) for _ in range(10))
+    return os.path.join(temp_dir, f'tmp.{suffix}')
+
+
 def _parse_env_line(line: str) -> typing.Tuple[str, str]:
     name, value = line.split('=', 1)
     return name.strip(), value.strip()
@@ -16,7 +16,12 @@
 from __future__ import absolute_import
 
 import collections
+from concurrent import futures
+import contextlib
 import enum
+import threading
+import typing
+import weakref
 
 from oslo_log import log
 
@@ -205,3 +210,123 @@ def execute_process(process: _process.ShellProcessFixture,
 
     LOG.debug("Command executed:\n%s\n", result.details)
     return result
+
+
+def execute_many(commands: typing.Iterable[typing.Any],
+                 ssh_client=None,
+                 workers_count: int = None,
+                 max_sessions: int = None,
+                 **execute_params) -> typing.List[ShellExecuteResult]:
+    """Execute many commands at the same time on the same host
+
+    Every command is executed on its own SSH session (channel) opened on
+    the same SSH connection.
+
+    :returns: execution results in the same order as given commands
+    """
+    return execute_jobs(jobs=[(command, ssh_client)
+                              for command in commands],
+                        workers_count=workers_count,
+                        max_sessions=max_sessions,
+                        **execute_params)
+
+
+def map_execute(command,
+                ssh_clients: typing.Iterable[typing.Any],
+                workers_count: int = None,
+                max_sessions: int = None,
+                **execute_params) -> typing.List[ShellExecuteResult]:
+    """Execute the same command at the same time on many hosts
+
+    :returns: execution results in the same order as given SSH clients
+    """
+    return execute_jobs(jobs=[(command, ssh_client)
+                              for ssh_client in ssh_clients],
+                        workers_count=workers_count,
+                        max_sessions=max_sessions,
+                        **execute_params)
+
+
+def execute_jobs(jobs: typing.Iterable[typing.Tuple[typing.Any, typing.Any]],
+                 workers_count: int = None,
+                 max_sessions: int = None,
+                 **execute_params) -> typing.List[ShellExecuteResult]:
+    """Execute (command, ssh_client) pairs concurrently
+
+    The number of commands being executed at the same time on the same SSH
+    connection is limited to max_sessions (by default to the value of
+    [ssh] max_sessions option) so that SSH server doesn't refuse to open
+    new sessions (see sshd MaxSessions option).
+
+    :raises Exception: the error raised by the first failed command (in
+    given order), after all commands have been executed
+    """
+    jobs = [(command, resolve_ssh_client(ssh_client))
+            for command, ssh_client in jobs]
+    if not jobs:
+        return []
+    if workers_count is None:
+        workers_count = len(jobs)
+    workers_count = max(1, min(workers_count, len(jobs)))
+    with futures.ThreadPoolExecutor(
+            max_workers=workers_count,
+            thread_name_prefix='tobiko-execute') as executor:
+        results = [executor.submit(execute_session,
+                                   command=command,
+                                   ssh_client=ssh_client,
+                                   max_sessions=max_sessions,
+                                   **execute_params)
+                   for command, ssh_client in jobs]
+    errors = [result.exception() for result in results]
+    for (command, ssh_client), error in zip(jobs, errors):
+        if error is not None:
+            LOG.debug(f"Command '{command}' failed (ssh_client="
+                      f"{ssh_client}): {error}")
+    for error in errors:
+        if error is not None:
+            raise error
+    return [result.result() for result in results]
+
+
+def execute_session(command, ssh_client=None, max_sessions: int = None,
+                    **execute_params) -> ShellExecuteResult:
+    with ssh_sessions_semaphore(ssh_client=ssh_client,
+                                max_sessions=max_sessions):
+        return execute(command, ssh_client=ssh_client, **execute_params)
+
+
+def resolve_ssh_client(ssh_client):
+    if ssh_client is None:
+        from tobiko.shell import ssh
+        ssh_client = ssh.ssh_proxy_client()
+    return ssh_client
+
+
+_SESSIONS_SEMAPHORES: typing.MutableMapping[typing.Any,
+                                            threading.BoundedSemaphore] = (
+    weakref.WeakKeyDictionary())
+_SESSIONS_SEMAPHORES_LOCK = threading.Lock()
+
+
+def ssh_sessions_semaphore(ssh_client, max_sessions: int = None) \
+        -> typing.ContextManager:
+    """Semaphore limiting the number of sessions opened on an SSH connection
+
+    Only the first max_sessions value given for an SSH client is used.
+    """
+    if not ssh_client:
+        # Local processes have no sessions limit
+        return contextlib.ExitStack()
+    with _SESSIONS_SEMAPHORES_LOCK:
+        semaphore = _SESSIONS_SEMAPHORES.get(ssh_client)
+        if semaphore is None:
+            if max_sessions is None:
+                max_sessions = default_max_sessions()
+            semaphore = threading.BoundedSemaphore(max(1, max_sessions))
+            _SESSIONS_SEMAPHORES[ssh_client] = semaphore
+    return semaphore
+
+
+def default_max_sessions() -> int:
+    from tobiko import config
+    return config.CONF.tobiko.ssh.max_sessions
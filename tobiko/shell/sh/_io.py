@@ -16,7 +16,9 @@
 from __future__ import absolute_import
 
 import io
-import select
+import selectors
+import time
+import typing
 
 from oslo_log import log
 
@@ -87,8 +89,11 @@ class ShellReadable(ShellIOBase):
 
     def read(self, size: int = None) -> bytes:
         size = size or self.buffer_size
+        # Prefer read1 when available as it returns data as soon as some is
+        # available instead of blocking until size bytes have been received
+        read = getattr(self.delegate, 'read1', None) or self.delegate.read
         try:
-            chunk: bytes = self.delegate.read(size) or b''
+            chunk: bytes = read(size) or b''
         except IOError:
             LOG.exception('Error reading from %r', self)
             try:
@@ -168,11 +173,48 @@ def select_files(files, timeout, mode='rw'):
     read_ready = select_read_ready_files(readable)
     write_ready = select_write_ready_files(writable)
     if not write_ready and not read_ready:
-        rlist, wlist, xlist = select.select(readable, writable, opened,
-                                            timeout)
-        read_ready = readable & set(rlist + xlist)
-        write_ready = writable & set(wlist + xlist)
+        read_ready, write_ready = wait_for_files(readable=readable,
+                                                 writable=writable,
+                                                 timeout=timeout)
+    return read_ready, write_ready
+
 
+def wait_for_files(readable, writable, timeout: float):
+    """Wait until any of given files can be read or written
+
+    Files sharing the same file descriptor (like STDOUT and STDERR of the
+    same SSH channel) are registered only once. When their descriptor gets
+    ready only those files telling they are ready are returned.
+    """
+    files_by_fd: typing.Dict[int, typing.List[ShellIOBase]] = {}
+    for f in readable | writable:
+        files_by_fd.setdefault(f.fileno(), []).append(f)
+    if not files_by_fd:
+        time.sleep(timeout)
+        return set(), set()
+
+    read_ready = set()
+    write_ready = set()
+    with selectors.DefaultSelector() as selector:
+        for fd, files in files_by_fd.items():
+            events = 0
+            if readable.intersection(files):
+                events |= selectors.EVENT_READ
+            if writable.intersection(files):
+                events |= selectors.EVENT_WRITE
+            selector.register(fd, events, files)
+        for key, events in selector.select(timeout=timeout):
+            files = key.data
+            if events & selectors.EVENT_READ:
+                ready = readable.intersection(files)
+                if len(files) > 1:
+                    ready = select_read_ready_files(ready)
+                read_ready.update(ready)
+            if events & selectors.EVENT_WRITE:
+                ready = writable.intersection(files)
+                if len(files) > 1:
+                    ready = select_write_ready_files(ready)
+                write_ready.update(ready)
     return read_ready, write_ready
 
 
@@ -82,6 +82,8 @@ class ShellProcessParameters(Parameters):
     stdout = True
     stderr = True
     buffer_size = io.DEFAULT_BUFFER_SIZE
+    # Max time to wait for process streams events before checking again
+    # for timeouts: data is handled as soon as it is received anyway
     poll_interval = 1.
     network_namespace = None
     retry_count: typing.Optional[int] = 3
@@ -336,8 +338,12 @@ class ShellProcessFixture(tobiko.SharedFixture):
             else:
                 self._check_communicate_timeout(attempt=attempt,
                                                 timeout=timeout)
-                # Wait for data in the following loops
+                # Wait for data in the following loops, but don't wait after
+                # the time limit
                 poll_interval = self.parameters.poll_interval
+                time_left = attempt.time_left
+                if time_left is not None:
+                    poll_interval = min(poll_interval, max(0., time_left))
                 LOG.debug(f"Waiting for process data {poll_interval} "
                           f"seconds... \n"
                           f"  command: {self.command}\n"
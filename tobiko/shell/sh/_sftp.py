@@ -0,0 +1,210 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+from concurrent import futures
+import os
+import stat
+import typing
+
+from oslo_log import log
+import paramiko
+from paramiko import sftp as _sftp
+
+
+LOG = log.getLogger(__name__)
+
+SFTPReply = typing.Tuple[int, paramiko.Message]
+SFTPClientFactory = typing.Callable[[], paramiko.SFTPClient]
+
+
+class SFTPPipeline(object):
+    """It sends many SFTP requests before waiting for their replies
+
+    Replies are dispatched by paramiko to this object the same way they are
+    to files read or written with prefetching or pipelining enabled, so
+    that a batch of requests takes about the time of a single round trip.
+    At most 'window' requests are waiting for a reply at the same time.
+    """
+
+    def __init__(self, sftp: paramiko.SFTPClient, window: int = 64):
+        self.sftp = sftp
+        self.window = max(1, window)
+        self._replies: typing.Dict[int, SFTPReply] = {}
+
+    def _async_response(self, t: int, msg: paramiko.Message, num: int):
+        # Called by paramiko when a reply to a request of ours arrives
+        self._replies[num] = t, msg
+
+    def run(self, requests: typing.Sequence[typing.Tuple[typing.Any, ...]]) \
+            -> typing.List[SFTPReply]:
+        """Sends (command, path, ...) requests
+
+        :returns: the (type, message) reply to every request, in order
+        """
+        # pylint: disable=protected-access
+        nums: typing.List[int] = []
+        self._replies.clear()
+        while len(self._replies) < len(requests):
+            while (len(nums) < len(requests) and
+                   len(nums) - len(self._replies) < self.window):
+                command, *args = requests[len(nums)]
+                nums.append(self.sftp._async_request(self, command, *args))
+            self.sftp._read_response()
+        return [self._replies.pop(num) for num in nums]
+
+    def check_status(self, t: int, msg: paramiko.Message):
+        """It raises IOError when a request failed"""
+        # pylint: disable=protected-access
+        if t == _sftp.CMD_STATUS:
+            self.sftp._convert_status(msg)
+
+
+def sftp_path(path: str) -> str:
+    """Remote path understood by the SFTP server
+
+    Relative paths are relative to the user home directory, the same as
+    paths starting with '~'.
+    """
+    if path == '~':
+        return '.'
+    if path.startswith('~/'):
+        return path[2:]
+    return path
+
+
+def stat_sftp_paths(sftp: paramiko.SFTPClient,
+                    paths: typing.Iterable[str]) \
+        -> typing.Dict[str, typing.Optional[paramiko.SFTPAttributes]]:
+    """Gets attributes of many files using a single SFTP requests batch
+
+    :returns: a dictionary with attributes of every path (None for paths
+        that don't exist or can't be accessed)
+    """
+    # pylint: disable=protected-access
+    paths = list(paths)
+    pipeline = SFTPPipeline(sftp)
+    replies = pipeline.run([(_sftp.CMD_STAT, sftp._adjust_cwd(sftp_path(path)))
+                            for path in paths])
+    stats: typing.Dict[str, typing.Optional[paramiko.SFTPAttributes]] = {}
+    for path, (t, msg) in zip(paths, replies):
+        if t == _sftp.CMD_ATTRS:
+            stats[path] = paramiko.SFTPAttributes._from_msg(msg)
+        else:
+            stats[path] = None
+    return stats
+
+
+def is_sftp_directory(attributes: typing.Optional[paramiko.SFTPAttributes]) \
+        -> bool:
+    return (attributes is not None and attributes.st_mode is not None and
+            stat.S_ISDIR(attributes.st_mode))
+
+
+def is_sftp_file(attributes: typing.Optional[paramiko.SFTPAttributes]) \
+        -> bool:
+    return (attributes is not None and attributes.st_mode is not None and
+            stat.S_ISREG(attributes.st_mode))
+
+
+def make_sftp_dirs(sftp: paramiko.SFTPClient,
+                   names: typing.Iterable[str],
+                   exist_ok=True,
+                   mode=0o777) -> typing.List[str]:
+    """Creates many directories (and their missing parents) at once
+
+    Every directory and its parents are looked for with a single requests
+    batch, then missing ones are created with a batch for every level of
+    the tree.
+
+    :returns: the list of created directories
+    """
+    # pylint: disable=protected-access
+    created: typing.List[str] = []
+    pipeline = SFTPPipeline(sftp)
+    attributes = paramiko.SFTPAttributes()
+    attributes.st_mode = mode
+    missing = list_missing_sftp_dirs(sftp, names, exist_ok=exist_ok)
+    for level_dirs in missing:
+        replies = pipeline.run([(_sftp.CMD_MKDIR, sftp._adjust_cwd(name),
+                                 attributes)
+                                for name in level_dirs])
+        for name, (t, msg) in zip(level_dirs, replies):
+            try:
+                pipeline.check_status(t, msg)
+            except IOError as ex:
+                raise OSError(f"Unable to create remote directory "
+                              f"'{name}': {ex}") from ex
+        created += level_dirs
+    if created:
+        LOG.debug(f"Remote directories created: {created}")
+    return created
+
+
+def list_missing_sftp_dirs(sftp: paramiko.SFTPClient,
+                           names: typing.Iterable[str],
+                           exist_ok=True) -> typing.List[typing.List[str]]:
+    """Looks for directories and their parents with a single batch
+
+    :returns: missing directories grouped by tree level, from the top one
+    """
+    names = {os.path.normpath(sftp_path(name)) for name in names}
+    dirs: typing.Set[str] = set()
+    for name in names:
+        while name not in dirs and name not in ['', '.', '/']:
+            dirs.add(name)
+            name = os.path.dirname(name)
+
+    missing: typing.Dict[int, typing.List[str]] = {}
+    for name, attributes in sorted(stat_sftp_paths(sftp, dirs).items()):
+        if attributes is None:
+            missing.setdefault(name.count('/'), []).append(name)
+        elif not is_sftp_directory(attributes):
+            raise NotADirectoryError(f"Remote path is not a directory: "
+                                     f"'{name}'")
+        elif name in names and not exist_ok:
+            raise FileExistsError(f"Remote directory already exists: "
+                                  f"'{name}'")
+    return [level_dirs for _, level_dirs in sorted(missing.items())]
+
+
+def put_sftp_files(open_sftp: SFTPClientFactory,
+                   files: typing.Dict[str, str],
+                   workers_count: int = 4):
+    """Uploads files concurrently using an SFTP channel for every worker
+
+    SFTP clients can't be shared between threads, so every worker thread
+    opens its own channel on the same SSH connection. Writes to every file
+    are pipelined by paramiko.
+
+    :param files: dictionary of remote paths indexed by local path
+    """
+    items = sorted(files.items())
+    workers_count = max(1, min(workers_count, len(items)))
+    chunks = [items[i::workers_count] for i in range(workers_count)]
+
+    def put_files(chunk: typing.List[typing.Tuple[str, str]]):
+        sftp = open_sftp()
+        try:
+            for local_file, remote_file in chunk:
+                sftp.put(local_file, sftp_path(remote_file))
+        finally:
+            sftp.close()
+
+    with futures.ThreadPoolExecutor(max_workers=workers_count) as executor:
+        for future in [executor.submit(put_files, chunk)
+                       for chunk in chunks]:
+            future.result()
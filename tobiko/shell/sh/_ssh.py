@@ -220,9 +220,27 @@ class SSHShellProcessFixture(_process.ShellProcessFixture):
 
 class SSHChannelFile(channel.ChannelFile):
 
+    # read buffer initialized by paramiko.file.BufferedFile
+    _rbuffer: bytes
+
     def fileno(self):
         return self.channel.fileno()
 
+    def read1(self, size: int = None) -> bytes:
+        """Read up to size bytes without waiting for more to arrive"""
+        if self._rbuffer:
+            size = size or len(self._rbuffer)
+            data, self._rbuffer = self._rbuffer[:size], self._rbuffer[size:]
+            return data
+        try:
+            return self._read(size or self._DEFAULT_BUFSIZE) or b''
+        except EOFError:
+            return b''
+
+    @property
+    def at_eof(self) -> bool:
+        return bool(self.channel.eof_received or self.channel.closed)
+
 
 class StdinSSHChannelFile(SSHChannelFile):
 
@@ -246,7 +264,7 @@ class StdoutSSHChannelFile(SSHChannelFile):
 
     @property
     def read_ready(self):
-        return self.channel.recv_ready()
+        return self.channel.recv_ready() or self.at_eof
 
 
 class StderrSSHChannelFile(SSHChannelFile, paramiko.channel.ChannelStderrFile):
@@ -256,4 +274,4 @@ class StderrSSHChannelFile(SSHChannelFile, paramiko.channel.ChannelStderrFile):
 
     @property
     def read_ready(self):
-        return self.channel.recv_stderr_ready()
+        return self.channel.recv_stderr_ready() or self.at_eof
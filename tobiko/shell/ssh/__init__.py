@@ -30,6 +30,7 @@ SSHClientFixture = _client.SSHClientFixture
 ssh_client = _client.ssh_client
 ssh_command = _command.ssh_command
 ssh_proxy_client = _client.ssh_proxy_client
+ssh_proxy_sock = _client.ssh_proxy_sock
 SSHConnectFailure = _client.SSHConnectFailure
 gather_ssh_connect_parameters = _client.gather_ssh_connect_parameters
 SSHClientType = _client.SSHClientType
@@ -521,10 +521,16 @@ class SSHClientManager(object):
 
     def __init__(self):
         self.clients = {}
+        # Proxy clients are looked up recursively while holding the lock
+        self._lock = threading.RLock()
 
-    def get_client(self, host, hostname=None, username=None, port=None,
-                   proxy_jump=None, host_config=None, config_files=None,
-                   proxy_client=None, **connect_parameters) -> \
+    def get_client(self, host, **params) -> SSHClientFixture:
+        with self._lock:
+            return self._get_client(host, **params)
+
+    def _get_client(self, host, hostname=None, username=None, port=None,
+                    proxy_jump=None, host_config=None, config_files=None,
+                    proxy_client=None, **connect_parameters) -> \
             SSHClientFixture:
         if isinstance(host, netaddr.IPAddress):
             host = str(host)
@@ -653,14 +659,20 @@ def ssh_connect(hostname, username=None, port=None, connection_interval=None,
                   f"  - attempt: {attempt.details}\n")
         for pkey in pkeys + [None]:  # type: ignore
             succeeded = False
-            proxy_sock = ssh_proxy_sock(
-                hostname=hostname,
-                port=port,
-                command=proxy_command,
-                client=proxy_client,
-                timeout=connection_timeout,
-                connection_attempts=1,
-                connection_interval=connection_interval)
+            try:
+                proxy_sock = ssh_proxy_sock(
+                    hostname=hostname,
+                    port=port,
+                    command=proxy_command,
+                    client=proxy_client,
+                    timeout=connection_timeout,
+                    connection_attempts=1,
+                    connection_interval=connection_interval)
+            except paramiko.ChannelException as ex:
+                # Proxy server could be unable to reach the host yet
+                LOG.debug(f"Error opening proxy channel to '{login}': {ex}")
+                attempt.check_limits()
+                break
             try:
                 client.connect(hostname=hostname,
                                username=username,
@@ -696,15 +708,36 @@ def ssh_proxy_sock(hostname=None, port=None, command=None, client=None,
                    source_address=None, timeout=None,
                    connection_attempts=None, connection_interval=None):
     if not command:
-        if client:
-            # I need a command to execute with proxy client
-            options = []
-            if source_address:
-                options += ['-s', str(source_address)]
-            command = ['nc'] + options + ['{hostname!s}', '{port!s}']
-        elif not command:
+        if not client:
             # Proxy sock is not required
             return None
+        client = ssh_proxy_sock_client(
+            client=client,
+            timeout=timeout,
+            connection_attempts=connection_attempts,
+            connection_interval=connection_interval)
+        # Source address of direct-tcpip channels is only informative:
+        # 'nc' command is required to bind it
+        if not source_address:
+            try:
+                return ssh_direct_tcpip_channel(client=client,
+                                                hostname=hostname,
+                                                port=port,
+                                                timeout=timeout)
+            except paramiko.ChannelException as ex:
+                if (ex.code != paramiko.common.
+                        OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED):
+                    # Target host is unreachable by proxy server
+                    raise
+                # Proxy server has TCP forwarding disabled
+                LOG.debug("Unable to open direct-tcpip channel with proxy "
+                          f"client {client}: {ex}. Fallback to 'nc' "
+                          "command")
+        # I need a command to execute with proxy client
+        options = []
+        if source_address:
+            options += ['-s', str(source_address)]
+        command = ['nc'] + options + ['{hostname!s}', '{port!s}']
 
     # Apply connect parameters to proxy command
     if not isinstance(command, str):
@@ -712,15 +745,11 @@ def ssh_proxy_sock(hostname=None, port=None, command=None, client=None,
     if hostname:
         command = command.format(hostname=hostname, port=(port or 22))
     if client:
-        if isinstance(client, SSHClientFixture):
-            # Connect to proxy server
-            client = client.connect(connection_timeout=timeout,
-                                    connection_attempts=connection_attempts,
-                                    connection_interval=connection_interval)
-        elif not isinstance(client, paramiko.SSHClient):
-            message = "Object {!r} is not an SSHClient".format(client)
-            raise TypeError(message)
-
+        client = ssh_proxy_sock_client(
+            client=client,
+            timeout=timeout,
+            connection_attempts=connection_attempts,
+            connection_interval=connection_interval)
         # Open proxy channel
         LOG.debug("Execute proxy command with proxy client %r: %r",
                   client, command)
@@ -733,6 +762,38 @@ def ssh_proxy_sock(hostname=None, port=None, command=None, client=None,
     return sock
 
 
+def ssh_proxy_sock_client(client, timeout=None, connection_attempts=None,
+                          connection_interval=None) -> paramiko.SSHClient:
+    if isinstance(client, SSHClientFixture):
+        # Connect to proxy server
+        return client.connect(connection_timeout=timeout,
+                              connection_attempts=connection_attempts,
+                              connection_interval=connection_interval)
+    if not isinstance(client, paramiko.SSHClient):
+        message = "Object {!r} is not an SSHClient".format(client)
+        raise TypeError(message)
+    return client
+
+
+def ssh_direct_tcpip_channel(client: paramiko.SSHClient,
+                             hostname,
+                             port=None,
+                             source_address=None,
+                             timeout=None) -> paramiko.Channel:
+    """Open a channel forwarded by proxy server to given host TCP port
+
+    It requires proxy server SSH daemon allowing TCP forwarding
+    """
+    dest_addr = (str(hostname), int(port or 22))
+    src_addr = (str(source_address or '127.0.0.1'), 0)
+    LOG.debug("Open direct-tcpip channel with proxy client %r: %r",
+              client, dest_addr)
+    return client.get_transport().open_channel('direct-tcpip',
+                                               dest_addr=dest_addr,
+                                               src_addr=src_addr,
+                                               timeout=timeout)
+
+
 def ssh_proxy_client(manager=None,
                      host=None,
                      host_config=None,
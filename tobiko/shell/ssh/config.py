@@ -73,6 +73,13 @@ OPTIONS = [
     cfg.StrOpt('proxy_command',
                default=None,
                help="Default proxy command"),
+    cfg.IntOpt('max_sessions',
+               default=5,
+               help=("Maximum number of commands executed at the same time "
+                     "on the same SSH connection. Together with the SFTP "
+                     "channels opened on the same connection (up to 5) it "
+                     "should not exceed SSH server MaxSessions option "
+                     "(10 by default)")),
 ]
 
 
@@ -16,16 +16,20 @@
 from __future__ import absolute_import
 from __future__ import division
 
-import dpkt
+import typing
+
 from oslo_log import log
 
 import tobiko
 
+if typing.TYPE_CHECKING:
+    import dpkt
+
 
 LOG = log.getLogger(__name__)
 
 
-def assert_pcap_content(pcap: dpkt.pcap.Reader, expect_empty: bool):
+def assert_pcap_content(pcap: 'dpkt.pcap.Reader', expect_empty: bool):
     actual_empty = True
     for _ in pcap:
         actual_empty = False
@@ -35,11 +39,11 @@ def assert_pcap_content(pcap: dpkt.pcap.Reader, expect_empty: bool):
     testcase.assertEqual(expect_empty, actual_empty)
 
 
-def assert_pcap_is_empty(pcap: dpkt.pcap.Reader):
+def assert_pcap_is_empty(pcap: 'dpkt.pcap.Reader'):
     LOG.debug('This test expects an empty pcap capture')
     assert_pcap_content(pcap, True)
 
 
-def assert_pcap_is_not_empty(pcap: dpkt.pcap.Reader):
+def assert_pcap_is_not_empty(pcap: 'dpkt.pcap.Reader'):
     LOG.debug('This test expects a non-empty pcap capture')
     assert_pcap_content(pcap, False)
@@ -17,15 +17,21 @@ from __future__ import absolute_import
 from __future__ import division
 
 import io
+import typing
 
-import dpkt
 from oslo_log import log
 
+import tobiko
 from tobiko.shell.tcpdump import _interface
 from tobiko.shell.tcpdump import _parameters
 from tobiko.shell import sh
 from tobiko.shell import ssh
 
+if typing.TYPE_CHECKING:
+    import dpkt
+else:
+    dpkt = tobiko.lazy_import('dpkt')
+
 
 LOG = log.getLogger(__name__)
 
@@ -62,7 +68,7 @@ def stop_capture(process):
 
 def get_pcap(process,
              capture_file: str,
-             ssh_client: ssh.SSHClientType = None) -> dpkt.pcap.Reader:
+             ssh_client: ssh.SSHClientType = None) -> 'dpkt.pcap.Reader':
     stop_capture(process)
 
     stdout = sh.execute(f"cat '{capture_file}'",
@@ -0,0 +1,190 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+from datetime import datetime
+import json
+import os
+import typing
+
+from oslo_log import log
+from py.xml import html  # pylint: disable=no-name-in-module,import-error
+from py.xml import raw  # pylint: disable=no-name-in-module,import-error
+
+import tobiko
+
+
+LOG = log.getLogger(__name__)
+
+ResultRecord = typing.Dict[str, typing.Any]
+
+RESULTS_TABLE_COLUMNS = ['Result', 'Time', 'Test', 'Description', 'Duration']
+
+
+def make_result_record(nodeid: str,
+                       reports: typing.Iterable[typing.Any]) -> ResultRecord:
+    """Summarizes all reports of a test case the same way pytest-html does"""
+    outcome = 'passed'
+    when = 'call'
+    wasxfail = False
+    duration = 0.
+    description = ''
+    longrepr: typing.List[str] = []
+    for report in reports:
+        if report.outcome == 'rerun':
+            continue
+        duration += getattr(report, 'duration', 0.)
+        description = getattr(report, 'description', None) or description
+        if report.longreprtext:
+            longrepr.append(report.longreprtext)
+        if report.outcome != 'passed' and outcome == 'passed':
+            outcome = report.outcome
+            when = report.when
+        if hasattr(report, 'wasxfail'):
+            wasxfail = True
+    return {'nodeid': nodeid,
+            'result': get_result_label(outcome, when=when, wasxfail=wasxfail),
+            'time': datetime.utcnow().isoformat(sep=' '),
+            'duration': duration,
+            'description': description,
+            'longrepr': '\n'.join(longrepr)}
+
+
+def get_result_label(outcome: str, when: str, wasxfail: bool) -> str:
+    if outcome == 'passed':
+        return wasxfail and 'XPassed' or 'Passed'
+    if outcome == 'skipped':
+        return wasxfail and 'XFailed' or 'Skipped'
+    if when == 'call':
+        return 'Failed'
+    return 'Error'
+
+
+class ResultsStore:
+    """Test results appended as JSON lines to a file as soon as known"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file: typing.Optional[typing.TextIO] = None
+
+    def open(self):
+        if self._file is None:
+            tobiko.makedirs(os.path.dirname(self.filename))
+            self._file = open(self.filename, 'w', encoding='utf-8')
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def append(self, record: ResultRecord):
+        self.open()
+        assert self._file is not None
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+    def load(self) -> typing.Iterator[ResultRecord]:
+        with open(self.filename, encoding='utf-8') as fd:
+            for line in fd:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class StreamingHTMLReport:
+    """HTML test report written a row at the time
+
+    Header is written when the file is opened and each result is then
+    appended as a new table row, so that the cost of updating the report
+    doesn't depend on the number of results already written to it. Web
+    browsers can show the report before its closing tags are written.
+    """
+
+    def __init__(self, filename: str, title: str, css: str = ''):
+        self.filename = filename
+        self.title = title
+        self.css = css
+        self._file: typing.Optional[typing.TextIO] = None
+
+    def open(self):
+        if self._file is None:
+            tobiko.makedirs(os.path.dirname(self.filename))
+            self._file = open(self.filename, 'w', encoding='utf-8')
+            self._write(self.render_header())
+
+    def close(self):
+        if self._file is not None:
+            self._write(self.render_footer())
+            self._file.close()
+            self._file = None
+
+    def write_result(self, record: ResultRecord):
+        self.open()
+        self._write(self.render_result(record))
+
+    def _write(self, text: str):
+        assert self._file is not None
+        # Fix encoding issues, e.g. with surrogates
+        self._file.write(text.encode('utf-8', errors='xmlcharrefreplace')
+                         .decode('utf-8'))
+        self._file.flush()
+
+    def render_header(self) -> str:
+        head = html.head(html.meta(charset='utf-8'),
+                         html.title(self.title),
+                         raw(f'<style>{self.css}</style>'))
+        header = html.thead(html.tr([html.th(column)
+                                     for column in RESULTS_TABLE_COLUMNS]),
+                            id='results-table-head')
+        return ('<!DOCTYPE html>\n<html>' + head.unicode(indent=0) +
+                '<body>' + html.h1(self.title).unicode(indent=0) +
+                '<table id="results-table">' + header.unicode(indent=0) +
+                '\n')
+
+    @staticmethod
+    def render_footer() -> str:
+        return '</table></body></html>\n'
+
+    @staticmethod
+    def render_result(record: ResultRecord) -> str:
+        result = record['result']
+        tbody = html.tbody(
+            html.tr(html.td(result, class_='col-result'),
+                    html.td(record['time'], class_='col-time'),
+                    html.td(record['nodeid'], class_='col-name'),
+                    html.td(record['description'] or ''),
+                    html.td(f"{record['duration']:.2f}",
+                            class_='col-duration')),
+            class_=f'{result.lower()} results-table-row')
+        if record['longrepr']:
+            tbody.append(html.tr(html.td(
+                html.div(html.pre(record['longrepr']), class_='log'),
+                class_='extra',
+                colspan=str(len(RESULTS_TABLE_COLUMNS)))))
+        return tbody.unicode(indent=0) + '\n'
+
+
+def render_html_report(results_file: str,
+                       html_file: str,
+                       title: str,
+                       css: str = ''):
+    """Writes an HTML report from results stored in given file on demand"""
+    report = StreamingHTMLReport(filename=html_file, title=title, css=css)
+    report.open()
+    try:
+        for record in ResultsStore(results_file).load():
+            report.write_result(record)
+    finally:
+        report.close()
@@ -15,8 +15,10 @@
 from __future__ import absolute_import
 
 from datetime import datetime
+import glob
 import os
 import subprocess
+import typing
 
 from oslo_log import log
 from py.xml import html  # pylint: disable=no-name-in-module,import-error
@@ -24,6 +26,7 @@ import pytest
 from pytest_html import plugin as html_plugin
 
 import tobiko
+from tobiko.tests import _report
 
 LOG = log.getLogger(__name__)
 
@@ -54,6 +57,10 @@ REPORT_HTML = (
     os.environ.get('TOX_REPORT_HTML') or
     REPORT_PREFIX + '.html')
 
+FIXTURE_PROFILE_PREFIX = (
+    os.environ.get('TOBIKO_FIXTURE_PROFILE') or
+    REPORT_PREFIX + '_fixtures')
+
 
 @pytest.hookimpl
 def pytest_configure(config):
@@ -62,6 +69,7 @@ def pytest_configure(config):
     configure_timeout(config)
     configure_junitxml(config)
     configure_html(config)
+    configure_fixture_profile(config)
 
 
 def configure_metadata(config):
@@ -129,31 +137,94 @@ def configure_html(config):
 
 class HTMLReport(html_plugin.HTMLReport):
 
-    session = None
-    last_html_generation: tobiko.Seconds = None
+    results_store: typing.Optional[_report.ResultsStore] = None
+    streaming_report: typing.Optional[_report.StreamingHTMLReport] = None
 
     def pytest_sessionstart(self, session):
         super().pytest_sessionstart(session)
-        self.session = session
+        self.config.hook.pytest_html_report_title(report=self)
+        css_file = os.path.join(os.path.dirname(html_plugin.__file__),
+                                'resources', 'style.css')
+        with open(css_file) as fd:
+            css = fd.read()
+        self.results_store = _report.ResultsStore(
+            os.path.splitext(self.logfile)[0] + '.jsonl')
+        self.streaming_report = _report.StreamingHTMLReport(
+            filename=self.logfile, title=self.title, css=css)
 
     def pytest_runtest_logreport(self, report):
         super().pytest_runtest_logreport(report)
 
-        # Avoid report regeneration ad an interval smaller than 10 seconds
-        now = tobiko.time()
-        if (self.last_html_generation is not None and
-                now - self.last_html_generation < 10.):
-            return
-        self.last_html_generation = now
+        # Test case results are known after its teardown: they are
+        # appended to the report files without regenerating them
+        if (report.when == 'teardown' and report.outcome != 'rerun' and
+                self.results_store is not None and
+                self.streaming_report is not None):
+            record = _report.make_result_record(
+                nodeid=report.nodeid, reports=self.reports[report.nodeid])
+            self.results_store.append(record)
+            self.streaming_report.write_result(record)
+
+    def pytest_sessionfinish(self, session):
+        if self.results_store is not None:
+            self.results_store.close()
+        if self.streaming_report is not None:
+            self.streaming_report.close()
+        LOG.debug("Generate final HTML test report files...")
+        super().pytest_sessionfinish(session)
+        LOG.debug("HTML test report files generated")
+
+
+def is_xdist_worker(config) -> bool:
+    return hasattr(config, 'workerinput')
 
-        LOG.debug("Update HTML test report files...")
-        temp_report = html_plugin.HTMLReport(logfile=self.logfile,
-                                             config=self.config)
-        # pylint: disable=attribute-defined-outside-init
-        temp_report.suite_start_time = self.suite_start_time
-        temp_report.reports = dict(self.reports)
-        temp_report.pytest_sessionfinish(self.session)
-        LOG.debug("HTML test report files updated")
+
+def configure_fixture_profile(config):
+    if not tobiko.tobiko_config().common.fixture_profile:
+        return
+    if not is_xdist_worker(config):
+        # Remove calls recorded by previous test sessions
+        for filename in glob.glob(FIXTURE_PROFILE_PREFIX + '-*.jsonl'):
+            os.remove(filename)
+    tobiko.enable_fixture_profiler()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    # pylint: disable=unused-argument
+    profiler = tobiko.get_fixture_profiler()
+    if profiler is not None:
+        profiler.test_id = item.nodeid
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.test_id = None
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    profiler = tobiko.get_fixture_profiler()
+    if profiler is None:
+        return
+    # Every xdist worker writes its own calls, then the controller (that
+    # finishes after all of them) merges them into the reports
+    profiler.dump(f'{FIXTURE_PROFILE_PREFIX}-{profiler.worker}.jsonl')
+    if not is_xdist_worker(session.config):
+        records = tobiko.load_fixture_calls(
+            sorted(glob.glob(FIXTURE_PROFILE_PREFIX + '-*.jsonl')))
+        summary = tobiko.write_fixture_profile(
+            records,
+            prefix=FIXTURE_PROFILE_PREFIX,
+            top=tobiko.tobiko_config().common.fixture_profile_top)
+        slowest = [fixture for fixture in summary['fixtures']
+                   if fixture['name'] in summary['slowest']]
+        LOG.info("Slowest fixtures:\n" +
+                 '\n'.join(f"  {fixture['name']}: "
+                           f"{fixture['total_time']:.3f} s "
+                           f"({fixture['setups']} setups, "
+                           f"{fixture['cache_hits']} cache hits)"
+                           for fixture in slowest))
 
 
 def set_default_inicfg(config, key, default):
@@ -226,6 +297,18 @@ def pytest_html_report_title(report):
     report.title = f"Tobiko test results ({REPORT_NAME})"
 
 
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    setup_required_fixtures(item)
+
+
+def setup_required_fixtures(item):
+    workers_count = tobiko.tobiko_config().common.fixture_setup_workers
+    if workers_count is not None and workers_count > 1:
+        # Set up independent required fixtures concurrently
+        tobiko.setup_fixtures([item.obj], workers_count=workers_count)
+
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_call(item):
     # pylint: disable=unused-argument
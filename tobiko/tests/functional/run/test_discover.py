@@ -15,12 +15,21 @@
 #    under the License.
 from __future__ import absolute_import
 
+import ast
 import os
+import sys
+import textwrap
 import typing
 
+import fixtures
 import testtools
 
+from tobiko.common import _loader
 from tobiko import run
+from tobiko.run import _cache
+from tobiko.run import _config
+from tobiko.run import _discover
+from tobiko.run import _static
 
 
 class DiscoverTestIdsTest(testtools.TestCase):
@@ -52,3 +61,171 @@ class DiscoverTestIdsTest(testtools.TestCase):
 
     def test_find_test_ids_with_forked(self):
         self.test_find_test_ids(forked=True)
+
+
+BASE_MODULE = """
+import unittest
+
+
+class BaseTest(unittest.TestCase):
+
+    def test_base(self):
+        pass
+
+
+class Mixin:
+
+    def test_mixin(self):
+        pass
+"""
+
+TEST_MODULE = """
+from mypkg import base
+from mypkg.base import BaseTest
+
+
+class MyTest(base.Mixin, base.BaseTest):
+
+    def test_one(self):
+        pass
+
+    def helper(self):
+        pass
+
+
+class NotATest(base.Mixin):
+    pass
+"""
+
+
+class DiscoverCacheTest(testtools.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.python_dir = self.useFixture(fixtures.TempDir()).path
+        self.package_dir = os.path.join(self.python_dir, 'mypkg')
+        os.mkdir(self.package_dir)
+        self.write_file('__init__.py', '')
+        self.write_file('base.py', BASE_MODULE)
+        self.test_file = self.write_file('test_my.py', TEST_MODULE)
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.config = _config.RunConfigFixture()
+        self.config.discover_cache_file = os.path.join(cache_dir,
+                                                       'discover.json')
+
+    def write_file(self, name: str, text: str) -> str:
+        path = os.path.join(self.package_dir, name)
+        with open(path, 'w') as fd:
+            fd.write(textwrap.dedent(text))
+        return path
+
+    @staticmethod
+    def unload_package():
+        for module_name in list(sys.modules):
+            if module_name.split('.', 1)[0] == 'mypkg':
+                del sys.modules[module_name]
+
+    def discover_test_ids(self) -> typing.List[str]:
+        return run.discover_test_ids(test_files=[self.test_file],
+                                     python_path=[self.python_dir],
+                                     config=self.config)
+
+    def test_discover_test_ids(self):
+        self.assertEqual(['mypkg.test_my.BaseTest.test_base',
+                          'mypkg.test_my.MyTest.test_base',
+                          'mypkg.test_my.MyTest.test_mixin',
+                          'mypkg.test_my.MyTest.test_one'],
+                         self.discover_test_ids())
+
+    def test_discover_test_ids_from_cache(self):
+        expected = self.discover_test_ids()
+        self.useFixture(fixtures.MockPatchObject(
+            _discover, 'discover_file_entry',
+            side_effect=AssertionError('Test file not in cache')))
+        self.assertEqual(expected, self.discover_test_ids())
+
+    def test_discover_test_ids_when_base_changed(self):
+        self.discover_test_ids()
+        self.write_file('base.py',
+                        BASE_MODULE + '\n    def test_two(self):\n'
+                                      '        pass\n')
+        os.utime(os.path.join(self.package_dir, 'base.py'), ns=(0, 0))
+        self.assertIn('mypkg.test_my.MyTest.test_two',
+                      self.discover_test_ids())
+
+    def test_forked_discover_test_ids_from_cache(self):
+        expected = self.discover_test_ids()
+        self.useFixture(fixtures.MockPatchObject(
+            _discover, 'discover_file_entry',
+            side_effect=AssertionError('Test file not in cache')))
+        self.assertEqual(expected, run.forked_discover_test_ids(
+            test_files=[self.test_file],
+            python_path=[self.python_dir],
+            config=self.config))
+
+    def test_discover_test_ids_with_external_base(self):
+        self.write_file('scenarios.py', """
+            import testscenarios
+
+
+            class Base(testscenarios.TestWithScenarios):
+                pass
+            """)
+        self.test_file = self.write_file('test_scenarios.py', """
+            from mypkg import scenarios
+
+
+            class MyTest(scenarios.Base):
+
+                def test_one(self):
+                    pass
+            """)
+        self.useFixture(fixtures.PythonPathEntry(self.python_dir))
+        self.useFixture(fixtures.MockPatchObject(
+            _loader, 'LOADERS', _loader.LoaderManager()))
+        self.addCleanup(self.unload_package)
+        index = _static.StaticIndex([self.python_dir])
+        index.packages.add('mypkg')
+        self.assertRaises(_static.StaticDiscoveryError,
+                          index.discover_module_test_ids,
+                          'mypkg.test_scenarios')
+        self.assertEqual(['mypkg.test_scenarios.MyTest.test_one'],
+                         self.discover_test_ids())
+
+    def test_cache_with_invalid_file(self):
+        with open(self.config.discover_cache_file, 'w') as fd:
+            fd.write('<invalid>')
+        cache = _cache.DiscoverCache(self.config.discover_cache_file)
+        self.assertIsNone(cache.get(self.test_file, 'mypkg.test_my'))
+
+
+class StaticIndexTest(testtools.TestCase):
+
+    def test_discover_module_test_ids(self):
+        python_dirs = _discover.get_python_dirs()
+        module_name = _discover.get_test_module_name(
+            os.path.realpath(__file__), python_dirs)
+        index = _static.StaticIndex(python_dirs)
+        test_ids, files = index.discover_module_test_ids(module_name)
+        self.assertEqual(_discover.discover_module_test_ids(module_name),
+                         test_ids)
+        self.assertIn(os.path.realpath(__file__), files)
+
+    def test_discover_module_test_ids_with_dynamic_member(self):
+        python_dirs = _discover.get_python_dirs()
+        index = _static.StaticIndex(python_dirs)
+        self.assertRaises(_static.StaticDiscoveryError,
+                          index.discover_module_test_ids,
+                          'tobiko.tests.unit.test_skip')
+
+    def test_get_decorator_names(self):
+        node = ast.parse(textwrap.dedent("""
+            @abc.abstractmethod
+            @mock.patch.object(os, 'getcwd')
+            @property
+            def f():
+                pass
+            """)).body[0]
+        self.assertEqual(['abc.abstractmethod', 'mock.patch.object',
+                          'property'],
+                         _static.get_decorator_names(node))
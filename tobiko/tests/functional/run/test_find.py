@@ -43,3 +43,8 @@ class FindTestFilesTest(testtools.TestCase):
     def test_find_test_files_with_test_dir(self):
         return self.test_find_test_files(
             test_path=[os.path.dirname(__file__)])
+
+    def test_find_test_files_with_missing_dir(self):
+        self.assertRaises(FileNotFoundError, run.find_test_files,
+                          test_path=[os.path.join(os.path.dirname(__file__),
+                                                  'missing', 'test_*.py')])
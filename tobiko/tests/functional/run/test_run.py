@@ -54,3 +54,31 @@ class RunTestsTest(unittest.TestCase):
         test_dir = os.path.dirname(__file__)
         result = run.run_tests(test_path=test_dir)
         self.assertGreater(result.testsRun, 0)
+
+    @nested_test_case
+    def test_run_tests_with_forked(self):
+        result = run.run_tests(__file__, forked=True)
+        self.assertGreater(result.testsRun, 0)
+        self.assertEqual([], result.errors)
+        self.assertEqual([], result.failures)
+
+
+class SkippingTest(unittest.TestCase):
+
+    def test_skip(self):
+        self.skipTest('skipped on purpose')
+
+
+class RunTestIdsTest(unittest.TestCase):
+
+    @nested_test_case
+    def test_run_test_ids_with_forked(self):
+        test_ids = [f'{__name__}.RunTestsTest.test_run_tests',
+                    f'{__name__}.RunTestsTest.test_run_tests_with_dir',
+                    f'{__name__}.SkippingTest.test_skip']
+        result = run.run_test_ids(test_ids=test_ids, forked=True, check=False)
+        self.assertGreaterEqual(result.testsRun, 3)
+        self.assertEqual([], result.errors)
+        self.assertEqual([], result.failures)
+        self.assertIn(f'{__name__}.SkippingTest.test_skip',
+                      [test.id() for test, _ in result.skipped])
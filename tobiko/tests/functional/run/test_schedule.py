@@ -0,0 +1,99 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import testtools
+
+import tobiko
+from tobiko.run import _schedule
+
+
+class MyFixture1(tobiko.SharedFixture):
+    pass
+
+
+class MyFixture2(tobiko.SharedFixture):
+    pass
+
+
+class Fixture1Test(testtools.TestCase):
+
+    fixture = tobiko.required_fixture(MyFixture1)
+
+    def test_1(self):
+        pass
+
+    def test_2(self):
+        pass
+
+
+class Fixture1And2Test(testtools.TestCase):
+
+    fixture = tobiko.required_fixture(MyFixture1)
+
+    def test_1(self, fixture2=MyFixture2):
+        pass
+
+
+class Fixture2Test(testtools.TestCase):
+
+    fixture = tobiko.required_fixture(MyFixture2)
+
+    def test_1(self):
+        pass
+
+    def test_2(self):
+        pass
+
+
+class NoFixtureTest(testtools.TestCase):
+
+    def test_1(self):
+        pass
+
+
+class ScheduleTestIdsTest(testtools.TestCase):
+
+    test_ids = [f'{__name__}.Fixture1Test.test_1',
+                f'{__name__}.Fixture2Test.test_1',
+                f'{__name__}.Fixture1And2Test.test_1',
+                f'{__name__}.Fixture1Test.test_2',
+                f'{__name__}.Fixture2Test.test_2',
+                f'{__name__}.NoFixtureTest.test_1']
+
+    def test_schedule_test_ids(self):
+        groups = _schedule.schedule_test_ids(self.test_ids, workers_count=2)
+        self.assertEqual(
+            [[f'{__name__}.Fixture1Test.test_1',
+              f'{__name__}.Fixture1Test.test_2',
+              f'{__name__}.Fixture1And2Test.test_1'],
+             [f'{__name__}.Fixture2Test.test_1',
+              f'{__name__}.Fixture2Test.test_2',
+              f'{__name__}.NoFixtureTest.test_1']],
+            groups)
+
+    def test_schedule_test_ids_with_one_worker(self):
+        groups = _schedule.schedule_test_ids(self.test_ids, workers_count=1)
+        self.assertEqual([sorted(self.test_ids)], [sorted(groups[0])])
+        self.assertEqual(1, len(groups))
+
+    def test_schedule_test_ids_with_many_workers(self):
+        groups = _schedule.schedule_test_ids(self.test_ids, workers_count=10)
+        self.assertEqual(4, len(groups))
+        self.assertEqual(sorted(self.test_ids),
+                         sorted(test_id
+                                for group in groups
+                                for test_id in group))
@@ -0,0 +1,120 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+from http import server
+import re
+import socketserver
+import threading
+import time
+import typing
+
+
+RANGE_HEADER = re.compile(r'^bytes=(?P<start>\d+)-(?P<stop>\d*)$')
+
+
+class FileServer(socketserver.ThreadingMixIn, server.HTTPServer):
+    """Local HTTP server standing for an image files server
+
+    Files are served from a dictionary of contents indexed by URL path. It
+    supports single range requests and it can simulate slow or broken
+    connections.
+    """
+
+    daemon_threads = True
+
+    def __init__(self,
+                 files: typing.Dict[str, bytes] = None,
+                 accept_ranges=True,
+                 bandwidth: int = None):
+        super().__init__(('127.0.0.1', 0), FileRequestHandler)
+        self.files = dict(files or {})
+        self.accept_ranges = accept_ranges
+        #: bytes per second sent by every connection (unlimited when None)
+        self.bandwidth = bandwidth
+        #: number of body bytes to be sent before breaking next connection
+        self.break_after: typing.Optional[int] = None
+        #: (method, path, range header) of every request received
+        self.requests: typing.List[typing.Tuple[str, str, str]] = []
+        self._thread = threading.Thread(target=self.serve_forever,
+                                        kwargs={'poll_interval': 0.05},
+                                        daemon=True)
+
+    def url(self, path: str) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}{path}'
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+
+class FileRequestHandler(server.BaseHTTPRequestHandler):
+
+    server: FileServer
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    def do_HEAD(self):
+        self._send_file(send_body=False)
+
+    def do_GET(self):
+        self._send_file(send_body=True)
+
+    def _send_file(self, send_body: bool):
+        range_header = self.headers.get('Range') or ''
+        self.server.requests.append((self.command, self.path, range_header))
+        content = self.server.files.get(self.path)
+        if content is None:
+            self.send_error(404)
+            return
+        start, stop = 0, len(content)
+        match = RANGE_HEADER.match(range_header)
+        if match is not None and self.server.accept_ranges:
+            start = int(match.group('start'))
+            if match.group('stop'):
+                stop = min(stop, int(match.group('stop')) + 1)
+            if start >= len(content):
+                self.send_error(416)
+                return
+            self.send_response(206)
+            self.send_header('Content-Range',
+                             f'bytes {start}-{stop - 1}/{len(content)}')
+        else:
+            self.send_response(200)
+        if self.server.accept_ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(stop - start))
+        self.send_header('ETag', f'"{hash(content)}"')
+        self.end_headers()
+        if send_body:
+            self._send_body(content[start:stop])
+
+    def _send_body(self, body: bytes):
+        break_after = self.server.break_after
+        if break_after is not None:
+            self.server.break_after = None
+            body = body[:break_after]
+            self.close_connection = True
+        chunk_size = 64 * 1024
+        for offset in range(0, len(body), chunk_size):
+            self.wfile.write(body[offset:offset + chunk_size])
+            if self.server.bandwidth:
+                time.sleep(chunk_size / self.server.bandwidth)
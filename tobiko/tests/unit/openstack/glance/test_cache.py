@@ -0,0 +1,212 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import hashlib
+import os
+
+import requests
+
+from tobiko.openstack import glance
+from tobiko.openstack.glance import _cache
+from tobiko.tests import unit
+from tobiko.tests.unit.openstack.glance import _http
+
+
+CONTENT = bytes(range(256)) * 1024
+CHECKSUM = hashlib.sha256(CONTENT).hexdigest()
+
+# Raised when the connection is closed before the whole file is received
+DOWNLOAD_ERRORS = (glance.ImageCacheError, requests.RequestException)
+
+
+class ParseChecksumsTest(unit.TobikoUnitTest):
+
+    def test_parse_checksums(self):
+        text = (f"{CHECKSUM.upper()}  image.img\n"
+                f"{'1' * 64} *dir/other.img\n"
+                f"SHA256 (bsd.img) = {'2' * 64}\n"
+                f"{'3' * 32}  md5.img\n"
+                "garbage\n")
+        self.assertEqual({'image.img': CHECKSUM,
+                          'other.img': '1' * 64,
+                          'bsd.img': '2' * 64},
+                         glance.parse_checksums(text))
+
+
+class ImageCacheTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.server = _http.FileServer(files={
+            '/image.img': CONTENT,
+            '/SHA256SUMS': f'{CHECKSUM}  image.img\n'.encode()})
+        self.enterContext(self.server)
+        self.url = self.server.url('/image.img')
+        self.cache = glance.ImageCache(cache_dir=self.create_tempdir(),
+                                       chunk_size=64 * 1024)
+
+    def enterContext(self, context):
+        result = context.__enter__()
+        self.addCleanup(context.__exit__, None, None, None)
+        return result
+
+    def assert_cached(self, cached_file: str):
+        self.assertEqual(self.cache.get_file(CHECKSUM), cached_file)
+        with open(cached_file, 'rb') as fd:
+            self.assertEqual(CONTENT, fd.read())
+
+    def get_requests(self, method='GET'):
+        return [(path, range_header)
+                for command, path, range_header in self.server.requests
+                if command == method]
+
+    def test_fetch(self):
+        cached_file = self.cache.fetch(self.url)
+        self.assert_cached(cached_file)
+        self.assertEqual([('/image.img', '')], self.get_requests())
+
+    def test_fetch_twice(self):
+        cached_file = self.cache.fetch(self.url)
+        self.assertEqual(cached_file, self.cache.fetch(self.url))
+        # Second time only the HEAD request is sent
+        self.assertEqual(1, len(self.get_requests()))
+        self.assertEqual(2, len(self.get_requests('HEAD')))
+
+    def test_fetch_when_changed(self):
+        self.cache.fetch(self.url)
+        self.server.files['/image.img'] = b'changed'
+        cached_file = self.cache.fetch(self.url)
+        with open(cached_file, 'rb') as fd:
+            self.assertEqual(b'changed', fd.read())
+
+    def test_fetch_with_checksum(self):
+        self.cache.fetch(self.url, checksum=CHECKSUM)
+        self.server.requests.clear()
+        cached_file = self.cache.fetch(self.server.url('/other.img'),
+                                       checksum=CHECKSUM.upper())
+        self.assert_cached(cached_file)
+        self.assertEqual([], self.server.requests)
+
+    def test_fetch_with_checksums_url(self):
+        cached_file = self.cache.fetch(
+            self.url, checksums_url=self.server.url('/SHA256SUMS'))
+        self.assert_cached(cached_file)
+
+    def test_fetch_with_checksum_mismatch(self):
+        ex = self.assertRaises(glance.ImageChecksumMismatch,
+                               self.cache.fetch, self.url,
+                               checksum='0' * 64)
+        self.assertEqual(CHECKSUM, ex.actual)
+        self.assertIsNone(self.cache.get_file(CHECKSUM))
+
+    def test_fetch_resume(self):
+        self.server.break_after = 100000
+        self.assertRaises(DOWNLOAD_ERRORS, self.cache.fetch,
+                          self.url)
+        cached_file = self.cache.fetch(self.url)
+        self.assert_cached(cached_file)
+        self.assertEqual([('/image.img', ''),
+                          ('/image.img', 'bytes=100000-')],
+                         self.get_requests())
+
+    def test_fetch_without_ranges(self):
+        self.server.accept_ranges = False
+        self.server.break_after = 100000
+        self.assertRaises(DOWNLOAD_ERRORS, self.cache.fetch,
+                          self.url)
+        cached_file = self.cache.fetch(self.url)
+        self.assert_cached(cached_file)
+        self.assertEqual([('/image.img', ''), ('/image.img', '')],
+                         self.get_requests())
+
+    def test_fetch_parallel_ranges(self):
+        self.cache.workers_count = 3
+        cached_file = self.cache.fetch(self.url)
+        self.assert_cached(cached_file)
+        self.assertEqual({'bytes=0-87381', 'bytes=87382-174763',
+                          'bytes=174764-262143'},
+                         {range_header
+                          for _, range_header in self.get_requests()})
+
+    def test_fetch_parallel_ranges_resume(self):
+        self.cache.workers_count = 3
+        self.server.break_after = 1000
+        self.assertRaises(DOWNLOAD_ERRORS, self.cache.fetch,
+                          self.url)
+        self.server.requests.clear()
+        cached_file = self.cache.fetch(self.url)
+        self.assert_cached(cached_file)
+        # Only the broken range is requested again
+        self.assertEqual(1, len(self.get_requests()))
+
+    def test_fetch_parallel_ranges_when_changed(self):
+        self.cache.workers_count = 3
+        self.server.break_after = 1000
+        self.assertRaises(DOWNLOAD_ERRORS, self.cache.fetch,
+                          self.url)
+        changed = CONTENT[::-1]
+        self.server.files['/image.img'] = changed
+        self.server.requests.clear()
+        cached_file = self.cache.fetch(self.url)
+        with open(cached_file, 'rb') as fd:
+            self.assertEqual(changed, fd.read())
+        # Parts of the old file are not resumed
+        self.assertEqual(3, len(self.get_requests()))
+
+    def create_seed_file(self, content: bytes = CONTENT) -> str:
+        seed_file = os.path.join(self.create_tempdir(), 'image.img')
+        with open(seed_file, 'wb') as fd:
+            fd.write(content)
+        return seed_file
+
+    def test_fetch_with_seed_file(self):
+        seed_file = self.create_seed_file()
+        cached_file = self.cache.fetch(self.url, checksum=CHECKSUM,
+                                       seed_file=seed_file)
+        self.assert_cached(cached_file)
+        self.assertEqual([], self.get_requests())
+
+    def test_fetch_with_seed_file_and_checksums_url(self):
+        seed_file = self.create_seed_file()
+        cached_file = self.cache.fetch(
+            self.url, checksums_url=self.server.url('/SHA256SUMS'),
+            seed_file=seed_file)
+        self.assert_cached(cached_file)
+        self.assertEqual(['/SHA256SUMS'],
+                         [path for path, _ in self.get_requests()])
+
+    def test_fetch_with_stale_seed_file(self):
+        seed_file = self.create_seed_file(b'x' * len(CONTENT))
+        cached_file = self.cache.fetch(self.url, checksum=CHECKSUM,
+                                       seed_file=seed_file)
+        self.assert_cached(cached_file)
+        self.assertEqual(1, len(self.get_requests()))
+
+    def test_fetch_with_seed_file_without_checksum(self):
+        seed_file = self.create_seed_file(b'x' * len(CONTENT))
+        cached_file = self.cache.fetch(self.url, seed_file=seed_file)
+        self.assert_cached(cached_file)
+        self.assertEqual(1, len(self.get_requests()))
+
+    def test_link_image_file(self):
+        cached_file = self.cache.fetch(self.url)
+        image_file = os.path.join(self.create_tempdir(), 'a', 'image.img')
+        self.assertEqual(image_file,
+                         _cache.link_image_file(cached_file, image_file))
+        self.assertTrue(os.path.samefile(cached_file, image_file))
+        self.assertEqual(image_file,
+                         _cache.link_image_file(cached_file, image_file))
@@ -0,0 +1,138 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import subprocess
+import unittest
+import zipfile
+
+from tobiko.openstack import glance
+from tobiko.openstack.glance import _pipeline
+from tobiko.tests import unit
+
+
+CONTENT = os.urandom(100000) * 5
+
+
+def compress_streams(compress, data: bytes, stream_size: int) -> bytes:
+    return b''.join(compress(data[i:i + stream_size])
+                    for i in range(0, len(data), stream_size))
+
+
+class ImageReaderTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = self.create_tempdir()
+
+    def write_file(self, name: str, data: bytes) -> str:
+        filename = os.path.join(self.temp_dir, name)
+        with open(filename, 'wb') as fd:
+            fd.write(data)
+        return filename
+
+    def read_image(self, filename: str, **params) -> bytes:
+        params.setdefault('workers_count', 3)
+        params.setdefault('buffers_count', 2)
+        with glance.open_image_reader(filename, **params) as reader:
+            data = b''.join(iter(lambda: reader.read(65536), b''))
+        self.assertEqual(len(data), reader.stats.read_bytes)
+        return data
+
+    def test_get_file_compression_type(self):
+        for compression_type, data in [('bz2', bz2.compress(b'x')),
+                                       ('gz', gzip.compress(b'x')),
+                                       ('xz', lzma.compress(b'x')),
+                                       (None, b'QFI\xfb')]:
+            filename = self.write_file('image', data)
+            self.assertEqual(compression_type,
+                             glance.get_file_compression_type(filename))
+
+    def test_read_gzip(self):
+        filename = self.write_file('image.gz', gzip.compress(CONTENT))
+        self.assertEqual(CONTENT, self.read_image(filename))
+
+    def test_read_zip(self):
+        filename = os.path.join(self.temp_dir, 'image.zip')
+        with zipfile.ZipFile(filename, 'w') as archive:
+            archive.writestr('image.qcow2', CONTENT)
+        self.assertEqual(CONTENT, self.read_image(filename))
+
+    def test_read_bz2_streams(self):
+        filename = self.write_file(
+            'image.bz2', compress_streams(bz2.compress, CONTENT, 120000))
+        segments = _pipeline.list_image_segments(filename, 'bz2')
+        self.assertEqual(5, len(segments))
+        self.assertEqual(CONTENT, self.read_image(filename))
+
+    def test_read_bz2_single_stream(self):
+        filename = self.write_file('image.bz2', bz2.compress(CONTENT))
+        self.assertIsNone(_pipeline.list_image_segments(filename, 'bz2'))
+        self.assertEqual(CONTENT, self.read_image(filename))
+
+    def test_read_xz_streams(self):
+        # Streams can be followed by padding made of null bytes
+        filename = self.write_file(
+            'image.xz', compress_streams(
+                lambda data: lzma.compress(data) + b'\x00' * 8,
+                CONTENT, 200000))
+        segments = _pipeline.list_image_segments(filename, 'xz')
+        self.assertEqual([200000, 200000, 100000],
+                         [s.uncompressed_size for s in segments])
+        self.assertEqual(CONTENT, self.read_image(filename))
+
+    @unittest.skipIf(shutil.which('xz') is None, "xz command not found")
+    def test_read_xz_blocks(self):
+        filename = self.write_file('image', CONTENT)
+        subprocess.run(['xz', '-T2', '--block-size=150000', filename],
+                       check=True)
+        filename += '.xz'
+        self.assertEqual(4, len(_pipeline.list_image_segments(filename,
+                                                              'xz')))
+        self.assertEqual(CONTENT, self.read_image(filename))
+
+    def test_read_with_invalid_segment(self):
+        data = bytearray(compress_streams(bz2.compress, CONTENT, 120000))
+        data[-100] ^= 0xff
+        filename = self.write_file('image.bz2', bytes(data))
+        self.assertRaises((glance.ImageDecompressError, OSError),
+                          self.read_image, filename)
+
+    def test_read_with_copy_file(self):
+        filename = self.write_file('image.gz', gzip.compress(CONTENT))
+        copy_file = filename + '.decompressed'
+        self.assertEqual(CONTENT, self.read_image(filename,
+                                                  copy_file=copy_file))
+        with open(copy_file, 'rb') as fd:
+            self.assertEqual(CONTENT, fd.read())
+
+    def test_close_before_end(self):
+        # Data is made of more chunks than read-ahead buffers
+        filename = self.write_file(
+            'image.gz', gzip.compress(CONTENT * 8, compresslevel=1))
+        copy_file = filename + '.decompressed'
+        reader = glance.open_image_reader(filename, buffers_count=1,
+                                          copy_file=copy_file)
+        self.assertEqual(CONTENT[:10], reader.read(10))
+        reader.close()
+        self.assertFalse(reader._thread.is_alive())
+        self.assertEqual([os.path.basename(filename)],
+                         os.listdir(self.temp_dir))
@@ -0,0 +1,246 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import threading
+import time
+import types
+
+from heatclient import exc
+from heatclient.v1 import client as heatclient
+import mock
+
+import tobiko
+from tobiko import config
+from tobiko.openstack import heat
+from tobiko.tests.unit import openstack
+
+
+class FakeStacks(object):
+    """In-memory stacks manager
+
+    Every list request makes stacks in progress move to the next status.
+    """
+
+    def __init__(self, delete_status='DELETE_COMPLETE'):
+        self.stacks = {}
+        self.delete_status = delete_status
+        self.lock = threading.Lock()
+        self.list_calls = []
+        self.creating = 0
+        self.max_creating = 0
+
+    def create(self, stack_name, template, parameters):
+        with self.lock:
+            self.stacks[stack_name] = 'CREATE_IN_PROGRESS'
+            self.creating += 1
+            self.max_creating = max(self.max_creating, self.creating)
+        return {'stack': {'id': stack_name}}
+
+    def delete(self, stack_id):
+        with self.lock:
+            if stack_id not in self.stacks:
+                raise exc.NotFound
+            self.stacks[stack_id] = 'DELETE_IN_PROGRESS'
+
+    def get(self, stack_name, resolve_outputs=False):
+        with self.lock:
+            if stack_name not in self.stacks:
+                raise exc.HTTPNotFound
+            return self.make_stack(stack_name)
+
+    def list(self, filters):
+        with self.lock:
+            self.list_calls.append(filters)
+            for name, status in list(self.stacks.items()):
+                if status == 'CREATE_IN_PROGRESS':
+                    self.stacks[name] = 'CREATE_COMPLETE'
+                    self.creating -= 1
+                elif status == 'DELETE_IN_PROGRESS':
+                    if self.delete_status == 'DELETE_COMPLETE':
+                        del self.stacks[name]
+                    else:
+                        self.stacks[name] = self.delete_status
+            return [self.make_stack(name)
+                    for name in filters['name']
+                    if name in self.stacks]
+
+    def make_stack(self, stack_name):
+        return types.SimpleNamespace(id=stack_name,
+                                     stack_name=stack_name,
+                                     stack_status=self.stacks[stack_name],
+                                     stack_status_reason='')
+
+
+class MockClient(mock.NonCallableMagicMock):
+    pass
+
+
+class MyStack(heat.HeatStackFixture):
+    template = heat.heat_template({'template': 'from-class'})
+    wait_interval = 0.01
+    # Mocks are not thread safe: avoid getting it from mocked session
+    project = 'my-project'
+
+
+class HeatStackPollerTest(openstack.OpenstackTest):
+
+    def setUp(self):
+        super().setUp()
+        self.client = MockClient()
+        self.client.stacks = self.stacks = FakeStacks()
+        self.poller = heat.HeatStackPoller(client=self.client, max_age=60.)
+
+    def test_get_stack(self):
+        self.stacks.create('a', None, None)
+        self.stacks.create('b', None, None)
+        self.assertEqual('CREATE_COMPLETE',
+                         self.poller.get_stack('a').stack_status)
+        # Stack 'b' has not been asked for yet
+        self.assertEqual([{'name': ['a']}], self.stacks.list_calls)
+        self.assertIsNone(self.poller.get_stack('c'))
+        self.assertEqual([{'name': ['a']}, {'name': ['c']}],
+                         self.stacks.list_calls)
+
+    def test_get_stack_when_recent(self):
+        self.stacks.create('a', None, None)
+        stack = self.poller.get_stack('a')
+        self.assertIs(stack, self.poller.get_stack('a'))
+        self.assertEqual(1, self.poller.polls_count)
+
+    def test_get_stack_when_invalidated(self):
+        self.stacks.create('a', None, None)
+        self.poller.get_stack('a')
+        self.stacks.delete('a')
+        self.poller.invalidate('a')
+        self.assertIsNone(self.poller.get_stack('a'))
+        self.assertEqual(2, self.poller.polls_count)
+
+    def test_get_stack_while_polling(self):
+        self.poller = heat.HeatStackPoller(client=self.client, max_age=0.)
+        self.stacks.create('a', None, None)
+        self.stacks.list({'name': ['a']})  # CREATE_COMPLETE
+        polling = threading.Event()
+        waiting = threading.Event()
+        stacks_list = self.stacks.list
+
+        def list_stacks(filters):
+            if not polling.is_set():
+                polling.set()
+                # Wait for the other thread to ask for the same stack
+                waiting.wait(timeout=10.)
+                time.sleep(0.1)
+            return stacks_list(filters)
+
+        self.stacks.list = list_stacks
+        thread = threading.Thread(target=self.poller.get_stack, args=('a',))
+        thread.start()
+        self.addCleanup(thread.join)
+        polling.wait(timeout=10.)
+        waiting.set()
+        stack = self.poller.get_stack('a')
+        self.assertEqual('CREATE_COMPLETE', stack.stack_status)
+
+    def test_get_stack_concurrently(self):
+        names = [f'stack-{i}' for i in range(10)]
+        for name in names:
+            self.stacks.create(name, None, None)
+        list_calls = []
+        started = threading.Barrier(len(names))
+        stacks_list = self.stacks.list
+
+        def list_stacks(filters):
+            list_calls.append(filters)
+            # Give other threads the time to ask for their stacks
+            time.sleep(0.1)
+            return stacks_list(filters)
+
+        self.stacks.list = list_stacks
+        results = {}
+
+        def get_stack(name):
+            started.wait()
+            results[name] = self.poller.get_stack(name).stack_status
+
+        threads = [threading.Thread(target=get_stack, args=(name,))
+                   for name in names]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual({name: 'CREATE_COMPLETE' for name in names},
+                         results)
+        # Every stack is listed only once
+        self.assertEqual(sorted(names),
+                         sorted(name
+                                for filters in list_calls
+                                for name in filters['name']))
+        self.assertLessEqual(len(list_calls), 3)
+
+
+class CreateStacksTest(openstack.OpenstackTest):
+
+    def setUp(self):
+        super().setUp()
+        self.patch(heatclient, 'Client', MockClient)
+        self.client = MockClient()
+        self.client.stacks = self.stacks = FakeStacks()
+        self.poller = heat.HeatStackPoller(client=self.client, max_age=0.)
+        self.patch(heat._poller, 'get_stack_poller',
+                   return_value=self.poller)
+        # Keep track of tests using these stacks apart from other test
+        # processes running at the same time
+        self.patch(config.CONF.tobiko.common, 'shelves_dir',
+                   self.create_tempdir())
+
+    def make_stacks(self, count=8):
+        stacks = [MyStack(stack_name=f'stack-{i}', client=self.client)
+                  for i in range(count)]
+        for stack in stacks:
+            self.addCleanup(tobiko.removeme_from_shared_resource,
+                            'tobiko.openstack.heat._stack', stack.stack_name)
+        return stacks
+
+    def test_create_stacks(self):
+        stacks = self.make_stacks()
+        self.assertEqual(stacks, heat.create_stacks(stacks,
+                                                    workers_count=4))
+        for stack in stacks:
+            self.assertIs(self.poller, stack.stack_poller)
+            self.assertEqual('CREATE_COMPLETE', stack.stack.stack_status)
+        self.assertEqual({stack.stack_name: 'CREATE_COMPLETE'
+                          for stack in stacks}, self.stacks.stacks)
+
+    def test_create_stacks_with_limiter(self):
+        stacks = self.make_stacks()
+        heat.create_stacks(stacks, workers_count=8,
+                           limiter=heat.ProjectStackLimiter(max_stacks=2))
+        self.assertLessEqual(self.stacks.max_creating, 2)
+        self.assertEqual(8, len(self.stacks.stacks))
+
+    def test_delete_stacks(self):
+        stacks = self.make_stacks()
+        heat.create_stacks(stacks, workers_count=4)
+        self.assertEqual(stacks, heat.delete_stacks(stacks,
+                                                    workers_count=4))
+        self.assertEqual({}, self.stacks.stacks)
+
+    def test_delete_stacks_when_failed(self):
+        stacks = self.make_stacks(count=2)
+        heat.create_stacks(stacks, workers_count=2)
+        self.stacks.delete_status = 'DELETE_FAILED'
+        self.assertRaises(heat.HeatStackDeletionFailed, heat.delete_stacks,
+                          stacks, workers_count=2)
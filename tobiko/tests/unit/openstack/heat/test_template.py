@@ -19,6 +19,7 @@ from heatclient.common import template_utils
 
 import tobiko
 from tobiko.openstack import heat
+from tobiko.openstack.heat import _template
 from tobiko.tests.unit import openstack
 
 
@@ -45,3 +46,84 @@ class HeatTemplateFileTest(openstack.OpenstackTest):
         self.assertEqual(template_files, template.template_files)
         template_yaml = tobiko.dump_yaml(template_dict)
         self.assertEqual(template_yaml, template.template_yaml)
+
+
+class HeatTemplateCacheTest(openstack.OpenstackTest):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = heat.HeatTemplateCache()
+        self.patch(_template, 'TEMPLATE_CACHE', self.cache)
+        self.template_dir = self.create_tempdir()
+        self.template_file = self.write_file(
+            'stack.yaml',
+            "heat_template_version: 2015-04-30\n"
+            "resources:\n"
+            "  config:\n"
+            "    type: OS::Heat::SoftwareConfig\n"
+            "    properties:\n"
+            "      config: {get_file: config.sh}\n")
+        self.config_file = self.write_file('config.sh', 'true\n')
+        self.get_template_contents = self.patch(
+            template_utils, 'get_template_contents',
+            side_effect=template_utils.get_template_contents)
+
+    def write_file(self, filename: str, content: str) -> str:
+        filename = os.path.join(self.template_dir, filename)
+        with open(filename, 'w') as fd:
+            fd.write(content)
+        return filename
+
+    def test_get_template(self):
+        entry = self.cache.get_template(self.template_file)
+        self.assertEqual(self.template_file, entry.template_file)
+        config_url = f'file://{self.config_file}'
+        self.assertEqual({'get_file': config_url},
+                         entry.template['resources']['config']['properties'][
+                             'config'])
+        self.assertEqual({config_url: b'true\n'}, entry.template_files)
+        self.assertEqual(tobiko.dump_yaml(entry.template),
+                         entry.template_yaml)
+        self.assertIs(entry, self.cache.get_template(self.template_file))
+        self.assertEqual(1, self.get_template_contents.call_count)
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    def test_get_template_when_modified(self):
+        entry = self.cache.get_template(self.template_file)
+        self.write_file('stack.yaml', "heat_template_version: 2015-04-30\n"
+                                      "resources: {}\n")
+        new_entry = self.cache.get_template(self.template_file)
+        self.assertIsNot(entry, new_entry)
+        self.assertEqual({}, new_entry.template['resources'])
+
+    def test_get_template_when_required_file_modified(self):
+        self.cache.get_template(self.template_file)
+        self.write_file('config.sh', 'false\n')
+        entry = self.cache.get_template(self.template_file)
+        self.assertEqual([b'false\n'], list(entry.template_files.values()))
+        self.assertEqual(2, self.get_template_contents.call_count)
+
+    def test_find_template_file(self):
+        template_dirs = [self.create_tempdir(), self.template_dir]
+        self.assertEqual(self.template_file,
+                         self.cache.find_template_file('stack.yaml',
+                                                       template_dirs))
+        exists = self.patch(os.path, 'exists', return_value=True)
+        self.assertEqual(self.template_file,
+                         self.cache.find_template_file('stack.yaml',
+                                                       template_dirs))
+        # Only the path found before is checked
+        exists.assert_called_once_with(self.template_file)
+
+    def test_find_template_file_when_missing(self):
+        self.assertRaises(IOError, self.cache.find_template_file,
+                          'missing.yaml', [self.template_dir])
+
+    def test_heat_template_files_share_template(self):
+        templates = [
+            heat.heat_template_file('stack.yaml',
+                                    template_dirs=[self.template_dir])
+            for _ in range(2)]
+        for template in templates:
+            tobiko.setup_fixture(template)
+        self.assertIs(templates[0].template, templates[1].template)
@@ -0,0 +1,119 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import datetime
+import os
+from unittest import mock
+
+from keystoneauth1 import access
+from keystoneauth1 import loading
+
+from tobiko.openstack import keystone
+from tobiko.tests import unit
+
+
+def create_auth(password='this is a secret'):
+    loader = loading.get_plugin_loader('password')
+    return loader.load_from_options(auth_url='http://127.0.0.1:5000/v3',
+                                    username='demo',
+                                    password=password,
+                                    project_name='demo',
+                                    user_domain_name='Default',
+                                    project_domain_name='Default')
+
+
+class KeystoneTokenCacheTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = keystone.KeystoneTokenCache(
+            cache_dir=self.create_tempdir(), renew_before=300.)
+        self.tokens = iter(f'token-{i}' for i in range(100))
+        self.expires_in = datetime.timedelta(hours=1)
+
+    def bind_auth(self, **params):
+        auth = create_auth(**params)
+        auth.get_auth_ref = mock.Mock(side_effect=self.authenticate)
+        self.assertTrue(self.cache.bind(auth))
+        return auth
+
+    def authenticate(self, session):
+        expires_at = datetime.datetime.utcnow() + self.expires_in
+        body = {'token': {'expires_at': expires_at.isoformat() + 'Z',
+                          'catalog': [{'type': 'compute',
+                                       'name': 'nova',
+                                       'endpoints': []}]}}
+        return access.create(body=body, auth_token=next(self.tokens))
+
+    def test_get_access(self):
+        auth = self.bind_auth()
+        auth_ref = auth.get_access(session=mock.Mock())
+        self.assertEqual('token-0', auth_ref.auth_token)
+        self.assertEqual(1, auth.get_auth_ref.call_count)
+        self.assertIs(auth_ref, auth.get_access(session=mock.Mock()))
+        self.assertEqual(1, auth.get_auth_ref.call_count)
+
+    def test_get_access_from_other_process(self):
+        self.bind_auth().get_access(session=mock.Mock())
+        auth = self.bind_auth()
+        auth_ref = auth.get_access(session=mock.Mock())
+        self.assertEqual('token-0', auth_ref.auth_token)
+        self.assertTrue(auth_ref.service_catalog.get_endpoints())
+        auth.get_auth_ref.assert_not_called()
+
+    def test_get_access_with_other_credentials(self):
+        self.bind_auth().get_access(session=mock.Mock())
+        auth = self.bind_auth(password='other secret')
+        self.assertEqual('token-1',
+                         auth.get_access(session=mock.Mock()).auth_token)
+        auth.get_auth_ref.assert_called_once()
+
+    def test_get_access_when_expiring_soon(self):
+        self.expires_in = datetime.timedelta(seconds=200)
+        self.bind_auth().get_access(session=mock.Mock())
+        self.expires_in = datetime.timedelta(hours=1)
+        auth = self.bind_auth()
+        self.assertEqual('token-1',
+                         auth.get_access(session=mock.Mock()).auth_token)
+        # renewed token is shared
+        auth = self.bind_auth()
+        self.assertEqual('token-1',
+                         auth.get_access(session=mock.Mock()).auth_token)
+        auth.get_auth_ref.assert_not_called()
+
+    def list_cache_files(self):
+        return [filename
+                for filename in os.listdir(self.cache.cache_dir)
+                if filename.endswith('.json')]
+
+    def test_invalidate(self):
+        auth = self.bind_auth()
+        auth.get_access(session=mock.Mock())
+        self.assertEqual(1, len(self.list_cache_files()))
+        self.assertTrue(auth.invalidate())
+        self.assertEqual([], self.list_cache_files())
+        auth = self.bind_auth()
+        self.assertEqual('token-1',
+                         auth.get_access(session=mock.Mock()).auth_token)
+
+    def test_cache_file_is_private(self):
+        self.bind_auth().get_access(session=mock.Mock())
+        cache_files = self.list_cache_files()
+        self.assertEqual(1, len(cache_files))
+        mode = os.stat(os.path.join(self.cache.cache_dir,
+                                    cache_files[0])).st_mode
+        self.assertEqual(0o600, mode & 0o777)
@@ -0,0 +1,217 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import types
+
+import mock
+import novaclient.exceptions
+
+from tobiko.openstack import nova
+from tobiko.tests.unit import openstack
+
+
+class FakeServers(object):
+    """In-memory servers manager
+
+    Every list request makes every server move to the next of its
+    statuses.
+    """
+
+    def __init__(self):
+        self.statuses = {}
+        self.updated = {}
+        self.hidden = set()
+        self.list_calls = []
+        self.get_calls = []
+        self.actions = []
+        self.clock = 0
+
+    def add(self, server_id, *statuses, hidden=False):
+        self.statuses[server_id] = list(statuses)
+        self.updated[server_id] = self.clock
+        if hidden:
+            self.hidden.add(server_id)
+
+    def list(self, search_opts=None):
+        self.list_calls.append(search_opts)
+        self.clock += 1
+        for server_id, statuses in self.statuses.items():
+            if len(statuses) > 1:
+                statuses.pop(0)
+                self.updated[server_id] = self.clock
+        since = (search_opts or {}).get('changes-since', '')
+        return [self.make_server(server_id)
+                for server_id in self.statuses
+                if (server_id not in self.hidden and
+                    self.make_server(server_id).updated >= since)]
+
+    def get(self, server_id):
+        self.get_calls.append(server_id)
+        if server_id not in self.statuses:
+            raise novaclient.exceptions.NotFound(404)
+        return self.make_server(server_id)
+
+    def make_server(self, server_id):
+        return types.SimpleNamespace(
+            id=server_id,
+            status=self.statuses[server_id][0],
+            updated=f'2022-01-01T{self.updated[server_id]:06d}Z')
+
+    def start(self, server_id):
+        self.actions.append(('start', server_id))
+        self.statuses[server_id] = ['REBOOT', 'ACTIVE']
+
+    def stop(self, server_id):
+        self.actions.append(('stop', server_id))
+        self.statuses[server_id] = ['ACTIVE', 'SHUTOFF']
+
+    def confirm_resize(self, server):
+        self.actions.append(('confirm_resize', server.id))
+        self.statuses[server.id] = ['ACTIVE']
+
+    def reboot(self, server_id, reboot_type):
+        self.actions.append(('reboot', server_id))
+        self.statuses[server_id] = ['REBOOT', 'ACTIVE']
+
+
+class MockClient(mock.NonCallableMagicMock):
+    pass
+
+
+class ServersStatusTest(openstack.OpenstackTest):
+
+    def setUp(self):
+        super().setUp()
+        self.patch(nova._client, 'CLIENT_CLASSES', (MockClient,))
+        self.client = MockClient()
+        self.client.servers = self.servers = FakeServers()
+
+    def wait_for_servers_status(self, servers, status='ACTIVE', **params):
+        params.setdefault('sleep_time', 0.001)
+        return nova.wait_for_servers_status(servers, status=status,
+                                            client=self.client, **params)
+
+    def test_wait_for_servers_status(self):
+        server_ids = [f'server-{i}' for i in range(100)]
+        for i, server_id in enumerate(server_ids):
+            self.servers.add(server_id, *(['BUILD'] * (i % 5)), 'ACTIVE')
+        servers = self.wait_for_servers_status(server_ids)
+        self.assertEqual(server_ids, [server.id for server in servers])
+        self.assertEqual({'ACTIVE'}, {server.status for server in servers})
+        # As many list requests as the slowest server status changes
+        self.assertEqual(4, len(self.servers.list_calls))
+        self.assertIsNone(self.servers.list_calls[0])
+        self.assertEqual([{'changes-since': f'2022-01-01T{i:06d}Z'}
+                          for i in range(1, 4)],
+                         self.servers.list_calls[1:])
+        self.assertEqual([], self.servers.get_calls)
+
+    def test_wait_for_servers_status_with_fixed_interval(self):
+        mock_time = self.patch_time(current_time=0., time_increment=0.)
+        self.servers.add('a', *(['REBOOT'] * 5), 'ACTIVE')
+        self.wait_for_servers_status(['a'], sleep_time=5.)
+        self.assertEqual([5.] * 4,
+                         [call[0][0]
+                          for call in mock_time.sleep.call_args_list])
+
+    def test_iter_servers_status(self):
+        self.servers.add('a', 'BUILD', 'BUILD', 'BUILD', 'ACTIVE')
+        self.servers.add('b', 'BUILD', 'ACTIVE')
+        self.servers.add('c', 'BUILD', 'BUILD', 'ACTIVE')
+        servers = nova.iter_servers_status(['a', 'b', 'c', 'b'],
+                                           status='ACTIVE',
+                                           client=self.client,
+                                           sleep_time=0.001)
+        self.assertEqual(['b', 'c', 'a'], [server.id for server in servers])
+
+    def test_wait_for_servers_status_with_error(self):
+        self.servers.add('a', 'BUILD', 'BUILD', 'ACTIVE')
+        self.servers.add('b', 'BUILD', 'ERROR')
+        results = []
+        ex = self.assertRaises(
+            nova.WaitForServerStatusError, list,
+            map(results.append, nova.iter_servers_status(
+                ['a', 'b'], status='ACTIVE', client=self.client,
+                sleep_time=0.001)))
+        self.assertIn("Server b not changing status from ERROR to ACTIVE",
+                      str(ex))
+        # Other servers are still waited for
+        self.assertEqual(['a'], [server.id for server in results])
+
+    def test_wait_for_servers_status_with_timeout(self):
+        self.servers.add('a', 'BUILD')
+        self.servers.add('b', 'BUILD', 'ACTIVE')
+        ex = self.assertRaises(nova.WaitForServerStatusTimeout,
+                               self.wait_for_servers_status, ['a', 'b'],
+                               timeout=0.05)
+        self.assertIn("Server a didn't change its status from BUILD to "
+                      "ACTIVE", str(ex))
+
+    def test_wait_for_servers_status_with_hidden_server(self):
+        self.servers.add('a', 'BUILD', 'ACTIVE', hidden=True)
+        self.servers.add('b', 'BUILD', 'BUILD', 'ACTIVE')
+        servers = self.wait_for_servers_status(['a', 'b'])
+        self.assertEqual(['ACTIVE', 'ACTIVE'],
+                         [server.status for server in servers])
+        self.assertEqual(['a'], self.servers.get_calls)
+
+    def test_wait_for_servers_status_with_changing_hidden_server(self):
+        self.servers.add('a', 'BUILD', 'BUILD', 'BUILD', 'ACTIVE',
+                         hidden=True)
+        self.servers.add('b', 'BUILD', 'ACTIVE')
+        servers = self.wait_for_servers_status(['a', 'b'])
+        self.assertEqual(['ACTIVE', 'ACTIVE'],
+                         [server.status for server in servers])
+        # Hidden server is got at every attempt
+        self.assertEqual(['a', 'a', 'a'], self.servers.get_calls)
+        self.assertEqual(3, len(self.servers.list_calls))
+
+    def test_wait_for_servers_status_with_missing_server(self):
+        self.servers.add('a', 'BUILD', 'ACTIVE')
+        ex = self.assertRaises(nova.WaitForServerStatusError,
+                               self.wait_for_servers_status, ['a', 'b'])
+        self.assertIn("Server b not changing status", str(ex))
+
+    def test_wait_for_servers_status_with_no_servers(self):
+        self.assertEqual([], self.wait_for_servers_status([]))
+        self.assertEqual([], self.servers.list_calls)
+
+    def test_activate_servers(self):
+        self.servers.add('a', 'ACTIVE')
+        self.servers.add('b', 'SHUTOFF')
+        self.servers.add('c', 'VERIFY_RESIZE')
+        self.servers.add('d', 'RESIZE', 'RESIZE', 'VERIFY_RESIZE')
+        self.servers.add('e', 'ERROR')
+        servers = nova.activate_servers(['a', 'b', 'c', 'd', 'e'],
+                                        client=self.client,
+                                        sleep_time=0.001)
+        self.assertEqual(['ACTIVE'] * 5,
+                         [server.status for server in servers])
+        self.assertEqual([('start', 'b'),
+                          ('confirm_resize', 'c'),
+                          ('confirm_resize', 'd'),
+                          ('reboot', 'e')], self.servers.actions)
+
+    def test_shutoff_servers(self):
+        self.servers.add('a', 'ACTIVE')
+        self.servers.add('b', 'SHUTOFF')
+        servers = nova.ensure_servers_status(['a', 'b'], status='SHUTOFF',
+                                             client=self.client,
+                                             sleep_time=0.001)
+        self.assertEqual(['SHUTOFF', 'SHUTOFF'],
+                         [server.status for server in servers])
+        self.assertEqual([('stop', 'a')], self.servers.actions)
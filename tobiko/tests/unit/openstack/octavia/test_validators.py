@@ -0,0 +1,57 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+from tobiko.openstack import octavia
+from tobiko.shell import curl
+from tobiko.tests import unit
+
+
+class CheckMembersBalancedTest(unit.TobikoUnitTest):
+
+    def check_members_balanced(self, *replies):
+        generate_curl_load = self.patch(
+            curl, 'generate_curl_load',
+            return_value=curl.CurlLoadResult(replies))
+        result = octavia.check_members_balanced(ip_address='10.0.0.1',
+                                                protocol='HTTP',
+                                                port=80,
+                                                members_count=2,
+                                                requests_count=2,
+                                                concurrency=4)
+        generate_curl_load.assert_called_once()
+        self.assertEqual(4, generate_curl_load.call_args[1]['concurrency'])
+        return result
+
+    def test_concurrent(self):
+        replies = self.check_members_balanced(
+            curl.CurlReply(0, 'member-0', 0.1),
+            curl.CurlReply(0, 'member-0', 0.1),
+            curl.CurlReply(0, 'member-1', 0.1),
+            curl.CurlReply(0, 'member-1', 0.1))
+        self.assertEqual({'member-0': 2, 'member-1': 2}, replies)
+
+    def test_concurrent_with_missing_member(self):
+        self.assertRaises(octavia.RoundRobinException,
+                          self.check_members_balanced,
+                          curl.CurlReply(0, 'member-0', 0.1),
+                          curl.CurlReply(0, 'member-0', 0.1))
+
+    def test_concurrent_with_timeout(self):
+        self.assertRaises(octavia.TrafficTimeoutError,
+                          self.check_members_balanced,
+                          curl.CurlReply(0, 'member-0', 0.1),
+                          curl.CurlReply(28, '', 10.))
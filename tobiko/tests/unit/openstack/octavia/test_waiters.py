@@ -0,0 +1,160 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import openstack
+
+import tobiko
+from tobiko.openstack import octavia
+from tobiko.tests import unit
+
+
+class FakeObject(dict):
+
+    def __init__(self, object_id, statuses):
+        super().__init__()
+        self.id = object_id
+        self.statuses = list(statuses)
+
+    def __getitem__(self, key):
+        assert key == octavia.PROVISIONING_STATUS
+        if len(self.statuses) > 1:
+            return self.statuses.pop(0)
+        return self.statuses[0]
+
+
+class FakeLoadBalancerProxy:
+
+    def __init__(self):
+        self.objects = {'load_balancers': [], 'listeners': [], 'pools': []}
+        self.pool_members = {}
+        self.calls = []
+
+    def add(self, kind, object_id, *statuses, pool_id=None):
+        obj = FakeObject(object_id, statuses)
+        if pool_id is None:
+            self.objects[kind].append(obj)
+        else:
+            self.pool_members.setdefault(pool_id, []).append(obj)
+
+    def load_balancers(self):
+        self.calls.append('load_balancers')
+        return self.objects['load_balancers']
+
+    def listeners(self):
+        self.calls.append('listeners')
+        return self.objects['listeners']
+
+    def pools(self):
+        self.calls.append('pools')
+        return self.objects['pools']
+
+    def members(self, pool):
+        self.calls.append(f'members:{pool}')
+        if pool not in self.pool_members:
+            raise openstack.exceptions.NotFoundException()
+        return self.pool_members[pool]
+
+
+class FakeClient:
+
+    def __init__(self):
+        self.load_balancer = FakeLoadBalancerProxy()
+
+
+class WaitForObjectsStatusTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.client = FakeClient()
+        self.proxy = self.client.load_balancer
+        self.mock_time = self.patch_time(current_time=0.,
+                                         time_increment=0.)
+
+    def wait(self, **params):
+        params.setdefault('interval', 1.)
+        params.setdefault('max_interval', 8.)
+        params.setdefault('timeout', 600.)
+        return octavia.wait_for_objects_status(client=self.client, **params)
+
+    def test_wait_for_objects_status(self):
+        self.proxy.add('load_balancers', 'lb1', 'PENDING_UPDATE', 'ACTIVE')
+        self.proxy.add('load_balancers', 'lb2', 'ACTIVE')
+        self.proxy.add('load_balancers', 'other', 'ERROR')
+        self.proxy.add('pools', 'pool1', 'PENDING_CREATE', 'PENDING_CREATE',
+                       'ACTIVE')
+        self.proxy.add('members', 'm1', 'ACTIVE', pool_id='pool1')
+        self.proxy.add('members', 'm2', 'PENDING_CREATE', 'ACTIVE',
+                       pool_id='pool1')
+        found = self.wait(load_balancers=['lb1', 'lb2'],
+                          pools=['pool1'],
+                          members=[('pool1', 'm1'), ('pool1', 'm2')])
+        self.assertEqual({'lb1', 'lb2', 'pool1', 'm1', 'm2'}, set(found))
+        # a single list request per kind (and pool) per check
+        self.assertEqual(['load_balancers', 'pools', 'members:pool1',
+                          'load_balancers', 'pools', 'members:pool1',
+                          'pools'],
+                         self.proxy.calls)
+
+    def test_wait_for_objects_status_with_backoff(self):
+        self.proxy.add('listeners', 'l1', *(['PENDING_CREATE'] * 6 +
+                                            ['ACTIVE']))
+        self.wait(listeners=['l1'])
+        self.assertEqual([2., 4., 8., 8., 8., 8.],
+                         [call[0][0]
+                          for call in self.mock_time.sleep.call_args_list])
+
+    def test_wait_for_objects_status_with_status_change(self):
+        self.proxy.add('listeners', 'l1', 'PENDING_CREATE', 'PENDING_CREATE',
+                       'PENDING_UPDATE', 'PENDING_UPDATE', 'ACTIVE')
+        self.wait(listeners=['l1'])
+        self.assertEqual([2., 4., 1., 2.],
+                         [call[0][0]
+                          for call in self.mock_time.sleep.call_args_list])
+
+    def test_wait_for_objects_status_with_error(self):
+        self.proxy.add('load_balancers', 'lb1', 'ACTIVE')
+        self.proxy.add('listeners', 'l1', 'PENDING_CREATE', 'ERROR')
+        ex = self.assertRaises(octavia.UnexpectedStatusException,
+                               self.wait,
+                               load_balancers=['lb1'],
+                               listeners=['l1'])
+        self.assertIn('listener l1', str(ex))
+
+    def test_wait_for_objects_status_with_deleted_object(self):
+        self.proxy.add('listeners', 'l1', 'PENDING_DELETE')
+        self.proxy.add('listeners', 'l2', 'PENDING_CREATE', 'ACTIVE')
+        self.mock_time.sleep.side_effect = (
+            lambda _: self.proxy.objects['listeners'].pop(0))
+        ex = self.assertRaises(octavia.ObjectNotFoundException,
+                               self.wait, listeners=['l1', 'l2'])
+        self.assertIn('listener l1 not found', str(ex))
+        self.assertEqual(['listeners', 'listeners'], self.proxy.calls)
+
+    def test_wait_for_objects_status_with_deleted_pool(self):
+        ex = self.assertRaises(octavia.ObjectNotFoundException,
+                               self.wait, members=[('pool1', 'm1')])
+        self.assertIn('member m1 not found', str(ex))
+
+    def test_wait_for_objects_status_with_timeout(self):
+        self.proxy.add('pools', 'pool1', 'PENDING_CREATE')
+        self.patch(tobiko, 'time', side_effect=[0., 0., 700.])
+        self.assertRaises(tobiko.RetryTimeLimitError, self.wait,
+                          pools=['pool1'])
+
+    def test_wait_for_no_objects(self):
+        self.assertEqual({}, self.wait())
+        self.assertEqual([], self.proxy.calls)
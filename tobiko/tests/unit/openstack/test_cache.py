@@ -0,0 +1,143 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import time
+from unittest import mock
+
+from neutronclient.v2_0 import client as neutronclient
+import novaclient.v2.client
+
+from tobiko.openstack import _cache
+from tobiko.openstack import neutron
+from tobiko.openstack import nova
+from tobiko.tests import unit
+
+
+class ResourceCacheTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = _cache.ResourceCache(ttl=10.)
+        self.fetch = mock.Mock(side_effect=lambda: object())
+
+    def get(self, kind='servers', client='client', **params):
+        return self.cache.get(kind=kind, client=client, params=params,
+                              fetch=self.fetch)
+
+    def test_get(self):
+        value = self.get(status='ACTIVE')
+        self.assertIs(value, self.get(status='ACTIVE'))
+        self.fetch.assert_called_once_with()
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    def test_get_with_other_params(self):
+        self.assertIsNot(self.get(status='ACTIVE'),
+                         self.get(status='SHUTOFF'))
+        self.assertIsNot(self.get(client='other'),
+                         self.get(client='client'))
+        self.assertIsNot(self.get(kind='ports'), self.get(kind='servers'))
+        # servers listed by 'client' without params were already cached
+        self.assertEqual(5, self.fetch.call_count)
+
+    def test_get_with_unhashable_params(self):
+        value = self.get(fixed_ips=['subnet_id=x'])
+        self.assertIs(value, self.get(fixed_ips=['subnet_id=x']))
+
+    def test_get_when_expired(self):
+        now = time.monotonic()
+        monotonic = self.patch(time, 'monotonic', return_value=now)
+        value = self.get()
+        monotonic.return_value = now + 9.
+        self.assertIs(value, self.get())
+        monotonic.return_value = now + 11.
+        self.assertIsNot(value, self.get())
+
+    def test_get_with_zero_ttl(self):
+        self.cache = _cache.ResourceCache(ttl=0.)
+        self.assertIsNot(self.get(), self.get())
+
+    def test_invalidate(self):
+        servers = self.get(kind='servers')
+        ports = self.get(kind='ports')
+        self.cache.invalidate('servers')
+        self.assertIsNot(servers, self.get(kind='servers'))
+        self.assertIs(ports, self.get(kind='ports'))
+        self.cache.invalidate()
+        self.assertIsNot(ports, self.get(kind='ports'))
+
+    def test_invalidate_while_fetching(self):
+        def fetch():
+            self.cache.invalidate('servers')
+            return object()
+
+        self.fetch.side_effect = fetch
+        value = self.get()
+        self.fetch.side_effect = lambda: object()
+        self.assertIsNot(value, self.get())
+
+    def test_invalidates_resources(self):
+        invalidate = self.patch(_cache.RESOURCES_CACHE, 'invalidate')
+
+        @_cache.invalidates_resources('servers', 'ports')
+        def delete_server():
+            raise RuntimeError
+
+        self.assertRaises(RuntimeError, delete_server)
+        invalidate.assert_called_once_with('servers', 'ports')
+
+
+class ListServersTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.patch(_cache, 'RESOURCES_CACHE', _cache.ResourceCache(ttl=10.))
+        self.client = mock.MagicMock(spec=novaclient.v2.client.Client)
+        self.client.servers = mock.MagicMock()
+        self.client.servers.list.return_value = [
+            mock.Mock(status='ACTIVE', name='a'),
+            mock.Mock(status='ACTIVE', name='b')]
+
+    def test_list_servers(self):
+        servers = nova.list_servers(client=self.client, status='ACTIVE')
+        self.assertEqual(2, len(servers))
+        self.assertEqual(servers, nova.list_servers(client=self.client,
+                                                    status='ACTIVE'))
+        self.client.servers.list.assert_called_once_with(
+            search_opts={'status': 'ACTIVE'})
+
+    def test_list_servers_after_delete(self):
+        nova.list_servers(client=self.client)
+        nova.delete_server(server_id='a', client=self.client)
+        nova.list_servers(client=self.client)
+        self.assertEqual(2, self.client.servers.list.call_count)
+
+
+class ListPortsTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.patch(_cache, 'RESOURCES_CACHE', _cache.ResourceCache(ttl=10.))
+        self.client = mock.MagicMock(spec=neutronclient.Client)
+        self.client.list_ports.return_value = {'ports': [{'id': 'a'}]}
+        self.client.create_subnet.return_value = {'subnet': {'id': 's'}}
+
+    def test_list_ports_after_create_subnet(self):
+        neutron.list_ports(client=self.client)
+        neutron.create_subnet(client=self.client, network_id='n',
+                              add_cleanup=False)
+        neutron.list_ports(client=self.client)
+        self.assertEqual(2, self.client.list_ports.call_count)
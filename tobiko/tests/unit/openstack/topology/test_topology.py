@@ -0,0 +1,169 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import json
+import os
+import threading
+import time
+
+import netaddr
+
+from tobiko.openstack import topology
+from tobiko.openstack.topology import _connection
+from tobiko.openstack.topology import _snapshot
+from tobiko.openstack.topology import _topology
+from tobiko.shell import sh
+from tobiko.shell import ssh
+from tobiko.tests import unit
+
+
+class FakeTopology(topology.OpenStackTopology):
+
+    hosts = {'10.0.0.1': 'controller-0.example.com',
+             '10.0.0.2': 'compute-0.example.com',
+             '10.0.0.3': 'compute-1.example.com'}
+
+    def discover_nodes(self):
+        self.add_nodes(dict(address=address, group='compute')
+                       for address in ['10.0.0.2', '10.0.0.3'])
+        self.add_node(address='10.0.0.1', group='controller')
+
+
+class OpenStackTopologyTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.probing = []
+        self.max_probing = 0
+        self.lock = threading.Lock()
+        self.patch(_topology.OpenStackTopology, 'snapshot_file',
+                   os.path.join(self.create_tempdir(), 'topology.json'))
+        self.patch(_topology.OpenStackTopology, '_list_addresses',
+                   side_effect=self.fake_list_addresses)
+        self.patch(_topology.OpenStackTopology, '_list_addresses_from_host',
+                   return_value=[])
+        self.ssh_connect = self.patch(_topology.OpenStackTopology,
+                                      '_ssh_connect',
+                                      side_effect=self.fake_ssh_connect)
+        self.patch(sh, 'get_hostname', side_effect=self.fake_get_hostname)
+
+    def fake_ssh_connect(self, addresses, hostname=None):
+        address = str(addresses[0])
+        with self.lock:
+            self.probing.append(address)
+            self.max_probing = max(self.max_probing, len(self.probing))
+        time.sleep(0.1)
+        with self.lock:
+            self.probing.remove(address)
+        return ssh.ssh_client(host=address, username='tobiko', port=22)
+
+    @staticmethod
+    def fake_list_addresses(obj):
+        if isinstance(obj, str):
+            obj = [obj]
+        return [netaddr.IPAddress(address) for address in obj]
+
+    @staticmethod
+    def fake_get_hostname(ssh_client):
+        return FakeTopology.hosts[ssh_client.host]
+
+    def test_add_nodes(self):
+        fixture = FakeTopology()
+        nodes = fixture.add_nodes(dict(address=address, group='compute')
+                                  for address in ['10.0.0.2', '10.0.0.3'])
+        self.assertEqual(['compute-0', 'compute-1'],
+                         [node.name for node in nodes])
+        self.assertEqual(2, self.max_probing)
+        self.assertEqual(['compute-0', 'compute-1'],
+                         [node.name for node in fixture.get_group('compute')])
+        self.assertEqual({'compute'}, nodes[0].groups)
+
+    def test_add_nodes_with_ignored_errors(self):
+        def ssh_connect(addresses, hostname=None):
+            if str(addresses[0]) == '10.0.0.2':
+                raise _connection.UreachableSSHServer(addresses=addresses,
+                                                      failures='')
+            return self.fake_ssh_connect(addresses, hostname=hostname)
+
+        self.ssh_connect.side_effect = ssh_connect
+        fixture = FakeTopology()
+        nodes = fixture.add_nodes(
+            (dict(address=address)
+             for address in ['10.0.0.2', '10.0.0.3']),
+            ignore_errors=(_connection.UreachableSSHServer,))
+        self.assertIsNone(nodes[0])
+        self.assertEqual('compute-1', nodes[1].name)
+        self.assertRaises(_connection.UreachableSSHServer,
+                          fixture.add_nodes,
+                          [dict(address='10.0.0.2')])
+
+    def test_setup_saves_snapshot(self):
+        fixture = FakeTopology()
+        fixture.setUp()
+        self.assertEqual(['compute-0', 'compute-1', 'controller-0'],
+                         [node.name for node in fixture.nodes])
+        with open(fixture.snapshot_file) as fd:
+            data = json.load(fd)
+        self.assertEqual(_snapshot.SNAPSHOT_VERSION, data['version'])
+        self.assertEqual({'compute': ['compute-0', 'compute-1'],
+                          'controller': ['controller-0']},
+                         data['groups'])
+
+    def test_setup_loads_snapshot(self):
+        FakeTopology().setUp()
+        self.ssh_connect.reset_mock()
+
+        fixture = FakeTopology()
+        fixture.setUp()
+        self.ssh_connect.assert_not_called()
+        self.assertEqual(['compute-0', 'compute-1', 'controller-0'],
+                         [node.name for node in fixture.nodes])
+        self.assertEqual(['compute', 'controller'], fixture.groups)
+        node = fixture.get_node(address='10.0.0.3')
+        self.assertEqual('compute-1.example.com', node.hostname)
+        self.assertEqual({'compute'}, node.groups)
+        self.assertEqual('10.0.0.3', node.ssh_client.host)
+        self.assertIsNone(node.ssh_client.client)
+
+    def test_setup_with_expired_snapshot(self):
+        FakeTopology().setUp()
+        self.ssh_connect.reset_mock()
+        self.patch(_snapshot, 'load_snapshot', return_value=None)
+
+        FakeTopology().setUp()
+        self.assertEqual(3, self.ssh_connect.call_count)
+
+    def test_snapshot_dir_is_disabled_by_default(self):
+        from tobiko import config
+        snapshot_dir = config.CONF.tobiko.topology.snapshot_dir
+        self.assertEqual('', snapshot_dir)
+        self.assertIsNone(_snapshot.get_snapshot_file(
+            snapshot_dir=snapshot_dir, key_params={}))
+
+    def test_load_snapshot_with_ttl(self):
+        snapshot_file = os.path.join(self.create_tempdir(), 'topology.json')
+        _snapshot.save_snapshot(snapshot_file, nodes=[], groups={})
+        self.assertIsNotNone(_snapshot.load_snapshot(snapshot_file, ttl=60.))
+        self.patch(time, 'time', return_value=time.time() + 120.)
+        self.assertIsNone(_snapshot.load_snapshot(snapshot_file, ttl=60.))
+
+    def test_load_snapshot_with_incompatible_version(self):
+        snapshot_file = os.path.join(self.create_tempdir(), 'topology.json')
+        with open(snapshot_file, 'w') as fd:
+            json.dump({'version': _snapshot.SNAPSHOT_VERSION + 1,
+                       'nodes': [], 'groups': {}, 'created_at': 0.}, fd)
+        self.assertIsNone(_snapshot.load_snapshot(snapshot_file))
@@ -0,0 +1,88 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import threading
+import time
+from unittest import mock
+
+from tobiko.shell import sh
+from tobiko.shell.sh import _execute
+from tobiko.shell import ssh
+from tobiko.tests import unit
+
+
+class ExecuteManyTest(unit.TobikoUnitTest):
+
+    def test_execute_many(self):
+        start = time.monotonic()
+        results = sh.execute_many([f'sleep 0.3; echo {i}' for i in range(5)],
+                                  ssh_client=False)
+        self.assertLess(time.monotonic() - start, 1.4)
+        self.assertEqual([f'{i}\n' for i in range(5)],
+                         [result.stdout for result in results])
+        for result in results:
+            self.assertIsInstance(result, sh.ShellExecuteResult)
+
+    def test_execute_many_with_no_commands(self):
+        self.assertEqual([], sh.execute_many([], ssh_client=False))
+
+    def test_execute_many_with_failure(self):
+        ex = self.assertRaises(sh.ShellCommandFailed,
+                               sh.execute_many,
+                               ['true', 'exit 3', 'exit 4'],
+                               ssh_client=False)
+        self.assertEqual(3, ex.exit_status)
+
+    def test_execute_many_with_expect_exit_status(self):
+        results = sh.execute_many(['true', 'exit 3'],
+                                  ssh_client=False,
+                                  expect_exit_status=None)
+        self.assertEqual([0, 3], [result.exit_status for result in results])
+
+    def test_map_execute(self):
+        ssh_clients = [mock.MagicMock(spec=ssh.SSHClientFixture)
+                       for _ in range(3)]
+        execute = self.patch(_execute, 'execute',
+                             side_effect=lambda command, ssh_client:
+                             ssh_clients.index(ssh_client))
+        self.assertEqual([0, 1, 2],
+                         sh.map_execute('hostname', ssh_clients=ssh_clients))
+        execute.assert_has_calls([mock.call('hostname', ssh_client=client)
+                                  for client in ssh_clients],
+                                 any_order=True)
+
+    def test_execute_many_with_max_sessions(self, max_sessions=2):
+        ssh_client = mock.MagicMock(spec=ssh.SSHClientFixture)
+        lock = threading.Lock()
+        sessions = []
+        max_concurrent = []
+
+        def execute(command, ssh_client):
+            with lock:
+                sessions.append(command)
+                max_concurrent.append(len(sessions))
+            time.sleep(0.05)
+            with lock:
+                sessions.remove(command)
+            return command
+
+        self.patch(_execute, 'execute', side_effect=execute)
+        results = sh.execute_many(list(range(10)),
+                                  ssh_client=ssh_client,
+                                  max_sessions=max_sessions)
+        self.assertEqual(list(range(10)), results)
+        self.assertEqual(max_sessions, max(max_concurrent))
@@ -32,18 +32,20 @@ class HostnameTest(unit.TobikoUnitTest):
                         stderr='',
                         exit_status=0) \
             -> ssh.SSHClientFixture:
-        channel_mock = mock.MagicMock(spec=paramiko.Channel,
-                                      exit_status=exit_status)
-        channel_mock.recv.side_effect = [bytes(stdout, 'utf-8'),
-                                         EOFError,
-                                         EOFError] * 10
-        channel_mock.recv_stderr.side_effect = [bytes(stderr, 'utf-8'),
-                                                EOFError,
-                                                EOFError] * 10
+        def open_session(*_args, **_kwargs):
+            channel_mock = mock.MagicMock(spec=paramiko.Channel,
+                                          exit_status=exit_status)
+            channel_mock.recv.side_effect = [bytes(stdout, 'utf-8'),
+                                             EOFError,
+                                             EOFError]
+            channel_mock.recv_stderr.side_effect = [bytes(stderr, 'utf-8'),
+                                                    EOFError,
+                                                    EOFError]
+            return channel_mock
 
         client_mock = mock.MagicMock(spec=ssh.SSHClientFixture)
-        client_mock.connect().get_transport().open_session.return_value = \
-            channel_mock
+        client_mock.connect().get_transport().open_session.side_effect = \
+            open_session
         client_mock.connect_parameters = {'retry_count': 200,
                                           'connection_timeout': 1000}
         return client_mock
@@ -15,8 +15,12 @@
 #    under the License.
 from __future__ import absolute_import
 
+import os
+import threading
+import time
 
 from tobiko.shell import sh
+from tobiko.shell.sh import _io
 from tobiko.tests import unit
 
 
@@ -57,3 +61,55 @@ class JoinChunksTest(unit.TobikoUnitTest):
 
     def test_join_chunks_with_unicodes_and_nones(self):
         self.test_join_chunks([None, u'ab', None, u'cd'], u'abcd')
+
+
+class SelectFilesTest(unit.TobikoUnitTest):
+
+    def create_pipe(self):
+        read_fd, write_fd = os.pipe()
+        reader = _io.ShellStdout(delegate=os.fdopen(read_fd, 'rb'))
+        writer = os.fdopen(write_fd, 'wb', buffering=0)
+        self.addCleanup(reader.close)
+        self.addCleanup(writer.close)
+        return reader, writer
+
+    def test_select_files(self):
+        reader, writer = self.create_pipe()
+        writer.write(b'data')
+        read_ready, write_ready = _io.select_files([reader], timeout=5.)
+        self.assertEqual({reader}, read_ready)
+        self.assertEqual(set(), write_ready)
+
+    def test_select_files_wakes_up_on_data(self):
+        reader, writer = self.create_pipe()
+        timer = threading.Timer(0.1, writer.write, args=(b'data',))
+        timer.start()
+        self.addCleanup(timer.cancel)
+        start = time.monotonic()
+        read_ready, _ = _io.select_files([reader], timeout=10.)
+        self.assertEqual({reader}, read_ready)
+        self.assertLess(time.monotonic() - start, 5.)
+
+    def test_select_files_with_timeout(self):
+        reader, _ = self.create_pipe()
+        start = time.monotonic()
+        read_ready, write_ready = _io.select_files([reader], timeout=0.1)
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        self.assertEqual(set(), read_ready)
+        self.assertEqual(set(), write_ready)
+
+    def test_select_files_with_shared_fd(self):
+        reader, writer = self.create_pipe()
+        other = _io.ShellStderr(delegate=reader.delegate)
+        self.patch(_io.ShellStdout, 'read_ready', False)
+        self.patch(_io.ShellStderr, 'read_ready', True)
+        writer.write(b'data')
+        read_ready, _ = _io.select_files([reader, other], timeout=5.)
+        self.assertEqual({other}, read_ready)
+
+    def test_read_returns_received_data(self):
+        reader, writer = self.create_pipe()
+        writer.write(b'data')
+        # It must not wait for buffer_size bytes being received
+        self.assertEqual(b'data', reader.read())
+        self.assertEqual(b'data', reader.data)
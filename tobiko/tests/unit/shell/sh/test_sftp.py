@@ -0,0 +1,173 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import os
+import socket
+import threading
+
+import paramiko
+
+from tobiko.shell.sh import _sftp
+from tobiko.tests import unit
+
+
+class LocalSFTPServer(paramiko.SFTPServerInterface):
+    """SFTP server serving files from a local directory"""
+
+    root_dir = '/'
+
+    def __init__(self, server, *args, **kwargs):
+        super().__init__(server, *args, **kwargs)
+        self.root_dir = server.root_dir
+
+    def _local_path(self, path) -> str:
+        if isinstance(path, bytes):
+            path = path.decode()
+        return os.path.join(self.root_dir, path.lstrip('/'))
+
+    def canonicalize(self, path):
+        return '/' + path.lstrip('/')
+
+    def stat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(
+                os.stat(self._local_path(path)))
+        except OSError as ex:
+            return paramiko.SFTPServer.convert_errno(ex.errno)
+
+    lstat = stat
+
+    def mkdir(self, path, attr):
+        try:
+            os.mkdir(self._local_path(path), attr.st_mode or 0o777)
+        except OSError as ex:
+            return paramiko.SFTPServer.convert_errno(ex.errno)
+        return paramiko.SFTP_OK
+
+    def open(self, path, flags, attr):
+        try:
+            fd = os.open(self._local_path(path), flags, 0o666)
+        except OSError as ex:
+            return paramiko.SFTPServer.convert_errno(ex.errno)
+        handle = paramiko.SFTPHandle(flags)
+        handle.readfile = handle.writefile = os.fdopen(
+            fd, (flags & os.O_WRONLY) and 'wb' or 'r+b')
+        return handle
+
+
+class SSHServer(paramiko.ServerInterface):
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def check_auth_none(self, username):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return 'none'
+
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED
+
+
+class SFTPTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.root_dir = self.create_tempdir()
+        server_socket, client_socket = socket.socketpair()
+        server = paramiko.Transport(server_socket)
+        server.add_server_key(paramiko.RSAKey.generate(1024))
+        server.set_subsystem_handler('sftp', paramiko.SFTPServer,
+                                     LocalSFTPServer)
+        server.start_server(event=threading.Event(),
+                            server=SSHServer(root_dir=self.root_dir))
+        self.addCleanup(server.close)
+        self.transport = paramiko.Transport(client_socket)
+        self.transport.connect()
+        self.addCleanup(self.transport.close)
+        self.transport.auth_none('tobiko')
+        self.sftp = self.open_sftp()
+
+    def open_sftp(self) -> paramiko.SFTPClient:
+        return paramiko.SFTPClient.from_transport(self.transport)
+
+    def local_path(self, path: str) -> str:
+        return os.path.join(self.root_dir, path.lstrip('/'))
+
+    def test_pipeline(self):
+        os.mkdir(self.local_path('a'))
+        read_response = self.patch(self.sftp, '_read_response',
+                                   side_effect=self.sftp._read_response)
+        pipeline = _sftp.SFTPPipeline(self.sftp, window=3)
+        replies = pipeline.run([(paramiko.sftp.CMD_STAT, path)
+                                for path in ['/a', '/b'] * 3])
+        self.assertEqual([paramiko.sftp.CMD_ATTRS, paramiko.sftp.CMD_STATUS] *
+                         3, [t for t, _ in replies])
+        self.assertEqual(6, read_response.call_count)
+
+    def test_stat_sftp_paths(self):
+        os.mkdir(self.local_path('a'))
+        with open(self.local_path('a/b'), 'w'):
+            pass
+        stats = _sftp.stat_sftp_paths(self.sftp, ['/a', '/a/b', '/c'])
+        self.assertTrue(_sftp.is_sftp_directory(stats['/a']))
+        self.assertFalse(_sftp.is_sftp_file(stats['/a']))
+        self.assertTrue(_sftp.is_sftp_file(stats['/a/b']))
+        self.assertIsNone(stats['/c'])
+
+    def test_make_sftp_dirs(self):
+        os.mkdir(self.local_path('a'))
+        created = _sftp.make_sftp_dirs(self.sftp,
+                                       ['/a/b/c', '/a/d', '/e/f', '/a'])
+        # Parent directories are created before their children
+        self.assertEqual(['/e', '/a/b', '/a/d', '/e/f', '/a/b/c'], created)
+        for path in created:
+            self.assertTrue(os.path.isdir(self.local_path(path)))
+        self.assertEqual([], _sftp.make_sftp_dirs(self.sftp, ['/a/b/c']))
+
+    def test_make_sftp_dirs_when_exists(self):
+        os.mkdir(self.local_path('a'))
+        self.assertRaises(FileExistsError, _sftp.make_sftp_dirs,
+                          self.sftp, ['/a'], exist_ok=False)
+
+    def test_make_sftp_dirs_when_file(self):
+        with open(self.local_path('a'), 'w'):
+            pass
+        self.assertRaises(NotADirectoryError, _sftp.make_sftp_dirs,
+                          self.sftp, ['/a/b'])
+
+    def test_put_sftp_files(self):
+        local_dir = self.create_tempdir()
+        files = {}
+        for i in range(20):
+            local_file = os.path.join(local_dir, f'file-{i}')
+            with open(local_file, 'w') as fd:
+                fd.write(f'content-{i}')
+            files[local_file] = f'/dir-{i % 3}/file-{i}'
+        _sftp.make_sftp_dirs(self.sftp,
+                             {os.path.dirname(f) for f in files.values()})
+        _sftp.put_sftp_files(self.open_sftp, files=files, workers_count=4)
+        for local_file, remote_file in files.items():
+            with open(self.local_path(remote_file)) as fd:
+                self.assertEqual(os.path.basename(local_file).replace(
+                    'file', 'content'), fd.read())
+
+    def test_sftp_path(self):
+        self.assertEqual('.', _sftp.sftp_path('~'))
+        self.assertEqual('a/b', _sftp.sftp_path('~/a/b'))
+        self.assertEqual('/a/b', _sftp.sftp_path('/a/b'))
@@ -0,0 +1,102 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+from http import server
+import itertools
+import socketserver
+import threading
+
+from tobiko.shell import curl
+from tobiko.tests import unit
+
+
+class MembersRequestHandler(server.BaseHTTPRequestHandler):
+
+    members = itertools.cycle(['member-0', 'member-1', 'member-2'])
+
+    def do_GET(self):
+        if self.path != '/id':
+            self.send_error(404)
+            return
+        content = next(self.members).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args, **kwargs):
+        pass
+
+
+class MembersServer(socketserver.ThreadingMixIn, server.HTTPServer):
+    daemon_threads = True
+
+
+class GenerateCurlLoadTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.server = MembersServer(('127.0.0.1', 0), MembersRequestHandler)
+        self.addCleanup(self.server.server_close)
+        thread = threading.Thread(target=self.server.serve_forever,
+                                  daemon=True)
+        thread.start()
+        self.addCleanup(self.server.shutdown)
+
+    def generate_curl_load(self, path='id', **params):
+        return curl.generate_curl_load(hostname='127.0.0.1',
+                                       port=self.server.server_port,
+                                       path=path,
+                                       connect_timeout=5.,
+                                       **params)
+
+    def test_generate_curl_load(self):
+        result = self.generate_curl_load(requests_count=30, concurrency=4)
+        self.assertEqual(30, result.requests_count)
+        self.assertEqual({'member-0': 10, 'member-1': 10, 'member-2': 10},
+                         result.contents)
+        self.assertEqual({}, result.errors)
+        self.assertEqual(0., result.error_rate)
+        percentiles = result.latency_percentiles
+        self.assertEqual([50, 90, 99], sorted(percentiles))
+        self.assertLessEqual(percentiles[50], percentiles[99])
+
+    def test_generate_curl_load_with_errors(self):
+        result = self.generate_curl_load(path='missing', requests_count=5,
+                                         concurrency=2)
+        self.assertEqual({22: 5}, result.errors)
+        self.assertEqual({}, result.contents)
+        self.assertEqual(1., result.error_rate)
+
+    def test_generate_curl_load_with_invalid_requests_count(self):
+        self.assertRaises(ValueError, self.generate_curl_load,
+                          requests_count=0)
+
+
+class CurlLoadResultTest(unit.TobikoUnitTest):
+
+    def test_parse_output(self):
+        result = curl.CurlLoadResult(curl._load.parse_curl_load_output(
+            "0|member 0|0.5\n"
+            "0| member|1 |0.1\n"
+            "28||10.0\n"
+            "unexpected\n"))
+        self.assertEqual({'member 0': 1, 'member|1': 1}, result.contents)
+        self.assertEqual({28: 1}, result.errors)
+        self.assertEqual(1. / 3., result.error_rate)
+        self.assertEqual(0.1, result.latency_percentile(50))
+        self.assertEqual(0.5, result.latency_percentile(99))
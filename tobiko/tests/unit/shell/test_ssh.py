@@ -71,3 +71,60 @@ class SSHClientFixtureTest(unit.TobikoUnitTest):
         self.assertEqual(fixture.host, fixture.global_host_config.host)
         self.assertEqual(expected_host_config,
                          fixture.global_host_config.host_config)
+
+
+class SSHProxySockTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super(SSHProxySockTest, self).setUp()
+        self.proxy_client = mock.MagicMock(spec=paramiko.SSHClient)
+        self.transport = self.proxy_client.get_transport.return_value
+
+    def test_ssh_proxy_sock(self):
+        sock = ssh.ssh_proxy_sock(hostname='some-host', port=2222,
+                                  client=self.proxy_client, timeout=10.)
+        self.assertIs(self.transport.open_channel.return_value, sock)
+        self.transport.open_channel.assert_called_once_with(
+            'direct-tcpip', dest_addr=('some-host', 2222),
+            src_addr=('127.0.0.1', 0), timeout=10.)
+        self.transport.open_session.assert_not_called()
+
+    def test_ssh_proxy_sock_with_source_address(self):
+        sock = ssh.ssh_proxy_sock(hostname='some-host',
+                                  client=self.proxy_client,
+                                  source_address='10.0.0.1')
+        channel = self.transport.open_session.return_value
+        self.assertIs(channel, sock)
+        channel.exec_command.assert_called_once_with(
+            'nc -s 10.0.0.1 some-host 22')
+        self.transport.open_channel.assert_not_called()
+
+    def test_ssh_proxy_sock_with_forwarding_disabled(self):
+        self.transport.open_channel.side_effect = paramiko.ChannelException(
+            1, 'Administratively prohibited')
+        sock = ssh.ssh_proxy_sock(hostname='some-host', port=2222,
+                                  client=self.proxy_client, timeout=10.)
+        channel = self.transport.open_session.return_value
+        self.assertIs(channel, sock)
+        channel.exec_command.assert_called_once_with('nc some-host 2222')
+
+    def test_ssh_proxy_sock_with_connect_failed(self):
+        self.transport.open_channel.side_effect = paramiko.ChannelException(
+            2, 'Connect failed')
+        self.assertRaises(paramiko.ChannelException, ssh.ssh_proxy_sock,
+                          hostname='some-host', port=2222,
+                          client=self.proxy_client, timeout=10.)
+        self.transport.open_session.assert_not_called()
+
+    def test_ssh_proxy_sock_with_command(self):
+        sock = ssh.ssh_proxy_sock(hostname='some-host', port=2222,
+                                  command='connect {hostname} {port}',
+                                  client=self.proxy_client)
+        channel = self.transport.open_session.return_value
+        self.assertIs(channel, sock)
+        channel.exec_command.assert_called_once_with(
+            'connect some-host 2222')
+        self.transport.open_channel.assert_not_called()
+
+    def test_ssh_proxy_sock_without_proxy(self):
+        self.assertIsNone(ssh.ssh_proxy_sock(hostname='some-host'))
@@ -15,6 +15,8 @@ from __future__ import absolute_import
 
 import os
 import sys
+import threading
+import time
 import unittest
 
 import fixtures
@@ -535,3 +537,104 @@ class SharedFixtureTest(unit.TobikoUnitTest):
     def test_fixture_id_with_fixture_id(self):
         fixture = tobiko.get_fixture(MyFixture, fixture_id=12)
         self.assertEqual(12, fixture.fixture_id)
+
+
+class SlowFixture(tobiko.SharedFixture):
+
+    setup_count = 0
+
+    def setup_fixture(self):
+        time.sleep(.2)
+        self.setup_count += 1
+
+
+class SlowFixture1(SlowFixture):
+    pass
+
+
+class SlowFixture2(SlowFixture):
+    pass
+
+
+class SlowFixture3(SlowFixture):
+    required1 = tobiko.required_fixture(SlowFixture1)
+    required2 = tobiko.required_fixture(SlowFixture2)
+    not_required = tobiko.required_fixture(MyFixture, setup=False)
+
+    def setup_fixture(self):
+        assert self.required1.setup_count == 1
+        assert self.required2.setup_count == 1
+        super().setup_fixture()
+
+
+class FailingRequiringFixture(tobiko.SharedFixture):
+    failing = tobiko.required_fixture(FailingFixture)
+    setup_fixture = mock.Mock(specs=tobiko.SharedFixture.setup_fixture)
+
+
+class SetupFixturesTest(unit.TobikoUnitTest):
+
+    slow3 = tobiko.required_fixture(SlowFixture3)
+    slow1 = tobiko.required_fixture(SlowFixture1)
+
+    def test_get_fixture_graph(self):
+        graph = tobiko.get_fixture_graph([SlowFixture3])
+        self.assertEqual({canonical_name(SlowFixture1): frozenset(),
+                          canonical_name(SlowFixture2): frozenset(),
+                          canonical_name(SlowFixture3): frozenset(
+                              [canonical_name(SlowFixture1),
+                               canonical_name(SlowFixture2)])},
+                         {name: node.requires
+                          for name, node in graph.items()})
+
+    def test_get_fixture_graph_with_test_method(
+            self, fixture=MyFixture):
+        graph = tobiko.get_fixture_graph([self.id()])
+        self.assertEqual([canonical_name(fixture),
+                          canonical_name(SlowFixture1),
+                          canonical_name(SlowFixture3),
+                          canonical_name(SlowFixture2)],
+                         list(graph))
+
+    def test_setup_fixtures(self):
+        start = time.time()
+        result = tobiko.setup_fixtures([SlowFixture3], workers_count=4)
+        elapsed = time.time() - start
+        self.assertEqual([tobiko.get_fixture(SlowFixture1),
+                          tobiko.get_fixture(SlowFixture2),
+                          tobiko.get_fixture(SlowFixture3)],
+                         sorted(result, key=lambda f: f.fixture_name))
+        for fixture in result:
+            self.assertEqual(1, fixture.setup_count)
+        # independent fixtures have been set up at the same time
+        self.assertLess(elapsed, .6)
+        tobiko.get_fixture(MyFixture).setup_fixture.assert_not_called()
+
+    def test_setup_fixtures_sequentially(self):
+        result = tobiko.setup_fixtures([SlowFixture3], workers_count=1)
+        self.assertEqual([tobiko.get_fixture(SlowFixture3),
+                          tobiko.get_fixture(SlowFixture1),
+                          tobiko.get_fixture(SlowFixture2)],
+                         result)
+        for fixture in result:
+            self.assertEqual(1, fixture.setup_count)
+
+    def test_setup_fixtures_with_failing_fixture(self):
+        ex = self.assertRaises(RuntimeError, tobiko.setup_fixtures,
+                               [FailingRequiringFixture, SlowFixture1],
+                               workers_count=2)
+        self.assertEqual('raised by setup_fixture', str(ex))
+        self.assertEqual(1, tobiko.get_fixture(SlowFixture1).setup_count)
+        tobiko.get_fixture(
+            FailingRequiringFixture).setup_fixture.assert_not_called()
+
+    def test_setup_shared_fixture_from_many_threads(self):
+        fixture = tobiko.get_fixture(SlowFixture1)
+        threads = [threading.Thread(target=tobiko.setup_fixture,
+                                    args=(SlowFixture1,))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, fixture.setup_count)
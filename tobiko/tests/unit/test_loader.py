@@ -13,7 +13,10 @@
 #    under the License.
 from __future__ import absolute_import
 
+import json
+import subprocess
 import sys
+from unittest import mock
 
 import tobiko
 from tobiko.common import _loader
@@ -119,3 +122,50 @@ class TestLoader(TobikoUnitTest):
                               SomeClass.__name__,
                               '<non-existing>'])
         self.assertRaises(AttributeError, tobiko.load_module, object_id)
+
+
+class LazyImportTest(TobikoUnitTest):
+
+    def setUp(self):
+        super(LazyImportTest, self).setUp()
+        patcher = mock.patch.dict(sys.modules)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in list(sys.modules):
+            if name == 'wsgiref' or name.startswith('wsgiref.'):
+                del sys.modules[name]
+
+    def test_lazy_import(self):
+        module = tobiko.lazy_import('wsgiref.util')
+        self.assertIsInstance(module, tobiko.LazyModule)
+        self.assertNotIn('wsgiref.util', sys.modules)
+        self.assertTrue(callable(module.guess_scheme))
+        self.assertIn('wsgiref.util', sys.modules)
+        self.assertIs(sys.modules['wsgiref.util'].guess_scheme,
+                      module.guess_scheme)
+
+    def test_lazy_import_with_imported_module(self):
+        self.assertIs(sys.modules[__name__], tobiko.lazy_import(__name__))
+
+    def test_lazy_import_with_submodule(self):
+        module = tobiko.lazy_import('wsgiref')
+        make_server = module.simple_server.make_server
+        self.assertIs(sys.modules['wsgiref.simple_server'].make_server,
+                      make_server)
+
+    def test_lazy_import_with_non_existing(self):
+        module = tobiko.lazy_import('tobiko.<non-existing>')
+        self.assertRaises(ImportError, getattr, module, 'something')
+
+    def test_lazy_import_with_non_existing_member(self):
+        module = tobiko.lazy_import('wsgiref')
+        self.assertRaises(AttributeError, getattr, module, '<non-existing>')
+
+    def test_import_tobiko(self):
+        script = (f"import json, sys; import tobiko.shell.sh; "
+                  f"print(json.dumps([m for m in "
+                  f"{_loader.LAZY_MODULES!r} "
+                  f"if m in sys.modules]))")
+        output = subprocess.check_output([sys.executable, '-c', script],
+                                         universal_newlines=True)
+        self.assertEqual([], json.loads(output.splitlines()[-1]))
@@ -14,9 +14,12 @@
 #    under the License.
 from __future__ import absolute_import
 
+import logging
+
 from oslo_log import log
 
 import tobiko
+from tobiko.common import _logging
 from tobiko.tests import unit
 
 
@@ -37,3 +40,53 @@ class CapureLogTest(unit.TobikoUnitTest):
             lines = '\n'.join(logged_lines)
             self.fail(f"log line not captured: '{expected}' not in \n"
                       f"{lines}")
+
+
+class CaptureLogHandlerTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.logger = logging.getLogger(self.id())
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+
+    def add_handler(self, **params):
+        handler = _logging.CaptureLogHandler(level=logging.DEBUG, **params)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.logger.addHandler(handler)
+        self.addCleanup(handler.close)
+        self.addCleanup(self.logger.removeHandler, handler)
+        return handler
+
+    def test_format_all(self):
+        handler = self.add_handler(max_memory=1024)
+        for i in range(3):
+            self.logger.debug('line %d', i)
+        self.assertEqual('line 0\nline 1\nline 2\n',
+                         ''.join(handler.format_all()))
+
+    def test_spill_to_file(self):
+        handler = self.add_handler(max_memory=1024)
+        lines = [f'line {i:04d}' for i in range(1000)]
+        for line in lines:
+            self.logger.debug(line)
+        # pylint: disable=protected-access
+        self.assertTrue(handler.stream._rolled)  # type: ignore
+        self.assertEqual(lines, ''.join(handler.format_all()).splitlines())
+
+    def test_iter_bytes_while_emitting(self):
+        handler = self.add_handler()
+        handler.chunk_size = 8
+        self.logger.debug('first line')
+        chunks = handler.iter_bytes()
+        self.assertEqual(b'first li', next(chunks))
+        self.logger.debug('second line')
+        self.assertEqual(b'first line\nsecond line\n',
+                         b'first li' + b''.join(chunks))
+
+    def test_close(self):
+        handler = self.add_handler()
+        self.logger.debug('some line')
+        handler.close()
+        self.assertEqual([], list(handler.iter_bytes()))
+        self.logger.debug('other line')
@@ -0,0 +1,181 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import json
+import os
+
+import tobiko
+from tobiko.common import _profiler
+from tobiko.tests import unit
+
+
+class ChildFixture(tobiko.SharedFixture):
+    pass
+
+
+class ParentFixture(tobiko.SharedFixture):
+
+    def setup_fixture(self):
+        tobiko.setup_fixture(ChildFixture)
+
+
+def make_call(name, start, duration, stack=(), self_time=None,
+              worker='gw0', operation='setup', cached=False,
+              test_id='test.py::test'):
+    if self_time is None:
+        self_time = duration
+    return tobiko.FixtureCall(name=name, operation=operation,
+                              stack=tuple(stack), test_id=test_id,
+                              cached=cached, start=start, duration=duration,
+                              self_time=self_time, worker=worker,
+                              thread='MainThread')
+
+
+class FixtureProfilerTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.patch_time(current_time=0., time_increment=1.)
+        self.profiler = tobiko.enable_fixture_profiler(
+            profiler=tobiko.FixtureProfiler(worker='gw0'))
+        self.profiler.test_id = 'test.py::test'
+        self.addCleanup(tobiko.disable_fixture_profiler)
+
+    def test_disabled(self):
+        tobiko.disable_fixture_profiler()
+        tobiko.setup_fixture(ParentFixture)
+        self.assertIsNone(tobiko.get_fixture_profiler())
+        self.assertEqual([], self.profiler.records)
+
+    def test_setup_fixture(self):
+        tobiko.setup_fixture(ParentFixture)
+        child, parent = self.profiler.records
+        parent_name = tobiko.get_fixture_name(ParentFixture)
+        self.assertEqual(tobiko.get_fixture_name(ChildFixture), child.name)
+        self.assertEqual((parent_name,), child.stack)
+        self.assertEqual(1., child.duration)
+        self.assertEqual(parent_name, parent.name)
+        self.assertEqual((), parent.stack)
+        self.assertEqual(3., parent.duration)
+        self.assertEqual(2., parent.self_time)
+        for record in [child, parent]:
+            self.assertEqual('setup', record.operation)
+            self.assertFalse(record.cached)
+            self.assertEqual('test.py::test', record.test_id)
+            self.assertEqual('gw0', record.worker)
+
+    def test_setup_fixture_twice(self):
+        tobiko.setup_fixture(ChildFixture)
+        tobiko.setup_fixture(ChildFixture)
+        self.assertEqual([False, True],
+                         [record.cached for record in self.profiler.records])
+
+    def test_setup_fixture_when_cached(self):
+        tobiko.setup_fixture(ChildFixture)
+        for _ in range(3):
+            tobiko.setup_fixture(ChildFixture)
+        self.profiler.test_id = 'test.py::other'
+        tobiko.setup_fixture(ChildFixture)
+        # Cache hits are summed up by test case
+        self.assertEqual([(False, 1, 1.), (True, 3, 3.), (True, 1, 1.)],
+                         [(record.cached, record.calls, record.duration)
+                          for record in self.profiler.records])
+
+    def test_cleanup_fixture(self):
+        tobiko.setup_fixture(ChildFixture)
+        tobiko.cleanup_fixture(ChildFixture)
+        record = self.profiler.records[-1]
+        self.assertEqual('cleanup', record.operation)
+        self.assertEqual(f'{record.name} (cleanup)', record.label)
+
+    def test_dump_and_load(self):
+        tobiko.setup_fixture(ParentFixture)
+        filename = os.path.join(self.create_tempdir(), 'calls-gw0.jsonl')
+        self.profiler.dump(filename)
+        self.assertEqual(self.profiler.records,
+                         tobiko.load_fixture_calls([filename]))
+
+
+class FixtureProfileReportTest(unit.TobikoUnitTest):
+
+    records = [make_call('a', start=0., duration=4., self_time=1.),
+               make_call('b', start=1., duration=3., stack=['a']),
+               make_call('b', start=5., duration=0., cached=True,
+                         test_id='test.py::other'),
+               make_call('c', start=2., duration=2., worker='gw1'),
+               make_call('c', start=3., duration=2., worker='gw1',
+                         operation='cleanup')]
+
+    def test_collapsed_stacks(self):
+        self.assertEqual(
+            'test.py::other;b 0\n'
+            'test.py::test;a 1000000\n'
+            'test.py::test;a;b 3000000\n'
+            'test.py::test;c 2000000\n'
+            'test.py::test;c (cleanup) 2000000\n',
+            _profiler.get_collapsed_stacks(self.records))
+
+    def test_speedscope_profile(self):
+        profile = _profiler.get_speedscope_profile(self.records)
+        self.assertEqual(_profiler.SPEEDSCOPE_SCHEMA, profile['$schema'])
+        frames = [frame['name'] for frame in profile['shared']['frames']]
+        self.assertEqual(['a', 'b', 'c', 'c (cleanup)'], frames)
+        gw0, gw1 = profile['profiles']
+        self.assertEqual('gw0', gw0['name'])
+        self.assertEqual([[0], [0, 1], [1]], gw0['samples'])
+        self.assertEqual([1., 3., 0.], gw0['weights'])
+        self.assertEqual(4., gw0['endValue'])
+        self.assertEqual('gw1', gw1['name'])
+        self.assertEqual([[2], [3]], gw1['samples'])
+
+    def test_blocking_time(self):
+        # gw1 calls overlap between 3 and 4 seconds
+        self.assertEqual(7., _profiler.get_blocking_time(self.records))
+
+    def test_critical_path(self):
+        path = _profiler.get_critical_path(self.records)
+        self.assertEqual([('a', 4.), ('b', 3.)],
+                         [(call['name'], call['duration']) for call in path])
+
+    def test_fixture_summary(self):
+        summary = tobiko.get_fixture_summary(self.records, top=2)
+        self.assertEqual(['gw0', 'gw1'], summary['workers'])
+        self.assertEqual(['a', 'c'], summary['slowest'])
+        a, c, b = summary['fixtures']
+        self.assertEqual(5, summary['calls'])
+        self.assertEqual(
+            {'name': 'b', 'setups': 1, 'cache_hits': 1, 'cleanups': 0,
+             'setup_time': 3., 'cleanup_time': 0., 'total_time': 3.,
+             'self_time': 3., 'max_time': 3., 'tests': 2,
+             'blocking_ratio': 3. / 7.},
+            b)
+        self.assertEqual((1, 1, 4.), (c['setups'], c['cleanups'],
+                                      c['total_time']))
+        # Time spent setting up 'b' from 'a' is not counted twice
+        self.assertEqual(1. / 7., a['blocking_ratio'])
+        self.assertEqual(4. / 7., c['blocking_ratio'])
+
+    def test_write_fixture_profile(self):
+        prefix = os.path.join(self.create_tempdir(), 'fixtures')
+        summary = tobiko.write_fixture_profile(self.records, prefix=prefix)
+        with open(prefix + '.json') as fd:
+            self.assertEqual(summary['slowest'], json.load(fd)['slowest'])
+        with open(prefix + '.speedscope.json') as fd:
+            self.assertEqual(2, len(json.load(fd)['profiles']))
+        with open(prefix + '.collapsed.txt') as fd:
+            self.assertEqual(_profiler.get_collapsed_stacks(self.records),
+                             fd.read())
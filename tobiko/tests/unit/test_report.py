@@ -0,0 +1,138 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import json
+import os
+from unittest import mock
+
+from tobiko.tests import _report
+from tobiko.tests import unit
+
+
+def make_report(when, outcome='passed', longreprtext='', **attributes):
+    return mock.Mock(spec=['when', 'outcome', 'longreprtext', 'duration',
+                           'description'] + list(attributes),
+                     when=when,
+                     outcome=outcome,
+                     longreprtext=longreprtext,
+                     duration=1.,
+                     description='Some test case',
+                     **attributes)
+
+
+class MakeResultRecordTest(unit.TobikoUnitTest):
+
+    def make_record(self, *reports):
+        return _report.make_result_record(nodeid='test.py::test',
+                                          reports=reports)
+
+    def test_passed(self):
+        record = self.make_record(make_report('setup'),
+                                  make_report('call'),
+                                  make_report('teardown'))
+        self.assertEqual('Passed', record['result'])
+        self.assertEqual(3., record['duration'])
+        self.assertEqual('Some test case', record['description'])
+
+    def test_failed(self):
+        record = self.make_record(
+            make_report('setup'),
+            make_report('call', outcome='failed', longreprtext='boom'),
+            make_report('teardown'))
+        self.assertEqual('Failed', record['result'])
+        self.assertEqual('boom', record['longrepr'])
+
+    def test_error(self):
+        record = self.make_record(
+            make_report('setup', outcome='failed'),
+            make_report('teardown'))
+        self.assertEqual('Error', record['result'])
+
+    def test_xfailed(self):
+        record = self.make_record(
+            make_report('setup'),
+            make_report('call', outcome='skipped', wasxfail='reason'),
+            make_report('teardown'))
+        self.assertEqual('XFailed', record['result'])
+
+
+class StreamingHTMLReportTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.report_dir = self.create_tempdir()
+        self.results_file = os.path.join(self.report_dir, 'results.jsonl')
+        self.html_file = os.path.join(self.report_dir, 'results.html')
+
+    def make_record(self, index, result='Passed', longrepr=''):
+        return {'nodeid': f'test.py::test_{index}',
+                'result': result,
+                'time': '2022-01-01 00:00:00',
+                'duration': 1.,
+                'description': '<Some test case>',
+                'longrepr': longrepr}
+
+    def test_write_result(self):
+        report = _report.StreamingHTMLReport(filename=self.html_file,
+                                             title='Test results')
+        report.write_result(self.make_record(0))
+        with open(self.html_file) as fd:
+            content = fd.read()
+        self.assertIn('<h1>Test results</h1>', content)
+        self.assertIn('test.py::test_0', content)
+        self.assertIn('&lt;Some test case&gt;', content)
+        self.assertNotIn('</html>', content)
+
+        # written rows are never rewritten
+        report.write_result(self.make_record(1, result='Failed',
+                                             longrepr='boom'))
+        report.close()
+        with open(self.html_file) as fd:
+            new_content = fd.read()
+        self.assertTrue(new_content.startswith(content))
+        self.assertIn('<pre>boom</pre>', new_content)
+        self.assertTrue(new_content.endswith('</html>\n'))
+
+    def test_results_store(self):
+        store = _report.ResultsStore(filename=self.results_file)
+        records = [self.make_record(i) for i in range(3)]
+        for record in records:
+            store.append(record)
+        with open(self.results_file) as fd:
+            self.assertEqual(records[0], json.loads(fd.readline()))
+        store.close()
+        self.assertEqual(records, list(store.load()))
+
+    def test_render_html_report(self):
+        store = _report.ResultsStore(filename=self.results_file)
+        report = _report.StreamingHTMLReport(filename=self.html_file,
+                                             title='Test results')
+        for i in range(3):
+            record = self.make_record(i)
+            store.append(record)
+            report.write_result(record)
+        store.close()
+        report.close()
+        with open(self.html_file) as fd:
+            expected = fd.read()
+
+        html_file = os.path.join(self.report_dir, 'rendered.html')
+        _report.render_html_report(results_file=self.results_file,
+                                   html_file=html_file,
+                                   title='Test results')
+        with open(html_file) as fd:
+            self.assertEqual(expected, fd.read())
@@ -14,6 +14,7 @@
 from __future__ import absolute_import
 
 import itertools
+import typing
 
 import mock
 import testtools
@@ -370,3 +371,105 @@ class RetryTest(unit.TobikoUnitTest):
                                               timeout=3.).is_last)
         self.assertTrue(tobiko.retry_attempt(elapsed_time=2.,
                                              timeout=2.).is_last)
+
+
+class RetryBackoffTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super(RetryBackoffTest, self).setUp()
+        self.mock_time = self.patch_time(current_time=0., time_increment=0.)
+
+    def run_retry(self, retry: tobiko.Retry, attempts_count: int,
+                  states: typing.Iterable = ()) -> typing.List[float]:
+        states = iter(states)
+        for attempt in retry:
+            for state in states:
+                attempt.observe(state)
+                break
+            if attempt.number >= attempts_count:
+                break
+        return [c.args[0] for c in self.mock_time.sleep.call_args_list]
+
+    def test_exponential_backoff(self):
+        retry = tobiko.retry(interval=1., backoff=tobiko.ExponentialBackoff(
+            max_interval=10.))
+        self.assertEqual([1., 2., 4., 8., 10., 10.],
+                         self.run_retry(retry, 7))
+
+    def test_exponential_backoff_by_name(self):
+        retry = tobiko.retry(sleep_time=2., backoff='exponential')
+        self.assertEqual([2., 4., 8.], self.run_retry(retry, 4))
+
+    def test_fibonacci_backoff(self):
+        retry = tobiko.retry(interval=2., backoff='fibonacci')
+        self.assertEqual([2., 2., 4., 6., 10., 16.],
+                         self.run_retry(retry, 7))
+
+    def test_decorrelated_jitter_backoff(self):
+        uniform = mock.Mock(side_effect=lambda a, b: b)
+        retry = tobiko.retry(interval=1., backoff=(
+            tobiko.DecorrelatedJitterBackoff(max_interval=20.,
+                                             uniform=uniform)))
+        self.assertEqual([1., 3., 9., 20.], self.run_retry(retry, 5))
+        uniform.assert_has_calls([mock.call(1., 3.),
+                                  mock.call(1., 9.),
+                                  mock.call(1., 27.)])
+
+    def test_adaptive_backoff(self):
+        retry = tobiko.retry(interval=4., backoff=tobiko.AdaptiveBackoff(
+            factor=2., max_interval=16.))
+        sleeps = self.run_retry(retry, 8, states=['BUILD', 'BUILD', 'BUILD',
+                                                  'SPAWN', 'SPAWN', 'SPAWN',
+                                                  'SPAWN', 'ACTIVE'])
+        self.assertEqual([4., 8., 16., 1., 2., 4., 8.], sleeps)
+
+    def test_adaptive_backoff_with_default_intervals(self):
+        retry = tobiko.retry(interval=4., backoff='adaptive')
+        sleeps = self.run_retry(retry, 7, states=['BUILD'] * 5 + ['ACTIVE'])
+        self.assertEqual([4., 6., 9., 13.5, 16., 1.], sleeps)
+
+    def test_backoff_with_timeout(self):
+        retry = tobiko.retry(timeout=10., interval=3., backoff='exponential')
+        attempts = []
+        with self.assertRaises(tobiko.RetryTimeLimitError):
+            for attempt in retry:
+                attempts.append(attempt)
+        self.assertEqual([0., 3., 9., 10.],
+                         [attempt.elapsed_time for attempt in attempts])
+        self.assertEqual([3., 6., 1.],
+                         [c.args[0]
+                          for c in self.mock_time.sleep.call_args_list])
+
+    def test_invalid_backoff(self):
+        self.assertRaises(ValueError, tobiko.retry, backoff='<invalid>')
+
+    def test_retry_with_other_retry_backoff(self):
+        other = tobiko.retry(backoff='adaptive')
+        self.assertEqual(tobiko.AdaptiveBackoff(),
+                         tobiko.retry(other_retry=other).backoff)
+
+    def test_stats(self):
+        retry = tobiko.retry(interval=1., backoff='exponential')
+        self.run_retry(retry, 3)
+        self.run_retry(retry, 2)
+        self.assertEqual(2, retry.stats.loops)
+        self.assertEqual(5, retry.stats.attempts)
+        self.assertEqual(3, retry.stats.sleeps)
+        self.assertEqual(4., retry.stats.sleep_time)
+
+    def test_stats_without_backoff(self):
+        retry = tobiko.retry(interval=1.)
+        self.run_retry(retry, 3)
+        self.assertEqual(3, retry.stats.attempts)
+        self.assertEqual(2, retry.stats.sleeps)
+        self.assertEqual(2., retry.stats.sleep_time)
+
+    def test_attempt_state_changed(self):
+        attempt = tobiko.retry_attempt()
+        self.assertFalse(attempt.state_changed)
+        attempt.observe('BUILD')
+        self.assertFalse(attempt.state_changed)
+        attempt.previous_state = 'BUILD'
+        self.assertFalse(attempt.state_changed)
+        attempt.observe('ACTIVE')
+        self.assertTrue(attempt.state_changed)
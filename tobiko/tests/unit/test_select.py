@@ -16,6 +16,7 @@ from __future__ import absolute_import
 
 from collections import abc
 import re
+import types
 import typing
 
 import tobiko
@@ -164,3 +165,116 @@ class SelectTest(SelectionTest):
     @staticmethod
     def create_selection(*args, **kwargs):
         return tobiko.select(*args, **kwargs)
+
+
+class IndexedSelectionTest(SelectionTest):
+
+    @staticmethod
+    def create_selection(*args, **kwargs):
+        return tobiko.IndexedSelection(*args, **kwargs)
+
+    def test_selection(self,
+                       objects: typing.Iterable[T] = tuple()) \
+            -> tobiko.Selection[T]:
+        selection = super(IndexedSelectionTest, self).test_selection(objects)
+        self.assertIsInstance(selection, tobiko.IndexedSelection)
+        return selection
+
+    def test_with_attribute_builds_index_once(self):
+        counted = []
+
+        class CountedObj(Obj):
+
+            @property
+            def counted(self):
+                counted.append(self)
+                return self.number
+
+        objects = [CountedObj(i % 10, str(i)) for i in range(100)]
+        selection = self.create_selection(objects)
+        self.assertEqual(objects[3::10], selection.with_attributes(counted=3))
+        self.assertEqual(objects[4::10], selection.with_attributes(counted=4))
+        # Indexed once, then only found objects are checked again
+        self.assertEqual(100 + 10 + 10, len(counted))
+
+    def test_with_attributes_after_change(self):
+        a = Obj(0, 'a')
+        b = Obj(1, 'b')
+        selection = self.create_selection([a])
+        self.assertEqual([], selection.with_attributes(number=1))
+        selection.append(b)
+        self.assertEqual([b], selection.with_attributes(number=1))
+        selection[1] = a
+        self.assertEqual([], selection.with_attributes(number=1))
+        del selection[0]
+        self.assertEqual([a], selection.with_attributes(number=0))
+
+    def test_with_attributes_after_object_change(self):
+        a = types.SimpleNamespace(number=0)
+        b = types.SimpleNamespace(number=1)
+        selection = self.create_selection([a, b])
+        self.assertEqual([a], selection.with_attributes(number=0))
+        self.assertEqual([b], selection.without_attributes(number=0))
+        a.number = 1
+        self.assertEqual([], selection.without_attributes(number=1))
+        self.assertEqual([], selection.with_attributes(number=0))
+        self.assertEqual([a, b], selection.with_attributes(number=1))
+
+    def test_with_items_after_object_change(self):
+        a = {'number': 0}
+        b = {'number': 1}
+        selection = self.create_selection([a, b])
+        self.assertEqual([a], selection.with_items(number=0))
+        a['number'] = 1
+        self.assertEqual([], selection.with_items(number=0))
+        self.assertEqual([a, b], selection.with_items(number=1))
+
+    def test_with_attributes_with_unhashable_values(self):
+        a = Obj(0, ['a'])  # type: ignore
+        b = Obj(1, 'b')
+        selection = self.create_selection([a, b])
+        self.assertEqual([a], selection.with_attributes(text=['a']))
+        self.assertEqual([b], selection.without_attributes(text=['a']))
+
+    def test_with_items_with_missing_key(self):
+        a = {'number': 0}
+        b = {'number': 1, 'text': 'b'}
+        selection = self.create_selection([a, b])
+        self.assertEqual([b], selection.with_items(number=1))
+        self.assertRaises(KeyError, selection.with_items, text='b')
+
+    def test_contains(self):
+        a = Obj(0, 'a')
+        b = {'number': 1, 'text': 'b'}
+        selection = self.create_selection([a, b])
+        self.assertIn(a, selection)
+        self.assertIn(Obj(0, 'a'), selection)
+        self.assertIn({'number': 1, 'text': 'b'}, selection)
+        self.assertNotIn(Obj(1, 'a'), selection)
+        self.assertNotIn({}, selection)
+        selection.remove(a)
+        self.assertNotIn(a, selection)
+
+
+class SelectIndexedTest(IndexedSelectionTest):
+
+    @staticmethod
+    def create_selection(*args, **kwargs):
+        return tobiko.select_indexed(*args, **kwargs)
+
+
+class SelectUniquesTest(unit.TobikoUnitTest):
+
+    def test_select_uniques(self):
+        a = Obj(0, 'a')
+        b = {'number': 1}
+        c = [1]
+        selection = tobiko.select_uniques([a, b, c, b, a, Obj(0, 'a'), [1]])
+        self.assertEqual([a, b, c], selection)
+
+    def test_select_uniques_with_destination(self):
+        destination = tobiko.select([1, {'number': 1}])
+        selection = tobiko.select_uniques([2, 1, {'number': 1}],
+                                          destination=destination)
+        self.assertIs(destination, selection)
+        self.assertEqual([1, {'number': 1}, 2], selection)
@@ -0,0 +1,124 @@
+# Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import multiprocessing
+
+from tobiko.common import _shelves
+from tobiko.tests import unit
+
+
+def add_tests(backend_name, shelves_dir, worker, count):
+    backend = _shelves.get_shelves_backend(backend_name=backend_name,
+                                           shelves_dir=shelves_dir)
+    for i in range(count):
+        backend.add_test('my_shelf', 'my_resource', f'test-{worker}-{i}')
+
+
+class SQLiteShelvesBackendTest(unit.TobikoUnitTest):
+
+    backend_name = 'sqlite'
+
+    def setUp(self):
+        super().setUp()
+        self.shelves_dir = self.create_tempdir()
+        self.backend = _shelves.get_shelves_backend(
+            backend_name=self.backend_name,
+            shelves_dir=self.shelves_dir)
+
+    def test_add_test(self):
+        self.assertEqual({'test1'},
+                         self.backend.add_test('shelf', 'res', 'test1'))
+        self.assertEqual({'test1', 'test2'},
+                         self.backend.add_test('shelf', 'res', 'test2'))
+        self.assertEqual({'test1', 'test2'},
+                         self.backend.add_test('shelf', 'res', 'test1'))
+        self.assertEqual({'test1'},
+                         self.backend.add_test('shelf', 'other', 'test1'))
+
+    def test_remove_test(self):
+        self.backend.add_test('shelf', 'res', 'test1')
+        self.backend.add_test('shelf', 'res', 'test2')
+        self.assertEqual({'test2'},
+                         self.backend.remove_test('shelf', 'res', 'test1'))
+        self.assertEqual({'test2'},
+                         self.backend.remove_test('shelf', 'res', 'test1'))
+        self.assertEqual(set(),
+                         self.backend.remove_test('shelf', 'res', 'test2'))
+
+    def test_remove_test_from_all(self):
+        self.backend.add_test('shelf1', 'res1', 'test1')
+        self.backend.add_test('shelf1', 'res1', 'test2')
+        self.backend.add_test('shelf2', 'res2', 'test1')
+        self.backend.remove_test_from_all('test1')
+        self.assertEqual({'test2'},
+                         self.backend.remove_test('shelf1', 'res1', 'other'))
+        self.assertEqual(set(),
+                         self.backend.remove_test('shelf2', 'res2', 'other'))
+
+    def test_initialize(self):
+        self.backend.add_test('shelf', 'res', 'test1')
+        self.backend.initialize(test_run_uid='run-1')
+        self.assertEqual({'test2'},
+                         self.backend.add_test('shelf', 'res', 'test2'))
+        # Other workers of the same test run don't clean shelves again
+        self.backend.initialize(test_run_uid='run-1')
+        self.assertEqual({'test2', 'test3'},
+                         self.backend.add_test('shelf', 'res', 'test3'))
+        self.backend.initialize(test_run_uid='run-2')
+        self.assertEqual(set(),
+                         self.backend.remove_test('shelf', 'res', 'test2'))
+
+    def test_add_test_from_many_processes(self):
+        context = multiprocessing.get_context('spawn')
+        processes = [context.Process(target=add_tests,
+                                     args=(self.backend_name,
+                                           self.shelves_dir,
+                                           worker,
+                                           10))
+                     for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(0, process.exitcode)
+        self.assertEqual(
+            {f'test-{worker}-{i}' for worker in range(4) for i in range(10)},
+            self.backend.remove_test('my_shelf', 'my_resource', 'other'))
+
+
+class DbmShelvesBackendTest(SQLiteShelvesBackendTest):
+
+    backend_name = 'dbm'
+
+    def test_add_test_from_many_processes(self):
+        self.skipTest('dbm shelves require retrying on lock contention')
+
+
+class GetShelvesBackendTest(unit.TobikoUnitTest):
+
+    def test_get_shelves_backend(self):
+        shelves_dir = self.create_tempdir()
+        backend = _shelves.get_shelves_backend(backend_name='sqlite',
+                                               shelves_dir=shelves_dir)
+        self.assertIsInstance(backend, _shelves.SQLiteShelvesBackend)
+        self.assertIs(backend, _shelves.get_shelves_backend(
+            backend_name='sqlite', shelves_dir=shelves_dir))
+
+    def test_get_shelves_backend_with_invalid_name(self):
+        ex = self.assertRaises(ValueError, _shelves.get_shelves_backend,
+                               backend_name='<invalid>',
+                               shelves_dir=self.create_tempdir())
+        self.assertEqual("Invalid shelves backend name: '<invalid>'",
+                         str(ex))
@@ -0,0 +1,105 @@
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import threading
+import time
+
+from tobiko.tests import unit
+from tobiko.tripleo import _overcloud
+from tobiko.tripleo import processes
+
+
+PS_OUTPUT = """\
+USER    DELIM    PID DELIM   PPID DELIM%CPU DELIM   VSZ DELIM    TIME \
+DELIMCOMMAND        DELIMCOMMAND
+root    DELIM      1 DELIM      0 DELIM 1.3 DELIM246892 DELIM01:08:57 \
+DELIMsystemd        DELIM/usr/lib/systemd/systemd --switched-root
+root    DELIM      2 DELIM      0 DELIM 0.0 DELIM     0 DELIM00:00:00 \
+DELIMkthreadd       DELIM[kthreadd]
+neutron DELIM   1234 DELIM      1 DELIM 2.5 DELIM 10000 DELIM00:01:00 \
+DELIMneutron-server:DELIM/usr/bin/python3 /usr/bin/neutron-server
+unexpected line
+"""
+
+
+class ParseProcessesTableTest(unit.TobikoUnitTest):
+
+    def test_parse_processes_table(self):
+        rows = list(processes.parse_processes_table(
+            PS_OUTPUT, overcloud_node='controller-0'))
+        self.assertEqual(['systemd', 'kthreadd', 'neutron-server:'],
+                         [row.process for row in rows])
+        self.assertEqual(
+            processes.OvercloudProcess(
+                user='neutron', pid=1234, ppid=1, cpu=2.5, vsz=10000,
+                time='00:01:00', process='neutron-server:',
+                process_args='/usr/bin/python3 /usr/bin/neutron-server',
+                overcloud_node='controller-0'),
+            rows[2])
+
+
+class OvercloudProcessesTableTest(unit.TobikoUnitTest):
+
+    def setUp(self):
+        super().setUp()
+        self.table = processes.OvercloudProcessesTable()
+        for node in ['controller-0', 'controller-1', 'compute-0']:
+            self.table.extend(processes.parse_processes_table(
+                PS_OUTPUT, overcloud_node=node))
+
+    def test_has(self):
+        self.assertTrue(self.table.has('neutron-server:'))
+        self.assertFalse(self.table.has('neutron-server'))
+
+    def test_nodes(self):
+        self.assertEqual(['controller-0', 'controller-1', 'compute-0'],
+                         self.table.nodes('systemd'))
+        self.assertEqual([], self.table.nodes('mysqld'))
+        self.assertEqual(3, len(self.table.select('kthreadd')))
+        self.assertEqual(3, len(self.table.select_node('compute-0')))
+
+    def test_to_dataframe(self):
+        dataframe = self.table.to_dataframe()
+        self.assertEqual(9, len(dataframe))
+        self.assertEqual(['controller-0', 'controller-1', 'compute-0'],
+                         list(dataframe.query('PROCESS=="systemd"')[
+                             'overcloud_node']))
+
+
+class CollectOvercloudNodesDataTest(unit.TobikoUnitTest):
+
+    def test_collect_overcloud_nodes_data(self):
+        self.patch(_overcloud, 'list_overcloud_nodes',
+                   return_value=[f'node-{i}' for i in range(4)])
+        self.patch(_overcloud, 'overcloud_ssh_client',
+                   side_effect=lambda instance: f'ssh-{instance}')
+        running = []
+        max_running = []
+        lock = threading.Lock()
+
+        def function(ssh_client):
+            with lock:
+                running.append(ssh_client)
+                max_running.append(len(running))
+            time.sleep(0.1)
+            with lock:
+                running.remove(ssh_client)
+            return ssh_client.upper()
+
+        results = _overcloud.collect_overcloud_nodes_data(function)
+        self.assertEqual([f'SSH-NODE-{i}' for i in range(4)], results)
+        self.assertEqual(4, max(max_running))
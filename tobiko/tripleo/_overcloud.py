@@ -13,6 +13,7 @@
 #    under the License.
 from __future__ import absolute_import
 
+from concurrent import futures
 import functools
 import io
 import os
@@ -24,14 +25,20 @@ import tobiko
 from tobiko import config
 from tobiko import tripleo
 from tobiko.openstack import keystone
-from tobiko.openstack import ironic
-from tobiko.openstack import metalsmith
 from tobiko.openstack import neutron
 from tobiko.openstack import topology
 from tobiko.shell import sh
 from tobiko.shell import ssh
 from tobiko.tripleo import _undercloud
 
+if typing.TYPE_CHECKING:
+    from tobiko.openstack import ironic
+    from tobiko.openstack import metalsmith
+else:
+    # Bare metal clients are only required by tests running on TripleO
+    ironic = tobiko.lazy_import('tobiko.openstack.ironic')
+    metalsmith = tobiko.lazy_import('tobiko.openstack.metalsmith')
+
 
 CONF = config.CONF
 LOG = log.getLogger(__name__)
@@ -104,7 +111,7 @@ def find_overcloud_node(**params):
     return metalsmith.find_instance(client=client, **params)
 
 
-def power_on_overcloud_node(instance: metalsmith.MetalsmithInstance,
+def power_on_overcloud_node(instance: 'metalsmith.MetalsmithInstance',
                             timeout: tobiko.Seconds = 120.,
                             sleep_time: tobiko.Seconds = 5.):
     session = _undercloud.undercloud_keystone_session()
@@ -115,7 +122,7 @@ def power_on_overcloud_node(instance: metalsmith.MetalsmithInstance,
                          sleep_time=sleep_time)
 
 
-def power_off_overcloud_node(instance: metalsmith.MetalsmithInstance,
+def power_off_overcloud_node(instance: 'metalsmith.MetalsmithInstance',
                              timeout: tobiko.Seconds = None,
                              sleep_time: tobiko.Seconds = None):
     session = _undercloud.undercloud_keystone_session()
@@ -128,7 +135,7 @@ def power_off_overcloud_node(instance: metalsmith.MetalsmithInstance,
 
 def overcloud_ssh_client(ip_version: int = None,
                          network_name: str = None,
-                         instance: metalsmith.MetalsmithInstance = None,
+                         instance: 'metalsmith.MetalsmithInstance' = None,
                          host_config=None):
     if host_config is None:
         host_config = overcloud_host_config(ip_version=ip_version,
@@ -141,7 +148,7 @@ def overcloud_ssh_client(ip_version: int = None,
 
 def overcloud_host_config(ip_version: int = None,
                           network_name: str = None,
-                          instance: metalsmith.MetalsmithInstance = None):
+                          instance: 'metalsmith.MetalsmithInstance' = None):
     host_config = OvercloudHostConfig(ip_version=ip_version,
                                       network_name=network_name,
                                       instance=instance)
@@ -150,7 +157,7 @@ def overcloud_host_config(ip_version: int = None,
 
 def overcloud_node_ip_address(ip_version: int = None,
                               network_name: str = None,
-                              instance: metalsmith.MetalsmithInstance = None,
+                              instance: 'metalsmith.MetalsmithInstance' = None,
                               **params):
     if instance is None:
         instance = find_overcloud_node(**params)
@@ -207,7 +214,7 @@ class OvercloudHostConfig(tobiko.SharedFixture):
                  host: str = None,
                  hostname: str = None,
                  ip_version: int = None,
-                 instance: metalsmith.MetalsmithInstance = None,
+                 instance: 'metalsmith.MetalsmithInstance' = None,
                  key_filename: str = None,
                  network_name: str = None,
                  port: int = None,
@@ -250,6 +257,88 @@ class OvercloudHostConfig(tobiko.SharedFixture):
         return parameters
 
 
+T = typing.TypeVar('T')
+
+
+def collect_overcloud_nodes_data(
+        function: typing.Callable[[ssh.SSHClientType], T],
+        max_workers: int = None) -> typing.List[T]:
+    """Calls given function concurrently for every overcloud node
+
+    :param function: a function that queries a oc node using its SSH client
+    :param max_workers: maximum number of nodes queried at the same time
+    :return: function results in the same order as overcloud nodes
+    """
+    instances = list(list_overcloud_nodes())
+    if not instances:
+        return []
+
+    def call_function(instance):
+        return function(overcloud_ssh_client(instance=instance))
+
+    with futures.ThreadPoolExecutor(
+            max_workers=max_workers or min(32, len(instances))) as executor:
+        return list(executor.map(call_function, instances))
+
+
+R = typing.TypeVar('R', bound=typing.Tuple)
+
+
+class OvercloudNodesTable(typing.Generic[R]):
+    """Rows gathered from overcloud nodes indexed by name and node
+
+    Rows are named tuples having both a field containing their name (as
+    specified by name_field) and an 'overcloud_node' field.
+    """
+
+    name_field: str = 'name'
+    dataframe_columns: typing.Optional[typing.List[str]] = None
+
+    def __init__(self, rows: typing.Iterable[R] = ()):
+        self.rows: typing.List[R] = []
+        self._by_name: typing.Dict[str, typing.List[R]] = {}
+        self._by_node: typing.Dict[str, typing.List[R]] = {}
+        self.extend(rows)
+
+    def extend(self, rows: typing.Iterable[R]):
+        for row in rows:
+            self.rows.append(row)
+            self._by_name.setdefault(getattr(row, self.name_field),
+                                     []).append(row)
+            self._by_node.setdefault(getattr(row, 'overcloud_node'),
+                                     []).append(row)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> typing.Iterator[R]:
+        return iter(self.rows)
+
+    def has(self, name: str) -> bool:
+        return name in self._by_name
+
+    def select(self, name: str) -> typing.List[R]:
+        return list(self._by_name.get(name, []))
+
+    def select_node(self, node: str) -> typing.List[R]:
+        return list(self._by_node.get(node, []))
+
+    def nodes(self, name: str = None) -> typing.List[str]:
+        """Names of the overcloud nodes having rows with given name"""
+        if name is None:
+            return list(self._by_node)
+        return list(dict.fromkeys(getattr(row, 'overcloud_node')
+                                  for row in self._by_name.get(name, [])))
+
+    def to_dataframe(self):
+        import pandas
+        columns = self.dataframe_columns
+        if columns is None and self.rows:
+            columns = list(getattr(self.rows[0], '_fields'))
+        return pandas.DataFrame([tuple(row) for row in self.rows],
+                                columns=columns)
+
+
 def get_overcloud_nodes_dataframe(
         oc_node_df_function: typing.Callable[[ssh.SSHClientType],
                                              typing.Any]):
@@ -264,10 +353,7 @@ def get_overcloud_nodes_dataframe(
     :return: dataframe of all overcloud nodes processes
     """
     import pandas
-    oc_nodes_dfs = list()
-    for instance in list_overcloud_nodes():
-        ssh_client = overcloud_ssh_client(instance=instance)
-        oc_nodes_dfs.append(oc_node_df_function(ssh_client))
+    oc_nodes_dfs = collect_overcloud_nodes_data(oc_node_df_function)
     oc_procs_df = pandas.concat(oc_nodes_dfs, ignore_index=True)
     return oc_procs_df
 
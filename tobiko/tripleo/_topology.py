@@ -16,7 +16,6 @@ from __future__ import absolute_import
 import re
 import typing
 
-import metalsmith
 import netaddr
 from oslo_log import log
 
@@ -32,6 +31,9 @@ from tobiko.tripleo import _overcloud
 from tobiko.tripleo import _rhosp
 from tobiko.tripleo import _undercloud
 
+if typing.TYPE_CHECKING:
+    import metalsmith
+
 CONF = config.CONF
 LOG = log.getLogger(__name__)
 
@@ -106,24 +108,45 @@ class TripleoTopology(topology.OpenStackTopology):
 
     def discover_overcloud_nodes(self):
         if _undercloud.has_undercloud():
+            nodes_params = []
             for instance in _overcloud.list_overcloud_nodes():
-                try:
-                    _overcloud.power_on_overcloud_node(instance)
-                except Exception:
-                    LOG.exception("Error ensuring overcloud node power "
-                                  "status is on")
+                ensure_overcloud_node_power_on(instance)
                 host_config = _overcloud.overcloud_host_config(
                     instance=instance)
                 ssh_client = _overcloud.overcloud_ssh_client(
                     instance=instance,
                     host_config=host_config)
-                node = self.add_node(address=host_config.hostname,
-                                     group='overcloud',
-                                     ssh_client=ssh_client,
-                                     overcloud_instance=instance)
+                nodes_params.append(dict(address=host_config.hostname,
+                                         group='overcloud',
+                                         ssh_client=ssh_client,
+                                         overcloud_instance=instance))
+            for node in self.add_nodes(nodes_params):
                 assert isinstance(node, TripleoTopologyNode)
                 self.discover_overcloud_node_subgroups(node)
 
+    def load_snapshot(self) -> bool:
+        if not super().load_snapshot():
+            return False
+        # Nodes could have been left powered off after the snapshot was
+        # taken (for example by disruptive test cases)
+        for node in self._groups.get('overcloud', []):
+            assert isinstance(node, TripleoTopologyNode)
+            try:
+                instance = node.overcloud_instance
+            except Exception:
+                LOG.exception("Error finding overcloud node "
+                              f"'{node.name}' instance")
+                continue
+            if instance is not None:
+                ensure_overcloud_node_power_on(instance)
+        return True
+
+    def snapshot_key_params(self) -> typing.Dict[str, typing.Any]:
+        params = super().snapshot_key_params()
+        params['undercloud_ssh_hostname'] = (
+            CONF.tobiko.tripleo.undercloud_ssh_hostname)
+        return params
+
     def discover_overcloud_node_subgroups(self, node):
         # set of subgroups extracted from node name
         subgroups: typing.Set[str] = set()
@@ -153,6 +176,13 @@ class TripleoTopology(topology.OpenStackTopology):
         return subgroups
 
 
+def ensure_overcloud_node_power_on(instance: 'metalsmith.Instance'):
+    try:
+        _overcloud.power_on_overcloud_node(instance)
+    except Exception:
+        LOG.exception("Error ensuring overcloud node power status is on")
+
+
 class TripleoTopologyNode(topology.OpenStackTopologyNode):
 
     def __init__(self,
@@ -161,8 +191,9 @@ class TripleoTopologyNode(topology.OpenStackTopologyNode):
                  ssh_client: ssh.SSHClientFixture,
                  addresses: typing.Iterable[netaddr.IPAddress],
                  hostname: str,
-                 overcloud_instance: metalsmith.Instance = None,
-                 rhosp_version: tobiko.Version = None):
+                 overcloud_instance: 'metalsmith.Instance' = None,
+                 rhosp_version: tobiko.Version = None,
+                 overcloud_instance_uuid: str = None):
         # pylint: disable=redefined-outer-name
         super().__init__(topology=topology,
                          name=name,
@@ -171,11 +202,23 @@ class TripleoTopologyNode(topology.OpenStackTopologyNode):
                          hostname=hostname)
         self._overcloud_instance = overcloud_instance
         self._rhosp_version = rhosp_version
+        if overcloud_instance is not None:
+            overcloud_instance_uuid = overcloud_instance.uuid
+        self._overcloud_instance_uuid = overcloud_instance_uuid
 
     @property
-    def overcloud_instance(self) -> typing.Optional[metalsmith.Instance]:
+    def overcloud_instance(self) -> typing.Optional['metalsmith.Instance']:
+        if (self._overcloud_instance is None and
+                self._overcloud_instance_uuid is not None):
+            # Node has been restored from a topology snapshot
+            self._overcloud_instance = _overcloud.find_overcloud_node(
+                uuid=self._overcloud_instance_uuid)
         return self._overcloud_instance
 
+    @property
+    def snapshot_params(self) -> typing.Dict[str, typing.Any]:
+        return {'overcloud_instance_uuid': self._overcloud_instance_uuid}
+
     @property
     def rhosp_version(self) -> tobiko.Version:
         if self._rhosp_version is None:
@@ -207,14 +250,13 @@ class TripleoTopologyNode(topology.OpenStackTopologyNode):
         if running_servers:
             LOG.info(f'Restart servers after rebooting overcloud compute node '
                      f'{self.name}...')
-            for server in running_servers:
-                nova.wait_for_server_status(server=server.id,
-                                            status='SHUTOFF')
-                LOG.debug(f'Re-activate server {server.name} with ID '
-                          f'{server.id}')
-                nova.activate_server(server=server)
-                LOG.debug(f'Server {server.name} with ID {server.id} has '
-                          f'been reactivated')
+            nova.wait_for_servers_status(servers=running_servers,
+                                         status='SHUTOFF')
+            LOG.debug('Re-activate servers: '
+                      f'{[server.id for server in running_servers]}')
+            nova.activate_servers(servers=running_servers)
+            LOG.debug(f'{len(running_servers)} server(s) have been '
+                      'reactivated')
 
     def list_running_servers(self) -> typing.List[nova.NovaServer]:
         running_servers = list()
@@ -8,12 +8,9 @@ import time
 import typing
 
 from oslo_log import log
-import pandas
 
 import tobiko
 from tobiko import config
-from tobiko import podman
-from tobiko import docker
 from tobiko.openstack import neutron
 from tobiko.openstack import topology
 from tobiko.shell import sh
@@ -25,6 +22,11 @@ from tobiko.tripleo import topology as tripleo_topology
 CONF = config.CONF
 LOG = log.getLogger(__name__)
 
+# Container runtime clients are only required by the runtime in use
+docker = tobiko.lazy_import('tobiko.docker')
+podman = tobiko.lazy_import('tobiko.podman')
+pandas = tobiko.lazy_import('pandas')
+
 
 class ContainerRuntime(abc.ABC):
     runtime_name: str
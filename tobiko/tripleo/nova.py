@@ -6,7 +6,6 @@ from functools import wraps
 
 
 from oslo_log import log
-import pandas
 
 import tobiko
 from tobiko import tripleo
@@ -21,6 +20,8 @@ from tobiko.tripleo import containers
 
 LOG = log.getLogger(__name__)
 
+pandas = tobiko.lazy_import('pandas')
+
 
 def check_nova_services_health(timeout=600., interval=2.):
     retry = tobiko.retry(timeout=timeout, interval=interval)
@@ -6,7 +6,6 @@ import time
 import typing
 
 from oslo_log import log
-import pandas
 
 import tobiko
 from tobiko import config
@@ -15,6 +14,11 @@ from tobiko.shell import sh
 from tobiko.shell import ssh
 from tobiko.openstack import topology
 
+if typing.TYPE_CHECKING:
+    import pandas
+else:
+    pandas = tobiko.lazy_import('pandas')
+
 
 CONF = config.CONF
 LOG = log.getLogger(__name__)
@@ -28,7 +32,7 @@ class PcsResourceException(tobiko.TobikoException):
     message = "pcs cluster is not in a healthy state"
 
 
-def get_pcs_resources_table(timeout=720, interval=2) -> pandas.DataFrame:
+def get_pcs_resources_table(timeout=720, interval=2) -> 'pandas.DataFrame':
     """
     get pcs status from a controller and parse it
     to have it's resources states in check
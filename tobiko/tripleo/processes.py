@@ -1,11 +1,10 @@
 from __future__ import absolute_import
 
-import io
 import re
 import time
+import typing
 
 from oslo_log import log
-import pandas
 
 import tobiko
 from tobiko.openstack import neutron
@@ -23,61 +22,100 @@ class OvercloudProcessesException(tobiko.TobikoException):
               "{process_error}"
 
 
-def get_overcloud_node_processes_table(ssh_client: ssh.SSHClientType):
+class OvercloudProcess(typing.NamedTuple):
+    user: str
+    pid: int
+    ppid: int
+    cpu: float
+    vsz: int
+    time: str
+    process: str
+    process_args: str
+    overcloud_node: str
+
+
+class OvercloudProcessesTable(overcloud.OvercloudNodesTable[OvercloudProcess]):
+    """Overcloud processes indexed by process name and overcloud node"""
+
+    name_field = 'process'
+    dataframe_columns = ['USER', 'PID', 'PPID', 'CPU', 'VSZ', 'TIME',
+                         'PROCESS', 'PROCESS_ARGS', 'overcloud_node']
+
+
+PS_COMMAND = ("ps -axw -o \"%U\" -o \"DELIM%p\" -o \"DELIM%P\" -o "
+              "\"DELIM%C\" -o \"DELIM%z\" -o \"DELIM%x\" -o \"DELIM%c\" -o "
+              "\"DELIM%a\" |grep -v 'ps -axw' |sed 's/\"/''/g'")
+
+
+def parse_processes_table(output: str, overcloud_node: str) \
+        -> typing.Iterator[OvercloudProcess]:
+    lines = iter(output.splitlines())
+    next(lines, None)  # skip header line
+    for line in lines:
+        fields = [field.strip() for field in line.split('DELIM', 7)]
+        try:
+            yield OvercloudProcess(user=fields[0],
+                                   pid=int(fields[1]),
+                                   ppid=int(fields[2]),
+                                   cpu=float(fields[3]),
+                                   vsz=int(fields[4]),
+                                   time=fields[5],
+                                   process=fields[6],
+                                   process_args=fields[7],
+                                   overcloud_node=overcloud_node)
+        except (IndexError, ValueError):
+            LOG.debug(f"Skip unexpected process table line: {line!r}")
+
+
+def list_overcloud_node_processes(ssh_client: ssh.SSHClientType) \
+        -> typing.List[OvercloudProcess]:
     """
-    get processes tables from overcloud node
+    get processes from overcloud node
 
-       returns :
+       parses the output of following command:
 [root@controller-0 ~]# ps -axw -o "%U" -o "|%p" -o "|%P" -o "|%C" -o "|%z" -o
 "|%x" -o "|%c" -o "|%a" |grep -v 'ps -aux'|head
 USER    |    PID|   PPID|%CPU|   VSZ|    TIME|COMMAND        |COMMAND
-|overcloud_node
 root    |      1|      0| 1.3|246892|01:08:57|systemd        |/usr/lib/systemd
-controller-0 ...
 /systemd --switched-root --system --deserialize 18
 root    |      2|      0| 0.0|     0|00:00:00|kthreadd       |[kthreadd]
 root    |      3|      2| 0.0|     0|00:00:00|rcu_gp         |[rcu_gp]
-root    |      4|      2| 0.0|     0|00:00:00|rcu_par_gp     |[rcu_par_gp]
-root    |      6|      2| 0.0|     0|00:00:00|kworker/0:0H-ev|[kworker/0:0H
--events_highpri]
-root    |      8|      2| 0.0|     0|00:00:00|mm_percpu_wq   |[mm_percpu_wq]
-root    |      9|      2| 0.0|     0|00:00:06|ksoftirqd/0    |[ksoftirqd/0]
-root    |     10|      2| 0.0|     0|00:04:28|rcu_sched      |[rcu_sched]
-root    |     11|      2| 0.0|     0|00:00:05|migration/0    |[migration/0]
 
-    :return: dataframe of overcloud node processes dataframe
+    :return: list of overcloud node processes
     """
-
-    output = sh.execute(
-        "ps -axw -o \"%U\" -o \"DELIM%p\" -o \"DELIM%P\" -o \"DELIM%C\" -o "
-        "\"DELIM%z\" -o \"DELIM%x\" -o \"DELIM%c\" -o \"DELIM%a\" |grep -v "
-        "'ps -axw' |sed 's/\"/''/g'",
-        ssh_client=ssh_client).stdout
-    stream = io.StringIO(output)
-    table: pandas.DataFrame = pandas.read_csv(
-        stream, sep='DELIM', header=None, skiprows=1)
-    table.replace(to_replace=' ', value="", regex=True, inplace=True)
-    table.columns = ['USER', 'PID', 'PPID', 'CPU', 'VSZ', 'TIME', 'PROCESS',
-                     'PROCESS_ARGS']
-    # pylint: disable=unsupported-assignment-operation
+    output = sh.execute(PS_COMMAND, ssh_client=ssh_client).stdout
     hostname = sh.get_hostname(ssh_client=ssh_client)
-    table['overcloud_node'] = hostname
-
+    processes = list(parse_processes_table(output, overcloud_node=hostname))
     LOG.debug("Successfully got overcloud nodes processes status table")
+    return processes
+
+
+def list_overcloud_processes() -> OvercloudProcessesTable:
+    """Gets processes from all overcloud nodes concurrently"""
+    table = OvercloudProcessesTable()
+    for processes in overcloud.collect_overcloud_nodes_data(
+            list_overcloud_node_processes):
+        table.extend(processes)
     return table
 
 
+def get_overcloud_node_processes_table(ssh_client: ssh.SSHClientType):
+    """
+    get processes tables from overcloud node
+
+    :return: dataframe of overcloud node processes dataframe
+    """
+    return OvercloudProcessesTable(
+        list_overcloud_node_processes(ssh_client)).to_dataframe()
+
+
 def get_overcloud_nodes_running_process(process):
     """
     Check what nodes are running the specifies
     process: exact str of a process name as seen in ps -axw -o "%c"
     :return: list of overcloud nodes
     """
-    oc_procs_df = overcloud.get_overcloud_nodes_dataframe(
-                                            get_overcloud_node_processes_table)
-    oc_nodes_running_process = oc_procs_df.query('PROCESS=="{}"'.format(
-        process))['overcloud_node'].unique()
-    return oc_nodes_running_process
+    return list_overcloud_processes().nodes(process)
 
 
 def check_if_process_running_on_overcloud(process):
@@ -86,12 +124,7 @@ def check_if_process_running_on_overcloud(process):
     process: exact str of a process name as seen in ps -axw -o "%c"
     :return: list of overcloud nodes
     """
-    oc_procs_df = overcloud.get_overcloud_nodes_dataframe(
-                                          get_overcloud_node_processes_table)
-    if not oc_procs_df.query('PROCESS=="{}"'.format(process)).empty:
-        return True
-    else:
-        return False
+    return list_overcloud_processes().has(process)
 
 
 class OvercloudProcessesStatus(object):
@@ -120,13 +153,16 @@ class OvercloudProcessesStatus(object):
                                                  'node_group': 'controller',
                                                  'number': num_northd_proc}]
 
-        self.oc_procs_df = overcloud.get_overcloud_nodes_dataframe(
-                                            get_overcloud_node_processes_table)
+        self.oc_processes = list_overcloud_processes()
+
+    @property
+    def oc_procs_df(self):
+        return self.oc_processes.to_dataframe()
 
     @property
     def basic_overcloud_processes_running(self):
         """
-        Checks that the oc_procs_df dataframe has all of the list procs
+        Checks that the oc_processes table has all of the list procs
         :return: Bool
         """
         for attempt_number in range(600):
@@ -136,13 +172,11 @@ class OvercloudProcessesStatus(object):
                 for process_name in self.processes_to_check:
                     # osp16/python3 process is "neutron-server:"
                     if process_name == 'neutron-server' and \
-                            self.oc_procs_df.query('PROCESS=="{}"'.format(
-                            process_name)).empty:
+                            not self.oc_processes.has(process_name):
                         process_name = 'neutron-server:'
                     # osp17 mysqld process name is mysqld_safe
                     if process_name == 'mysqld' and \
-                            self.oc_procs_df.query('PROCESS=="{}"'.format(
-                            process_name)).empty:
+                            not self.oc_processes.has(process_name):
                         process_name = 'mysqld_safe'
                     # redis not deployed on osp17 by default, only if some
                     # other services such as designate and octavia are deployed
@@ -150,16 +184,14 @@ class OvercloudProcessesStatus(object):
                             not overcloud.is_redis_expected()):
                         redis_message = ("redis-server not expected on OSP 17 "
                                          "and later releases by default")
-                        if self.oc_procs_df.query(
-                                f'PROCESS=="{process_name}"').empty:
+                        if not self.oc_processes.has(process_name):
                             LOG.info(redis_message)
                             continue
                         else:
                             raise OvercloudProcessesException(
                                 process_error=redis_message)
 
-                    if not self.oc_procs_df.query('PROCESS=="{}"'.format(
-                            process_name)).empty:
+                    if self.oc_processes.has(process_name):
                         LOG.info("overcloud processes status checks: "
                                  "process {} is  "
                                  "in running state".format(process_name))
@@ -177,15 +209,14 @@ class OvercloudProcessesStatus(object):
                 LOG.info('Retrying overcloud processes checks attempt '
                          '{} of 360'.format(attempt_number))
                 time.sleep(1)
-                self.oc_procs_df = overcloud.get_overcloud_nodes_dataframe(
-                    get_overcloud_node_processes_table)
+                self.oc_processes = list_overcloud_processes()
         # exhausted all retries
         tobiko.fail('Not all overcloud processes are running !\n')
 
     @property
     def ovn_overcloud_processes_validations(self):
         """
-        Checks that the oc_procs_df dataframe has OVN processes running on the
+        Checks that the oc_processes table has OVN processes running on the
         expected overcloud node or nodes
         :return: Bool
         """
@@ -194,15 +225,11 @@ class OvercloudProcessesStatus(object):
             return True
 
         for process_dict in self.ovn_processes_to_check_per_node:
-            if not self.oc_procs_df.query('PROCESS=="{}"'.format(
-                    process_dict['name'])).empty:
+            if self.oc_processes.has(process_dict['name']):
                 LOG.info("overcloud processes status checks: "
                          f"process {process_dict['name']} is  "
                          "in running state")
 
-                ovn_proc_filtered_df = self.oc_procs_df.query(
-                    'PROCESS=="{}"'.format(process_dict['name']))
-
                 if (process_dict['node_group'] not in
                         topology.list_openstack_node_groups()):
                     LOG.debug(f"{process_dict['node_group']} is not "
@@ -213,20 +240,21 @@ class OvercloudProcessesStatus(object):
                              topology.list_openstack_nodes(
                                 group=process_dict['node_group'])]
                 node_names_re = re.compile(r'|'.join(node_list))
-                node_filter = (ovn_proc_filtered_df.overcloud_node.
-                               str.match(node_names_re))
                 # obtain the processes running on a specific type of nodes
-                ovn_proc_filtered_per_node_df = \
-                    ovn_proc_filtered_df[node_filter]
+                ovn_procs_per_node = [
+                    process
+                    for process in self.oc_processes.select(
+                        process_dict['name'])
+                    if node_names_re.match(process.overcloud_node)]
                 if type(process_dict['number']) == int:
                     assert process_dict['number'] == \
-                        len(ovn_proc_filtered_per_node_df), (
+                        len(ovn_procs_per_node), (
                         "Unexpected number"
                         f" of processes {process_dict['name']} running on "
                         f"{process_dict['node_group']} nodes")
                 elif process_dict['number'] == 'all':
                     num_nodes = len(node_list)
-                    assert num_nodes == len(ovn_proc_filtered_per_node_df), (
+                    assert num_nodes == len(ovn_procs_per_node), (
                         "Unexpected number of processes "
                         f"{process_dict['name']} running on "
                         f"{process_dict['node_group']} nodes")
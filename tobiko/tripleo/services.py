@@ -3,7 +3,6 @@ from __future__ import absolute_import
 import typing
 
 from oslo_log import log
-import pandas
 
 import tobiko
 from tobiko.tripleo import overcloud
@@ -18,62 +17,80 @@ class OvercloudServiceException(tobiko.TobikoException):
     message = "not all overcloud nodes services are in active state"
 
 
-def get_overcloud_node_services_table(ssh_client: ssh.SSHClientType):
+class OvercloudService(typing.NamedTuple):
+    unit: str
+    loaded_state: str
+    active_state: str
+    low_level_state: str
+    unit_description: str
+    overcloud_node: str
+
+
+class OvercloudServicesTable(overcloud.OvercloudNodesTable[OvercloudService]):
+    """Overcloud services indexed by unit name and overcloud node"""
+
+    name_field = 'unit'
+    dataframe_columns = ['UNIT', 'loaded_state', 'active_state',
+                         'low_level_state', 'UNIT_DESCRIPTION',
+                         'overcloud_node']
+
+
+def list_overcloud_node_services(ssh_client: ssh.SSHClientType) \
+        -> typing.List[OvercloudService]:
     """
-    get services table from overcloud node
+    get services from overcloud node
 
-       returns :
+       parses the output of systemctl list-units:
 auditd.service|loaded|active|running|SecurityAuditingService
 auth-rpcgss-module.service|loaded|inactivedead|KernelModulesupportingRPCSEC_GSS
 blk-availability.service|loaded|active|exited|Availabilityofblockdevices
-brandbot.service|loaded|inactivedead|FlexibleBrandingService
-certmonger.service|loaded|active|running|CertificatemonitoringandPKIenrollment
-cinder-lvm-losetup.service|loaded|inactivedead|CinderLVMlosetup
-cloud-config.service|loaded|active|exited|Applythesettingsspecifiedincloud-con
-cloud-final.service|loaded|active|exited|Executeclouduser/finalscripts
-cloud-init-local.service|loaded|active|exited|Initialcloud-initjob(pre-network)
-cloud-init.service|loaded|active|exited|Initialcloud-initjob(metadataservicecr)
 
-    :return: dataframe of overcloud node services
+    :return: list of overcloud node services
     """
     units = sh.list_systemd_units(all=True,
                                   ssh_client=ssh_client).without_attributes(
         load='not-found')
-
-    data: typing.Dict[str, list] = {'UNIT': [],
-                                    'loaded_state': [],
-                                    'active_state': [],
-                                    'low_level_state': [],
-                                    'UNIT_DESCRIPTION': []}
-    for unit in units:
-        data['UNIT'].append(unit.unit)
-        data['loaded_state'].append(unit.load)
-        data['active_state'].append(unit.active)
-        data['low_level_state'].append(unit.sub)
-        data['UNIT_DESCRIPTION'].append(unit.description)
-    table = pandas.DataFrame.from_dict(data)
-    table.replace(to_replace=' ', value="", regex=True, inplace=True)
-    table['overcloud_node'] = sh.get_hostname(ssh_client=ssh_client)
-
-    LOG.debug("Got overcloud nodes services status :\n%s", table)
+    hostname = sh.get_hostname(ssh_client=ssh_client)
+    services = [OvercloudService(unit=unit.unit,
+                                 loaded_state=unit.load,
+                                 active_state=unit.active,
+                                 low_level_state=unit.sub,
+                                 unit_description=unit.description,
+                                 overcloud_node=hostname)
+                for unit in units]
+    LOG.debug(f"Got {len(services)} overcloud node services from "
+              f"{hostname}")
+    return services
+
+
+def list_overcloud_services() -> OvercloudServicesTable:
+    """Gets services from all overcloud nodes concurrently"""
+    table = OvercloudServicesTable()
+    for services in overcloud.collect_overcloud_nodes_data(
+            list_overcloud_node_services):
+        table.extend(services)
     return table
 
 
+def get_overcloud_node_services_table(ssh_client: ssh.SSHClientType):
+    """
+    get services table from overcloud node
+
+    :return: dataframe of overcloud node services
+    """
+    return OvercloudServicesTable(
+        list_overcloud_node_services(ssh_client)).to_dataframe()
+
+
 def get_overcloud_nodes_running_service(service):
     """
     Check what nodes are running the specified service or unit
     process: exact str of a process name as seen in systemctl -a
     :return: list of overcloud nodes
     """
-    oc_procs_df = overcloud.get_overcloud_nodes_dataframe(
-                                            get_overcloud_node_services_table)
-    # remove the ".service" suffix
-    oc_procs_df = oc_procs_df.replace(to_replace={'UNIT': '.service'},
-                                      value='',
-                                      regex=True)
-    oc_nodes_running_service = oc_procs_df.query('UNIT=="{}"'.format(service))[
-                                                'overcloud_node'].unique()
-    return oc_nodes_running_service.tolist()
+    # the ".service" suffix is optional
+    table = list_overcloud_services()
+    return table.nodes(service) or table.nodes(f'{service}.service')
 
 
 def check_if_process_running_on_overcloud(process):
@@ -82,12 +99,7 @@ def check_if_process_running_on_overcloud(process):
     process: exact str of a process name as seen in ps -axw -o "%c"
     :return: list of overcloud nodes
     """
-    oc_services_df = overcloud.get_overcloud_nodes_dataframe(
-                                            get_overcloud_node_services_table)
-    if not oc_services_df.query('UNIT=="{}"'.format(process)).empty:
-        return True
-    else:
-        return False
+    return list_overcloud_services().has(process)
 
 
 class OvercloudServicesStatus(tobiko.SharedFixture):
@@ -116,23 +128,25 @@ class OvercloudServicesStatus(tobiko.SharedFixture):
             services_to_check = self.SERVICES_TO_CHECK
         self.services_to_check = services_to_check
 
-    oc_services_df: typing.Any
+    oc_services: OvercloudServicesTable
 
     def setup_fixture(self):
-        self.oc_services_df = overcloud.get_overcloud_nodes_dataframe(
-            get_overcloud_node_services_table)
+        self.oc_services = list_overcloud_services()
+
+    @property
+    def oc_services_df(self):
+        return self.oc_services.to_dataframe()
 
     @property
     def basic_overcloud_services_running(self):
         """
-        Checks that the oc_services dataframe has all of the list services
+        Checks that the oc_services table has all of the list services
         running
         :return: Bool
         """
         tobiko.setup_fixture(self)
         for service_name in self.services_to_check:
-            if not self.oc_services_df.query('UNIT=="{}"'.format(
-                    service_name)).empty:
+            if self.oc_services.has(service_name):
                 LOG.info("overcloud processes status checks: process {} is  "
                          "in running state".format(service_name))
                 continue
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import argparse
+import os
+import sys
+import timeit
+import typing
+
+TOP_DIR = os.path.realpath(os.path.dirname(os.path.dirname(__file__)))
+
+if TOP_DIR not in sys.path:
+    sys.path.insert(0, TOP_DIR)
+
+from tobiko.common import _select  # noqa
+
+
+class Port(typing.NamedTuple):
+    id: str
+    device_owner: str
+    network_id: str
+    status: str
+
+
+def create_ports(size: int) -> typing.List[Port]:
+    return [Port(id=f'port-{i}',
+                 device_owner=f'compute:nova-{i % 7}',
+                 network_id=f'network-{i % 100}',
+                 status=('ACTIVE', 'DOWN', 'BUILD')[i % 3])
+            for i in range(size)]
+
+
+def create_lookups(size: int) -> typing.Dict[str, typing.Callable]:
+    """Operations to be timed on a selection of given size"""
+    middle = create_ports(size)[size // 2]
+    return {
+        'with_attributes(id)':
+            lambda s: s.with_attributes(id=middle.id),
+        'with_attributes(network_id, status)':
+            lambda s: s.with_attributes(network_id=middle.network_id,
+                                        status=middle.status),
+        'without_attributes(status)':
+            lambda s: s.without_attributes(status='ACTIVE'),
+        'with_attributes(id).unique':
+            lambda s: s.with_attributes(id=middle.id).unique,
+        'contains':
+            lambda s: middle in s,
+    }
+
+
+def benchmark(size: int, lookups: int) -> typing.List[typing.Tuple]:
+    ports = create_ports(size)
+    results = []
+    for name, lookup in create_lookups(size).items():
+        times = []
+        for cls in [_select.Selection, _select.IndexedSelection]:
+            selection = cls(ports)
+            times.append(timeit.timeit(lambda: lookup(selection),
+                                       number=lookups))
+        results.append((name, size) + tuple(times))
+
+    duplicated = ports[:size // 100] * 100
+    times = [timeit.timeit(lambda: pairwise_select_uniques(duplicated),
+                           number=1),
+             timeit.timeit(lambda: _select.select_uniques(duplicated),
+                           number=1)]
+    results.append(('select_uniques', size) + tuple(times))
+    return results
+
+
+def pairwise_select_uniques(objects: typing.Iterable) -> typing.List:
+    """Previous select_uniques implementation, comparing every object"""
+    destination: typing.List = []
+    for obj in objects:
+        if obj not in destination:
+            destination.append(obj)
+    return destination
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare Selection and IndexedSelection lookup times")
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10000, 100000],
+                        help='number of objects in the selection')
+    parser.add_argument('--lookups', type=int, default=100,
+                        help='number of lookups made on every selection')
+    args = parser.parse_args()
+
+    sys.stdout.write(f"{'operation':40} {'size':>7} {'Selection':>12} "
+                     f"{'Indexed':>12} {'speedup':>8}\n")
+    for size in args.sizes:
+        for name, size, linear, indexed in benchmark(size, args.lookups):
+            sys.stdout.write(f"{name:40} {size:7} {linear:11.4f}s "
+                             f"{indexed:11.4f}s {linear / indexed:7.1f}x\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# Copyright (c) 2022 Red Hat, Inc.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from __future__ import absolute_import
+
+import argparse
+import collections
+import json
+import os
+import re
+import subprocess
+import sys
+import typing
+
+TOP_DIR = os.path.realpath(os.path.dirname(os.path.dirname(__file__)))
+
+if TOP_DIR not in sys.path:
+    sys.path.insert(0, TOP_DIR)
+
+from tools import common  # noqa
+
+LOG = common.get_logger(__name__)
+
+PYTHON_EXECUTABLE = common.PYTHON_EXECUTABLE
+
+# Modules checked by default
+CHECKED_MODULES = ['tobiko',
+                   'tobiko.shell.sh']
+
+# Maximum time (in milliseconds) every top-level package can take to be
+# imported by checked modules. Packages not listed here are checked against
+# the DEFAULT_BUDGET value
+IMPORT_TIME_BUDGETS: typing.Dict[str, float] = {
+    'oslo_utils': 120.,
+    'pkg_resources': 150.,
+    'setuptools': 150.,
+    'tobiko': 400.,
+}
+
+DEFAULT_BUDGET = 80.
+
+IMPORT_TIME_LINE = re.compile(
+    r'^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|'
+    r'(?P<indent>\s*)(?P<name>\S+)\s*$')
+
+
+class ImportTime(typing.NamedTuple):
+    name: str
+    self_time: int  # microseconds
+    cumulative_time: int  # microseconds
+    level: int
+
+
+def parse_import_time(output: str) -> typing.List[ImportTime]:
+    """Parses lines printed to stderr by 'python -X importtime'"""
+    import_times = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        import_times.append(ImportTime(
+            name=match.group('name'),
+            self_time=int(match.group('self')),
+            cumulative_time=int(match.group('cumulative')),
+            level=len(match.group('indent')) // 2))
+    return import_times
+
+
+def get_packages_import_time(import_times: typing.Iterable[ImportTime]) \
+        -> typing.Dict[str, float]:
+    """Sums the time (in milliseconds) taken by every top-level package"""
+    packages: typing.Dict[str, float] = collections.defaultdict(float)
+    for import_time in import_times:
+        package = import_time.name.split('.', 1)[0]
+        packages[package] += import_time.self_time / 1000.
+    return dict(packages)
+
+
+def measure_import_time(module_name: str,
+                        repeat: int = 5,
+                        python_executable: str = None) \
+        -> typing.Tuple[typing.Dict[str, float], typing.List[str]]:
+    """Imports given module in new Python processes
+
+    It returns the minimum time every top-level package took to be imported
+    in all the attempts (to filter out the noise of the machine load) and
+    the list of lazy modules that were imported.
+    """
+    python_executable = python_executable or PYTHON_EXECUTABLE
+    # Lazy modules are listed by tobiko.common._loader module, that is
+    # imported after checked module
+    script = (f"import json, sys; import {module_name}; "
+              "from tobiko.common import _loader; "
+              "print(json.dumps([m for m in _loader.LAZY_MODULES "
+              "if m in sys.modules]))")
+    best: typing.Dict[str, float] = {}
+    imported: typing.List[str] = []
+    for _ in range(max(1, repeat)):
+        result = subprocess.run([python_executable, '-X', 'importtime',
+                                 '-c', script],
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE,
+                                universal_newlines=True,
+                                cwd=TOP_DIR,
+                                check=True)
+        imported = json.loads(result.stdout.splitlines()[-1])
+        packages = get_packages_import_time(parse_import_time(result.stderr))
+        for package, import_time in packages.items():
+            best[package] = min(best.get(package, import_time), import_time)
+    return best, imported
+
+
+def check_import_time(module_name: str,
+                      packages: typing.Dict[str, float],
+                      imported: typing.List[str],
+                      budgets: typing.Dict[str, float] = None,
+                      default_budget: float = DEFAULT_BUDGET) \
+        -> typing.List[str]:
+    """Returns a message for every exceeded budget"""
+    if budgets is None:
+        budgets = IMPORT_TIME_BUDGETS
+    failures = [f"{module_name}: lazy module '{name}' has been imported"
+                for name in imported]
+    for package, import_time in sorted(packages.items()):
+        budget = budgets.get(package, default_budget)
+        if import_time > budget:
+            failures.append(f"{module_name}: package '{package}' took "
+                            f"{import_time:.1f} ms to be imported "
+                            f"(budget is {budget:.1f} ms)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check the time taken by Python to import tobiko")
+    parser.add_argument('modules', nargs='*',
+                        default=CHECKED_MODULES,
+                        help='modules to be imported')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of times every module is imported')
+    parser.add_argument('--top', type=int, default=10,
+                        help='number of slowest packages to be reported')
+    args = parser.parse_args()
+    common.setup_logging()
+
+    failures: typing.List[str] = []
+    for module_name in args.modules:
+        packages, imported = measure_import_time(module_name,
+                                                 repeat=args.repeat)
+        total = sum(packages.values())
+        slowest = sorted(packages.items(), key=lambda item: -item[1])
+        LOG.info(f"Module '{module_name}' imported in {total:.1f} ms:\n" +
+                 '\n'.join(f"  {package}: {import_time:.1f} ms"
+                           for package, import_time in slowest[:args.top]))
+        failures += check_import_time(module_name,
+                                      packages=packages,
+                                      imported=imported)
+
+    for failure in failures:
+        LOG.error(failure)
+    sys.exit(failures and 1 or 0)
+
+
+if __name__ == '__main__':
+    main()